@@ -0,0 +1,204 @@
+"""
+In-process publish/subscribe data bus for Car Monitor.
+The reader publishes samples; scorer, logger and display consume them on
+their own threads through bounded queues.
+"""
+
+import queue
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+
+class Topic(NamedTuple):
+    """Named channel carrying messages of one type."""
+    name: str
+    type: type
+
+
+# Raw OBD-II samples as produced by OBDReader.read_all()
+SAMPLES = Topic('obd.sample', dict)
+
+# Samples with 'score' and 'event_type' added by the scorer (during trips)
+SCORED = Topic('trip.scored', dict)
+
+# Stops a subscriber thread
+_STOP = object()
+
+
+class Subscription:
+    """
+    One subscriber: a bounded queue drained by a dedicated thread.
+
+    When the queue is full the oldest message is dropped, so a slow
+    subscriber loses data itself instead of delaying the publisher or
+    other subscribers.
+    """
+
+    def __init__(self, topic: Topic, callback: Callable[[Any], None],
+                 maxsize: int = 100, name: Optional[str] = None):
+        """
+        Initialize subscription.
+
+        Args:
+            topic: Topic to receive
+            callback: Function run on the subscriber thread for each message
+            maxsize: Queue bound
+            name: Thread name (for debugging)
+        """
+        self.topic = topic
+        self.callback = callback
+        self.name = name or getattr(callback, '__qualname__', topic.name)
+        self.queue: 'queue.Queue' = queue.Queue(maxsize=maxsize)
+        self.delivered = 0
+        self.dropped = 0
+        self.errors = 0
+        self._put_lock = Lock()
+        self._thread = Thread(target=self._run, name=f"bus:{self.name}", daemon=True)
+        self._thread.start()
+
+    def put(self, message: Any):
+        """Enqueue a message, dropping the oldest if the queue is full."""
+        with self._put_lock:
+            while True:
+                try:
+                    self.queue.put_nowait(message)
+                    return
+                except queue.Full:
+                    try:
+                        self.queue.get_nowait()
+                        self.queue.task_done()
+                        self.dropped += 1
+                    except queue.Empty:
+                        pass
+
+    def _run(self):
+        while True:
+            message = self.queue.get()
+            try:
+                if message is _STOP:
+                    return
+                self.callback(message)
+                self.delivered += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"Error in bus subscriber {self.name}: {e}")
+            finally:
+                self.queue.task_done()
+
+    def drain(self):
+        """Block until every queued message has been handled."""
+        self.queue.join()
+
+    def close(self, timeout: float = 2.0):
+        """
+        Handle queued messages, then stop the thread.
+
+        Args:
+            timeout: Seconds to wait for room in a full queue (the oldest
+                message is dropped after that) and for the thread to end
+        """
+        try:
+            self.queue.put(_STOP, timeout=timeout)
+        except queue.Full:
+            # A stuck subscriber must not hang shutdown
+            self.put(_STOP)
+        self._thread.join(timeout=timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get subscriber statistics.
+
+        Returns:
+            Dictionary with delivered/dropped/error counts and queue depth
+        """
+        return {
+            'topic': self.topic.name,
+            'delivered': self.delivered,
+            'dropped': self.dropped,
+            'errors': self.errors,
+            'queued': self.queue.qsize(),
+        }
+
+
+class DataBus:
+    """Typed topics fanned out to independent subscriber threads."""
+
+    def __init__(self):
+        """Initialize data bus."""
+        self._subscriptions: Dict[str, List[Subscription]] = {}
+        self._lock = Lock()
+
+    def subscribe(self, topic: Topic, callback: Callable[[Any], None],
+                  maxsize: int = 100, name: Optional[str] = None) -> Subscription:
+        """
+        Receive messages published on a topic.
+
+        Args:
+            topic: Topic to receive
+            callback: Function run on the subscription's own thread
+            maxsize: Queue bound (oldest messages are dropped beyond it)
+            name: Subscriber name for statistics
+
+        Returns:
+            Subscription handle
+        """
+        subscription = Subscription(topic, callback, maxsize=maxsize, name=name)
+        with self._lock:
+            self._subscriptions.setdefault(topic.name, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        """Stop delivering to a subscription and end its thread."""
+        with self._lock:
+            subscribers = self._subscriptions.get(subscription.topic.name, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+        subscription.close()
+
+    def publish(self, topic: Topic, message: Any):
+        """
+        Deliver a message to every subscriber of a topic (never blocks).
+
+        Args:
+            topic: Topic to publish on
+            message: Message of the topic's type
+        """
+        if not isinstance(message, topic.type):
+            raise TypeError(f"{topic.name} expects {topic.type.__name__}, "
+                            f"got {type(message).__name__}")
+        for subscription in tuple(self._subscriptions.get(topic.name, ())):
+            subscription.put(message)
+
+    def drain(self, topic: Optional[Topic] = None):
+        """
+        Wait until subscribers have handled everything published so far.
+
+        Args:
+            topic: Only wait for this topic's subscribers (default: all)
+        """
+        with self._lock:
+            if topic is None:
+                subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+            else:
+                subscriptions = list(self._subscriptions.get(topic.name, ()))
+        for subscription in subscriptions:
+            subscription.drain()
+
+    def close(self):
+        """Stop all subscriber threads."""
+        with self._lock:
+            subscriptions = [s for subs in self._subscriptions.values() for s in subs]
+            self._subscriptions.clear()
+        for subscription in subscriptions:
+            subscription.close()
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """
+        Get statistics for every subscription.
+
+        Returns:
+            List of per-subscriber statistics dictionaries
+        """
+        with self._lock:
+            return [dict(s.get_stats(), name=s.name)
+                    for subs in self._subscriptions.values() for s in subs]
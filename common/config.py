@@ -1,12 +1,153 @@
 """
 Configuration management for Car Monitor project.
-Loads and validates configuration from YAML files.
+Loads configuration from YAML files. Only the 'scoring' and 'display'
+sections are typed and validated (Config.settings) and can be reloaded
+while running (Config.watch); every other section is read untyped through
+Config.get() and takes effect after a restart.
 """
 
+import marshal
 import os
-import yaml
+import sys
 from pathlib import Path
-from typing import Any, Dict, Optional
+from threading import Event, Thread
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+# Sections applied to running components on reload; the rest need a restart
+LIVE_SECTIONS = ('scoring', 'display')
+
+# Fields of the live sections that running components cannot change
+RESTART_FIELDS = ('display.width', 'display.height', 'display.fullscreen')
+
+
+class ScoringSettings(NamedTuple):
+    """Typed 'scoring' section."""
+    harsh_brake_threshold: float = -5.0  # m/s²
+    aggressive_accel_threshold: float = 3.0  # m/s²
+    speeding_threshold: float = 120.0  # kph
+    update_interval: float = 1.0  # seconds
+
+
+class DisplaySettings(NamedTuple):
+    """Typed 'display' section (window size and fullscreen apply at start-up)."""
+    width: int = 480
+    height: int = 320
+    fullscreen: bool = True
+    update_rate: float = 10.0  # Hz
+    idle_rate: float = 1.0  # Hz
+    idle_after: float = 3.0  # seconds
+    history_seconds: float = 60.0
+
+
+class Settings(NamedTuple):
+    """Typed view of the live sections, rebuilt on every reload."""
+    scoring: ScoringSettings
+    display: DisplaySettings
+
+
+def cache_path(config_file: Path) -> Path:
+    """Location of the parsed-config cache for a YAML file."""
+    return config_file.parent / '__pycache__' / f"{config_file.name}.{sys.implementation.cache_tag}.marshal"
+
+
+def load_yaml(config_file: Path, use_cache: bool = True) -> Dict:
+    """
+    Load a YAML config file through a marshal cache.
+    
+    The parsed dictionary is cached next to the file (in __pycache__) and
+    reused while the file's size and modification time are unchanged, so
+    a warm start neither parses YAML nor imports PyYAML.
+    
+    Args:
+        config_file: YAML file
+        use_cache: Read and write the cache
+        
+    Returns:
+        Parsed configuration
+    """
+    stat = config_file.stat()
+    key = (stat.st_mtime_ns, stat.st_size)
+    cache = cache_path(config_file)
+    if use_cache:
+        try:
+            with open(cache, 'rb') as f:
+                cached_key, data = marshal.load(f)
+            if tuple(cached_key) == key:
+                return data
+        except (OSError, EOFError, ValueError, TypeError):
+            pass
+    
+    import yaml
+    with open(config_file, 'r') as f:
+        data = yaml.safe_load(f)
+    
+    if use_cache:
+        tmp = cache.with_suffix(f'.{os.getpid()}.tmp')
+        try:
+            cache.parent.mkdir(exist_ok=True)
+            with open(tmp, 'wb') as f:
+                marshal.dump((key, data), f)
+            os.replace(tmp, cache)
+        except (OSError, ValueError):
+            # Read-only tree, or values marshal cannot store (e.g. YAML dates)
+            try:
+                tmp.unlink()
+            except OSError:
+                pass
+    return data
+
+
+def _build_section(cls, name: str, values: Optional[Dict]):
+    """Build a typed section, checking value types (ints are accepted as floats)."""
+    values = values or {}
+    if not isinstance(values, dict):
+        raise ValueError(f"{name}: expected a mapping, got {values!r}")
+    
+    unknown = sorted(set(values) - set(cls._fields))
+    if unknown:
+        print(f"⚠️  Unknown config keys ignored: {', '.join(f'{name}.{key}' for key in unknown)}")
+    
+    fields = {}
+    for field, kind in cls.__annotations__.items():
+        if field not in values:
+            continue
+        value = values[field]
+        if kind is float and isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+            raise ValueError(f"{name}.{field}: expected {kind.__name__}, got {value!r}")
+        fields[field] = value
+    return cls(**fields)
+
+
+def build_settings(config: Dict) -> Settings:
+    """
+    Build and validate typed settings from a parsed config.
+    
+    Args:
+        config: Parsed configuration dictionary
+        
+    Returns:
+        Settings instance
+        
+    Raises:
+        ValueError: If a value has the wrong type or is out of range
+    """
+    scoring = _build_section(ScoringSettings, 'scoring', config.get('scoring'))
+    display = _build_section(DisplaySettings, 'display', config.get('display'))
+    
+    if scoring.harsh_brake_threshold >= 0:
+        raise ValueError("scoring.harsh_brake_threshold must be negative")
+    if scoring.aggressive_accel_threshold <= 0:
+        raise ValueError("scoring.aggressive_accel_threshold must be positive")
+    if scoring.speeding_threshold <= 0 or scoring.update_interval <= 0:
+        raise ValueError("scoring.speeding_threshold and scoring.update_interval must be positive")
+    if display.width <= 0 or display.height <= 0:
+        raise ValueError("display.width and display.height must be positive")
+    if min(display.update_rate, display.idle_rate, display.history_seconds) <= 0 or display.idle_after < 0:
+        raise ValueError("display rates and history_seconds must be positive")
+    
+    return Settings(scoring=scoring, display=display)
 
 
 class Config:
@@ -31,21 +172,44 @@ class Config:
         if not config_file.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_file}")
         
-        with open(config_file, 'r') as f:
-            self._config = yaml.safe_load(f)
+        self.config_file = config_file
+        self._config = load_yaml(config_file)
         
         # Resolve relative paths
-        self._resolve_paths()
+        self._resolve_paths(self._config)
+        
+        # Typed live sections (validated) and the flattened dot-key lookup
+        self.settings = build_settings(self._config)
+        self._compile()
+        
+        # Hot reload
+        self._reload_callbacks: List[Callable[[Settings], None]] = []
+        self._watcher: Optional[Thread] = None
+        self._watch_stop = Event()
     
-    def _resolve_paths(self):
+    def _resolve_paths(self, config: Dict):
         """Convert relative paths in config to absolute paths."""
-        if 'logging' in self._config and 'directory' in self._config['logging']:
-            log_dir = self._config['logging']['directory']
+        if 'logging' in config and 'directory' in config['logging']:
+            log_dir = config['logging']['directory']
             if not os.path.isabs(log_dir):
-                self._config['logging']['directory'] = str(
+                config['logging']['directory'] = str(
                     self.project_root / log_dir
                 )
     
+    def _compile(self):
+        """Flatten the config into one dict keyed by dotted path."""
+        flat = {}
+        
+        def walk(prefix: str, node: Dict):
+            for k, value in node.items():
+                key = f"{prefix}{k}"
+                flat[key] = value
+                if isinstance(value, dict):
+                    walk(f"{key}.", value)
+        
+        walk('', self._config)
+        self._flat = flat
+    
     def get(self, key: str, default: Any = None) -> Any:
         """
         Get configuration value using dot notation.
@@ -62,16 +226,7 @@ class Config:
             >>> port = config.get('obd.port')
             >>> width = config.get('display.width', 640)
         """
-        keys = key.split('.')
-        value = self._config
-        
-        for k in keys:
-            if isinstance(value, dict) and k in value:
-                value = value[k]
-            else:
-                return default
-        
-        return value
+        return self._flat.get(key, default)
     
     def get_section(self, section: str) -> Dict:
         """
@@ -102,6 +257,115 @@ class Config:
             config = config[k]
         
         config[keys[-1]] = value
+        
+        if keys[0] in LIVE_SECTIONS:
+            self.settings = build_settings(self._config)
+        self._compile()
+    
+    def on_reload(self, callback: Callable[[Settings], None]):
+        """
+        Register a callback run with the new settings after each reload.
+        
+        Args:
+            callback: Function taking a Settings instance (called from the
+                watcher thread)
+        """
+        self._reload_callbacks.append(callback)
+    
+    def reload(self) -> bool:
+        """
+        Re-read the config file and swap in the live sections.
+        
+        The new file is parsed and validated completely before anything is
+        replaced; on any error the running settings are kept. Changes to
+        other sections are reported but only take effect after a restart.
+        
+        Returns:
+            True if new settings were applied
+        """
+        try:
+            data = load_yaml(self.config_file)
+            if not isinstance(data, dict):
+                raise ValueError("expected a mapping at the top level")
+            self._resolve_paths(data)
+            settings = build_settings(data)
+        except Exception as e:
+            print(f"❌ Config reload failed, keeping current settings: {e}")
+            return False
+        
+        config = dict(self._config)
+        for section in LIVE_SECTIONS:
+            config[section] = data.get(section) or {}
+        restart = sorted(str(k) for k in set(data) | set(config)
+                         if data.get(k) != config.get(k))
+        for key in RESTART_FIELDS:
+            section, field = key.split('.')
+            old, new = getattr(self.settings, section), getattr(settings, section)
+            if getattr(old, field) != getattr(new, field):
+                restart.append(key)
+        
+        # Each swap is a single reference assignment
+        self._config = config
+        self._compile()
+        self.settings = settings
+        
+        print(f"✅ Config reloaded ({', '.join(LIVE_SECTIONS)})")
+        if restart:
+            print(f"⚠️  Changes to {', '.join(restart)} take effect after restart")
+        for callback in list(self._reload_callbacks):
+            try:
+                callback(settings)
+            except Exception as e:
+                print(f"Error in config reload callback: {e}")
+        return True
+    
+    def watch(self, interval: float = 1.0) -> bool:
+        """
+        Poll the config file and reload it when it changes.
+        
+        A change is applied once the file's mtime and size have been stable
+        for one poll, so a file caught mid-save is not loaded.
+        
+        Args:
+            interval: Seconds between checks (0 disables watching)
+            
+        Returns:
+            True if the watcher was started
+        """
+        if interval <= 0 or self._watcher is not None:
+            return False
+        self._watch_stop.clear()
+        self._watcher = Thread(target=self._watch, args=(interval, self._file_key()),
+                               name='config-watch', daemon=True)
+        self._watcher.start()
+        return True
+    
+    def stop_watching(self):
+        """Stop the config file watcher."""
+        if self._watcher is None:
+            return
+        self._watch_stop.set()
+        self._watcher.join(timeout=2.0)
+        self._watcher = None
+    
+    def _file_key(self):
+        stat = self.config_file.stat()
+        return stat.st_mtime_ns, stat.st_size
+    
+    def _watch(self, interval: float, current):
+        pending = current
+        while not self._watch_stop.wait(interval):
+            try:
+                key = self._file_key()
+            except OSError:
+                continue  # Replaced by an editor; check again next time
+            if key == current:
+                pending = key
+            elif key != pending:
+                pending = key  # Still changing
+            else:
+                current = key
+                self.reload()
     
     def save(self, output_file: Optional[str] = None):
         """
@@ -110,6 +374,8 @@ class Config:
         Args:
             output_file: Output file path. If None, overwrites original file.
         """
+        import yaml
+        
         if output_file is None:
             output_file = self.project_root / f"config/phase{self.phase}_config.yaml"
         
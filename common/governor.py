@@ -0,0 +1,203 @@
+"""
+Adaptive frame-rate governor for Car Monitor frontends.
+Refreshes fast while values change and drops to ~1 Hz when the car is static.
+"""
+
+import time
+from threading import Event, Lock
+from typing import Any, Callable, Dict, List, Optional
+
+from common.vehicle_state import MOVING
+
+
+# Minimum change per channel that counts as "the display would change"
+DEFAULT_CHANGE_THRESHOLDS = {
+    'speed_kph': 0.5,
+    'rpm': 25.0,
+    'throttle_pct': 1.0,
+    'engine_load': 2.0,
+    'accel_calculated': 0.1,
+}
+
+
+class FrameGovernor:
+    """Chooses the display refresh interval from recent data activity."""
+
+    def __init__(self, max_hz: float = 10.0, idle_hz: float = 1.0, idle_after: float = 3.0,
+                 harsh_brake_threshold: float = -5.0, aggressive_accel_threshold: float = 3.0,
+                 change_thresholds: Optional[Dict[str, float]] = None):
+        """
+        Initialize frame governor.
+
+        Args:
+            max_hz: Refresh rate while values are changing
+            idle_hz: Refresh rate once nothing has changed for a while
+            idle_after: Seconds without change before the rate starts dropping
+            harsh_brake_threshold: Acceleration (m/s²) that wakes immediately
+            aggressive_accel_threshold: Acceleration (m/s²) that wakes immediately
+            change_thresholds: Per-channel minimum change counted as activity
+        """
+        self.max_hz = max_hz
+        self.idle_hz = min(idle_hz, max_hz)
+        self.idle_after = idle_after
+        self.harsh_brake_threshold = harsh_brake_threshold
+        self.aggressive_accel_threshold = aggressive_accel_threshold
+        self.change_thresholds = change_thresholds or dict(DEFAULT_CHANGE_THRESHOLDS)
+        self.max_hz_override: Optional[float] = None  # Kept across configure()
+        self.ceiling_hz: Optional[float] = None  # Cap while the car is not moving
+
+        self.last_activity = time.monotonic()
+        self.last_touch = float('-inf')  # Lifts ceiling_hz for idle_after seconds
+        self._last_values: Dict[str, Any] = {}
+        self._lock = Lock()
+        self._wake_event = Event()
+        self._wake_callbacks: List[Callable[[], None]] = []
+
+    @classmethod
+    def from_config(cls, config, max_hz: Optional[float] = None) -> 'FrameGovernor':
+        """
+        Create a governor from the 'display' and 'scoring' config sections.
+
+        Args:
+            config: Config instance
+            max_hz: Override for display.update_rate (e.g. console refresh)
+
+        Returns:
+            FrameGovernor instance
+        """
+        governor = cls(
+            max_hz=max_hz if max_hz is not None else config.get('display.update_rate', 10),
+            idle_hz=config.get('display.idle_rate', 1.0),
+            idle_after=config.get('display.idle_after', 3.0),
+            harsh_brake_threshold=config.get('scoring.harsh_brake_threshold', -5.0),
+            aggressive_accel_threshold=config.get('scoring.aggressive_accel_threshold', 3.0)
+        )
+        governor.max_hz_override = max_hz
+        return governor
+
+    def configure(self, settings):
+        """
+        Apply reloaded 'display' and 'scoring' settings (safe from any thread).
+
+        Args:
+            settings: Settings from Config.settings
+        """
+        display, scoring = settings.display, settings.scoring
+        max_hz = self.max_hz_override or display.update_rate
+        with self._lock:
+            self.max_hz = max_hz
+            self.idle_hz = min(display.idle_rate, max_hz)
+            self.idle_after = display.idle_after
+            self.harsh_brake_threshold = scoring.harsh_brake_threshold
+            self.aggressive_accel_threshold = scoring.aggressive_accel_threshold
+            if self.ceiling_hz is not None:
+                self.ceiling_hz = self.idle_hz
+        self.wake()
+
+    def on_vehicle_state(self, previous: str, state: str):
+        """
+        Cap the refresh rate at idle_hz unless the car is moving.
+
+        Args:
+            previous: Previous vehicle state
+            state: New vehicle state (TripDetector listener)
+        """
+        if state == MOVING:
+            self.ceiling_hz = None
+            self.wake()
+        else:
+            self.ceiling_hz = self.idle_hz
+
+    def add_wake_callback(self, callback: Callable[[], None]):
+        """
+        Register a callback run (from any thread) when the governor wakes.
+
+        Args:
+            callback: Function that makes the frontend redraw promptly
+        """
+        self._wake_callbacks.append(callback)
+
+    def on_sample(self, data: Dict[str, Any]):
+        """
+        Observe a new sample (safe to call from the reader thread).
+
+        Args:
+            data: Sample dictionary from OBDReader
+        """
+        changed = False
+        with self._lock:
+            for channel, threshold in self.change_thresholds.items():
+                value = data.get(channel)
+                last = self._last_values.get(channel)
+                if value == last:
+                    continue
+                if value is not None and last is not None and abs(value - last) <= threshold:
+                    continue
+                self._last_values[channel] = value
+                changed = True
+
+        accel = data.get('accel_calculated')
+        event = accel is not None and (accel < self.harsh_brake_threshold or
+                                       accel > self.aggressive_accel_threshold)
+
+        if event or (changed and self.is_idle()):
+            self.wake()
+        elif changed:
+            self.last_activity = time.monotonic()
+
+    def touch(self):
+        """Go to full rate for user input, even while the car is not moving."""
+        self.last_touch = time.monotonic()
+        self.wake()
+
+    def wake(self):
+        """Go to full rate immediately (driving event, motion; capped by ceiling_hz)."""
+        self.last_activity = time.monotonic()
+        self._wake_event.set()
+        for callback in self._wake_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                print(f"Error in governor wake callback: {e}")
+
+    def is_idle(self) -> bool:
+        """Check if the display has dropped below full rate."""
+        return time.monotonic() - self.last_activity > self.idle_after
+
+    def current_hz(self) -> float:
+        """
+        Get the refresh rate to use now.
+
+        Returns:
+            Rate in Hz: max_hz while active, then halving every second
+            after idle_after down to idle_hz (capped by ceiling_hz, except
+            within idle_after of a touch)
+        """
+        now = time.monotonic()
+        quiet = now - self.last_activity
+        if quiet <= self.idle_after:
+            hz = self.max_hz
+        else:
+            hz = max(self.idle_hz, self.max_hz / 2 ** (quiet - self.idle_after))
+        ceiling = self.ceiling_hz
+        if ceiling is None or now - self.last_touch <= self.idle_after:
+            return hz
+        return min(hz, ceiling)
+
+    def interval(self) -> float:
+        """Get the time in seconds until the next frame."""
+        return 1.0 / self.current_hz()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Sleep until the next frame is due or the governor is woken.
+
+        Args:
+            timeout: Maximum wait (default: current frame interval)
+
+        Returns:
+            True if woken early
+        """
+        woken = self._wake_event.wait(self.interval() if timeout is None else timeout)
+        self._wake_event.clear()
+        return woken
@@ -3,31 +3,522 @@ Data logging system for Car Monitor project.
 Handles CSV logging of trip data and session management.
 """
 
+import io
 import os
 import csv
+import json
+import heapq
+import time
+import weakref
+import zlib
 from datetime import datetime
+from queue import Empty, SimpleQueue
+from threading import Condition, Lock, Thread
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+
+from common.stats import StatsRegistry
+
+
+# Phase 1: OBD-II only
+PHASE1_FIELDS = [
+    'timestamp',
+    'speed_kph',
+    'throttle_pct',
+    'rpm',
+    'engine_load',
+    'accel_calculated',
+    'event_type',
+    'score'
+]
+
+# Phase 2: + IMU + GPS
+PHASE2_FIELDS = PHASE1_FIELDS + [
+    'accel_x',
+    'accel_y',
+    'accel_z',
+    'jerk',
+    'latitude',
+    'longitude',
+    'gps_speed',
+    'gps_bearing'
+]
+
+# Phase 3: + Lane Detection
+PHASE3_FIELDS = PHASE2_FIELDS + [
+    'lane_center_offset',
+    'lane_confidence',
+    'lane_status',
+    'video_frame'
+]
+
+# Fields that are not numeric channels (skipped by aggregations)
+NON_NUMERIC_FIELDS = {'timestamp', 'event_type', 'lane_status', 'video_frame'}
+
+
+def get_fieldnames(phase: int = 1) -> List[str]:
+    """
+    Get CSV field names for a phase.
+    
+    Args:
+        phase: Phase number (1, 2, or 3)
+        
+    Returns:
+        List of field names in column order
+    """
+    if phase == 1:
+        return list(PHASE1_FIELDS)
+    elif phase == 2:
+        return list(PHASE2_FIELDS)
+    else:
+        return list(PHASE3_FIELDS)
+
+
+def get_channels(phase: int = 1) -> List[str]:
+    """
+    Get the numeric channels logged for a phase.
+    
+    Args:
+        phase: Phase number (1, 2, or 3)
+        
+    Returns:
+        Field names that hold numeric values
+    """
+    return [f for f in get_fieldnames(phase) if f not in NON_NUMERIC_FIELDS]
+
+
+def parse_timestamp(value: Any) -> Optional[float]:
+    """
+    Convert a logged timestamp to seconds since the epoch.
+    
+    Args:
+        value: Epoch seconds (number or string) or ISO-8601 string
+        
+    Returns:
+        Epoch seconds, or None if the value cannot be parsed
+    """
+    if value is None or value == '':
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        pass
+    try:
+        return datetime.fromisoformat(str(value)).timestamp()
+    except ValueError:
+        return None
+
+
+def parse_number(value: Any) -> Optional[float]:
+    """
+    Convert a logged cell to a float.
+    
+    Args:
+        value: Cell value (number, numeric string or empty)
+        
+    Returns:
+        Float value, or None for empty/non-numeric cells
+    """
+    if value is None or value == '':
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# Comment line that makes a trip log self-describing
+TRIP_META_PREFIX = '# carmonitor '
+
+# Trip logs are append-only: rows are written in blocks, each followed by a
+# checksummed trailer, and a completed trip ends with a summary footer
+TRIP_FORMAT = 'carmonitor-trip'
+TRIP_FORMAT_VERSION = 1
+BLOCK_PREFIX = '# block '
+END_PREFIX = '# end '
+
+# Deadband logs leave unchanged cells empty (trailing ones are not written,
+# so an unchanged tick is just its timestamp); an explicit missing value is this
+DEADBAND_NULL = 'NULL'
+
+
+def read_trip_header(f) -> Tuple[Dict[str, Any], List[str]]:
+    """
+    Read the metadata comments and CSV header of a trip log.
+    
+    Args:
+        f: Trip log opened in binary mode, positioned at the start
+        
+    Returns:
+        Tuple of (metadata dictionary, field names)
+    """
+    meta = {}
+    while True:
+        line = f.readline()
+        if not line:
+            return meta, []
+        text = line.decode('utf-8')
+        if text.startswith(TRIP_META_PREFIX):
+            meta.update(json.loads(text[len(TRIP_META_PREFIX):]))
+        elif not text.startswith('#'):
+            return meta, next(csv.reader([text]), [])
+
+
+def fill_held(values: List[str], held: List[str]) -> List[str]:
+    """
+    Rebuild a full deadband row in place from the last written values.
+    
+    Args:
+        values: Cells of one deadband row (empty or missing means unchanged)
+        held: Last value of each column, updated in place
+        
+    Returns:
+        The filled row
+    """
+    if len(values) < len(held):
+        values.extend([''] * (len(held) - len(values)))
+    for i, value in enumerate(values):
+        if value == '':
+            values[i] = held[i]
+        else:
+            if value == DEADBAND_NULL:
+                value = ''
+                values[i] = value
+            held[i] = value
+    return values
+
+
+def iter_trip_rows(path: str, offset: Optional[int] = None,
+                   with_offsets: bool = False) -> Iterator[Any]:
+    """
+    Iterate over the rows of a trip log.
+    
+    Deadband (change-only) logs are rebuilt transparently: every yielded
+    row carries each column's last written value.
+    
+    Args:
+        path: Path to a trip CSV written by TripLogger
+        offset: Byte offset of the first row to read (default: after header,
+            ignored for deadband logs which must be read from the start)
+        with_offsets: Yield (offset, row) pairs instead of rows
+        
+    Yields:
+        One dictionary per logged row (values as strings)
+    """
+    with open(path, 'rb') as f:
+        meta, fieldnames = read_trip_header(f)
+        deadband = meta.get('mode') == 'deadband'
+        held = [''] * len(fieldnames)
+        if offset is not None and not deadband:
+            f.seek(offset)
+        
+        while True:
+            row_offset = f.tell()
+            line = f.readline()
+            if not line:
+                break
+            if line.startswith(b'#'):
+                continue
+            values = next(csv.reader([line.decode('utf-8')]), None)
+            if not values:
+                continue
+            if deadband:
+                values = fill_held(values, held)
+                row_offset = None
+            row = dict(zip(fieldnames, values))
+            yield (row_offset, row) if with_offsets else row
+
+
+def _epoch_to_iso(value: Any) -> Optional[str]:
+    """Format a logged timestamp as ISO-8601 (None if unparseable)."""
+    timestamp = parse_timestamp(value)
+    if timestamp is None:
+        return None
+    return datetime.fromtimestamp(timestamp).isoformat()
+
+
+def read_trip_summary(path: str) -> Optional[Dict[str, Any]]:
+    """
+    Read the summary footer of a completed trip log.
+    
+    Only the tail of the file is read.
+    
+    Args:
+        path: Path to trip log
+        
+    Returns:
+        Summary dictionary, or None if the trip has no footer
+    """
+    with open(path, 'rb') as f:
+        size = f.seek(0, os.SEEK_END)
+        f.seek(max(0, size - 4096))
+        tail = f.read()
+    
+    lines = tail.splitlines(keepends=True)
+    if not lines or not lines[-1].endswith(b'\n'):
+        return None
+    last = lines[-1].decode('utf-8', errors='replace')
+    if not last.startswith(END_PREFIX):
+        return None
+    try:
+        return json.loads(last[len(END_PREFIX):])
+    except ValueError:
+        return None
+
+
+def recover_trip(path: str, chunk_size: int = 1 << 16) -> Optional[Dict[str, Any]]:
+    """
+    Repair a trip log that was not closed cleanly.
+    
+    Walks back from the end of the file to the last block whose checksum
+    verifies, truncates anything after it (torn rows or trailers) and
+    appends a summary footer rebuilt from that block's trailer. Only the
+    unsealed tail plus one block is read, so recovery time depends on the
+    block size, not on the trip length.
+    
+    Args:
+        path: Path to trip log
+        chunk_size: Read size while walking backwards
+        
+    Returns:
+        Rebuilt summary, or None if the trip was complete or is not an
+        append-only trip log
+    """
+    with open(path, 'r+b') as f:
+        meta, fieldnames = read_trip_header(f)
+        if meta.get('format') != TRIP_FORMAT or not fieldnames:
+            return None
+        header_end = f.tell()
+        size = f.seek(0, os.SEEK_END)
+        
+        trailer = None
+        cut = header_end
+        pos = size
+        tail = b''
+        
+        while trailer is None and pos > header_end:
+            start = max(header_end, pos - chunk_size)
+            f.seek(start)
+            tail = f.read(pos - start) + tail
+            pos = start
+            
+            # The first line is only known to be whole at the header boundary
+            first = 0 if pos == header_end else tail.find(b'\n') + 1
+            line_end = len(tail)
+            if not tail.endswith(b'\n'):
+                line_end = tail.rfind(b'\n') + 1  # drop the torn last line
+            
+            while line_end > first:
+                line_start = max(first, tail.rfind(b'\n', first, line_end - 1) + 1)
+                line = tail[line_start:line_end]
+                
+                if line.startswith(END_PREFIX.encode()):
+                    if pos + line_end == size:
+                        return None  # already complete
+                elif line.startswith(BLOCK_PREFIX.encode()):
+                    candidate = _verify_block(f, tail, pos, line_start, line, header_end)
+                    if candidate is not None:
+                        trailer = candidate
+                        cut = pos + line_end
+                        break
+                line_end = line_start
+        
+        f.truncate(cut)
+        f.seek(cut)
+        
+        trailer = trailer or {}
+        start_time = meta.get('start_time')
+        end_time = _epoch_to_iso(trailer.get('last_timestamp')) or start_time
+        duration = 0.0
+        if start_time and end_time:
+            duration = max(0.0, parse_timestamp(end_time) - parse_timestamp(start_time))
+        
+        summary = {
+            'file': str(path),
+            'start_time': start_time,
+            'end_time': end_time,
+            'duration_seconds': duration,
+            'data_points': trailer.get('data_points', 0),
+            'rows_written': trailer.get('rows_written', 0),
+            'recovered': True
+        }
+        f.write((END_PREFIX + json.dumps(summary) + '\n').encode('utf-8'))
+        f.flush()
+        os.fsync(f.fileno())
+    
+    return summary
+
+
+def _verify_block(f, tail: bytes, tail_pos: int, line_start: int, line: bytes,
+                  header_end: int) -> Optional[Dict[str, Any]]:
+    """Parse a block trailer and check the CRC of the rows before it."""
+    try:
+        trailer = json.loads(line[len(BLOCK_PREFIX):].decode('utf-8'))
+        length = int(trailer['bytes'])
+    except (ValueError, KeyError, TypeError):
+        return None
+    
+    data_start = tail_pos + line_start - length
+    if data_start < header_end:
+        return None
+    if data_start >= tail_pos:
+        data = tail[line_start - length:line_start]
+    else:
+        f.seek(data_start)
+        data = f.read(length)
+    
+    if zlib.crc32(data) != trailer.get('crc'):
+        return None
+    return trailer
+
+
+def recover_trips(log_dir: str, exclude: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Run crash recovery over every trip log in a directory.
+    
+    Args:
+        log_dir: Trip log directory
+        exclude: Path to skip (e.g. a trip currently being written)
+        
+    Returns:
+        Summaries of the trips that were repaired
+    """
+    recovered = []
+    for path in sorted(Path(log_dir).glob('*.csv')):
+        if exclude is not None and str(path) == str(exclude):
+            continue
+        try:
+            summary = recover_trip(str(path))
+        except (OSError, ValueError) as e:
+            print(f"Could not recover {path}: {e}")
+            continue
+        if summary is not None:
+            print(f"Recovered trip {path.name}: {summary['data_points']} data points")
+            recovered.append(summary)
+    return recovered
+
+
+class _BlockSealer:
+    """
+    Seals the pending block of any TripLogger once its oldest row is
+    durability_budget old, so the budget holds when rows stop arriving
+    (duty-cycled polling, dropped samples). One thread serves every live
+    logger from a deadline heap, so a gateway logging many vehicles does
+    not run a thread per trip. Only weak references are queued, so a
+    forgotten logger can still be collected and close its trip.
+    """
+
+    def __init__(self):
+        self._due: List[Tuple[float, int, 'weakref.ref']] = []
+        self._counter = 0
+        self._wakeup = Condition()
+        self._thread: Optional[Thread] = None
+
+    def schedule(self, logger: 'TripLogger', deadline: float):
+        """
+        Check a logger's pending block at a monotonic deadline.
+
+        Args:
+            logger: Logger with a pending block
+            deadline: time.monotonic() value the block reaches its budget
+        """
+        with self._wakeup:
+            self._counter += 1
+            heapq.heappush(self._due, (deadline, self._counter, weakref.ref(logger)))
+            if self._thread is None:
+                self._thread = Thread(target=self._run, name='trip-sealer', daemon=True)
+                self._thread.start()
+            if self._due[0][1] == self._counter:
+                self._wakeup.notify()
+
+    def _run(self):
+        while True:
+            with self._wakeup:
+                while not self._due or self._due[0][0] > time.monotonic():
+                    self._wakeup.wait(self._due[0][0] - time.monotonic() if self._due else None)
+                refs = []
+                while self._due and self._due[0][0] <= time.monotonic():
+                    refs.append(heapq.heappop(self._due)[2])
+            # Loggers are locked outside _wakeup; log_data schedules while holding its lock
+            for ref in refs:
+                logger = ref()
+                if logger is not None:
+                    logger._seal_if_aged()
+                del logger
+
+
+_sealer = _BlockSealer()
 
 
 class TripLogger:
     """Logger for trip data with CSV export."""
     
-    def __init__(self, log_dir: str, phase: int = 1):
+    def __init__(self, log_dir: str, phase: int = 1, build_pyramid: bool = False,
+                 deadband: Optional[Dict[str, float]] = None, max_interval: float = 10.0,
+                 durability_budget: float = 2.0, block_rows: int = 50, fsync: bool = True,
+                 clock: Callable[[], float] = time.time):
         """
         Initialize trip logger.
         
         Args:
             log_dir: Directory to store log files
             phase: Phase number (determines which fields to log)
+            build_pyramid: Build min/max/mean plotting pyramid while logging
+            deadband: Per-field tolerances enabling change-only logging. A
+                cell is written only when it moves by more than its tolerance
+                (fields not listed use 0, i.e. any change); an unchanged tick is
+                written as just its timestamp. None logs every row.
+            max_interval: Deadband mode writes a full row at least this often
+                (seconds), bounding how far back a reader must look
+            durability_budget: Maximum age in seconds of buffered rows, i.e.
+                the data at risk on power loss
+            block_rows: Maximum rows per checksummed block (bounds recovery time)
+            fsync: fsync each sealed block (flush only if False)
+            clock: Epoch-seconds clock for trip times and missing sample
+                timestamps (replays pass the recording's clock); the
+                durability budget always runs on the real monotonic clock
         """
         self.log_dir = Path(log_dir)
+        self.clock = clock
         self.phase = phase
+        self.build_pyramid = build_pyramid
+        self.deadband = deadband
+        self.max_interval = max_interval
+        self.pyramid_builder = None
+        self.pyramid_file = None
         self.current_file = None
         self.csv_writer = None
         self.file_handle = None
         self.trip_start_time = None
         self.row_count = 0
+        self.rows_written = 0
+        self.durability_budget = durability_budget
+        self.block_rows = block_rows
+        self.fsync = fsync
+        
+        # Deadband state: last written value per field and last full row time
+        self._written = {}
+        self._last_keyframe = None
+        
+        # Pending block: encoded rows not yet on disk
+        self._block = []
+        self._block_started = None
+        self._block_seq = 0
+        self._offset = 0
+        self._last_timestamp = None
+        self._row_buffer = io.StringIO()
+        
+        # Row and durable-write latency
+        self.stats = StatsRegistry()
+        
+        # Background crash recovery (see recover())
+        self._recovery: Optional[Thread] = None
+        
+        # Guards the pending block, which the shared sealer thread also
+        # seals once it reaches durability_budget (see _BlockSealer)
+        self._sealing = Lock()
         
         # Ensure log directory exists
         self.log_dir.mkdir(parents=True, exist_ok=True)
@@ -35,46 +526,40 @@ class TripLogger:
         # Define fields based on phase
         self.fieldnames = self._get_fieldnames()
     
+    @classmethod
+    def from_config(cls, config, phase: int = 1, log_dir: Optional[str] = None,
+                    clock: Callable[[], float] = time.time) -> 'TripLogger':
+        """
+        Create a trip logger from the 'logging' config section.
+        
+        Args:
+            config: Config instance
+            phase: Phase number
+            log_dir: Directory overriding logging.directory
+            clock: Epoch-seconds clock (see __init__)
+            
+        Returns:
+            TripLogger instance
+        """
+        deadband = None
+        if config.get('logging.deadband.enabled', False):
+            deadband = config.get('logging.deadband.tolerances', {}) or {}
+        
+        return cls(
+            log_dir=log_dir or config.log_directory,
+            phase=phase,
+            build_pyramid=config.get('logging.pyramid', False),
+            deadband=deadband,
+            max_interval=config.get('logging.deadband.max_interval', 10.0),
+            durability_budget=config.get('logging.durability.max_age', 2.0),
+            block_rows=config.get('logging.durability.block_rows', 50),
+            fsync=config.get('logging.durability.fsync', True),
+            clock=clock
+        )
+    
     def _get_fieldnames(self) -> List[str]:
         """Get CSV field names based on phase."""
-        # Phase 1: OBD-II only
-        phase1_fields = [
-            'timestamp',
-            'speed_kph',
-            'throttle_pct',
-            'rpm',
-            'engine_load',
-            'accel_calculated',
-            'event_type',
-            'score'
-        ]
-        
-        # Phase 2: + IMU + GPS
-        phase2_fields = phase1_fields + [
-            'accel_x',
-            'accel_y',
-            'accel_z',
-            'jerk',
-            'latitude',
-            'longitude',
-            'gps_speed',
-            'gps_bearing'
-        ]
-        
-        # Phase 3: + Lane Detection
-        phase3_fields = phase2_fields + [
-            'lane_center_offset',
-            'lane_confidence',
-            'lane_status',
-            'video_frame'
-        ]
-        
-        if self.phase == 1:
-            return phase1_fields
-        elif self.phase == 2:
-            return phase2_fields
-        else:
-            return phase3_fields
+        return get_fieldnames(self.phase)
     
     def start_trip(self, trip_name: Optional[str] = None) -> str:
         """
@@ -88,20 +573,52 @@ class TripLogger:
         """
         if self.file_handle:
             self.end_trip()
+        if self._recovery is not None:
+            self._recovery.join()
+            self._recovery = None
         
-        self.trip_start_time = datetime.now()
+        self.trip_start_time = datetime.fromtimestamp(self.clock())
         
         if trip_name is None:
             trip_name = self.trip_start_time.strftime('trip_%Y%m%d_%H%M%S')
         
         self.current_file = self.log_dir / f"{trip_name}.csv"
-        self.file_handle = open(self.current_file, 'w', newline='')
+        self.file_handle = open(self.current_file, 'wb')
         self.csv_writer = csv.DictWriter(
-            self.file_handle,
+            self._row_buffer,
             fieldnames=self.fieldnames
         )
-        self.csv_writer.writeheader()
         self.row_count = 0
+        self.rows_written = 0
+        self._written = {}
+        self._last_keyframe = None
+        self._block = []
+        self._block_started = None
+        self._block_seq = 0
+        self._last_timestamp = None
+        
+        meta = {
+            'format': TRIP_FORMAT,
+            'version': TRIP_FORMAT_VERSION,
+            'phase': self.phase,
+            'trip': trip_name,
+            'start_time': self.trip_start_time.isoformat(),
+            'mode': 'full' if self.deadband is None else 'deadband',
+            'block_rows': self.block_rows
+        }
+        if self.deadband is not None:
+            meta['max_interval'] = self.max_interval
+            meta['tolerances'] = self.deadband
+        
+        self.csv_writer.writeheader()
+        header = TRIP_META_PREFIX + json.dumps(meta) + '\n' + self._take_row_text()
+        self._write_durable(header.encode('utf-8'))
+        self._offset = len(header.encode('utf-8'))
+        
+        if self.build_pyramid:
+            from common.pyramid import PyramidBuilder, pyramid_path
+            self.pyramid_builder = PyramidBuilder(get_channels(self.phase))
+            self.pyramid_file = pyramid_path(self.current_file)
         
         print(f"Started trip logging: {self.current_file}")
         return str(self.current_file)
@@ -116,19 +633,144 @@ class TripLogger:
         if not self.csv_writer:
             raise RuntimeError("No active trip. Call start_trip() first.")
         
+        start = time.perf_counter()
+        
         # Add timestamp if not present
         if 'timestamp' not in data:
-            data['timestamp'] = datetime.now().isoformat()
+            data['timestamp'] = datetime.fromtimestamp(self.clock()).isoformat()
         
         # Filter to only include defined fieldnames
         filtered_data = {k: v for k, v in data.items() if k in self.fieldnames}
         
-        self.csv_writer.writerow(filtered_data)
-        self.row_count += 1
+        with self._sealing:
+            # Bucket boundaries remember where their rows start for fast seeks
+            # (deadband rows depend on earlier rows, so they are never seek targets)
+            row_offset = None
+            if (self.pyramid_builder and self.deadband is None
+                    and self.pyramid_builder.wants_offset()):
+                row_offset = self._offset
+            
+            row = filtered_data if self.deadband is None else self._deadband_row(filtered_data)
+            self.row_count += 1
+            self._last_timestamp = filtered_data.get('timestamp')
+            
+            if self.pyramid_builder:
+                self.pyramid_builder.add(filtered_data, row_offset)
+            
+            self.csv_writer.writerow(row)
+            text = self._take_row_text()
+            if self.deadband is not None:
+                # Unchanged trailing cells are implied (see fill_held)
+                text = text.rstrip('\r\n').rstrip(',') + '\r\n'
+            encoded = text.encode('utf-8')
+            self._block.append(encoded)
+            self._offset += len(encoded)
+            self.rows_written += 1
+            if self._block_started is None:
+                self._block_started = time.monotonic()
+                _sealer.schedule(self, self._block_started + self.durability_budget)
+            
+            # Seal the block when it is full or its oldest row hits the budget
+            if self._block and (len(self._block) >= self.block_rows or
+                                time.monotonic() - self._block_started >= self.durability_budget):
+                self._seal_block()
         
-        # Flush every 10 rows to ensure data isn't lost
-        if self.row_count % 10 == 0:
-            self.file_handle.flush()
+        self.stats.record('log_data', (time.perf_counter() - start) * 1e6)
+    
+    def _take_row_text(self) -> str:
+        """Return and clear the text written by csv_writer."""
+        text = self._row_buffer.getvalue()
+        self._row_buffer.seek(0)
+        self._row_buffer.truncate()
+        return text
+    
+    def _write_durable(self, data: bytes):
+        """Append bytes and push them to stable storage."""
+        start = time.perf_counter()
+        self.file_handle.write(data)
+        self.file_handle.flush()
+        if self.fsync:
+            os.fsync(self.file_handle.fileno())
+        self.stats.record('write', (time.perf_counter() - start) * 1e6)
+        self.stats.count('bytes', len(data))
+    
+    def _seal_if_aged(self):
+        """Seal the pending block if it reached the budget (sealer thread)."""
+        with self._sealing:
+            if self.file_handle is None or self._block_started is None:
+                return
+            deadline = self._block_started + self.durability_budget
+            if time.monotonic() < deadline:
+                _sealer.schedule(self, deadline)  # a newer block than the one scheduled
+                return
+            try:
+                self._seal_block()
+                self.stats.count('sealed_by_age')
+            except OSError as e:
+                print(f"❌ Cannot seal trip block: {e}")
+                _sealer.schedule(self, time.monotonic() + self.durability_budget)
+    
+    def _seal_block(self):
+        """Write pending rows followed by their checksummed trailer."""
+        data = b''.join(self._block)
+        self._block_seq += 1
+        
+        trailer = {
+            'seq': self._block_seq,
+            'rows': len(self._block),
+            'bytes': len(data),
+            'crc': zlib.crc32(data),
+            'rows_written': self.rows_written,
+            'data_points': self.row_count,
+            'last_timestamp': self._last_timestamp
+        }
+        line = (BLOCK_PREFIX + json.dumps(trailer, separators=(',', ':')) + '\n').encode('utf-8')
+        
+        self._write_durable(data + line)
+        self._offset += len(line)
+        self._block = []
+        self._block_started = None
+    
+    def _deadband_row(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Reduce a row to the cells that moved outside their deadband.
+        
+        Every tick keeps its timestamp, so readers get back one row per
+        logged sample.
+        
+        Args:
+            data: Filtered row
+            
+        Returns:
+            Row to write (unchanged cells omitted)
+        """
+        now = parse_timestamp(data.get('timestamp'))
+        if now is None:
+            now = self.clock()
+        
+        keyframe = (self._last_keyframe is None
+                    or now - self._last_keyframe >= self.max_interval)
+        
+        row = {}
+        for field in self.fieldnames:
+            if field == 'timestamp':
+                continue
+            value = data.get(field)
+            if not keyframe and field in self._written:
+                last = self._written[field]
+                if value == last:
+                    continue
+                tolerance = self.deadband.get(field, 0.0)
+                if (isinstance(value, (int, float)) and isinstance(last, (int, float))
+                        and abs(value - last) <= tolerance):
+                    continue
+            row[field] = DEADBAND_NULL if value is None or value == '' else value
+            self._written[field] = value
+        
+        if keyframe:
+            self._last_keyframe = now
+        row['timestamp'] = data.get('timestamp')
+        return row
     
     def end_trip(self) -> Dict[str, Any]:
         """
@@ -140,18 +782,28 @@ class TripLogger:
         if not self.file_handle:
             return {}
         
-        trip_end_time = datetime.now()
+        trip_end_time = datetime.fromtimestamp(self.clock())
         duration = (trip_end_time - self.trip_start_time).total_seconds()
         
-        summary = {
-            'file': str(self.current_file),
-            'start_time': self.trip_start_time.isoformat(),
-            'end_time': trip_end_time.isoformat(),
-            'duration_seconds': duration,
-            'data_points': self.row_count
-        }
+        with self._sealing:
+            summary = {
+                'file': str(self.current_file),
+                'start_time': self.trip_start_time.isoformat(),
+                'end_time': trip_end_time.isoformat(),
+                'duration_seconds': duration,
+                'data_points': self.row_count,
+                'rows_written': self.rows_written
+            }
+            
+            if self._block:
+                self._seal_block()
+            self._write_durable((END_PREFIX + json.dumps(summary) + '\n').encode('utf-8'))
+            self.file_handle.close()
+
+        if self.pyramid_builder:
+            summary['pyramid'] = self.pyramid_builder.save(self.pyramid_file, self.current_file)
+            self.pyramid_builder = None
         
-        self.file_handle.close()
         self.file_handle = None
         self.csv_writer = None
         self.current_file = None
@@ -160,6 +812,35 @@ class TripLogger:
         print(f"Trip ended. Duration: {duration:.1f}s, Data points: {summary['data_points']}")
         return summary
     
+    def recover(self, background: bool = False) -> List[Dict[str, Any]]:
+        """
+        Repair trips in the log directory that were not closed cleanly.
+        
+        Args:
+            background: Scan on a thread so start-up is not delayed;
+                start_trip() waits for it to finish
+        
+        Returns:
+            Summaries of the trips that were repaired (empty in background)
+        """
+        if background:
+            self._recovery = Thread(target=recover_trips, args=(self.log_dir,),
+                                    name='trip-recovery', daemon=True)
+            self._recovery.start()
+            return []
+        return recover_trips(self.log_dir, exclude=self.current_file)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get logging statistics.
+        
+        Returns:
+            StatsRegistry snapshot: log_data (per row, including block
+            writes) and write (flush + fsync per block) latency in ms,
+            bytes written, blocks sealed by age without a new row
+        """
+        return self.stats.snapshot()
+    
     def is_logging(self) -> bool:
         """Check if currently logging a trip."""
         return self.file_handle is not None
@@ -173,7 +854,7 @@ class TripLogger:
         """
         if not self.trip_start_time:
             return 0.0
-        return (datetime.now() - self.trip_start_time).total_seconds()
+        return (datetime.fromtimestamp(self.clock()) - self.trip_start_time).total_seconds()
     
     def __del__(self):
         """Ensure file is closed on cleanup."""
@@ -182,48 +863,265 @@ class TripLogger:
 
 
 class RealTimeLogger:
-    """Lightweight real-time logger for high-frequency data."""
+    """
+    Lightweight real-time logger for high-frequency data.
+    
+    log() only enqueues; a background thread owns a persistent file handle
+    and flushes when the buffer reaches buffer_size entries or the oldest
+    buffered entry is older than flush_interval seconds.
+    """
     
-    def __init__(self, log_file: str, buffer_size: int = 100):
+    def __init__(self, log_file: str, buffer_size: int = 100, flush_interval: float = 1.0,
+                 max_bytes: int = 0, backup_count: int = 3):
         """
         Initialize real-time logger.
         
         Args:
             log_file: Path to log file
             buffer_size: Number of entries to buffer before flushing
+            flush_interval: Maximum age in seconds of a buffered entry
+            max_bytes: Rotate the file when it grows past this size (0 disables)
+            backup_count: Number of rotated files to keep (log.1 ... log.N)
         """
         self.log_file = Path(log_file)
         self.buffer_size = buffer_size
-        self.buffer = []
-        self.file_handle = None
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
         
         # Ensure parent directory exists
         self.log_file.parent.mkdir(parents=True, exist_ok=True)
+        
+        self._writer = _LogWriter(self.log_file, buffer_size, flush_interval,
+                                  max_bytes, backup_count)
+        # Runs on garbage collection or at interpreter exit, whichever is first
+        self._finalizer = weakref.finalize(self, self._writer.close)
     
     def log(self, message: str):
         """
-        Log a message.
+        Log a message (never blocks on disk I/O while the logger is open).
         
         Args:
             message: Message to log
         """
         timestamp = datetime.now().isoformat()
-        log_entry = f"[{timestamp}] {message}\n"
-        self.buffer.append(log_entry)
+        entry = f"[{timestamp}] {message}\n"
+        if self._writer.closed:
+            # No writer thread any more: append directly rather than drop
+            self._writer.write_now(entry)
+        else:
+            self._writer.queue.put(entry)
+    
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Write all queued entries to disk.
+        
+        Args:
+            timeout: Seconds to wait for the writer thread (None waits forever)
+            
+        Returns:
+            True if the flush completed within the timeout
+        """
+        return self._writer.request_flush(timeout)
+    
+    def close(self):
+        """Flush remaining entries and close the log file."""
+        self._finalizer()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get writer statistics.
+        
+        Returns:
+            Dictionary with messages, bytes, flushes and rotations written,
+            write errors and messages dropped by them
+        """
+        return dict(self._writer.stats)
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _LogWriter:
+    """
+    Background writer thread owning the RealTimeLogger file handle.
+    
+    Write errors (e.g. disk full, failed rotation) are counted and the
+    batch is dropped; the thread keeps serving flush and stop requests and
+    reopens the file on the next batch.
+    """
+    
+    _FLUSH = object()
+    _STOP = object()
+    
+    def __init__(self, log_file: Path, buffer_size: int, flush_interval: float,
+                 max_bytes: int, backup_count: int):
+        self.log_file = log_file
+        self.buffer_size = buffer_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        
+        self.queue = SimpleQueue()
+        self.stats = {'messages': 0, 'bytes': 0, 'flushes': 0, 'rotations': 0,
+                      'errors': 0, 'dropped': 0}
+        self._flushed = Condition()
+        self._flush_seq = 0
+        self._closed = False
+        self._failing = False
         
-        if len(self.buffer) >= self.buffer_size:
-            self.flush()
+        # Binary mode so size and max_bytes count encoded bytes
+        self.file_handle = open(self.log_file, 'ab')
+        self.size = self.file_handle.tell()
+        
+        self.thread = Thread(target=self._run, name='RealTimeLogger', daemon=True)
+        self.thread.start()
+    
+    @property
+    def closed(self) -> bool:
+        return self._closed
     
-    def flush(self):
-        """Flush buffer to file."""
-        if not self.buffer:
+    def request_flush(self, timeout: Optional[float]) -> bool:
+        """Ask the writer to flush and wait for it."""
+        if self._closed:
+            return True
+        with self._flushed:
+            target = self._flush_seq + 1
+            self.queue.put(self._FLUSH)
+            # A dead writer thread wakes waiters too (see _run)
+            return self._flushed.wait_for(
+                lambda: self._flush_seq >= target or not self.thread.is_alive(), timeout
+            ) and self._flush_seq >= target
+    
+    def close(self):
+        """Stop the writer thread after draining the queue."""
+        if self._closed:
             return
+        self._closed = True
+        self.queue.put(self._STOP)
+        self.thread.join(timeout=5.0)
+    
+    def write_now(self, entry: str):
+        """Append one entry synchronously (used after close)."""
+        data = entry.encode('utf-8')
+        try:
+            with open(self.log_file, 'ab') as f:
+                f.write(data)
+        except OSError as e:
+            self._error(e, 1)
+            return
+        self.stats['messages'] += 1
+        self.stats['bytes'] += len(data)
+    
+    def _run(self):
+        try:
+            self._serve()
+        finally:
+            with self._flushed:
+                self._flushed.notify_all()
+    
+    def _serve(self):
+        buffer = []
+        oldest = None
         
-        with open(self.log_file, 'a') as f:
-            f.writelines(self.buffer)
+        while True:
+            if buffer:
+                timeout = max(0.0, oldest + self.flush_interval - time.monotonic())
+            else:
+                timeout = None
+            
+            try:
+                item = self.queue.get(timeout=timeout)
+            except Empty:
+                item = None
+            
+            if item is self._STOP:
+                # Entries queued by log() racing with close()
+                while True:
+                    try:
+                        entry = self.queue.get_nowait()
+                    except Empty:
+                        break
+                    if isinstance(entry, str):
+                        buffer.append(entry)
+            
+            if item is None or item is self._FLUSH or item is self._STOP:
+                self._write(buffer)
+                buffer = []
+                oldest = None
+                if item is not None:
+                    with self._flushed:
+                        self._flush_seq += 1
+                        self._flushed.notify_all()
+                if item is self._STOP:
+                    if self.file_handle:
+                        self.file_handle.close()
+                        self.file_handle = None
+                    return
+                continue
+            
+            if not buffer:
+                oldest = time.monotonic()
+            buffer.append(item)
+            
+            if len(buffer) >= self.buffer_size:
+                self._write(buffer)
+                buffer = []
+                oldest = None
+    
+    def _error(self, error: OSError, dropped: int):
+        """Count a write error, reporting only the first of a run."""
+        self.stats['errors'] += 1
+        self.stats['dropped'] += dropped
+        if not self._failing:
+            print(f"❌ Cannot write log {self.log_file}: {error}")
+        self._failing = True
+    
+    def _write(self, buffer: List[str]):
+        """Write and flush a batch, rotating the file if it is full."""
+        if not buffer:
+            return
+        
+        data = ''.join(buffer).encode('utf-8')
+        try:
+            if self.file_handle is None:
+                self.file_handle = open(self.log_file, 'ab')
+                self.size = self.file_handle.tell()
+            self.file_handle.write(data)
+            self.file_handle.flush()
+        except OSError as e:
+            self._error(e, len(buffer))
+            return
+        self._failing = False
+        
+        self.size += len(data)
+        self.stats['messages'] += len(buffer)
+        self.stats['bytes'] += len(data)
+        self.stats['flushes'] += 1
         
-        self.buffer.clear()
+        if self.max_bytes and self.size >= self.max_bytes:
+            try:
+                self._rotate()
+            except OSError as e:
+                self._error(e, 0)
     
-    def __del__(self):
-        """Flush remaining buffer on cleanup."""
-        self.flush()
+    def _rotate(self):
+        """Rotate log -> log.1 -> ... -> log.N (the next batch reopens the file)."""
+        self.file_handle.close()
+        self.file_handle = None
+        
+        if self.backup_count > 0:
+            for i in range(self.backup_count - 1, 0, -1):
+                src = self.log_file.with_name(f"{self.log_file.name}.{i}")
+                if src.exists():
+                    src.replace(self.log_file.with_name(f"{self.log_file.name}.{i + 1}"))
+            self.log_file.replace(self.log_file.with_name(f"{self.log_file.name}.1"))
+        else:
+            self.log_file.unlink()
+        
+        self.file_handle = open(self.log_file, 'ab')
+        self.size = 0
+        self.stats['rotations'] += 1
@@ -0,0 +1,481 @@
+"""
+Health metrics for Car Monitor.
+A small registry of counters and gauges rendered in the Prometheus text
+exposition format, served over HTTP on localhost or a Unix socket so
+unattended vehicles can be scraped. Rendering is a pure function of the
+registry, so it works (and can be checked) without any network.
+"""
+
+import math
+import os
+import socket
+import time
+from functools import lru_cache
+from threading import Lock, Thread
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# Prometheus text format version served by the endpoint
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+CPU_TEMP_PATH = '/sys/class/thermal/thermal_zone0/temp'
+
+
+class Sample(NamedTuple):
+    """One exposition line: metric name suffix, labels and value."""
+    suffix: str
+    labels: Dict[str, str]
+    value: float
+
+
+class Metric(NamedTuple):
+    """Metric family as produced by a collector."""
+    name: str
+    kind: str  # counter, gauge or summary
+    help: str
+    samples: List[Sample]
+
+
+class Counter:
+    """Monotonic counter; inc() is a locked add (under a microsecond)."""
+
+    def __init__(self, func: Optional[Callable[[], Optional[float]]] = None):
+        self._value = 0.0
+        self._func = func
+        self._lock = Lock()
+
+    def inc(self, amount: float = 1.0):
+        """Add to the counter (thread-safe)."""
+        with self._lock:
+            self._value += amount
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._func() if self._func is not None else self._value
+
+
+class Gauge:
+    """Value that can go up and down, or is read from a function at scrape time."""
+
+    def __init__(self, func: Optional[Callable[[], Optional[float]]] = None):
+        self._value = 0.0
+        self._func = func
+        self._lock = Lock()
+
+    def set(self, value: float):
+        self._value = value
+
+    def inc(self, amount: float = 1.0):
+        with self._lock:
+            self._value += amount
+
+    def dec(self, amount: float = 1.0):
+        self.inc(-amount)
+
+    @property
+    def value(self) -> Optional[float]:
+        return self._func() if self._func is not None else self._value
+
+
+class MetricsRegistry:
+    """
+    Named counters and gauges plus collectors evaluated at scrape time.
+
+    Values that components already track (bus queue depths, StatsRegistry
+    counters) are exported through collectors, so they cost nothing until
+    scraped.
+    """
+
+    def __init__(self, prefix: str = 'carmonitor'):
+        """
+        Initialize registry.
+
+        Args:
+            prefix: Prepended (with '_') to every metric name
+        """
+        self.prefix = prefix
+        self._metrics: Dict[str, Tuple[str, str, Any]] = {}
+        self._collectors: List[Callable[[], Iterable[Metric]]] = []
+
+    def _name(self, name: str) -> str:
+        return f"{self.prefix}_{name}" if self.prefix else name
+
+    def counter(self, name: str, help: str,
+                func: Optional[Callable[[], Optional[float]]] = None) -> Counter:
+        """
+        Get (creating if needed) a counter.
+
+        Args:
+            name: Metric name without prefix, ending in '_total'
+            help: Help text
+            func: Read a total kept elsewhere from this function at scrape time
+
+        Returns:
+            Counter
+        """
+        name = self._name(name)
+        if name not in self._metrics:
+            self._metrics[name] = ('counter', help, Counter(func))
+        return self._metrics[name][2]
+
+    def gauge(self, name: str, help: str,
+              func: Optional[Callable[[], Optional[float]]] = None) -> Gauge:
+        """
+        Get (creating if needed) a gauge.
+
+        Args:
+            name: Metric name without prefix
+            help: Help text
+            func: Read the value from this function at scrape time
+                (returning None omits the metric)
+
+        Returns:
+            Gauge
+        """
+        name = self._name(name)
+        if name not in self._metrics:
+            self._metrics[name] = ('gauge', help, Gauge(func))
+        return self._metrics[name][2]
+
+    def add_collector(self, collector: Callable[[], Iterable[Metric]]):
+        """
+        Add a function returning Metric families at scrape time.
+
+        Metric names from collectors are used as given (without prefix).
+        """
+        self._collectors.append(collector)
+
+    def collect(self) -> List[Metric]:
+        """
+        Evaluate every metric.
+
+        Returns:
+            Metric families; families of the same name from several
+            collectors are merged, empty ones skipped
+        """
+        metrics: Dict[str, Metric] = {}
+        for name, (kind, help, metric) in list(self._metrics.items()):
+            value = metric.value
+            if value is not None:
+                metrics[name] = Metric(name, kind, help, [Sample('', {}, value)])
+        for collector in self._collectors:
+            try:
+                families = list(collector())
+            except Exception as e:
+                print(f"Error in metrics collector: {e}")
+                continue
+            for family in families:
+                if family.name in metrics:
+                    metrics[family.name].samples.extend(family.samples)
+                elif family.samples:
+                    metrics[family.name] = Metric(family.name, family.kind, family.help,
+                                                  list(family.samples))
+        return list(metrics.values())
+
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text format.
+
+        Returns:
+            Exposition text
+        """
+        lines = []
+        for metric in self.collect():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample in metric.samples:
+                labels = ''
+                if sample.labels:
+                    labels = '{' + ','.join(f'{k}="{_escape_label(str(v))}"'
+                                            for k, v in sorted(sample.labels.items())) + '}'
+                lines.append(f"{metric.name}{sample.suffix}{labels} {_format_value(sample.value)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _escape_help(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n')
+
+
+def _escape_label(text: str) -> str:
+    return text.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return 'NaN'
+    if isinstance(value, float) and math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def read_cpu_temperature(path: str = CPU_TEMP_PATH) -> Optional[float]:
+    """
+    Read the SoC temperature.
+
+    Returns:
+        Degrees Celsius, or None where the thermal zone does not exist
+    """
+    try:
+        with open(path) as f:
+            return int(f.read().strip()) / 1000.0
+    except (OSError, ValueError):
+        return None
+
+
+def stats_collector(**components) -> Callable[[], List[Metric]]:
+    """
+    Export StatsRegistry snapshots of components.
+
+    Counters become carmonitor_events_total{section, name}; histograms
+    become the summary carmonitor_latency_seconds{section, name, quantile}.
+
+    Args:
+        **components: Section name to component with get_stats() (None skipped)
+
+    Returns:
+        Collector for MetricsRegistry.add_collector()
+    """
+    def collect() -> List[Metric]:
+        events = Metric('carmonitor_events_total', 'counter',
+                        'Event counters of monitor components', [])
+        latency = Metric('carmonitor_latency_seconds', 'summary',
+                         'Latencies recorded by monitor components', [])
+        for section, component in components.items():
+            if component is None:
+                continue
+            snapshot = component.get_stats()
+            for name, count in snapshot.get('counters', {}).items():
+                events.samples.append(Sample('', {'section': section, 'name': name}, count))
+            for name, s in snapshot.get('histograms', {}).items():
+                if not s.get('count'):
+                    continue
+                labels = {'section': section, 'name': name}
+                for key, quantile in (('p50', '0.5'), ('p90', '0.9'), ('p99', '0.99')):
+                    if s.get(key) is not None:
+                        latency.samples.append(Sample('', dict(labels, quantile=quantile),
+                                                      s[key] / 1000))
+                latency.samples.append(Sample('_count', labels, s['count']))
+                latency.samples.append(Sample('_sum', labels, s['mean'] * s['count'] / 1000))
+        return [events, latency]
+    return collect
+
+
+def bus_collector(bus) -> Callable[[], List[Metric]]:
+    """
+    Export DataBus queue depths and delivery counts per subscriber.
+
+    Args:
+        bus: DataBus
+
+    Returns:
+        Collector for MetricsRegistry.add_collector()
+    """
+    def collect() -> List[Metric]:
+        queued = Metric('carmonitor_bus_queue_depth', 'gauge',
+                        'Messages waiting in each bus subscriber queue', [])
+        delivered = Metric('carmonitor_bus_delivered_total', 'counter',
+                           'Messages handled by each bus subscriber', [])
+        dropped = Metric('carmonitor_bus_dropped_total', 'counter',
+                         'Messages dropped because a subscriber queue was full', [])
+        for s in bus.get_stats():
+            labels = {'subscriber': s['name'], 'topic': s['topic']}
+            queued.samples.append(Sample('', labels, s['queued']))
+            delivered.samples.append(Sample('', labels, s['delivered']))
+            dropped.samples.append(Sample('', labels, s['dropped']))
+        return [queued, delivered, dropped]
+    return collect
+
+
+def reader_metrics(registry: MetricsRegistry, reader):
+    """
+    Register OBD reader metrics (sample count, connection state, reader stats).
+
+    Args:
+        registry: Registry to add to
+        reader: OBD reader; a listener counts its samples
+    """
+    samples = registry.counter('samples_total', 'Samples delivered by the OBD reader')
+    reader.add_listener(lambda data: samples.inc())
+    registry.gauge('obd_connected', '1 while the OBD adapter is connected',
+                   lambda: float(bool(reader.is_connected)))
+    registry.add_collector(stats_collector(reader=reader))
+
+
+def monitor_metrics(registry: MetricsRegistry, reader=None, bus=None, pipeline=None,
+                    logger=None, **components):
+    """
+    Register the standard monitor health metrics.
+
+    Args:
+        registry: Registry to add to
+        reader: OBD reader (or None and call reader_metrics() once it exists)
+        bus: DataBus (queue depths)
+        pipeline: TripPipeline (current score)
+        logger: TripLogger (bytes written)
+        **components: Further sections exported through stats_collector()
+    """
+    started = time.time()
+    registry.gauge('start_time_seconds', 'Unix time the monitor started', lambda: started)
+    registry.gauge('cpu_temperature_celsius', 'SoC temperature', read_cpu_temperature)
+
+    if reader is not None:
+        reader_metrics(registry, reader)
+    if pipeline is not None:
+        registry.gauge('score', 'Current driver score (during a trip)', lambda: pipeline.last_score)
+        registry.gauge('trip_active', '1 while a trip is recorded',
+                       lambda: float(pipeline.trip_active))
+    if logger is not None:
+        registry.counter('log_bytes_written_total', 'Bytes written to trip logs',
+                         lambda: logger.stats.counters.get('bytes', 0))
+    if bus is not None:
+        registry.add_collector(bus_collector(bus))
+    registry.add_collector(stats_collector(pipeline=pipeline, logger=logger, **components))
+
+
+@lru_cache(maxsize=None)
+def _http_classes():
+    """HTTP handler and servers; http.server is imported only when serving."""
+    import socketserver
+    from http.server import BaseHTTPRequestHandler, HTTPServer
+
+    class _Handler(BaseHTTPRequestHandler):
+        server_version = 'CarMonitorMetrics/1.0'
+
+        def do_GET(self):
+            if self.path.split('?')[0] not in ('/', '/metrics'):
+                self.send_error(404)
+                return
+            body = self.server.registry.render().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', CONTENT_TYPE)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def address_string(self) -> str:
+            return str(self.client_address or 'local')
+
+        def log_message(self, format, *args):
+            pass  # scrapes every few seconds would flood the console
+
+    class _TCPServer(socketserver.ThreadingMixIn, HTTPServer):
+        daemon_threads = True
+
+    class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+        daemon_threads = True
+
+        def get_request(self):
+            request, _ = super().get_request()
+            return request, ('local', 0)  # BaseHTTPRequestHandler expects (host, port)
+
+    return _Handler, _TCPServer, _UnixServer
+
+
+class MetricsServer:
+    """HTTP endpoint serving a registry at /metrics."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 address: str = '127.0.0.1:9108'):
+        """
+        Initialize server.
+
+        Args:
+            registry: Registry to serve (default: a new one)
+            address: 'host:port' (use a localhost address; port 0 picks a
+                free port) or a Unix socket path
+        """
+        self.registry = registry or MetricsRegistry()
+        self.address = address
+        self.httpd = None
+        self.thread = None
+
+    @classmethod
+    def from_config(cls, config) -> Optional['MetricsServer']:
+        """
+        Create a server from the 'metrics' config section.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            MetricsServer, or None when metrics are disabled
+        """
+        if not config.get('metrics.enabled', False):
+            return None
+        return cls(address=str(config.get('metrics.address', '127.0.0.1:9108')))
+
+    @property
+    def is_unix(self) -> bool:
+        return ':' not in self.address
+
+    def start(self) -> bool:
+        """
+        Listen and serve on a background thread.
+
+        Returns:
+            True if listening
+        """
+        handler, tcp_server, unix_server = _http_classes()
+        try:
+            if self.is_unix:
+                if os.path.exists(self.address):
+                    os.unlink(self.address)  # stale socket of a previous run
+                self.httpd = unix_server(self.address, handler)
+            else:
+                host, port = self.address.rsplit(':', 1)
+                self.httpd = tcp_server((host, int(port)), handler)
+                self.address = f"{host}:{self.httpd.server_address[1]}"
+        except OSError as e:
+            print(f"❌ Metrics endpoint cannot listen on {self.address}: {e}")
+            return False
+        self.httpd.registry = self.registry
+        self.thread = Thread(target=self.httpd.serve_forever, name='metrics', daemon=True)
+        self.thread.start()
+        print(f"✅ Metrics on {self.address}/metrics" if not self.is_unix else
+              f"✅ Metrics on unix:{self.address}")
+        return True
+
+    def stop(self):
+        """Stop serving."""
+        if self.httpd is None:
+            return
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        self.thread.join(timeout=2.0)
+        self.httpd = self.thread = None
+        if self.is_unix and os.path.exists(self.address):
+            os.unlink(self.address)
+
+
+def scrape(address: str, timeout: float = 5.0) -> str:
+    """
+    Fetch /metrics from a MetricsServer (also over a Unix socket).
+
+    Args:
+        address: 'host:port' or Unix socket path
+        timeout: Socket timeout in seconds
+
+    Returns:
+        Exposition text
+    """
+    if ':' in address:
+        host, port = address.rsplit(':', 1)
+        sock = socket.create_connection((host, int(port)), timeout=timeout)
+    else:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(timeout)
+        sock.connect(address)
+    with sock:
+        sock.sendall(b'GET /metrics HTTP/1.0\r\nHost: localhost\r\n\r\n')
+        response = b''
+        while True:
+            data = sock.recv(65536)
+            if not data:
+                break
+            response += data
+    head, _, body = response.partition(b'\r\n\r\n')
+    status = head.split(b'\r\n', 1)[0]
+    if status.split()[1:2] != [b'200']:
+        raise OSError(f"metrics endpoint answered {status.decode(errors='replace')}")
+    return body.decode('utf-8')
@@ -0,0 +1,119 @@
+"""
+Trip pipeline for Car Monitor.
+Bus subscribers that score every sample once and log the scored samples,
+independently of how often the display refreshes.
+"""
+
+import time
+from threading import Lock
+from typing import Any, Callable, Dict, Optional
+
+from common.bus import DataBus, SAMPLES, SCORED
+from common.logger import TripLogger
+from common.scoring import DriverScorer
+from common.stats import StatsRegistry
+
+
+class TripPipeline:
+    """Scorer and logger stages running on their own bus threads."""
+
+    def __init__(self, bus: DataBus, scorer: DriverScorer, logger: TripLogger,
+                 queue_size: int = 1000, clock: Callable[[], float] = time.time):
+        """
+        Initialize pipeline and subscribe its stages.
+
+        Args:
+            bus: Data bus the reader publishes SAMPLES on
+            scorer: Driver scorer (only touched from the scorer thread while a trip runs)
+            logger: Trip logger (only touched from the logger thread while a trip runs)
+            queue_size: Samples buffered per stage before the oldest are dropped
+            clock: Epoch-seconds clock the sample ages are measured against
+        """
+        self.bus = bus
+        self.clock = clock
+        self.scorer = scorer
+        self.logger = logger
+        self.trip_active = False
+
+        self.last_score: Optional[float] = None
+        self.last_event: Optional[str] = None
+
+        # Age of samples (since their timestamp) when scored and when logged
+        self.stats = StatsRegistry()
+
+        # Held while logging a row and while starting/ending the trip file
+        self._trip_lock = Lock()
+
+        self.scorer_subscription = bus.subscribe(SAMPLES, self._score, maxsize=queue_size,
+                                                 name='scorer')
+        self.logger_subscription = bus.subscribe(SCORED, self._log, maxsize=queue_size,
+                                                 name='logger')
+
+    def _score(self, data: Dict[str, Any]):
+        if not self.trip_active or not data:
+            return
+        self._record_age('age.scored', data)
+        score, event_type = self.scorer.update(
+            speed_kph=data.get('speed_kph') or 0,
+            accel=data.get('accel_calculated') or 0
+        )
+        self.last_score = score
+        self.last_event = event_type
+        self.bus.publish(SCORED, {**data, 'score': score, 'event_type': event_type or ''})
+
+    def _log(self, data: Dict[str, Any]):
+        with self._trip_lock:
+            if self.logger.csv_writer:
+                self._record_age('age.logged', data)
+                self.logger.log_data(data)
+
+    def _record_age(self, name: str, data: Dict[str, Any]):
+        timestamp = data.get('timestamp')
+        if isinstance(timestamp, (int, float)):
+            self.stats.record(name, (self.clock() - timestamp) * 1e6)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get pipeline statistics.
+
+        Returns:
+            StatsRegistry snapshot: sample age when scored and logged (ms),
+            plus samples dropped by the scorer and logger queues
+        """
+        snapshot = self.stats.snapshot()
+        snapshot['counters']['scorer.dropped'] = self.scorer_subscription.dropped
+        snapshot['counters']['logger.dropped'] = self.logger_subscription.dropped
+        return snapshot
+
+    def start_trip(self, trip_name: str) -> str:
+        """
+        Start scoring and logging a trip.
+
+        Args:
+            trip_name: Trip name
+
+        Returns:
+            Path to the trip log file
+        """
+        with self._trip_lock:
+            path = self.logger.start_trip(trip_name)
+            self.scorer.reset()
+            self.last_score = None
+            self.last_event = None
+            self.trip_active = True
+        return path
+
+    def end_trip(self) -> Dict[str, Any]:
+        """
+        Stop the trip once every sample received so far is scored and logged.
+
+        Returns:
+            Trip summary statistics from the logger
+        """
+        # Score what is already queued, then stop and flush the rest
+        self.scorer_subscription.drain()
+        self.trip_active = False
+        self.scorer_subscription.drain()
+        self.logger_subscription.drain()
+        with self._trip_lock:
+            return self.logger.end_trip()
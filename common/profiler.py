@@ -0,0 +1,187 @@
+"""
+Sampling profiler for Car Monitor.
+Periodically snapshots the stacks of all threads for a bounded window and
+writes folded stacks (for flamegraph.pl / speedscope) plus a top-functions
+summary. Enabled by the 'profiling' config section or CARMONITOR_PROFILE;
+when disabled nothing is created or started.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# CARMONITOR_PROFILE=1 enables profiling; a number also sets the window in seconds
+ENV_VAR = 'CARMONITOR_PROFILE'
+
+
+class SamplingProfiler:
+    """
+    Background stack sampler for all threads.
+
+    Each sample walks every thread's frame chain and counts the stack of
+    code objects; labels are only built when the output is written, so a
+    sample costs a few microseconds per thread.
+    """
+
+    def __init__(self, interval: float = 0.005, duration: float = 60.0, max_depth: int = 64):
+        """
+        Initialize profiler.
+
+        Args:
+            interval: Seconds between samples
+            duration: Maximum seconds captured per window
+            max_depth: Frames kept per stack (innermost first)
+        """
+        self.interval = interval
+        self.duration = duration
+        self.max_depth = max_depth
+
+        self.output_base: Optional[Path] = None
+        self.thread: Optional[threading.Thread] = None
+        self.stop_event = threading.Event()
+        self._lock = threading.Lock()
+
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._started = 0.0
+        self._cpu = 0.0
+
+    @classmethod
+    def from_config(cls, config) -> Optional['SamplingProfiler']:
+        """
+        Create a profiler if enabled by config or environment.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            SamplingProfiler, or None when profiling is off
+        """
+        env = os.environ.get(ENV_VAR, '').strip().lower()
+        enabled = config.get('profiling.enabled', False)
+        duration = config.get('profiling.duration', 60.0)
+        if env in ('0', 'false', 'no', 'off'):
+            enabled = False
+        elif env:
+            enabled = True
+            try:
+                seconds = float(env)
+            except ValueError:
+                seconds = 0.0
+            if seconds > 1:
+                duration = seconds
+        if not enabled:
+            return None
+        return cls(interval=config.get('profiling.interval', 0.005), duration=duration)
+
+    @property
+    def is_running(self) -> bool:
+        return self.thread is not None and self.thread.is_alive()
+
+    def start(self, output_base: str):
+        """
+        Start a capture window (ending any window in progress).
+
+        Args:
+            output_base: Output path without suffix; '.folded' and
+                '.profile.txt' are appended (e.g. the trip log path)
+        """
+        self.stop()
+        self.output_base = Path(output_base).with_suffix('')
+        self._stacks = Counter()
+        self._samples = 0
+        self.stop_event.clear()
+        self.thread = threading.Thread(target=self._run, name='profiler', daemon=True)
+        self.thread.start()
+        print(f"Profiling for {self.duration:.0f} s -> {self.output_base}.folded")
+
+    def stop(self):
+        """End the current window and write its output."""
+        if self.thread is None:
+            return
+        self.stop_event.set()
+        self.thread.join(timeout=5.0)
+        self.thread = None
+
+    def _run(self):
+        own = threading.get_ident()
+        self._started = time.monotonic()
+        deadline = self._started + self.duration
+        cpu_start = time.thread_time()
+        while not self.stop_event.wait(self.interval) and time.monotonic() < deadline:
+            self._sample(own)
+        self._cpu = time.thread_time() - cpu_start
+        self.write()
+
+    def _sample(self, own: int):
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for ident, frame in sys._current_frames().items():
+            if ident == own:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(frame.f_code)
+                frame = frame.f_back
+            self._stacks[(names.get(ident, str(ident)), tuple(stack))] += 1
+        self._samples += 1
+
+    @staticmethod
+    def _label(code) -> str:
+        name = getattr(code, 'co_qualname', code.co_name)
+        return f"{Path(code.co_filename).stem}.{name}"
+
+    def write(self) -> Optional[Tuple[str, str]]:
+        """
+        Write folded stacks and the top-functions summary.
+
+        Returns:
+            (folded path, summary path), or None if nothing was sampled
+        """
+        with self._lock:
+            if not self._samples or self.output_base is None:
+                return None
+            folded_path = Path(f"{self.output_base}.folded")
+            summary_path = Path(f"{self.output_base}.profile.txt")
+            folded_path.parent.mkdir(parents=True, exist_ok=True)
+
+            labels: Dict = {}
+
+            def label(code):
+                if code not in labels:
+                    labels[code] = self._label(code)
+                return labels[code]
+
+            own: Counter = Counter()
+            total: Counter = Counter()
+            lines = []
+            for (thread, stack), count in self._stacks.items():
+                names = [label(code) for code in reversed(stack)]
+                lines.append(f"{thread};{';'.join(names)} {count}")
+                if names:
+                    own[names[-1]] += count
+                for name in set(names):
+                    total[name] += count
+            folded_path.write_text("\n".join(sorted(lines)) + "\n")
+
+            elapsed = time.monotonic() - self._started
+            stack_samples = sum(self._stacks.values())
+            report = [
+                f"Sampling profile: {self._samples} samples over {elapsed:.1f} s "
+                f"every {self.interval * 1000:.1f} ms",
+                f"Profiler CPU: {self._cpu:.2f} s ({100 * self._cpu / max(elapsed, 1e-9):.1f}% of one core)",
+                "",
+                "Top functions by own samples (all threads):",
+            ]
+            for name, count in own.most_common(25):
+                report.append(f"  {100 * count / stack_samples:5.1f}%  {count:6d}  {name}")
+            report += ["", "Top functions by inclusive samples:"]
+            for name, count in total.most_common(25):
+                report.append(f"  {100 * count / stack_samples:5.1f}%  {count:6d}  {name}")
+            summary_path.write_text("\n".join(report) + "\n")
+
+        print(f"✅ Profile written: {folded_path} ({self._samples} samples)")
+        return str(folded_path), str(summary_path)
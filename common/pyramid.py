@@ -0,0 +1,462 @@
+"""
+Multi-resolution trip pyramids for Car Monitor project.
+Builds min/max/mean summaries per channel so long trips plot in O(pixels).
+"""
+
+import json
+import os
+import sys
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from common.logger import get_channels, iter_trip_rows, parse_number, parse_timestamp
+
+
+# 2: min/max stored exactly (version 1 rounded them, which is unsafe for skipping)
+PYRAMID_VERSION = 2
+PYRAMID_SUFFIX = '.pyramid.json'
+
+
+def pyramid_path(trip_file: str) -> Path:
+    """
+    Get the pyramid sidecar path for a trip log.
+
+    Args:
+        trip_file: Path to trip CSV
+
+    Returns:
+        Path to the pyramid file next to the trip log
+    """
+    trip_file = Path(trip_file)
+    return trip_file.with_name(trip_file.stem + PYRAMID_SUFFIX)
+
+
+class _Bucket:
+    """Running min/max/sum/count aggregate for one time bucket."""
+
+    __slots__ = ('t_start', 't_end', 'offset', 'mins', 'maxs', 'sums', 'counts', 'members')
+
+    def __init__(self, n_channels: int):
+        self.t_start = None
+        self.offset = None
+        self.t_end = None
+        self.mins = [None] * n_channels
+        self.maxs = [None] * n_channels
+        self.sums = [0.0] * n_channels
+        self.counts = [0] * n_channels
+        self.members = 0
+
+    def add_sample(self, timestamp: float, values: List[Optional[float]],
+                   offset: Optional[int] = None):
+        """Fold one raw sample into the bucket."""
+        if self.t_start is None:
+            self.t_start = timestamp
+            self.offset = offset
+        self.t_end = timestamp
+        self.members += 1
+
+        for i, v in enumerate(values):
+            if v is None:
+                continue
+            if self.counts[i] == 0:
+                self.mins[i] = v
+                self.maxs[i] = v
+            else:
+                if v < self.mins[i]:
+                    self.mins[i] = v
+                if v > self.maxs[i]:
+                    self.maxs[i] = v
+            self.sums[i] += v
+            self.counts[i] += 1
+
+    def add_bucket(self, other: '_Bucket'):
+        """Fold a finer-level bucket into this one."""
+        if self.t_start is None:
+            self.t_start = other.t_start
+            self.offset = other.offset
+        self.t_end = other.t_end
+        self.members += 1
+
+        for i in range(len(self.sums)):
+            if other.counts[i] == 0:
+                continue
+            if self.counts[i] == 0:
+                self.mins[i] = other.mins[i]
+                self.maxs[i] = other.maxs[i]
+            else:
+                if other.mins[i] < self.mins[i]:
+                    self.mins[i] = other.mins[i]
+                if other.maxs[i] > self.maxs[i]:
+                    self.maxs[i] = other.maxs[i]
+            self.sums[i] += other.sums[i]
+            self.counts[i] += other.counts[i]
+
+
+class PyramidBuilder:
+    """Incrementally builds decimated min/max/mean levels for a trip."""
+
+    def __init__(self, channels: List[str], factor: int = 4, max_levels: int = 12,
+                 min_decimation: int = 16, precision: int = 4):
+        """
+        Initialize pyramid builder.
+
+        Args:
+            channels: Numeric channel names to summarize
+            factor: Decimation factor between consecutive levels
+            max_levels: Maximum number of decimated levels
+            min_decimation: Finest decimation stored (finer ranges read raw rows)
+            precision: Decimal places kept for stored means
+        """
+        if factor < 2:
+            raise ValueError("Pyramid factor must be at least 2")
+
+        self.channels = list(channels)
+        self.factor = factor
+        self.max_levels = max_levels
+        self.min_decimation = min_decimation
+        self.precision = precision
+        self.row_count = 0
+        self.t_start = None
+        self.t_end = None
+
+        # levels[k] holds closed buckets at decimation factor ** (k + 1)
+        self.levels: List[List[_Bucket]] = []
+        self._open: List[_Bucket] = []
+
+    def wants_offset(self) -> bool:
+        """Check if the next row starts a bucket (caller should pass its offset)."""
+        return self.row_count % self.factor == 0
+
+    def add(self, data: Dict[str, Any], offset: Optional[int] = None):
+        """
+        Add one logged row.
+
+        Args:
+            data: Row dictionary (same shape as TripLogger.log_data input)
+            offset: Byte offset of the row in the trip file, if known
+        """
+        timestamp = parse_timestamp(data.get('timestamp'))
+        if timestamp is None:
+            return
+
+        values = [parse_number(data.get(ch)) for ch in self.channels]
+
+        if self.t_start is None:
+            self.t_start = timestamp
+        self.t_end = timestamp
+        self.row_count += 1
+
+        bucket = self._open_bucket(0)
+        bucket.add_sample(timestamp, values, offset)
+        if bucket.members >= self.factor:
+            self._close(0)
+
+    def _open_bucket(self, level: int) -> _Bucket:
+        """Get (creating if needed) the open bucket at a level."""
+        while len(self._open) <= level:
+            self._open.append(_Bucket(len(self.channels)))
+            self.levels.append([])
+        return self._open[level]
+
+    def _close(self, level: int):
+        """Close the open bucket at a level and cascade upwards."""
+        bucket = self._open[level]
+        self.levels[level].append(bucket)
+        self._open[level] = _Bucket(len(self.channels))
+
+        if level + 1 >= self.max_levels:
+            return
+
+        parent = self._open_bucket(level + 1)
+        parent.add_bucket(bucket)
+        if parent.members >= self.factor:
+            self._close(level + 1)
+
+    def finish(self) -> Dict[str, Any]:
+        """
+        Close partial buckets and return the serializable pyramid.
+
+        Returns:
+            Pyramid dictionary (see TripPyramid for the layout)
+        """
+        # Flush partial buckets bottom-up so every sample reaches every level
+        level = 0
+        while level < len(self._open):
+            bucket = self._open[level]
+            if bucket.members > 0:
+                self.levels[level].append(bucket)
+                self._open[level] = _Bucket(len(self.channels))
+                if level + 1 < self.max_levels:
+                    self._open_bucket(level + 1).add_bucket(bucket)
+            level += 1
+
+        # Drop redundant top levels that add nothing over their child
+        levels = list(enumerate(self.levels))
+        while len(levels) > 1 and len(levels[-2][1]) <= 1:
+            levels.pop()
+
+        # Fine levels cost more to store than re-reading the raw rows
+        stored = [(k, b) for k, b in levels if self.factor ** (k + 1) >= self.min_decimation]
+        if not stored and levels:
+            stored = levels[-1:]
+
+        return {
+            'version': PYRAMID_VERSION,
+            'factor': self.factor,
+            'channels': self.channels,
+            'rows': self.row_count,
+            't_start': self.t_start,
+            't_end': self.t_end,
+            'levels': [self._serialize_level(k, buckets) for k, buckets in stored]
+        }
+
+    def _serialize_level(self, k: int, buckets: List[_Bucket]) -> Dict[str, Any]:
+        """Convert one level to columnar lists."""
+        level = {
+            'decimation': self.factor ** (k + 1),
+            't_start': [b.t_start for b in buckets],
+            't_end': [b.t_end for b in buckets],
+            'offset': [b.offset for b in buckets],
+            'data': {}
+        }
+        for i, ch in enumerate(self.channels):
+            level['data'][ch] = {
+                # Exact bounds: queries skip whole files on them
+                'min': [b.mins[i] for b in buckets],
+                'max': [b.maxs[i] for b in buckets],
+                'mean': [self._round(b.sums[i] / b.counts[i]) if b.counts[i] else None
+                         for b in buckets]
+            }
+        return level
+
+    def _round(self, value: Optional[float]) -> Optional[float]:
+        """Round a stored mean to the configured precision."""
+        return None if value is None else round(value, self.precision)
+
+    def save(self, output_file: str, source_file: Optional[str] = None) -> str:
+        """
+        Finish the pyramid and write it to disk.
+
+        Args:
+            output_file: Destination path
+            source_file: Finished trip file the pyramid describes (its size
+                is recorded so a changed trip is detected)
+
+        Returns:
+            Path written
+        """
+        pyramid = self.finish()
+        if source_file is not None:
+            pyramid['source_bytes'] = os.path.getsize(source_file)
+        output_file = Path(output_file)
+        tmp_file = output_file.with_name(output_file.name + '.tmp')
+        with open(tmp_file, 'w') as f:
+            json.dump(pyramid, f, separators=(',', ':'))
+        tmp_file.replace(output_file)
+        return str(output_file)
+
+
+class TripPyramid:
+    """Read-side access to a trip pyramid for zoomable charts."""
+
+    def __init__(self, pyramid: Dict[str, Any], trip_file: Optional[str] = None):
+        """
+        Initialize from a pyramid dictionary.
+
+        Args:
+            pyramid: Dictionary produced by PyramidBuilder.finish()
+            trip_file: Raw trip CSV (used for the full-resolution level)
+        """
+        if pyramid.get('version') != PYRAMID_VERSION:
+            raise ValueError(f"Unsupported pyramid version: {pyramid.get('version')}")
+
+        self.pyramid = pyramid
+        self.trip_file = trip_file
+        self.channels = pyramid['channels']
+        self.factor = pyramid['factor']
+        self.levels = pyramid['levels']
+
+    @classmethod
+    def load(cls, trip_file: str) -> 'TripPyramid':
+        """
+        Load the pyramid stored next to a trip log.
+
+        Args:
+            trip_file: Path to trip CSV
+
+        Returns:
+            TripPyramid instance
+        """
+        with open(pyramid_path(trip_file), 'r') as f:
+            return cls(json.load(f), trip_file=trip_file)
+
+    def is_fresh(self) -> bool:
+        """
+        Check that the pyramid still describes its trip file.
+
+        Returns:
+            True if the trip has the recorded size and is not newer than
+            the pyramid
+        """
+        if self.trip_file is None:
+            return False
+        try:
+            trip = os.stat(self.trip_file)
+            own = os.stat(pyramid_path(self.trip_file))
+        except OSError:
+            return False
+        size = self.pyramid.get('source_bytes')
+        if size is not None and size != trip.st_size:
+            return False
+        return own.st_mtime_ns >= trip.st_mtime_ns
+
+    @property
+    def t_start(self) -> Optional[float]:
+        return self.pyramid['t_start']
+
+    @property
+    def t_end(self) -> Optional[float]:
+        return self.pyramid['t_end']
+
+    def channel_range(self, channel: str) -> Optional[tuple]:
+        """
+        Get overall (min, max) of a channel from the coarsest level.
+
+        Args:
+            channel: Channel name
+
+        Returns:
+            (min, max) tuple, or None if the channel has no values
+        """
+        if not self.levels or channel not in self.channels:
+            return None
+        top = self.levels[-1]['data'][channel]
+        mins = [v for v in top['min'] if v is not None]
+        maxs = [v for v in top['max'] if v is not None]
+        if not mins:
+            return None
+        return min(mins), max(maxs)
+
+    def query(self, t_start: Optional[float], t_end: Optional[float], width: int,
+              channels: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Get the best resolution for a time range and a pixel width.
+
+        Picks the coarsest level that still has at least one bucket per
+        pixel, so the result size is O(width) regardless of trip length.
+        Falls back to raw rows when the range is short enough.
+
+        Args:
+            t_start: Range start (epoch seconds), None for trip start
+            t_end: Range end (epoch seconds), None for trip end
+            width: Chart width in pixels
+            channels: Channels to return (default: all)
+
+        Returns:
+            Dictionary with 'decimation', 't_start', 't_end' lists and
+            per-channel 'min'/'max'/'mean' lists
+        """
+        if t_start is None:
+            t_start = self.t_start
+        if t_end is None:
+            t_end = self.t_end
+        channels = channels or self.channels
+        width = max(1, int(width))
+
+        # Walk from coarsest to finest, keep the first level dense enough
+        for level in reversed(self.levels):
+            lo = bisect_left(level['t_end'], t_start)
+            hi = bisect_right(level['t_start'], t_end)
+            if hi - lo >= width:
+                return self._slice(level, lo, hi, channels)
+
+        if self.trip_file is not None:
+            return self._raw(t_start, t_end, channels)
+
+        # No raw data available, return the finest level we have
+        if not self.levels:
+            return {'decimation': 1, 't_start': [], 't_end': [], 'data': {}}
+        level = self.levels[0]
+        lo = bisect_left(level['t_end'], t_start)
+        hi = bisect_right(level['t_start'], t_end)
+        return self._slice(level, lo, hi, channels)
+
+    def _slice(self, level: Dict[str, Any], lo: int, hi: int,
+               channels: List[str]) -> Dict[str, Any]:
+        """Cut a level to bucket indices [lo, hi)."""
+        return {
+            'decimation': level['decimation'],
+            't_start': level['t_start'][lo:hi],
+            't_end': level['t_end'][lo:hi],
+            'data': {
+                ch: {key: values[lo:hi] for key, values in level['data'][ch].items()}
+                for ch in channels
+            }
+        }
+
+    def _raw(self, t_start: float, t_end: float, channels: List[str]) -> Dict[str, Any]:
+        """Read full-resolution rows in range (only used for short ranges)."""
+        times = []
+        data = {ch: [] for ch in channels}
+
+        # Seek straight to the bucket covering t_start when offsets are known
+        offset = None
+        if self.levels:
+            level = self.levels[0]
+            i = bisect_right(level['t_start'], t_start) - 1
+            if i >= 0 and level.get('offset') and level['offset'][i] is not None:
+                offset = level['offset'][i]
+
+        for row in iter_trip_rows(self.trip_file, offset=offset):
+            timestamp = parse_timestamp(row.get('timestamp'))
+            if timestamp is None or timestamp < t_start:
+                continue
+            if timestamp > t_end:
+                break
+            times.append(timestamp)
+            for ch in channels:
+                data[ch].append(parse_number(row.get(ch)))
+
+        return {
+            'decimation': 1,
+            't_start': times,
+            't_end': list(times),
+            'data': {
+                ch: {'min': values, 'max': values, 'mean': values}
+                for ch, values in data.items()
+            }
+        }
+
+
+def build_pyramid(trip_file: str, phase: int = 1, factor: int = 4) -> str:
+    """
+    Build the pyramid for an existing trip log.
+
+    Args:
+        trip_file: Path to trip CSV
+        phase: Phase the trip was logged with
+        factor: Decimation factor between levels
+
+    Returns:
+        Path to the written pyramid file
+    """
+    builder = PyramidBuilder(get_channels(phase), factor=factor)
+    for offset, row in iter_trip_rows(trip_file, with_offsets=True):
+        builder.add(row, offset)
+    return builder.save(pyramid_path(trip_file), trip_file)
+
+
+def main():
+    """Build pyramids for the trip logs given on the command line."""
+    if len(sys.argv) < 2:
+        print("Usage: python -m common.pyramid TRIP.csv [TRIP.csv ...]")
+        return 1
+
+    for trip_file in sys.argv[1:]:
+        print(f"Built {build_pyramid(trip_file)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,497 @@
+"""
+Trip query engine for Car Monitor project.
+Scans archived trip logs chunk by chunk with time-range and predicate push-down.
+"""
+
+import csv
+import operator
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from common.logger import (
+    NON_NUMERIC_FIELDS, fill_held, get_fieldnames, parse_number, parse_timestamp,
+    read_trip_header
+)
+
+
+OPERATORS = {
+    '>': operator.gt,
+    '>=': operator.ge,
+    '<': operator.lt,
+    '<=': operator.le,
+    '==': operator.eq,
+    '!=': operator.ne,
+}
+
+AGGREGATES = ('count', 'sum', 'min', 'max', 'mean')
+
+# (column, op, value), e.g. ('speed_kph', '>', 100)
+Predicate = Tuple[str, str, Any]
+
+
+def parse_predicate(text: str) -> Predicate:
+    """
+    Parse a predicate written as text.
+
+    Args:
+        text: Predicate such as 'speed_kph>100' or 'event_type==harsh_brake'
+
+    Returns:
+        (column, op, value) tuple
+    """
+    # Two-character operators first so '>=' is not read as '>'
+    for op in sorted(OPERATORS, key=len, reverse=True):
+        if op in text:
+            column, value = text.split(op, 1)
+            number = parse_number(value.strip())
+            return column.strip(), op, number if number is not None else value.strip()
+    raise ValueError(f"Invalid predicate: {text}")
+
+
+def find_trip_files(log_dir: str) -> List[str]:
+    """
+    List trip logs in a directory, oldest first.
+
+    Args:
+        log_dir: Trip log directory
+
+    Returns:
+        Sorted list of CSV paths
+    """
+    return sorted(str(p) for p in Path(log_dir).glob('*.csv'))
+
+
+class QueryResult:
+    """Result of a trip query."""
+
+    def __init__(self):
+        self.rows: List[Dict[str, Any]] = []
+        self.aggregates: Dict[str, Dict[str, Any]] = {}
+        self.rows_matched = 0
+        self.bytes_scanned = 0
+        self.files_scanned = 0
+        self.files_skipped = 0
+
+    def __repr__(self) -> str:
+        return (f"QueryResult(rows_matched={self.rows_matched}, "
+                f"bytes_scanned={self.bytes_scanned}, "
+                f"files_scanned={self.files_scanned}, "
+                f"files_skipped={self.files_skipped})")
+
+
+class TripQuery:
+    """
+    Query builder over a set of trip logs.
+
+    Deadband (change-only) logs are forward-filled while scanning, so
+    they give the same rows as a full log (within the tolerances).
+    """
+
+    def __init__(self, files: Iterable[str], phase: int = 1):
+        """
+        Initialize trip query.
+
+        Args:
+            files: Trip CSV paths to scan
+            phase: Phase whose TripLogger schema the query is checked against
+        """
+        self.files = list(files)
+        self.phase = phase
+        self.fieldnames = get_fieldnames(phase)
+
+        self.t_start = None
+        self.t_end = None
+        self.predicates: List[Predicate] = []
+        self.columns: Optional[List[str]] = None
+
+    @classmethod
+    def from_directory(cls, log_dir: str, phase: int = 1) -> 'TripQuery':
+        """
+        Create a query over every trip in a log directory.
+
+        Args:
+            log_dir: Trip log directory
+            phase: Phase number
+
+        Returns:
+            TripQuery instance
+        """
+        return cls(find_trip_files(log_dir), phase=phase)
+
+    def _check_column(self, column: str):
+        if column not in self.fieldnames:
+            raise ValueError(f"Unknown column for phase {self.phase}: {column}")
+
+    def between(self, t_start: Optional[float] = None,
+                t_end: Optional[float] = None) -> 'TripQuery':
+        """
+        Restrict to a time range (epoch seconds, inclusive).
+
+        Args:
+            t_start: Range start, None for unbounded
+            t_end: Range end, None for unbounded
+
+        Returns:
+            self (for chaining)
+        """
+        self.t_start = t_start
+        self.t_end = t_end
+        return self
+
+    def where(self, column: str, op: str, value: Any) -> 'TripQuery':
+        """
+        Add a column predicate (all predicates must match).
+
+        Values for numeric columns are converted to numbers, so '100'
+        compares numerically rather than as text.
+
+        Args:
+            column: Column name
+            op: One of >, >=, <, <=, ==, !=
+            value: Value to compare against
+
+        Returns:
+            self (for chaining)
+
+        Raises:
+            ValueError: Unknown column or operator, or a non-numeric value
+                for a numeric column
+        """
+        self._check_column(column)
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        if column not in NON_NUMERIC_FIELDS:
+            number = parse_number(value)
+            if number is None or isinstance(value, bool):
+                raise ValueError(f"Numeric column {column} compared with {value!r}")
+            value = number
+        self.predicates.append((column, op, value))
+        return self
+
+    def select(self, *columns: str) -> 'TripQuery':
+        """
+        Choose the columns returned by rows().
+
+        Args:
+            *columns: Column names (default: all)
+
+        Returns:
+            self (for chaining)
+        """
+        for column in columns:
+            self._check_column(column)
+        self.columns = list(columns) or None
+        return self
+
+    def rows(self, limit: Optional[int] = None, workers: Optional[int] = None) -> QueryResult:
+        """
+        Run the query and return matching rows.
+
+        Args:
+            limit: Maximum rows to return (all rows are still counted)
+            workers: Process pool size (1 scans in-process)
+
+        Returns:
+            QueryResult with rows populated
+        """
+        return self._run(limit=limit, aggregates=None, workers=workers)
+
+    def aggregate(self, aggregates: Dict[str, List[str]],
+                  workers: Optional[int] = None) -> QueryResult:
+        """
+        Run the query and aggregate matching rows.
+
+        Args:
+            aggregates: Column -> list of aggregate names
+                (count, sum, min, max, mean)
+            workers: Process pool size (1 scans in-process)
+
+        Returns:
+            QueryResult with aggregates populated
+        """
+        for column, names in aggregates.items():
+            self._check_column(column)
+            for name in names:
+                if name not in AGGREGATES:
+                    raise ValueError(f"Unknown aggregate: {name}")
+        return self._run(limit=0, aggregates=aggregates, workers=workers)
+
+    def _run(self, limit: Optional[int], aggregates: Optional[Dict[str, List[str]]],
+             workers: Optional[int]) -> QueryResult:
+        """Scan every file, in a process pool when there is more than one."""
+        tasks = [
+            (path, self.t_start, self.t_end, self.predicates, self.columns,
+             list(aggregates) if aggregates else [], limit)
+            for path in self.files
+        ]
+
+        if workers is None:
+            workers = min(len(tasks), os.cpu_count() or 1)
+
+        if workers <= 1 or len(tasks) <= 1:
+            partials = [_scan_file(task) for task in tasks]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                partials = list(pool.map(_scan_file, tasks))
+
+        result = QueryResult()
+        totals: Dict[str, List[Any]] = {}
+
+        for partial in partials:
+            result.bytes_scanned += partial['bytes_scanned']
+            result.rows_matched += partial['rows_matched']
+            if partial['skipped']:
+                result.files_skipped += 1
+            else:
+                result.files_scanned += 1
+
+            if limit is None or len(result.rows) < limit:
+                result.rows.extend(partial['rows'])
+
+            for column, (count, total, low, high) in partial['stats'].items():
+                merged = totals.setdefault(column, [0, 0.0, None, None])
+                merged[0] += count
+                merged[1] += total
+                if low is not None and (merged[2] is None or low < merged[2]):
+                    merged[2] = low
+                if high is not None and (merged[3] is None or high > merged[3]):
+                    merged[3] = high
+
+        if limit is not None:
+            result.rows = result.rows[:limit]
+
+        if aggregates:
+            for column, names in aggregates.items():
+                count, total, low, high = totals.get(column, [0, 0.0, None, None])
+                values = {
+                    'count': count,
+                    'sum': total,
+                    'min': low,
+                    'max': high,
+                    'mean': total / count if count else None
+                }
+                result.aggregates[column] = {name: values[name] for name in names}
+
+        return result
+
+
+def _can_skip(path: str, t_start: Optional[float], t_end: Optional[float],
+              predicates: List[Predicate]) -> Tuple[bool, Optional[int]]:
+    """
+    Use the trip pyramid (if any) as a zone map.
+
+    Returns:
+        (skip file, byte offset to start scanning from)
+    """
+    from common.pyramid import TripPyramid, pyramid_path
+
+    if not pyramid_path(path).exists():
+        return False, None
+
+    try:
+        pyramid = TripPyramid.load(path)
+    except (OSError, ValueError, KeyError):
+        return False, None
+
+    # A trip changed after its pyramid was written (e.g. truncated by
+    # recovery) is scanned in full
+    if not pyramid.is_fresh():
+        return False, None
+
+    if pyramid.t_start is None:
+        return True, None
+    if t_start is not None and pyramid.t_end < t_start:
+        return True, None
+    if t_end is not None and pyramid.t_start > t_end:
+        return True, None
+
+    for column, op, value in predicates:
+        if not isinstance(value, (int, float)):
+            continue
+        bounds = pyramid.channel_range(column)
+        if bounds is None:
+            if column in pyramid.channels:
+                return True, None  # channel never had a value
+            continue
+        low, high = bounds
+        if op in ('>', '>=') and not OPERATORS[op](high, value):
+            return True, None
+        if op in ('<', '<=') and not OPERATORS[op](low, value):
+            return True, None
+        if op == '==' and not low <= value <= high:
+            return True, None
+
+    # Seek to the bucket covering t_start instead of scanning from the top
+    offset = None
+    if t_start is not None and pyramid.levels:
+        from bisect import bisect_right
+        level = pyramid.levels[0]
+        i = bisect_right(level['t_start'], t_start) - 1
+        if i >= 0 and level.get('offset'):
+            offset = level['offset'][i]
+
+    return False, offset
+
+
+def _scan_file(task: tuple) -> Dict[str, Any]:
+    """Scan one trip file (runs in a worker process)."""
+    path, t_start, t_end, predicates, columns, agg_columns, limit = task
+
+    partial = {
+        'rows': [],
+        'stats': {},
+        'rows_matched': 0,
+        'bytes_scanned': 0,
+        'skipped': False
+    }
+
+    skip, offset = _can_skip(path, t_start, t_end, predicates)
+    if skip:
+        partial['skipped'] = True
+        return partial
+
+    stats = {column: [0, 0.0, None, None] for column in agg_columns}
+    chunk_size = 1 << 16
+
+    with open(path, 'rb') as f:
+        meta, fieldnames = read_trip_header(f)
+        partial['bytes_scanned'] += f.tell()
+        index = {name: i for i, name in enumerate(fieldnames)}
+
+        # Change-only logs are forward-filled before predicates see them
+        deadband = meta.get('mode') == 'deadband'
+        held = [''] * len(fieldnames)
+
+        ts_index = index.get('timestamp')
+        # Compile predicates to (column index, compare, value, numeric)
+        compiled = []
+        for column, op, value in predicates:
+            if column not in index:
+                return partial  # column not in this file, nothing can match
+            compiled.append((index[column], OPERATORS[op], value,
+                             isinstance(value, (int, float))))
+
+        out_columns = columns or fieldnames
+        out_index = [(c, index[c]) for c in out_columns if c in index]
+        agg_index = [(c, index[c]) for c in agg_columns if c in index]
+
+        if offset is not None and not deadband:
+            f.seek(offset)
+
+        remainder = b''
+        done = False
+
+        while not done:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                lines = [remainder] if remainder else []
+                remainder = b''
+                done = True
+            else:
+                partial['bytes_scanned'] += len(chunk)
+                chunk = remainder + chunk
+                cut = chunk.rfind(b'\n') + 1
+                lines, remainder = chunk[:cut].splitlines(), chunk[cut:]
+
+            for values in csv.reader(line.decode('utf-8') for line in lines
+                                     if not line.startswith(b'#')):
+                if not values:
+                    continue
+                if deadband:
+                    fill_held(values, held)
+
+                # Time range first: rows are in time order
+                if ts_index is not None and (t_start is not None or t_end is not None):
+                    timestamp = parse_timestamp(values[ts_index])
+                    if timestamp is None:
+                        continue
+                    if t_start is not None and timestamp < t_start:
+                        continue
+                    if t_end is not None and timestamp > t_end:
+                        done = True
+                        break
+
+                matched = True
+                for i, compare, value, numeric in compiled:
+                    cell = values[i] if i < len(values) else ''
+                    if numeric:
+                        cell = parse_number(cell)
+                        if cell is None:
+                            matched = False
+                            break
+                    if not compare(cell, value):
+                        matched = False
+                        break
+                if not matched:
+                    continue
+
+                partial['rows_matched'] += 1
+
+                if limit is None or len(partial['rows']) < limit:
+                    partial['rows'].append({
+                        c: values[i] if i < len(values) else '' for c, i in out_index
+                    })
+
+                for column, i in agg_index:
+                    value = parse_number(values[i]) if i < len(values) else None
+                    if value is None:
+                        continue
+                    s = stats[column]
+                    s[0] += 1
+                    s[1] += value
+                    if s[2] is None or value < s[2]:
+                        s[2] = value
+                    if s[3] is None or value > s[3]:
+                        s[3] = value
+
+    partial['stats'] = {column: tuple(s) for column, s in stats.items()}
+    return partial
+
+
+def main():
+    """Command line entry point."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Query archived trip logs")
+    parser.add_argument('log_dir', help="Trip log directory")
+    parser.add_argument('--phase', type=int, default=1)
+    parser.add_argument('--where', action='append', default=[],
+                        help="Predicate such as speed_kph>100 (repeatable)")
+    parser.add_argument('--since', type=str, help="Start time (epoch or ISO-8601)")
+    parser.add_argument('--until', type=str, help="End time (epoch or ISO-8601)")
+    parser.add_argument('--select', type=str, help="Comma-separated columns")
+    parser.add_argument('--agg', action='append', default=[],
+                        help="Aggregate as column:name[,name] (repeatable)")
+    parser.add_argument('--limit', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    query = TripQuery.from_directory(args.log_dir, phase=args.phase)
+    query.between(parse_timestamp(args.since), parse_timestamp(args.until))
+    for text in args.where:
+        query.where(*parse_predicate(text))
+    if args.select:
+        query.select(*args.select.split(','))
+
+    if args.agg:
+        aggregates = {}
+        for text in args.agg:
+            column, names = text.split(':', 1)
+            aggregates[column] = names.split(',')
+        result = query.aggregate(aggregates, workers=args.workers)
+        for column, values in result.aggregates.items():
+            print(f"{column}: {values}")
+    else:
+        result = query.rows(limit=args.limit, workers=args.workers)
+        for row in result.rows:
+            print(row)
+
+    print(result)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,164 @@
+"""
+Real-time scheduling helpers for Car Monitor.
+Periodic sampling loop plus optional Linux CPU pinning, SCHED_FIFO/nice
+priority and memory locking for the acquisition worker.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import sys
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional
+
+from common.stats import JitterMeter
+
+
+# mlockall() flags from <sys/mman.h>
+MCL_CURRENT = 1
+MCL_FUTURE = 2
+
+
+def sample_loop(read: Callable[[], Dict], write: Callable[[Dict], None],
+                interval: float, stop_event, jitter: Optional[JitterMeter] = None,
+                pace: Optional[Callable[[Dict], Optional[float]]] = None):
+    """
+    Sample on a fixed schedule until stopped.
+
+    Deadlines advance by `interval` from the start, so time spent reading
+    does not accumulate as drift. After an overrun the schedule restarts
+    from now instead of bursting to catch up.
+
+    Args:
+        read: Function returning one sample, or None if there is nothing
+            to write this time
+        write: Function consuming the sample
+        interval: Seconds between samples
+        stop_event: threading or multiprocessing Event ending the loop
+        jitter: Meter observing the start of every period
+        pace: Function of each sample returning the interval until the
+            next one (longer for duty cycling, 0 for bursts), or None for
+            `interval`; such periods are left out of the jitter statistics
+    """
+    deadline = time.monotonic()
+    while not stop_event.is_set():
+        if jitter is not None:
+            jitter.observe()
+        step = None
+        try:
+            data = read()
+            if data is not None:
+                write(data)
+            if pace is not None:
+                step = pace(data)
+        except Exception as e:
+            print(f"Error in acquisition: {e}")
+
+        if step is not None and step != interval:
+            deadline += step
+            if jitter is not None:
+                jitter.last = None
+        else:
+            deadline += interval
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            stop_event.wait(delay)
+        else:
+            deadline = time.monotonic()
+
+
+def apply_realtime(cpus: Optional[Iterable[int]] = None, policy: Optional[str] = None,
+                   priority: int = 10, nice: Optional[int] = None,
+                   lock_memory: bool = False) -> Dict[str, Any]:
+    """
+    Raise the scheduling class of the calling thread (Linux only).
+
+    Every step is best effort: anything the process lacks permission for
+    (CAP_SYS_NICE, RLIMIT_RTPRIO, RLIMIT_MEMLOCK) is reported and skipped.
+    If SCHED_FIFO is refused and `nice` is set, the nice value is tried
+    instead.
+
+    Args:
+        cpus: CPU numbers to pin the thread to
+        policy: 'fifo' for SCHED_FIFO, 'nice' for a nice value only, None to leave as is
+        priority: SCHED_FIFO priority (1-99)
+        nice: Nice value (-20 to 19) for policy 'nice' or as FIFO fallback
+        lock_memory: mlockall() the whole process to avoid page-fault stalls
+
+    Returns:
+        Dictionary describing what was applied and what failed
+    """
+    report: Dict[str, Any] = {'applied': [], 'failed': []}
+    if not sys.platform.startswith('linux'):
+        report['failed'].append('real-time options are Linux-only')
+        return report
+
+    tid = threading.get_native_id()
+
+    if cpus is not None:
+        try:
+            os.sched_setaffinity(tid, set(cpus))
+            report['applied'].append(f"affinity {sorted(os.sched_getaffinity(tid))}")
+        except (OSError, ValueError) as e:
+            report['failed'].append(f"affinity {sorted(cpus)}: {e}")
+
+    if policy == 'fifo':
+        try:
+            os.sched_setscheduler(tid, os.SCHED_FIFO, os.sched_param(priority))
+            report['applied'].append(f"SCHED_FIFO priority {priority}")
+        except OSError as e:
+            report['failed'].append(f"SCHED_FIFO: {e}")
+            if nice is not None:
+                _apply_nice(tid, nice, report)
+    elif policy == 'nice' and nice is not None:
+        _apply_nice(tid, nice, report)
+
+    if lock_memory:
+        libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if libc.mlockall(MCL_CURRENT | MCL_FUTURE) == 0:
+            report['applied'].append("mlockall")
+        else:
+            report['failed'].append(f"mlockall: {os.strerror(ctypes.get_errno())}")
+
+    return report
+
+
+def _apply_nice(tid: int, nice: int, report: Dict[str, Any]):
+    # On Linux the nice value is per thread, addressed by thread id
+    try:
+        os.setpriority(os.PRIO_PROCESS, tid, nice)
+        report['applied'].append(f"nice {nice}")
+    except OSError as e:
+        report['failed'].append(f"nice {nice}: {e}")
+
+
+def realtime_options(config, key: str = 'obd.realtime') -> Optional[Dict[str, Any]]:
+    """
+    Read real-time options from config.
+
+    Args:
+        config: Config instance
+        key: Section holding the options
+
+    Returns:
+        Keyword arguments for apply_realtime(), or None if disabled
+    """
+    section = config.get(key) or {}
+    if not section.get('enabled', False):
+        return None
+    return {
+        'cpus': section.get('cpus'),
+        'policy': section.get('policy'),
+        'priority': section.get('priority', 10),
+        'nice': section.get('nice'),
+        'lock_memory': section.get('lock_memory', False),
+    }
+
+
+def print_realtime_report(report: Dict[str, Any], name: str = "Acquisition"):
+    """Print what apply_realtime() did."""
+    if report['applied']:
+        print(f"✅ {name} real-time: {', '.join(report['applied'])}")
+    for failure in report['failed']:
+        print(f"⚠️  {name} real-time option skipped: {failure}")
@@ -3,7 +3,7 @@ Driver behavior scoring algorithms for Car Monitor project.
 Calculates scores based on acceleration, braking, and driving patterns.
 """
 
-from typing import List, Dict, Tuple
+from typing import Callable, List, Dict, Tuple
 from collections import deque
 import time
 
@@ -11,23 +11,29 @@ import time
 class DriverScorer:
     """Calculate driver behavior scores based on driving metrics."""
     
-    def __init__(self, config: Dict = None):
+    def __init__(self, config: Dict = None, clock: Callable[[], float] = time.time):
         """
         Initialize driver scorer.
         
         Args:
             config: Configuration dictionary with thresholds
+            clock: Epoch-seconds clock for the trip duration (replays pass
+                the recording's clock)
         """
+        self.clock = clock
         # Default thresholds (can be overridden)
-        self.harsh_brake_threshold = -5.0  # m/s²
-        self.aggressive_accel_threshold = 3.0  # m/s²
+        harsh_brake_threshold = -5.0  # m/s²
+        aggressive_accel_threshold = 3.0  # m/s²
         self.smooth_jerk_threshold = 3.0  # m/s³
-        self.speeding_threshold = 120  # kph
+        speeding_threshold = 120  # kph
         
         if config:
-            self.harsh_brake_threshold = config.get('harsh_brake_threshold', self.harsh_brake_threshold)
-            self.aggressive_accel_threshold = config.get('aggressive_accel_threshold', self.aggressive_accel_threshold)
-            self.speeding_threshold = config.get('speeding_threshold', self.speeding_threshold)
+            harsh_brake_threshold = config.get('harsh_brake_threshold', harsh_brake_threshold)
+            aggressive_accel_threshold = config.get('aggressive_accel_threshold', aggressive_accel_threshold)
+            speeding_threshold = config.get('speeding_threshold', speeding_threshold)
+        
+        # Swapped as one tuple so an update never sees a mix of old and new
+        self._thresholds = (harsh_brake_threshold, aggressive_accel_threshold, speeding_threshold)
         
         # Event counters
         self.harsh_brake_count = 0
@@ -39,9 +45,32 @@ class DriverScorer:
         self.score_history = deque(maxlen=100)
         
         # Time tracking
-        self.start_time = time.time()
+        self.start_time = clock()
         self.total_distance = 0.0
     
+    @property
+    def harsh_brake_threshold(self) -> float:
+        return self._thresholds[0]
+    
+    @property
+    def aggressive_accel_threshold(self) -> float:
+        return self._thresholds[1]
+    
+    @property
+    def speeding_threshold(self) -> float:
+        return self._thresholds[2]
+    
+    def configure(self, settings):
+        """
+        Apply new thresholds (safe to call from any thread, e.g. on config reload).
+        
+        Args:
+            settings: ScoringSettings (or any object with the threshold attributes)
+        """
+        self._thresholds = (settings.harsh_brake_threshold,
+                            settings.aggressive_accel_threshold,
+                            settings.speeding_threshold)
+    
     def reset(self):
         """Reset all counters and scores."""
         self.harsh_brake_count = 0
@@ -49,7 +78,7 @@ class DriverScorer:
         self.speeding_count = 0
         self.current_score = 100.0
         self.score_history.clear()
-        self.start_time = time.time()
+        self.start_time = self.clock()
         self.total_distance = 0.0
     
     def update(self, speed_kph: float, accel: float, **kwargs) -> Tuple[float, str]:
@@ -66,21 +95,22 @@ class DriverScorer:
         """
         event_type = 'normal'
         penalty = 0.0
+        harsh_brake_threshold, aggressive_accel_threshold, speeding_threshold = self._thresholds
         
         # Check for harsh braking
-        if accel < self.harsh_brake_threshold:
+        if accel < harsh_brake_threshold:
             self.harsh_brake_count += 1
             event_type = 'harsh_brake'
             penalty = 2.0
         
         # Check for aggressive acceleration
-        elif accel > self.aggressive_accel_threshold:
+        elif accel > aggressive_accel_threshold:
             self.aggressive_accel_count += 1
             event_type = 'aggressive_accel'
             penalty = 1.5
         
         # Check for speeding
-        if speed_kph > self.speeding_threshold:
+        if speed_kph > speeding_threshold:
             self.speeding_count += 1
             if event_type == 'normal':
                 event_type = 'speeding'
@@ -104,7 +134,7 @@ class DriverScorer:
         Returns:
             Dictionary with score summary and statistics
         """
-        duration = time.time() - self.start_time
+        duration = self.clock() - self.start_time
         
         return {
             'current_score': self.current_score,
@@ -0,0 +1,246 @@
+"""
+Shared-memory sample ring for Car Monitor.
+One writer process publishes fixed-layout samples; any number of reader
+processes map the same block and read them without locks, using a
+per-slot sequence number and checksum to detect torn reads.
+"""
+
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+# Channels carried in every slot (None is stored as NaN)
+RING_FIELDS = ('timestamp', 'speed_kph', 'rpm', 'throttle_pct', 'engine_load', 'accel_calculated')
+
+# Header words: magic, capacity, field count, samples written
+_MAGIC = 0x434D5247  # 'CMRG'
+_HEADER_WORDS = 4
+_COUNT = 3
+
+# Retries while the writer is mid-update on the slot being read
+_MAX_RETRIES = 100
+
+
+def _attach_untracked(name: str) -> shared_memory.SharedMemory:
+    """
+    Attach without letting this process's resource tracker unlink the block.
+
+    Before Python 3.13 attaching registers the block with the resource
+    tracker, which unlinks it when the process exits. Processes started by
+    multiprocessing share their parent's tracker, where the creator's
+    registration must stay; any other process gets its own tracker, so the
+    registration is withdrawn.
+    """
+    from multiprocessing import resource_tracker
+    shared_tracker = getattr(resource_tracker._resource_tracker, '_fd', None) is not None
+    shm = shared_memory.SharedMemory(name=name)
+    if not shared_tracker:
+        try:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+    return shm
+
+
+def _checksum(values: np.ndarray, seq: int) -> int:
+    """XOR of a slot's data words and its sequence number."""
+    return int(np.bitwise_xor.reduce(values.view(np.uint64), initial=np.uint64(seq)))
+
+
+class SharedSampleRing:
+    """
+    Fixed-capacity ring of samples in a multiprocessing.shared_memory block.
+
+    Layout (all 8-byte words): header[4], seq[capacity], check[capacity],
+    data[capacity][fields]. The writer makes a slot's sequence odd, writes
+    the data and its checksum, then makes the sequence even again, so after
+    the n-th write to a slot its sequence is 2n. A reader copies a slot
+    between two sequence reads and accepts the copy only if both equal the
+    value expected for the sample it wants and the checksum matches.
+
+    The stores are plain numpy writes with no memory barriers, so on weakly
+    ordered CPUs (the aarch64 Pi) a reader may see the even sequence before
+    the data lands. The sequence alone therefore only tells which sample a
+    slot holds; the checksum (XOR of the data words and the sequence) is
+    what rejects a torn or stale copy, which the reader then retries.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool, writable: bool,
+                 fields: Sequence[str] = RING_FIELDS):
+        """
+        Wrap a mapped block (use create() or attach()).
+
+        Args:
+            shm: Shared memory block
+            owner: True for the process that created (and will unlink) the block
+            writable: True for the single writer
+            fields: Channel names, in slot order
+        """
+        self.shm = shm
+        self.owner = owner
+        self.writable = writable
+        self.fields = tuple(fields)
+
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=shm.buf)
+        if owner:
+            header[0] = _MAGIC
+        elif int(header[0]) != _MAGIC or int(header[2]) != len(self.fields):
+            raise ValueError(f"Shared memory {shm.name} is not a sample ring with "
+                             f"{len(self.fields)} fields")
+        self.capacity = int(header[1])
+
+        offset = _HEADER_WORDS * 8
+        self._header = header
+        self._seq = np.ndarray((self.capacity,), dtype=np.uint64, buffer=shm.buf, offset=offset)
+        offset += self.capacity * 8
+        self._check = np.ndarray((self.capacity,), dtype=np.uint64, buffer=shm.buf, offset=offset)
+        offset += self.capacity * 8
+        self._data = np.ndarray((self.capacity, len(self.fields)), dtype=np.float64,
+                                buffer=shm.buf, offset=offset)
+
+        if not writable:
+            # Readers never write; catch mistakes early
+            for array in (self._header, self._seq, self._check, self._data):
+                array.flags.writeable = False
+
+    @classmethod
+    def create(cls, name: Optional[str] = None, capacity: int = 1024,
+               fields: Sequence[str] = RING_FIELDS) -> 'SharedSampleRing':
+        """
+        Create a new ring (writer side).
+
+        Args:
+            name: Shared memory name (default: generated)
+            capacity: Number of samples kept
+            fields: Channel names
+
+        Returns:
+            Writable ring owned by this process
+        """
+        size = (_HEADER_WORDS + 2 * capacity + capacity * len(fields)) * 8
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        header = np.ndarray((_HEADER_WORDS,), dtype=np.uint64, buffer=shm.buf)
+        header[:] = (0, capacity, len(fields), 0)
+        np.ndarray((capacity,), dtype=np.uint64, buffer=shm.buf, offset=_HEADER_WORDS * 8)[:] = 0
+        return cls(shm, owner=True, writable=True, fields=fields)
+
+    @classmethod
+    def attach(cls, name: str, writable: bool = False,
+               fields: Sequence[str] = RING_FIELDS) -> 'SharedSampleRing':
+        """
+        Map an existing ring.
+
+        Args:
+            name: Shared memory name used by the creator
+            writable: Map for writing (only the single writer process)
+            fields: Channel names (must match the creator)
+
+        Returns:
+            Ring (read-only unless writable)
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+        except TypeError:
+            shm = _attach_untracked(name)
+        return cls(shm, owner=False, writable=writable, fields=fields)
+
+    @property
+    def name(self) -> str:
+        """Shared memory name to pass to readers."""
+        return self.shm.name
+
+    @property
+    def count(self) -> int:
+        """Total number of samples written."""
+        return int(self._header[_COUNT])
+
+    def write(self, sample: Dict[str, Any]):
+        """
+        Publish a sample (single writer only).
+
+        Args:
+            sample: Dictionary with RING_FIELDS keys (missing or None -> NaN)
+        """
+        count = int(self._header[_COUNT])
+        slot = count % self.capacity
+        seq = int(self._seq[slot])
+
+        values = np.array([np.nan if sample.get(field) is None else sample.get(field)
+                           for field in self.fields], dtype=np.float64)
+
+        self._seq[slot] = seq + 1  # odd: write in progress
+        self._data[slot] = values
+        self._check[slot] = _checksum(values, seq + 2)
+        self._seq[slot] = seq + 2  # even: stable
+        self._header[_COUNT] = count + 1
+
+    def _read_slot(self, index: int) -> Optional[Tuple[float, ...]]:
+        slot = index % self.capacity
+        expected = 2 * (index // self.capacity + 1)
+        for _ in range(_MAX_RETRIES):
+            before = int(self._seq[slot])
+            if before < expected:
+                continue  # Being written, or the count became visible first
+            if before > expected:
+                return None  # Overwritten by a newer sample
+            values = self._data[slot].copy()
+            check = int(self._check[slot])
+            if int(self._seq[slot]) == expected and check == _checksum(values, expected):
+                return tuple(values.tolist())
+        return None
+
+    def _to_dict(self, values: Tuple[float, ...]) -> Dict[str, Any]:
+        return {field: (None if value != value else value)
+                for field, value in zip(self.fields, values)}
+
+    def latest(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the newest sample.
+
+        Returns:
+            Sample dictionary, or None if nothing was written yet
+        """
+        count = self.count
+        if count == 0:
+            return None
+        values = self._read_slot(count - 1)
+        return None if values is None else self._to_dict(values)
+
+    def read_since(self, cursor: int) -> Tuple[List[Dict[str, Any]], int, int]:
+        """
+        Get every sample written after a cursor.
+
+        Args:
+            cursor: Value returned by the previous call (0 to start)
+
+        Returns:
+            (samples oldest first, new cursor, samples lost because the
+            reader fell more than `capacity` behind)
+        """
+        count = self.count
+        lost = 0
+        if count - cursor > self.capacity:
+            lost = count - cursor - self.capacity
+            cursor = count - self.capacity
+
+        samples = []
+        for index in range(cursor, count):
+            values = self._read_slot(index)
+            if values is None:
+                lost += 1
+            else:
+                samples.append(self._to_dict(values))
+        return samples, count, lost
+
+    def close(self):
+        """Unmap the ring (and remove it if this process created it)."""
+        # Drop numpy views first; the buffer cannot be released while exported
+        self._header = self._seq = self._check = self._data = None
+        self.shm.close()
+        if self.owner:
+            try:
+                self.shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,64 @@
+"""
+Startup timing for Car Monitor.
+Measures time to first frame from process start (including interpreter
+start-up and imports) against the budget in system.startup_budget.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+from typing import Optional
+
+# Fallback reference when /proc is unavailable
+_IMPORTED = time.monotonic()
+
+
+def process_age() -> float:
+    """
+    Seconds since this process started (including interpreter start-up).
+
+    Uses the kernel's process start time where available (10 ms
+    resolution); elsewhere, the time since this module was imported.
+    """
+    try:
+        with open('/proc/self/stat') as f:
+            # Fields after the command name; starttime is field 22 of the line
+            fields = f.read().rsplit(')', 1)[1].split()
+        with open('/proc/uptime') as f:
+            uptime = float(f.read().split()[0])
+        return uptime - int(fields[19]) / os.sysconf('SC_CLK_TCK')
+    except (OSError, ValueError, IndexError):
+        return time.monotonic() - _IMPORTED
+
+
+def record_first_frame(frontend: str, config, log_dir: Optional[str] = None) -> float:
+    """
+    Report time to first frame and append it to startup.jsonl.
+
+    Args:
+        frontend: Frontend name (e.g. 'touch', 'gui')
+        config: Config instance (system.startup_budget, logging.directory)
+        log_dir: Directory for startup.jsonl (default: logging directory)
+
+    Returns:
+        Seconds from process start to the first frame
+    """
+    elapsed = process_age()
+    budget = config.get('system.startup_budget')
+    if budget is None or elapsed <= budget:
+        print(f"✅ First frame after {elapsed:.2f} s")
+    else:
+        print(f"⚠️  First frame after {elapsed:.2f} s (budget {budget:.2f} s)")
+
+    log_dir = log_dir or config.log_directory
+    if log_dir:
+        entry = {'time': time.time(), 'frontend': frontend,
+                 'first_frame_s': round(elapsed, 3), 'budget_s': budget}
+        try:
+            Path(log_dir).mkdir(parents=True, exist_ok=True)
+            with open(Path(log_dir) / 'startup.jsonl', 'a') as f:
+                f.write(json.dumps(entry) + '\n')
+        except OSError as e:
+            print(f"⚠️  Cannot record startup time: {e}")
+    return elapsed
@@ -0,0 +1,329 @@
+"""
+Streaming statistics for Car Monitor.
+Fixed-memory histograms for latency and jitter measurements, and per-
+component registries of them for the stats API and debug overlays.
+"""
+
+import math
+import time
+from typing import Any, Dict, List, Optional
+
+
+class StreamingHistogram:
+    """
+    Fixed-memory histogram with logarithmic buckets.
+
+    Values between min_value and max_value fall into buckets whose width is
+    a constant fraction of their value (about 12% with the default 20
+    buckets per decade), so percentiles keep the same relative precision
+    from microseconds to seconds. Values outside the range are counted in
+    underflow/overflow buckets; min and max are tracked exactly.
+    """
+
+    def __init__(self, min_value: float = 1.0, max_value: float = 1e7,
+                 buckets_per_decade: int = 20):
+        """
+        Initialize histogram.
+
+        Args:
+            min_value: Lower edge of the first bucket (must be > 0)
+            max_value: Upper edge of the last bucket
+            buckets_per_decade: Resolution (buckets per factor of 10)
+        """
+        self.min_value = min_value
+        self.max_value = max_value
+        self.buckets_per_decade = buckets_per_decade
+        self._log_min = math.log10(min_value)
+        self.nbuckets = math.ceil((math.log10(max_value) - self._log_min) * buckets_per_decade)
+
+        # counts[0] is underflow, counts[-1] is overflow
+        self.counts: List[int] = [0] * (self.nbuckets + 2)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _index(self, value: float) -> int:
+        if value < self.min_value:
+            return 0
+        index = int((math.log10(value) - self._log_min) * self.buckets_per_decade) + 1
+        return min(index, self.nbuckets + 1)
+
+    def edge(self, index: int) -> float:
+        """Lower edge of bucket `index` (1-based; 0 is underflow)."""
+        return 10 ** (self._log_min + (index - 1) / self.buckets_per_decade)
+
+    def record(self, value: float):
+        """Add a value."""
+        self.counts[self._index(value)] += 1
+        self.count += 1
+        self.total += value
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def merge(self, other: 'StreamingHistogram'):
+        """Add another histogram with the same bucket layout."""
+        if (other.min_value, other.max_value, other.buckets_per_decade) != \
+                (self.min_value, self.max_value, self.buckets_per_decade):
+            raise ValueError("Histograms have different bucket layouts")
+        for i, c in enumerate(other.counts):
+            self.counts[i] += c
+        self.count += other.count
+        self.total += other.total
+        for value in (other.min, other.max):
+            if value is not None:
+                self.min = value if self.min is None else min(self.min, value)
+                self.max = value if self.max is None else max(self.max, value)
+
+    def reset(self):
+        """Discard all values."""
+        self.counts = [0] * len(self.counts)
+        self.count = 0
+        self.total = 0.0
+        self.min = self.max = None
+
+    @property
+    def mean(self) -> Optional[float]:
+        """Mean of all values."""
+        return self.total / self.count if self.count else None
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Estimate a percentile.
+
+        Args:
+            p: Percentile in [0, 100]
+
+        Returns:
+            Upper edge of the bucket holding the percentile (clamped to the
+            exact min/max), or None if empty
+        """
+        if not self.count:
+            return None
+        rank = max(1, math.ceil(p / 100 * self.count))
+        seen = 0
+        for index, c in enumerate(self.counts):
+            seen += c
+            if seen >= rank:
+                if index == 0:
+                    return self.min
+                if index > self.nbuckets:
+                    return self.max
+                return min(max(self.edge(index + 1), self.min), self.max)
+        return self.max
+
+    def summary(self, scale: float = 1.0) -> Dict[str, Any]:
+        """
+        Get count, mean, extremes and common percentiles.
+
+        Args:
+            scale: Factor applied to every value (e.g. 1e-3 for us -> ms)
+
+        Returns:
+            Dictionary of statistics
+        """
+        def scaled(value):
+            return None if value is None else value * scale
+
+        return {
+            'count': self.count,
+            'mean': scaled(self.mean),
+            'min': scaled(self.min),
+            'p50': scaled(self.percentile(50)),
+            'p90': scaled(self.percentile(90)),
+            'p99': scaled(self.percentile(99)),
+            'p999': scaled(self.percentile(99.9)),
+            'max': scaled(self.max),
+        }
+
+    def format(self, scale: float = 1.0, unit: str = '', width: int = 40,
+               buckets_per_row: int = 5) -> str:
+        """
+        Render an ASCII bar chart of the non-empty range.
+
+        Args:
+            scale: Factor applied to bucket edges for display
+            unit: Unit label for bucket edges
+            width: Width of the longest bar
+            buckets_per_row: Buckets merged into one row
+
+        Returns:
+            Multi-line string
+        """
+        if not self.count:
+            return "(no data)"
+
+        used = [i for i, c in enumerate(self.counts) if c]
+        rows = []
+        start = used[0] - (used[0] - 1) % buckets_per_row if used[0] > 0 else 0
+        index = start
+        while index <= used[-1]:
+            if index == 0:
+                label = f"< {self.min_value * scale:g}{unit}"
+                count, index = self.counts[0], 1
+            elif index > self.nbuckets:
+                label = f">= {self.max_value * scale:g}{unit}"
+                count, index = self.counts[index], index + 1
+            else:
+                end = min(index + buckets_per_row, self.nbuckets + 1)
+                label = f"{self.edge(index) * scale:8.3g} - {self.edge(end) * scale:<8.3g}{unit}"
+                count = sum(self.counts[index:end])
+                index = end
+            rows.append((label, count))
+
+        peak = max(c for _, c in rows)
+        label_width = max(len(label) for label, _ in rows)
+        return "\n".join(f"{label:>{label_width}} |{'#' * round(width * c / peak):<{width}} {c}"
+                         for label, c in rows)
+
+
+class JitterMeter:
+    """
+    Period jitter of a periodic task.
+
+    Each observe() call marks the start of one period; the measured period
+    and its deviation from the nominal interval are recorded in microseconds.
+    """
+
+    def __init__(self, interval: float):
+        """
+        Initialize jitter meter.
+
+        Args:
+            interval: Nominal period in seconds
+        """
+        self.interval = interval
+        self.histogram = StreamingHistogram()
+        self.periods = StreamingHistogram()
+        self.last: Optional[float] = None
+
+    def observe(self, timestamp: Optional[float] = None):
+        """
+        Mark the start of a period.
+
+        Args:
+            timestamp: Time in seconds (default: time.monotonic())
+        """
+        now = time.monotonic() if timestamp is None else timestamp
+        if self.last is not None:
+            period = now - self.last
+            self.periods.record(period * 1e6)
+            self.histogram.record(abs(period - self.interval) * 1e6)
+        self.last = now
+
+    def reset(self, interval: Optional[float] = None):
+        """Discard measurements (optionally changing the nominal period)."""
+        if interval is not None:
+            self.interval = interval
+        self.histogram.reset()
+        self.periods.reset()
+        self.last = None
+
+    def summary(self) -> Dict[str, Any]:
+        """Get jitter statistics in milliseconds."""
+        return dict(self.histogram.summary(scale=1e-3), interval_ms=self.interval * 1000)
+
+    def report(self) -> str:
+        """Get a printable jitter summary and histogram (milliseconds)."""
+        s = self.summary()
+        if not s['count']:
+            return "Sampling jitter: no data"
+        header = (f"Sampling jitter over {s['count']} periods of {s['interval_ms']:.0f} ms: "
+                  f"p50 {s['p50']:.2f} ms, p99 {s['p99']:.2f} ms, max {s['max']:.2f} ms")
+        return header + "\n" + self.histogram.format(scale=1e-3, unit=' ms')
+
+
+class StatsRegistry:
+    """
+    Named latency histograms and event counters of one component.
+
+    Recording costs about a microsecond, cheap enough for every query and
+    sample on the hot path. Histograms hold microseconds; snapshots report
+    milliseconds.
+    """
+
+    def __init__(self):
+        """Initialize empty registry."""
+        self.histograms: Dict[str, StreamingHistogram] = {}
+        self.counters: Dict[str, int] = {}
+
+    def histogram(self, name: str) -> StreamingHistogram:
+        """Get (creating if needed) a histogram."""
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            histogram = self.histograms[name] = StreamingHistogram()
+        return histogram
+
+    def record(self, name: str, value_us: float):
+        """
+        Add a value to a histogram.
+
+        Args:
+            name: Histogram name
+            value_us: Value in microseconds
+        """
+        self.histogram(name).record(value_us)
+
+    def count(self, name: str, n: int = 1):
+        """Increment a counter."""
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def reset(self):
+        """Clear all histograms and counters."""
+        for histogram in self.histograms.values():
+            histogram.reset()
+        self.counters = {}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get all statistics.
+
+        Returns:
+            {'histograms': {name: summary in ms}, 'counters': {name: count}}
+        """
+        return {
+            'histograms': {name: h.summary(scale=1e-3)
+                           for name, h in list(self.histograms.items())},
+            'counters': dict(self.counters),
+        }
+
+    # Same method name as the components that own registries
+    get_stats = snapshot
+
+
+def collect_stats(**components) -> Dict[str, Dict[str, Any]]:
+    """
+    Gather snapshots from components that have a get_stats() method.
+
+    Args:
+        **components: Section name to component (None entries are skipped)
+
+    Returns:
+        Dictionary of section name to snapshot
+    """
+    return {name: component.get_stats() for name, component in components.items()
+            if component is not None and hasattr(component, 'get_stats')}
+
+
+def overlay_lines(stats: Dict[str, Dict[str, Any]]) -> List[str]:
+    """
+    Format collected stats as short lines for a debug overlay.
+
+    Args:
+        stats: Output of collect_stats()
+
+    Returns:
+        One line per non-empty histogram ("section name p50/p99 ms") plus one
+        line of counters per section
+    """
+    lines = []
+    for section, snapshot in stats.items():
+        for name, s in snapshot.get('histograms', {}).items():
+            if s['count']:
+                lines.append(f"{section} {name} {s['p50']:.1f}/{s['p99']:.1f} ms")
+        counters = snapshot.get('counters', {})
+        if counters:
+            lines.append(f"{section} " + " ".join(f"{k}={v}" for k, v in sorted(counters.items())))
+    return lines
@@ -0,0 +1,415 @@
+"""
+Local telemetry export for Car Monitor.
+Streams live samples to other processes on the Pi (fleet agent, dashcam
+overlay) as newline-delimited JSON over a Unix socket or localhost TCP.
+Each client picks its channels and a maximum rate; slow clients lose their
+own oldest lines instead of delaying acquisition or other clients.
+"""
+
+import json
+import os
+import selectors
+import socket
+from collections import deque
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+from common.bus import DataBus, SAMPLES, Topic
+from common.stats import StatsRegistry
+
+# Always sent with the selected channels
+KEY_FIELDS = ('timestamp', 'vehicle')
+
+
+class TelemetryClient:
+    """Connection state of one subscriber (owned by the server thread)."""
+
+    def __init__(self, sock: socket.socket, peer: str, max_buffer: int):
+        """
+        Initialize client.
+
+        Args:
+            sock: Accepted non-blocking socket
+            peer: Printable peer address
+            max_buffer: Bytes of unsent lines kept before dropping the oldest
+        """
+        self.sock = sock
+        self.peer = peer
+        self.max_buffer = max_buffer
+
+        # None = every channel; interval 0 = every sample
+        self.channels: Optional[Tuple[str, ...]] = None
+        self.interval = 0.0
+        self._next_due: Dict[Any, float] = {}
+
+        self.outgoing: deque = deque()
+        self.buffered = 0
+        self.offset = 0  # bytes of outgoing[0] already sent
+        self.incoming = bytearray()
+
+        self.sent = 0
+        self.dropped = 0
+
+    def configure(self, request: Dict[str, Any]):
+        """
+        Apply a subscription request.
+
+        Args:
+            request: {"channels": [...] or null, "rate": Hz (0 = every sample)}
+
+        Raises:
+            ValueError: On malformed values
+        """
+        if 'channels' in request:
+            channels = request['channels']
+            if channels is not None and (not isinstance(channels, list) or
+                                         not all(isinstance(c, str) for c in channels)):
+                raise ValueError("channels must be a list of names or null")
+            self.channels = tuple(channels) if channels is not None else None
+        if 'rate' in request:
+            rate = float(request['rate'] or 0)
+            if rate < 0:
+                raise ValueError("rate must be >= 0")
+            self.interval = 1.0 / rate if rate else 0.0
+            self._next_due.clear()
+
+    def wants(self, data: Dict[str, Any]) -> bool:
+        """Decimate by sample time (separately per vehicle)."""
+        if not self.interval:
+            return True
+        timestamp = data.get('timestamp')
+        if not isinstance(timestamp, (int, float)):
+            return True
+        key = data.get('vehicle')
+        due = self._next_due.get(key)
+        if due is not None and timestamp < due:
+            return False
+        # Stay on the rate grid unless we fell more than one interval behind
+        self._next_due[key] = timestamp + self.interval if due is None or \
+            timestamp - due > self.interval else due + self.interval
+        return True
+
+    def enqueue(self, line: bytes):
+        """Queue a line, dropping the oldest unsent lines beyond max_buffer."""
+        self.outgoing.append(line)
+        self.buffered += len(line)
+        while self.buffered > self.max_buffer and len(self.outgoing) > 1:
+            # Keep the line that is partly on the wire and the new line
+            index = 1 if self.offset else 0
+            if index == len(self.outgoing) - 1:
+                break
+            self.buffered -= len(self.outgoing[index])
+            del self.outgoing[index]
+            self.dropped += 1
+
+    def flush(self) -> bool:
+        """
+        Send as much as the socket takes.
+
+        Returns:
+            True if lines are still waiting
+
+        Raises:
+            OSError: If the connection failed
+        """
+        while self.outgoing:
+            line = self.outgoing[0]
+            try:
+                written = self.sock.send(memoryview(line)[self.offset:])
+            except (BlockingIOError, InterruptedError):
+                return True
+            self.offset += written
+            if self.offset < len(line):
+                return True
+            self.outgoing.popleft()
+            self.buffered -= len(line)
+            self.offset = 0
+            self.sent += 1
+        return False
+
+
+class TelemetryServer:
+    """
+    Newline-JSON sample stream for local subscribers.
+
+    Protocol: after connecting, a client may send one JSON object per line,
+    e.g. {"channels": ["speed_kph", "rpm"], "rate": 2}, to select channels
+    (null = all) and a maximum rate in Hz (0 = every sample); it may do so
+    again at any time. The server writes one JSON object per sample with
+    the selected channels plus timestamp (and vehicle, for the gateway).
+    Malformed requests are answered with {"error": "..."}.
+
+    The bus callback only appends to a bounded queue and wakes the server
+    thread, which encodes each sample once per distinct channel selection
+    and writes with non-blocking sockets.
+    """
+
+    def __init__(self, bus: DataBus, address: str = '/tmp/carmonitor.sock',
+                 topic: Topic = SAMPLES, max_buffer: int = 65536, max_clients: int = 32):
+        """
+        Initialize server.
+
+        Args:
+            bus: Data bus to export
+            address: Unix socket path, or 'host:port' for TCP (use a
+                localhost address; port 0 picks a free port)
+            topic: Topic to export
+            max_buffer: Unsent bytes kept per client before dropping its oldest lines
+            max_clients: Connections accepted at once
+        """
+        self.bus = bus
+        self.address = address
+        self.topic = topic
+        self.max_buffer = max_buffer
+        self.max_clients = max_clients
+
+        self.clients: List[TelemetryClient] = []
+        self.stats = StatsRegistry()
+
+        self.listener: Optional[socket.socket] = None
+        self.selector = None
+        self.thread = None
+        self.subscription = None
+        self.stop_event = Event()
+        self._pending: deque = deque(maxlen=1000)
+        self._wake_lock = Lock()
+        self._woken = False
+        self._wake_r = self._wake_w = None
+
+    @classmethod
+    def from_config(cls, config, bus: DataBus, topic: Topic = SAMPLES) -> Optional['TelemetryServer']:
+        """
+        Create a server from the 'telemetry' config section.
+
+        Args:
+            config: Config instance
+            bus: Data bus to export
+            topic: Topic to export
+
+        Returns:
+            TelemetryServer, or None when telemetry is disabled
+        """
+        if not config.get('telemetry.enabled', False):
+            return None
+        return cls(bus, address=str(config.get('telemetry.address', '/tmp/carmonitor.sock')),
+                   topic=topic,
+                   max_buffer=int(config.get('telemetry.buffer_kb', 64) * 1024),
+                   max_clients=config.get('telemetry.max_clients', 32))
+
+    @property
+    def is_unix(self) -> bool:
+        return ':' not in self.address
+
+    def start(self) -> bool:
+        """
+        Listen and start the server thread.
+
+        Returns:
+            True if listening
+        """
+        try:
+            if self.is_unix:
+                if os.path.exists(self.address):
+                    os.unlink(self.address)  # stale socket of a previous run
+                self.listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+                self.listener.bind(self.address)
+            else:
+                host, port = self.address.rsplit(':', 1)
+                self.listener = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.listener.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                self.listener.bind((host, int(port)))
+                self.address = f"{host}:{self.listener.getsockname()[1]}"
+            self.listener.listen(8)
+        except OSError as e:
+            print(f"❌ Telemetry server cannot listen on {self.address}: {e}")
+            if self.listener is not None:
+                self.listener.close()
+                self.listener = None
+            return False
+        self.listener.setblocking(False)
+
+        self.selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, 'wake')
+        self.selector.register(self.listener, selectors.EVENT_READ, 'listen')
+
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, name='telemetry', daemon=True)
+        self.thread.start()
+        self.subscription = self.bus.subscribe(self.topic, self.publish, name='telemetry')
+        print(f"✅ Telemetry on {self.address}")
+        return True
+
+    def stop(self):
+        """Disconnect clients and stop the server thread."""
+        if self.subscription is not None:
+            self.bus.unsubscribe(self.subscription)
+            self.subscription = None
+        self.stop_event.set()
+        self._wake()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        for client in list(self.clients):
+            self._disconnect(client)
+        if self.selector:
+            self.selector.close()
+            self.selector = None
+        if self.listener is not None:
+            self.listener.close()
+            self.listener = None
+            if self.is_unix and os.path.exists(self.address):
+                os.unlink(self.address)
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+
+    def publish(self, data: Dict[str, Any]):
+        """
+        Hand a sample to the server thread (never blocks).
+
+        Args:
+            data: Sample dictionary
+        """
+        if not self.clients:
+            return
+        self._pending.append(data)
+        with self._wake_lock:
+            if self._woken:
+                return
+            self._woken = True
+        self._wake()
+
+    def _wake(self):
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b'x')
+            except BlockingIOError:
+                pass
+
+    # Server thread
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            for key, mask in self.selector.select(1.0):
+                if key.data == 'wake':
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                    with self._wake_lock:
+                        self._woken = False
+                    self._send_pending()
+                elif key.data == 'listen':
+                    self._accept()
+                else:
+                    client = key.data
+                    if mask & selectors.EVENT_READ:
+                        self._receive(client)
+                    if mask & selectors.EVENT_WRITE and client in self.clients:
+                        self._flush(client)
+
+    def _accept(self):
+        try:
+            sock, peer = self.listener.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        if len(self.clients) >= self.max_clients:
+            sock.close()
+            self.stats.count('rejected')
+            return
+        sock.setblocking(False)
+        client = TelemetryClient(sock, str(peer or 'local'), self.max_buffer)
+        self.clients.append(client)
+        self.selector.register(sock, selectors.EVENT_READ, client)
+        self.stats.count('connections')
+
+    def _receive(self, client: TelemetryClient):
+        try:
+            data = client.sock.recv(4096)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError:
+            data = b''
+        if not data:
+            self._disconnect(client)
+            return
+        client.incoming += data
+        if len(client.incoming) > 65536:
+            self._disconnect(client)
+            return
+        while b'\n' in client.incoming:
+            line, _, rest = bytes(client.incoming).partition(b'\n')
+            client.incoming = bytearray(rest)
+            if not line.strip():
+                continue
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("expected a JSON object")
+                client.configure(request)
+            except (ValueError, TypeError) as e:
+                client.enqueue(json.dumps({'error': str(e)}).encode() + b'\n')
+                self._flush(client)
+
+    def _send_pending(self):
+        while self._pending:
+            data = self._pending.popleft()
+            # One encoding per distinct channel selection
+            encoded: Dict[Optional[Tuple[str, ...]], bytes] = {}
+            for client in list(self.clients):
+                if not client.wants(data):
+                    continue
+                line = encoded.get(client.channels)
+                if line is None:
+                    if client.channels is None:
+                        message = data
+                    else:
+                        message = {k: data[k] for k in KEY_FIELDS if k in data}
+                        message.update((k, data.get(k)) for k in client.channels)
+                    line = json.dumps(message, separators=(',', ':'), default=str).encode() + b'\n'
+                    encoded[client.channels] = line
+                dropped = client.dropped
+                client.enqueue(line)
+                if client.dropped != dropped:
+                    self.stats.count('dropped', client.dropped - dropped)
+                self._flush(client)
+
+    def _flush(self, client: TelemetryClient):
+        sent = client.sent
+        try:
+            waiting = client.flush()
+        except OSError:
+            self._disconnect(client)
+            return
+        if client.sent != sent:
+            self.stats.count('sent', client.sent - sent)
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if waiting else 0)
+        if self.selector.get_key(client.sock).events != events:
+            self.selector.modify(client.sock, events, client)
+
+    def _disconnect(self, client: TelemetryClient):
+        if client not in self.clients:
+            return
+        self.clients.remove(client)
+        if self.selector:
+            try:
+                self.selector.unregister(client.sock)
+            except (KeyError, ValueError):
+                pass
+        client.sock.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get server statistics.
+
+        Returns:
+            StatsRegistry snapshot: lines sent and dropped, connections,
+            plus the current client count
+        """
+        snapshot = self.stats.snapshot()
+        snapshot['counters']['clients'] = len(self.clients)
+        return snapshot
@@ -0,0 +1,257 @@
+"""
+Vehicle state detection for Car Monitor.
+Classifies samples as off / ignition on / idle / moving from speed, RPM and
+whether the adapter got any reply, starts and ends trips on the state
+changes, and slows polling and display refresh while the car is not moving.
+"""
+
+import copy
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from common.stats import StatsRegistry
+
+OFF = 'off'
+IGNITION_ON = 'ignition_on'
+IDLE = 'idle'
+MOVING = 'moving'
+
+# Fields that show the ECU answered at all
+REPLY_FIELDS = ('speed_kph', 'rpm', 'throttle_pct', 'engine_load')
+
+# States that count as the engine being off when timing the end of a trip
+ENGINE_OFF = (OFF, IGNITION_ON)
+
+
+class VehicleState:
+    """
+    Per-sample state classifier that also paces the reader.
+
+    Called with each sample it returns the interval until the next one
+    (None for full rate), so a copy can run inside the reading loop, also
+    in the acquisition process: polling is back at full rate from the
+    first sample that shows motion.
+    """
+
+    def __init__(self, moving_kph: float = 2.0, running_rpm: float = 300.0,
+                 off_after: float = 3.0, idle_interval: float = 1.0, off_interval: float = 5.0):
+        """
+        Initialize classifier.
+
+        Args:
+            moving_kph: Speed above which the car is moving
+            running_rpm: RPM above which the engine is running
+            off_after: Seconds without any reply before the car counts as off
+            idle_interval: Polling interval with ignition on or idling (seconds)
+            off_interval: Polling interval while off (seconds)
+        """
+        self.moving_kph = moving_kph
+        self.running_rpm = running_rpm
+        self.off_after = off_after
+        self.idle_interval = idle_interval
+        self.off_interval = off_interval
+
+        self.state = OFF
+        self.last_reply: Optional[float] = None
+
+    def update(self, data: Dict[str, Any]) -> str:
+        """
+        Classify a sample.
+
+        A sample without any reply keeps the previous state until nothing
+        has been heard for off_after seconds, so a dropped query while
+        driving does not count as the engine stopping.
+
+        Args:
+            data: Sample dictionary from the reader
+
+        Returns:
+            New state
+        """
+        now = data.get('timestamp') or time.time()
+        if any(data.get(field) is not None for field in REPLY_FIELDS):
+            self.last_reply = now
+            speed = data.get('speed_kph')
+            rpm = data.get('rpm')
+            if speed is not None and speed > self.moving_kph:
+                self.state = MOVING
+            elif rpm is not None and rpm > self.running_rpm:
+                self.state = IDLE
+            else:
+                self.state = IGNITION_ON
+        elif self.last_reply is None or now - self.last_reply >= self.off_after:
+            self.state = OFF
+        return self.state
+
+    def interval(self) -> Optional[float]:
+        """Polling interval for the current state (None for full rate)."""
+        if self.state == MOVING:
+            return None
+        if self.state == OFF:
+            return self.off_interval
+        return self.idle_interval
+
+    def __call__(self, data: Dict[str, Any]) -> Optional[float]:
+        """Classify a sample and return the interval until the next one."""
+        self.update(data)
+        return self.interval()
+
+
+class TripDetector:
+    """
+    Vehicle state machine that starts and ends trips automatically.
+
+    Runs as a bus subscriber, so state changes and trip actions happen on
+    its own thread, never in the reading loop. A trip starts when the car
+    starts moving and ends once the engine has been off for end_after_off
+    seconds, or the car has stood with the engine running for
+    end_after_idle seconds. Manual start and stop keep working; a trip
+    stopped by hand is not restarted until the car stops and moves again.
+    """
+
+    def __init__(self, vehicle: Optional[VehicleState] = None, auto_trips: bool = True,
+                 duty_cycle: bool = True, end_after_off: float = 10.0,
+                 end_after_idle: float = 300.0):
+        """
+        Initialize trip detector.
+
+        Args:
+            vehicle: State classifier (default: VehicleState())
+            auto_trips: Start and end trips on state changes
+            duty_cycle: Slow polling and display refresh when not moving
+            end_after_off: Seconds with the engine off before a trip ends
+            end_after_idle: Seconds standing with the engine running before a trip ends
+        """
+        self.vehicle = vehicle or VehicleState()
+        self.auto_trips = auto_trips
+        self.duty_cycle = duty_cycle
+        self.end_after_off = end_after_off
+        self.end_after_idle = end_after_idle
+
+        self.since: Optional[float] = None
+        self._stopped_since: Optional[float] = None
+        self._trip_since: Optional[float] = None
+        self._start_trip: Optional[Callable[[], Any]] = None
+        self._end_trip: Optional[Callable[[], Any]] = None
+        self._trip_active: Callable[[], bool] = lambda: False
+
+        # Callbacks run with (previous, new) state on every change
+        self.listeners: List[Callable[[str, str], None]] = []
+        self.stats = StatsRegistry()
+
+    @classmethod
+    def from_config(cls, config) -> Optional['TripDetector']:
+        """
+        Create a detector from the 'vehicle_state' config section.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            TripDetector, or None unless vehicle_state.enabled is set
+        """
+        if not config.get('vehicle_state.enabled', False):
+            return None
+        vehicle = VehicleState(
+            moving_kph=config.get('vehicle_state.moving_kph', 2.0),
+            running_rpm=config.get('vehicle_state.running_rpm', 300.0),
+            off_after=config.get('vehicle_state.off_after', 3.0),
+            idle_interval=config.get('vehicle_state.idle_interval', 1.0),
+            off_interval=config.get('vehicle_state.off_interval', 5.0)
+        )
+        return cls(vehicle,
+                   auto_trips=config.get('vehicle_state.auto_trips', False),
+                   duty_cycle=config.get('vehicle_state.duty_cycle', True),
+                   end_after_off=config.get('vehicle_state.end_after_off', 10.0),
+                   end_after_idle=config.get('vehicle_state.end_after_idle', 300.0))
+
+    @property
+    def state(self) -> str:
+        return self.vehicle.state
+
+    def pacer(self) -> Optional[VehicleState]:
+        """
+        Get a classifier for the reader's pace hook.
+
+        Returns:
+            Independent copy of the classifier, or None when duty cycling is off
+        """
+        return copy.deepcopy(self.vehicle) if self.duty_cycle else None
+
+    def bind_trips(self, start: Callable[[], Any], end: Callable[[], Any],
+                   active: Callable[[], bool]):
+        """
+        Set the frontend's trip actions (called from the detector's thread).
+
+        Args:
+            start: Starts a trip
+            end: Ends the current trip
+            active: Returns True while a trip is running
+        """
+        self._start_trip = start
+        self._end_trip = end
+        self._trip_active = active
+
+    def add_listener(self, callback: Callable[[str, str], None]):
+        """
+        Register a callback for state changes (and for the first sample).
+
+        Args:
+            callback: Function taking the previous and the new state
+        """
+        self.listeners.append(callback)
+
+    def on_sample(self, data: Dict[str, Any]):
+        """
+        Update the state from a sample (bus subscriber).
+
+        Args:
+            data: Sample dictionary from the reader
+        """
+        now = data.get('timestamp') or time.time()
+        previous = self.vehicle.state
+        state = self.vehicle.update(data)
+        active = self._trip_active()
+        if not active:
+            self._trip_since = None
+        elif self._trip_since is None:
+            self._trip_since = now
+
+        if state != previous or self.since is None:
+            self.since = now
+            if not (state in ENGINE_OFF and previous in ENGINE_OFF) or self._stopped_since is None:
+                self._stopped_since = now
+            self.stats.count(f'state.{state}')
+            for listener in self.listeners:
+                try:
+                    listener(previous, state)
+                except Exception as e:
+                    print(f"Error in vehicle state listener: {e}")
+            if self.auto_trips and state == MOVING and not active and self._start_trip:
+                self.stats.count('trips.started')
+                self._start_trip()
+            return
+
+        if not (self.auto_trips and active and self._end_trip):
+            return
+        if state == IDLE:
+            limit = self.end_after_idle
+        elif state in ENGINE_OFF:
+            limit = self.end_after_off
+        else:
+            return
+        # Timed from the later of stopping and the trip start, so a trip
+        # started by hand while parked is not ended at once
+        if now - max(self._stopped_since, self._trip_since) >= limit:
+            self.stats.count('trips.ended')
+            self._end_trip()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get detector statistics.
+
+        Returns:
+            StatsRegistry snapshot: entries into each state and trips
+            started and ended automatically
+        """
+        return self.stats.snapshot()
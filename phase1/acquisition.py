@@ -0,0 +1,315 @@
+"""
+Isolated OBD-II acquisition - Phase 1
+Runs the reader in its own process so sampling is never delayed by the GIL
+of the UI/scoring process. Samples are shared through a SharedSampleRing.
+"""
+
+import copy
+import multiprocessing as mp
+import signal
+import time
+from threading import Thread
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional
+
+from common.realtime import apply_realtime, print_realtime_report, realtime_options, sample_loop
+from common.stats import JitterMeter, StatsRegistry
+from phase1.burst_capture import BurstCapture
+
+if TYPE_CHECKING:
+    # Imported on connect: it pulls in numpy, which slows UI start-up
+    from common.shm_ring import SharedSampleRing
+
+
+def _acquisition_main(ring_name: str, port: str, baudrate: int, synthetic: bool,
+                      timeout: int, realtime: Optional[Dict[str, Any]],
+                      interval, state, start_event, stop_event, wake_event, pace=None,
+                      burst=None, thresholds=None):
+    """Entry point of the acquisition process."""
+    # Ctrl-C is handled by the parent, which stops us through stop_event
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    if realtime:
+        print_realtime_report(apply_realtime(**realtime), "Acquisition process")
+
+    if synthetic:
+        from phase1.synthetic_reader import SyntheticReader
+        reader = SyntheticReader(realtime=True)
+    else:
+        from phase1.obd_reader import OBDReader
+        reader = OBDReader(port=port, baudrate=baudrate)
+
+    if not reader.connect(timeout=timeout):
+        state.value = -1
+        return
+    state.value = 1
+
+    from common.shm_ring import SharedSampleRing
+    ring = SharedSampleRing.attach(ring_name, writable=True)
+
+    applied = 0.0
+
+    def write(data):
+        nonlocal applied
+        ring.write(data)
+        wake_event.set()
+        # Thresholds reloaded in the parent since the last sample
+        if burst is not None and thresholds[0] != applied:
+            with thresholds.get_lock():
+                applied, brake, accel = thresholds[:]
+            burst.configure_thresholds(brake, accel)
+
+    try:
+        while not start_event.wait(0.1):
+            if stop_event.is_set():
+                return
+        if synthetic:
+            sample_loop(reader.read_all, write, interval.value, stop_event, pace=pace)
+        else:
+            reader.update_rate = interval.value
+            reader.pace = pace
+            reader.burst = burst
+            sample_loop(reader.sample, write, interval.value, stop_event, pace=reader.next_interval)
+    finally:
+        if burst is not None:
+            burst.close()
+        reader.disconnect()
+        ring.close()
+
+
+class IsolatedReader:
+    """
+    OBDReader stand-in whose reading happens in a child process.
+
+    The child owns the adapter and writes every sample into a shared-memory
+    ring; this side maps the ring read-only and delivers samples to
+    listeners from a light polling thread.
+    """
+
+    def __init__(self, port: str = '/dev/rfcomm0', baudrate: int = 38400,
+                 synthetic: bool = False, capacity: int = 1024,
+                 realtime: Optional[Dict[str, Any]] = None):
+        """
+        Initialize isolated reader.
+
+        Args:
+            port: Serial port of the OBD-II adapter
+            baudrate: Serial baudrate
+            synthetic: Use SyntheticReader in the child (benchmarks, demos)
+            capacity: Samples kept in the shared ring
+            realtime: apply_realtime() options for the child process
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.synthetic = synthetic
+        self.capacity = capacity
+        self.realtime = realtime
+        self.is_connected = False
+
+        # Period jitter, measured from the child's sample timestamps, and the
+        # age of samples when they reach this process
+        self.jitter = JitterMeter(0.1)
+        self.stats = StatsRegistry()
+        self.stats.histograms['loop.jitter'] = self.jitter.histogram
+        self.stats.histograms['loop.period'] = self.jitter.periods
+
+        # spawn: never fork a process that already runs GUI/bus threads
+        self._ctx = mp.get_context('spawn')
+        self._ring: Optional['SharedSampleRing'] = None
+        self._process = None
+        self._state = self._ctx.Value('i', 0)  # 0 pending, 1 connected, -1 failed
+        self._interval = self._ctx.Value('d', 0.1)
+        self._start_event = self._ctx.Event()
+        self._stop_event = self._ctx.Event()
+        self._wake_event = self._ctx.Event()
+        # Burst thresholds for the child: version, harsh brake, aggressive accel
+        self._burst_thresholds = self._ctx.Array('d', 3)
+
+        # Duty-cycling hook and BurstCapture, run in the child (must pickle;
+        # the child gets a copy, so change thresholds with configure_burst())
+        self.pace: Optional[Callable[[Dict], Optional[float]]] = None
+        self.burst = None
+
+        self.listeners: List[Callable[[Dict], None]] = []
+        self.poll_thread = None
+        self.cursor = 0
+        self.lost = 0
+
+    def connect(self, timeout: int = 10) -> bool:
+        """
+        Start the acquisition process and wait for it to connect.
+
+        Args:
+            timeout: Connection timeout in seconds
+
+        Returns:
+            True if the child connected to the adapter
+        """
+        if self.is_connected:
+            return True
+
+        from common.shm_ring import SharedSampleRing
+        self._ring = SharedSampleRing.create(capacity=self.capacity)
+        # The new ring counts from zero; self.lost stays a running total
+        self.cursor = 0
+        self._state.value = 0
+        self._start_event.clear()
+        self._stop_event.clear()
+        self._process = self._ctx.Process(
+            target=_acquisition_main, name='obd-acquisition', daemon=True,
+            args=(self._ring.name, self.port, self.baudrate, self.synthetic, timeout,
+                  self.realtime, self._interval, self._state, self._start_event, self._stop_event,
+                  self._wake_event, self.pace, self.burst, self._burst_thresholds))
+        self._process.start()
+
+        deadline = time.monotonic() + timeout + 5  # allow for interpreter start-up
+        while self._state.value == 0 and self._process.is_alive() and time.monotonic() < deadline:
+            time.sleep(0.05)
+
+        if self._state.value != 1:
+            print("❌ Acquisition process failed to connect")
+            self._shutdown()
+            return False
+
+        self.is_connected = True
+        self.stats.count('connects')
+        print(f"✅ Acquisition process running (pid {self._process.pid})")
+        return True
+
+    def disconnect(self):
+        """Stop acquisition and release the shared ring."""
+        self._shutdown()
+        self.is_connected = False
+
+    def _shutdown(self):
+        self._stop_event.set()
+        if self.poll_thread:
+            self.poll_thread.join(timeout=2.0)
+            self.poll_thread = None
+        if self._process:
+            self._process.join(timeout=5.0)
+            if self._process.is_alive():
+                self._process.terminate()
+            self._process = None
+        if self._ring:
+            self._ring.close()
+            self._ring = None
+
+    def configure_burst(self, settings):
+        """
+        Apply reloaded scoring thresholds to burst capture in the child.
+
+        Args:
+            settings: ScoringSettings
+        """
+        if self.burst is None:
+            return
+        self.burst.configure(settings)
+        with self._burst_thresholds.get_lock():
+            version = self._burst_thresholds[0] + 1
+            self._burst_thresholds[:] = [version, settings.harsh_brake_threshold,
+                                         settings.aggressive_accel_threshold]
+
+    def start_async_reading(self, update_rate: float = 0.1):
+        """
+        Start sampling in the child and delivering samples here.
+
+        Args:
+            update_rate: Sample interval in seconds
+        """
+        if self.poll_thread and self.poll_thread.is_alive():
+            print("Async reading already running")
+            return
+        self._interval.value = update_rate
+        self.jitter.reset(update_rate)
+        self._start_event.set()
+        self.poll_thread = Thread(target=self._poll_loop, daemon=True)
+        self.poll_thread.start()
+        print(f"Started isolated OBD-II reading at {1/update_rate:.1f} Hz")
+
+    def stop_async_reading(self):
+        """Stop sampling (the process exits; connect() again to restart)."""
+        self._shutdown()
+        self.is_connected = False
+
+    def _poll_loop(self):
+        # Same pacing as the child, to leave lengthened periods out of the jitter
+        pace = copy.deepcopy(self.pace)
+        while not self._stop_event.is_set():
+            self._wake_event.wait(0.5)
+            self._wake_event.clear()
+            ring = self._ring
+            if ring is None:
+                return
+            samples, self.cursor, lost = ring.read_since(self.cursor)
+            self.lost += lost
+            if lost:
+                self.stats.count('lost', lost)
+            now = time.time()
+            for data in samples:
+                if data.get('timestamp') is not None:
+                    self.jitter.observe(data['timestamp'])
+                    self.stats.record('age.delivered', (now - data['timestamp']) * 1e6)
+                if pace is not None and (pace(data) or 0) > self._interval.value:
+                    self.jitter.last = None
+                for listener in self.listeners:
+                    try:
+                        listener(data)
+                    except Exception as e:
+                        print(f"Error in sample listener: {e}")
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Register a callback for every new sample (runs on the polling thread)."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict], None]):
+        """Unregister a sample callback."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def get_latest_data(self) -> Dict:
+        """Get the newest sample from the shared ring."""
+        ring = self._ring
+        if ring is None:
+            return {}
+        return ring.latest() or {}
+
+    def get_stats(self) -> Dict:
+        """Get loop period/jitter, delivery age (ms) and lost-sample count."""
+        return self.stats.snapshot()
+
+    def is_vehicle_moving(self, threshold_kph: float = 1.0) -> bool:
+        """Check if vehicle is moving."""
+        speed = self.get_latest_data().get('speed_kph')
+        return speed is not None and speed > threshold_kph
+
+    def __repr__(self) -> str:
+        status = "connected" if self.is_connected else "disconnected"
+        return f"IsolatedReader(port={self.port}, status={status})"
+
+
+def create_reader(config):
+    """
+    Create the OBD-II reader selected by the 'obd' config section.
+
+    Args:
+        config: Config instance
+
+    Returns:
+        ReplayReader if obd.replay names a recording, IsolatedReader if
+        obd.isolated is set, else OBDReader (with burst capture attached
+        when burst.enabled is set)
+    """
+    if config.get('obd.replay'):
+        from phase1.replay import ReplayReader
+        return ReplayReader(config.get('obd.replay'), speed=config.get('obd.replay_speed', 1.0))
+
+    port = config.get('obd.port')
+    baudrate = config.get('obd.baudrate')
+    realtime = realtime_options(config)
+    if config.get('obd.isolated', False):
+        reader = IsolatedReader(port=port, baudrate=baudrate, realtime=realtime)
+    else:
+        from phase1.obd_reader import OBDReader
+        reader = OBDReader(port=port, baudrate=baudrate, realtime=realtime)
+    reader.burst = BurstCapture.from_config(config)
+    return reader
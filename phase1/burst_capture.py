@@ -0,0 +1,305 @@
+"""
+Event-triggered burst capture - Phase 1
+While cruising, every sample goes into a preallocated pre-event ring. When
+acceleration crosses a scoring threshold (or an early-warning fraction of
+it), the reader switches to speed-only polling as fast as the adapter
+answers for a few seconds, and the ring plus the burst are saved as one
+high-resolution event trace.
+"""
+
+import csv
+import math
+from array import array
+from datetime import datetime
+from pathlib import Path
+from queue import SimpleQueue
+from threading import Thread
+from typing import Any, Dict, List, Optional, Tuple
+
+# Columns kept in the pre-event ring (held values are repeated in burst rows)
+RING_FIELDS = ('timestamp', 'speed_kph', 'accel_calculated', 'rpm', 'throttle_pct')
+
+TRACE_FIELDS = ('timestamp', 'phase', 'speed_kph', 'accel_calculated', 'rpm', 'throttle_pct')
+
+NAN = float('nan')
+
+
+def _number(value: Any) -> float:
+    return NAN if value is None else float(value)
+
+
+def _cell(value: float) -> str:
+    return '' if math.isnan(value) else f"{value:.6g}"
+
+
+class BurstCapture:
+    """
+    Trigger, pre-event ring and burst buffer for one reader.
+
+    Used from the reading loop only (OBDReader.sample); finished traces are
+    written to CSV by a background thread. The ring and the burst buffer
+    are preallocated arrays, so the per-sample cost is a few stores.
+    Picklable for the acquisition process (the writer thread is created on
+    first use).
+    """
+
+    def __init__(self, output_dir: str, harsh_brake_threshold: float = -5.0,
+                 aggressive_accel_threshold: float = 3.0, precursor: float = 0.6,
+                 pre_seconds: float = 5.0, post_seconds: float = 3.0, max_seconds: float = 10.0,
+                 max_rate: float = 100.0, sample_rate: float = 10.0, accel_window: float = 0.2):
+        """
+        Initialize burst capture.
+
+        Args:
+            output_dir: Directory for event traces
+            harsh_brake_threshold: Scoring threshold for braking (m/s², negative)
+            aggressive_accel_threshold: Scoring threshold for acceleration (m/s²)
+            precursor: Fraction of the thresholds that already starts a burst
+            pre_seconds: Seconds of normal-rate samples kept before the trigger
+            post_seconds: Burst length after the last reading past the precursor level
+            max_seconds: Longest burst
+            max_rate: Highest burst rate expected (sizes the burst buffer)
+            sample_rate: Normal sampling rate in Hz (sizes the pre-event ring)
+            accel_window: Seconds of speed history used for acceleration during a burst
+        """
+        self.output_dir = Path(output_dir)
+        self.precursor = precursor
+        self.pre_seconds = pre_seconds
+        self.post_seconds = post_seconds
+        self.max_seconds = max_seconds
+        self.accel_window = accel_window
+        self.configure_thresholds(harsh_brake_threshold, aggressive_accel_threshold)
+
+        # Pre-event ring: one column per field, NaN for missing values
+        self.ring_size = max(2, int(math.ceil(pre_seconds * sample_rate)) + 1)
+        self.ring = {field: array('d', [NAN]) * self.ring_size for field in RING_FIELDS}
+        self.ring_count = 0
+
+        # Burst buffer: timestamp and speed of every speed-only reading
+        self.burst_size = max(2, int(math.ceil(max_seconds * max_rate)))
+        self.burst_time = array('d', [NAN]) * self.burst_size
+        self.burst_speed = array('d', [NAN]) * self.burst_size
+        self.burst_count = 0
+
+        self.active = False
+        self.reason = ''
+        self.started = 0.0
+        self.extend_until = 0.0
+        self._window_start = 0
+        self._held: Tuple[float, float] = (NAN, NAN)
+        self._pre: List[Tuple[float, ...]] = []
+
+        self.bursts = 0
+        self.truncated = 0
+        self._queue: Optional[SimpleQueue] = None
+        self._writer: Optional[Thread] = None
+
+    @classmethod
+    def from_config(cls, config) -> Optional['BurstCapture']:
+        """
+        Create burst capture from the 'burst' and 'scoring' config sections.
+
+        Args:
+            config: Config instance
+
+        Returns:
+            BurstCapture, or None when burst.enabled is false
+        """
+        if not config.get('burst.enabled', False):
+            return None
+        scoring = config.settings.scoring
+        return cls(str(Path(config.log_directory) / 'events'),
+                   harsh_brake_threshold=scoring.harsh_brake_threshold,
+                   aggressive_accel_threshold=scoring.aggressive_accel_threshold,
+                   precursor=config.get('burst.precursor', 0.6),
+                   pre_seconds=config.get('burst.pre_seconds', 5.0),
+                   post_seconds=config.get('burst.post_seconds', 3.0),
+                   max_seconds=config.get('burst.max_seconds', 10.0),
+                   max_rate=config.get('burst.max_rate', 100.0),
+                   accel_window=config.get('burst.accel_window', 0.2))
+
+    def configure_thresholds(self, harsh_brake_threshold: float, aggressive_accel_threshold: float):
+        """Set the event thresholds (and the precursor levels derived from them)."""
+        self.harsh_brake_threshold = harsh_brake_threshold
+        self.aggressive_accel_threshold = aggressive_accel_threshold
+        self.brake_trigger = harsh_brake_threshold * self.precursor
+        self.accel_trigger = aggressive_accel_threshold * self.precursor
+
+    def configure(self, settings):
+        """
+        Apply reloaded scoring thresholds.
+
+        Args:
+            settings: ScoringSettings
+        """
+        self.configure_thresholds(settings.harsh_brake_threshold,
+                                  settings.aggressive_accel_threshold)
+
+    def _classify(self, accel: float) -> str:
+        if accel < self.harsh_brake_threshold:
+            return 'harsh_brake'
+        if accel > self.aggressive_accel_threshold:
+            return 'aggressive_accel'
+        if accel < self.brake_trigger:
+            return 'brake_precursor'
+        if accel > self.accel_trigger:
+            return 'accel_precursor'
+        return ''
+
+    def observe(self, data: Dict[str, Any]) -> bool:
+        """
+        Store a normal-rate sample in the ring and check the trigger.
+
+        Args:
+            data: Full sample from OBDReader.read_all()
+
+        Returns:
+            True if this sample started a burst
+        """
+        slot = self.ring_count % self.ring_size
+        for field in RING_FIELDS:
+            self.ring[field][slot] = _number(data.get(field))
+        self.ring_count += 1
+        self._held = (_number(data.get('rpm')), _number(data.get('throttle_pct')))
+
+        accel = data.get('accel_calculated')
+        if self.active or accel is None:
+            return False
+        reason = self._classify(accel)
+        if not reason:
+            return False
+
+        now = self.ring['timestamp'][slot]
+        self.active = True
+        self.reason = reason
+        self.started = now
+        self.extend_until = now + self.post_seconds
+        self.burst_count = 0
+        self._window_start = 0
+        self._pre = self._ring_rows(now)
+        self.bursts += 1
+        return True
+
+    def _ring_rows(self, now: float) -> List[Tuple[float, ...]]:
+        rows = []
+        count = min(self.ring_count, self.ring_size)
+        for i in range(self.ring_count - count, self.ring_count):
+            slot = i % self.ring_size
+            timestamp = self.ring['timestamp'][slot]
+            if now - timestamp <= self.pre_seconds:
+                rows.append(tuple(self.ring[field][slot] for field in RING_FIELDS))
+        return rows
+
+    def record(self, timestamp: float, speed: Optional[float]) -> Optional[float]:
+        """
+        Add one speed-only reading taken during a burst.
+
+        The burst is extended while acceleration over accel_window stays
+        past the precursor level, and ends post_seconds after that (or at
+        max_seconds, or when the buffer is full); the trace is then queued
+        for writing.
+
+        Args:
+            timestamp: Reading time (epoch seconds)
+            speed: Speed in km/h, or None if the query failed
+
+        Returns:
+            Acceleration over accel_window in m/s², or None if not known yet
+        """
+        accel = None
+        if speed is not None:
+            i = self.burst_count
+            self.burst_time[i] = timestamp
+            self.burst_speed[i] = speed
+            self.burst_count += 1
+
+            # Oldest reading still at least accel_window back
+            while (self._window_start + 1 < i and
+                   timestamp - self.burst_time[self._window_start + 1] >= self.accel_window):
+                self._window_start += 1
+            j = self._window_start
+            dt = timestamp - self.burst_time[j]
+            if j < i and dt >= self.accel_window:
+                accel = (speed - self.burst_speed[j]) / 3.6 / dt
+                reason = self._classify(accel)
+                if reason:
+                    self.extend_until = timestamp + self.post_seconds
+                    if reason in ('harsh_brake', 'aggressive_accel'):
+                        self.reason = reason
+
+        if self.burst_count >= self.burst_size:
+            self.truncated += 1
+            self.finish()
+        elif timestamp >= self.extend_until or timestamp - self.started >= self.max_seconds:
+            self.finish()
+        return accel
+
+    def finish(self):
+        """End the current burst and queue its trace for writing."""
+        if not self.active:
+            return
+        self.active = False
+        burst = [(self.burst_time[i], self.burst_speed[i]) for i in range(self.burst_count)]
+        trace = (self.started, self.reason, self._pre, burst, self._held)
+        self._pre = []
+        if self._queue is None:
+            self._queue = SimpleQueue()
+            self._writer = Thread(target=self._write_loop, args=(self._queue,),
+                                  name='burst-writer', daemon=True)
+            self._writer.start()
+        self._queue.put(trace)
+
+    def close(self, timeout: float = 5.0):
+        """Save a burst in progress and wait for queued traces to be written."""
+        self.finish()
+        if self._writer is None:
+            return
+        self._queue.put(None)
+        self._writer.join(timeout)
+        self._queue = None
+        self._writer = None
+
+    def _write_loop(self, queue: SimpleQueue):
+        while True:
+            trace = queue.get()
+            if trace is None:
+                return
+            try:
+                self.write_trace(*trace)
+            except OSError as e:
+                print(f"❌ Cannot write event trace: {e}")
+
+    def write_trace(self, started: float, reason: str, pre: List[Tuple[float, ...]],
+                    burst: List[Tuple[float, float]], held: Tuple[float, float]) -> Path:
+        """
+        Write one event trace as CSV.
+
+        Burst rows repeat the last full sample's rpm and throttle, and
+        their acceleration is taken over accel_window.
+
+        Returns:
+            Path of the trace file
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = datetime.fromtimestamp(started).strftime('event_%Y%m%d_%H%M%S_%f')[:-3]
+        path = self.output_dir / f"{name}_{reason}.csv"
+
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(TRACE_FIELDS)
+            for timestamp, speed, accel, rpm, throttle in pre:
+                writer.writerow([f"{timestamp:.3f}", 'pre', _cell(speed), _cell(accel),
+                                 _cell(rpm), _cell(throttle)])
+            j = 0
+            for i, (timestamp, speed) in enumerate(burst):
+                while j + 1 < i and timestamp - burst[j + 1][0] >= self.accel_window:
+                    j += 1
+                dt = timestamp - burst[j][0]
+                accel = (speed - burst[j][1]) / 3.6 / dt if j < i and dt >= self.accel_window else NAN
+                writer.writerow([f"{timestamp:.3f}", 'burst', _cell(speed), _cell(accel),
+                                 _cell(held[0]), _cell(held[1])])
+
+        rate = (len(burst) - 1) / (burst[-1][0] - burst[0][0]) if len(burst) > 1 else 0.0
+        print(f"✅ Event trace: {path.name} ({len(pre)} pre-event, {len(burst)} burst samples "
+              f"at {rate:.0f} Hz)")
+        return path
@@ -0,0 +1,348 @@
+"""
+ELM327 protocol - Phase 1
+Sans-I/O implementation of the ELM327 command/response protocol: it turns
+queries into bytes and bytes into decoded values, and never touches a port
+itself. Used by the multi-adapter gateway, the asyncio client and the pty
+adapter emulator.
+"""
+
+import time
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+
+# Adapter set-up: reset, echo/linefeeds/spaces/headers off, automatic protocol
+INIT_COMMANDS = ('ATZ', 'ATE0', 'ATL0', 'ATS0', 'ATH0', 'ATSP0')
+
+# The adapter prints this when it is ready for the next command
+PROMPT = b'>'
+
+
+class PID(NamedTuple):
+    """Mode 01 parameter: response byte count and decoder."""
+    code: str
+    nbytes: int
+    decode: Callable[[bytes], float]
+    encode: Callable[[float], bytes]
+
+
+# Sample fields as produced by OBDReader.read_all()
+PIDS: Dict[str, PID] = {
+    'speed_kph': PID('0D', 1, lambda b: float(b[0]),
+                     lambda v: bytes([max(0, min(255, round(v)))])),
+    'rpm': PID('0C', 2, lambda b: (b[0] * 256 + b[1]) / 4,
+               lambda v: max(0, min(65535, round(v * 4))).to_bytes(2, 'big')),
+    'throttle_pct': PID('11', 1, lambda b: b[0] * 100 / 255,
+                        lambda v: bytes([max(0, min(255, round(v * 255 / 100)))])),
+    'engine_load': PID('04', 1, lambda b: b[0] * 100 / 255,
+                       lambda v: bytes([max(0, min(255, round(v * 255 / 100)))])),
+}
+
+
+def parse_response(pid: PID, lines: List[str]) -> Optional[float]:
+    """
+    Decode the response lines of a mode 01 query.
+
+    Args:
+        pid: Queried parameter
+        lines: Response lines (without the prompt)
+
+    Returns:
+        Decoded value, or None for NO DATA / errors / malformed responses
+    """
+    prefix = '41' + pid.code
+    for line in lines:
+        hexdigits = line.replace(' ', '').upper()
+        if not hexdigits.startswith(prefix):
+            continue
+        payload = hexdigits[len(prefix):len(prefix) + 2 * pid.nbytes]
+        try:
+            raw = bytes.fromhex(payload)
+        except ValueError:
+            return None
+        if len(raw) == pid.nbytes:
+            return pid.decode(raw)
+    return None
+
+
+class ELM327Session:
+    """
+    State machine for one adapter.
+
+    The caller writes data_to_send() to the port, feeds everything it reads
+    to receive_data(), and calls request_sample() when the next sample is
+    due. A sample is complete once every PID has been answered.
+
+    States: 'init' (running INIT_COMMANDS), 'idle', 'busy' (sample cycle).
+    """
+
+    def __init__(self, fields: Optional[List[str]] = None):
+        """
+        Initialize session.
+
+        Args:
+            fields: Sample fields to query (keys of PIDS, default all)
+        """
+        self.fields = list(fields or PIDS)
+        self.state = 'init'
+        self.pending: Optional[str] = None
+        self.sent_at: Optional[float] = None
+        self.adapter_version: Optional[str] = None
+
+        self.timeouts = 0
+        self.errors = 0
+
+        self._outgoing = bytearray()
+        self._incoming = bytearray()
+        self._init_queue = list(INIT_COMMANDS)
+        self._field_queue: List[str] = []
+        self._values: Dict[str, Optional[float]] = {}
+        self._send(self._init_queue.pop(0))
+
+    @property
+    def ready(self) -> bool:
+        """True once initialized and no sample cycle is running."""
+        return self.state == 'idle'
+
+    def _send(self, command: str):
+        self.pending = command
+        self.sent_at = time.monotonic()
+        self._outgoing += command.encode('ascii') + b'\r'
+
+    def data_to_send(self) -> bytes:
+        """Take the bytes waiting to be written to the adapter."""
+        data = bytes(self._outgoing)
+        self._outgoing.clear()
+        return data
+
+    def request_sample(self) -> bool:
+        """
+        Start a sample cycle over all configured fields.
+
+        Returns:
+            False if the session is still initializing or busy
+        """
+        return self.request(self.fields)
+
+    def request(self, fields: List[str]) -> bool:
+        """
+        Start a cycle querying the given fields.
+
+        Args:
+            fields: Keys of PIDS, queried in order
+
+        Returns:
+            False if the session is still initializing or busy
+        """
+        if self.state != 'idle' or not fields:
+            return False
+        self.state = 'busy'
+        self._values = {}
+        self._field_queue = list(fields)
+        self._send('01' + PIDS[self._field_queue[0]].code)
+        return True
+
+    def receive_data(self, data: bytes) -> Optional[Dict[str, Optional[float]]]:
+        """
+        Consume bytes read from the adapter.
+
+        Args:
+            data: Raw bytes
+
+        Returns:
+            Values of the completed sample, or None if no sample completed
+        """
+        self._incoming += data
+        sample = None
+        while True:
+            end = self._incoming.find(PROMPT)
+            if end < 0:
+                return sample
+            text = self._incoming[:end].decode('ascii', errors='replace')
+            del self._incoming[:end + 1]
+            result = self._handle_response(text)
+            if result is not None:
+                sample = result
+
+    def _handle_response(self, text: str) -> Optional[Dict[str, Optional[float]]]:
+        lines = [line.strip() for line in text.replace('\n', '\r').split('\r')]
+        lines = [line for line in lines
+                 if line and line != self.pending and not line.startswith('SEARCHING')]
+        command, self.pending = self.pending, None
+
+        if self.state == 'init':
+            if command == 'ATZ' and lines:
+                self.adapter_version = lines[-1]
+            if self._init_queue:
+                self._send(self._init_queue.pop(0))
+            else:
+                self.state = 'idle'
+            return None
+
+        if self.state != 'busy' or command is None:
+            # Stray prompt (e.g. the late answer of a timed-out query)
+            return None
+
+        field = self._field_queue[0]
+        value = parse_response(PIDS[field], lines)
+        if value is None and any(line.replace(' ', '').startswith('41') for line in lines):
+            # Answer to another PID: a late reply to a timed-out query
+            self.pending = command
+            return None
+
+        self._field_queue.pop(0)
+        if value is None and lines and lines[0] not in ('NO DATA', 'STOPPED'):
+            self.errors += 1
+        self._values[field] = value
+        return self._advance()
+
+    def _advance(self) -> Optional[Dict[str, Optional[float]]]:
+        if self._field_queue:
+            self._send('01' + PIDS[self._field_queue[0]].code)
+            return None
+        self.state = 'idle'
+        return self._values
+
+    def check_timeout(self, timeout: float, now: Optional[float] = None) -> Optional[Dict]:
+        """
+        Give up on an unanswered command.
+
+        Args:
+            timeout: Seconds to wait for the prompt
+            now: Current time.monotonic() (default: now)
+
+        Returns:
+            Partial sample if giving up completed a sample cycle, else None
+        """
+        if self.pending is None or self.sent_at is None:
+            return None
+        now = time.monotonic() if now is None else now
+        if now - self.sent_at < timeout:
+            return None
+
+        self.timeouts += 1
+        self._incoming.clear()
+        if self.state == 'init':
+            # Retry the whole set-up; the adapter may have been resetting
+            self._init_queue = list(INIT_COMMANDS[1:])
+            self._send(INIT_COMMANDS[0])
+            return None
+
+        self.pending = None
+        self._values[self._field_queue.pop(0)] = None
+        return self._advance()
+
+    def deadline(self, timeout: float) -> Optional[float]:
+        """Time (monotonic) at which the pending command times out, if any."""
+        if self.pending is None or self.sent_at is None:
+            return None
+        return self.sent_at + timeout
+
+
+class ELM327Responder:
+    """
+    Adapter side of the protocol, for emulators.
+
+    Feed it bytes written by the client; it returns the adapter's reply,
+    with values taken from a sample function such as
+    SyntheticReader.sample(). Enough of the AT set (headers, voltage,
+    protocol number, supported PIDs) is answered for python-obd to connect,
+    presenting an 11-bit CAN vehicle. An empty line repeats the last
+    command, as python-obd's fast mode expects.
+    """
+
+    def __init__(self, sample: Callable[[float], Dict], version: str = 'ELM327 v1.5'):
+        """
+        Initialize responder.
+
+        Args:
+            sample: Function mapping seconds since start to a sample dict
+            version: Identification string returned by ATZ/ATI
+        """
+        self.sample = sample
+        self.version = version
+        self.start = time.monotonic()
+        self.echo = True
+        self.spaces = True
+        self.headers = False
+        self._buffer = bytearray()
+        self._last = ''
+        self._by_code = {pid.code: (field, pid) for field, pid in PIDS.items()}
+
+    def receive_data(self, data: bytes) -> List[Tuple[str, bytes]]:
+        """
+        Consume client bytes.
+
+        Args:
+            data: Raw bytes written by the client
+
+        Returns:
+            (command, reply bytes) for every complete command
+        """
+        self._buffer += data
+        replies = []
+        while True:
+            end = self._buffer.find(b'\r')
+            if end < 0:
+                return replies
+            command = self._buffer[:end].decode('ascii', errors='replace').strip().upper()
+            del self._buffer[:end + 1]
+            if command:
+                self._last = command
+            else:
+                command = self._last
+            replies.append((command, self.reply(command)))
+
+    def reply(self, command: str) -> bytes:
+        """
+        Build the reply to one command, including the trailing prompt.
+
+        Args:
+            command: Command without the carriage return
+
+        Returns:
+            Reply bytes
+        """
+        lines = [command] if self.echo else []
+        compact = command.replace(' ', '')
+        if compact in ('ATZ', 'ATI'):
+            if compact == 'ATZ':
+                self.echo = self.spaces = True
+                self.headers = False
+            lines.append(self.version)
+        elif compact == 'ATRV':
+            lines.append('12.6V')
+        elif compact == 'ATDPN':
+            lines.append('A6')  # automatic, ISO 15765-4 CAN 11-bit 500 kbaud
+        elif compact.startswith('AT'):
+            if compact in ('ATE0', 'ATE1'):
+                self.echo = compact == 'ATE1'
+            elif compact in ('ATS0', 'ATS1'):
+                self.spaces = compact == 'ATS1'
+            elif compact in ('ATH0', 'ATH1'):
+                self.headers = compact == 'ATH1'
+            lines.append('OK')
+        elif compact == '0100':
+            # Bit (32 - n) of the 4-byte mask marks PID n as supported
+            mask = 0
+            for code in self._by_code:
+                mask |= 1 << (32 - int(code, 16))
+            lines.append(self._frame(bytes([0x41, 0x00]) + mask.to_bytes(4, 'big')))
+        elif compact.startswith('01') and compact[2:4] in self._by_code:
+            field, pid = self._by_code[compact[2:4]]
+            value = self.sample(time.monotonic() - self.start).get(field)
+            if value is None:
+                lines.append('NO DATA')
+            else:
+                lines.append(self._frame(bytes([0x41, int(pid.code, 16)]) + pid.encode(value)))
+        elif compact.startswith('01'):
+            lines.append('NO DATA')
+        else:
+            lines.append('?')
+        return ('\r'.join(lines) + '\r\r').encode('ascii') + PROMPT
+
+    def _frame(self, payload: bytes) -> str:
+        """Format a response from the engine ECU (CAN ID and length if headers are on)."""
+        parts = [f'{b:02X}' for b in payload]
+        if self.headers:
+            parts = ['7E8', f'{len(payload):02X}'] + parts
+        return (' ' if self.spaces else '').join(parts)
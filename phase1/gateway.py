@@ -0,0 +1,544 @@
+#!/usr/bin/env python3
+"""
+Multi-adapter OBD-II gateway - Phase 1
+Polls many ELM327 adapters from a single thread with non-blocking serial
+I/O and a selector, instead of one blocking OBDReader thread per adapter.
+Each vehicle has its own scorer and trip logger.
+"""
+
+import argparse
+import heapq
+import os
+import selectors
+import signal
+import sys
+import time
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Dict, List, Optional
+
+import serial
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.bus import DataBus, Topic
+from common.config import Config
+from common.logger import TripLogger
+from common.scoring import DriverScorer, calculate_acceleration
+from common.stats import JitterMeter
+from common.telemetry import TelemetryServer
+from phase1.elm327 import ELM327Session
+
+
+# Samples of all vehicles; each carries its vehicle name in 'vehicle'
+VEHICLE_SAMPLES = Topic('gateway.sample', dict)
+
+
+class VehicleChannel:
+    """One adapter: serial port, protocol session, scorer and logger."""
+
+    def __init__(self, name: str, port: str, baudrate: int, interval: float,
+                 scorer: DriverScorer, logger: Optional[TripLogger]):
+        """
+        Initialize channel.
+
+        Args:
+            name: Vehicle name (used in samples and trip file names)
+            port: Serial port of the adapter
+            baudrate: Serial baudrate
+            interval: Sample interval in seconds
+            scorer: Scorer for this vehicle
+            logger: Trip logger for this vehicle (None disables logging)
+        """
+        self.name = name
+        self.port = port
+        self.baudrate = baudrate
+        self.scorer = scorer
+        self.logger = logger
+        self.serial = None
+        self.session = ELM327Session()
+        self.outgoing = bytearray()
+        self.error: Optional[str] = None
+
+        # Scheduling (gateway thread only)
+        self.next_due = 0.0
+        self.timer_at: Optional[float] = None
+        self.jitter = JitterMeter(interval)
+
+        self.speed_history = deque(maxlen=10)
+        self.latest_data: Dict[str, Any] = {}
+        self.samples = 0
+
+        # Trip state (worker thread, guarded by lock)
+        self.lock = Lock()
+        self.trip_active = False
+        self.last_score: Optional[float] = None
+        self.last_event: Optional[str] = None
+
+    @property
+    def fd(self) -> int:
+        return self.serial.fileno()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get counters for this vehicle."""
+        jitter = self.jitter.summary()
+        return {
+            'vehicle': self.name,
+            'port': self.port,
+            'state': 'error' if self.error else self.session.state,
+            'error': self.error,
+            'samples': self.samples,
+            'timeouts': self.session.timeouts,
+            'errors': self.session.errors,
+            'jitter_ms_p99': jitter['p99'],
+            'score': self.last_score,
+            'trip_active': self.trip_active,
+        }
+
+
+class OBDGateway:
+    """
+    Single-threaded driver for many ELM327 adapters.
+
+    The I/O thread only moves bytes and assembles samples. Completed samples
+    are published on VEHICLE_SAMPLES; one worker thread scores and logs
+    them per vehicle, so thread count does not grow with the number of
+    adapters.
+    """
+
+    def __init__(self, update_rate: float = 0.1, timeout: float = 1.0,
+                 queue_size: int = 10000):
+        """
+        Initialize gateway.
+
+        Args:
+            update_rate: Sample interval per vehicle in seconds
+            timeout: Seconds to wait for an adapter response
+            queue_size: Samples buffered for the scoring/logging worker
+        """
+        self.update_rate = update_rate
+        self.timeout = timeout
+        self.channels: Dict[str, VehicleChannel] = {}
+
+        self.bus = DataBus()
+        self.worker = self.bus.subscribe(VEHICLE_SAMPLES, self._process, maxsize=queue_size,
+                                         name='gateway-worker')
+
+        self.selector = None
+        self.thread = None
+        self.stop_event = Event()
+        self._timers: List = []
+        self._timer_seq = 0
+        self._wake_r = self._wake_w = None
+
+    @classmethod
+    def from_config(cls, config, vehicles: Optional[List[Dict]] = None) -> 'OBDGateway':
+        """
+        Create a gateway from the 'gateway' config section.
+
+        Args:
+            config: Config instance
+            vehicles: Vehicle entries ({name, port[, baudrate]}) overriding
+                gateway.vehicles
+
+        Returns:
+            OBDGateway with one channel per configured vehicle
+        """
+        gateway = cls(update_rate=1.0 / config.get('gateway.update_rate', 10),
+                      timeout=config.get('gateway.timeout', 1.0))
+        if vehicles is None:
+            vehicles = config.get('gateway.vehicles') or []
+        for vehicle in vehicles:
+            name = vehicle['name']
+            logger = None
+            if config.get('logging.enabled', True):
+                log_dir = Path(config.log_directory) / name
+                logger = TripLogger.from_config(config, phase=1, log_dir=str(log_dir))
+            gateway.add_vehicle(name, vehicle['port'],
+                                baudrate=vehicle.get('baudrate', config.get('obd.baudrate', 38400)),
+                                scorer=DriverScorer(config=config.settings.scoring._asdict()),
+                                logger=logger)
+        return gateway
+
+    def configure(self, settings):
+        """
+        Apply reloaded scoring thresholds to every vehicle (any thread).
+
+        Args:
+            settings: Settings from Config.settings
+        """
+        for channel in self.channels.values():
+            channel.scorer.configure(settings.scoring)
+
+    def add_vehicle(self, name: str, port: str, baudrate: int = 38400,
+                    scorer: Optional[DriverScorer] = None,
+                    logger: Optional[TripLogger] = None) -> VehicleChannel:
+        """
+        Add an adapter (before start()).
+
+        Args:
+            name: Unique vehicle name
+            port: Serial port of the adapter
+            baudrate: Serial baudrate
+            scorer: Driver scorer (default: new DriverScorer)
+            logger: Trip logger (None disables logging)
+
+        Returns:
+            The new channel
+        """
+        if self.thread is not None:
+            raise RuntimeError("Add vehicles before starting the gateway")
+        if name in self.channels:
+            raise ValueError(f"Duplicate vehicle name: {name}")
+        channel = VehicleChannel(name, port, baudrate, self.update_rate,
+                                 scorer or DriverScorer(), logger)
+        self.channels[name] = channel
+        return channel
+
+    def start(self) -> int:
+        """
+        Open all ports and start the I/O thread.
+
+        Returns:
+            Number of ports opened
+        """
+        self.selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = os.pipe()
+        os.set_blocking(self._wake_r, False)
+        os.set_blocking(self._wake_w, False)
+        self.selector.register(self._wake_r, selectors.EVENT_READ, None)
+
+        opened = 0
+        for channel in self.channels.values():
+            try:
+                # timeout=0: non-blocking reads; we only touch the fd when it is ready
+                channel.serial = serial.Serial(channel.port, channel.baudrate,
+                                               timeout=0, write_timeout=0)
+            except (serial.SerialException, OSError) as e:
+                channel.error = str(e)
+                print(f"❌ {channel.name}: cannot open {channel.port}: {e}")
+                continue
+            os.set_blocking(channel.fd, False)
+            self.selector.register(channel.fd, selectors.EVENT_READ, channel)
+            channel.outgoing += channel.session.data_to_send()
+            self._service(channel, time.monotonic())
+            opened += 1
+
+        self.stop_event.clear()
+        self.thread = Thread(target=self._run, name='obd-gateway', daemon=True)
+        self.thread.start()
+        print(f"Started OBD-II gateway: {opened}/{len(self.channels)} adapters "
+              f"at {1 / self.update_rate:.1f} Hz")
+        return opened
+
+    def wait_ready(self, timeout: float = 10.0) -> int:
+        """
+        Wait until every opened adapter finished initializing.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Number of adapters ready for sampling
+        """
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if all(c.error or c.session.state != 'init' for c in self.channels.values()):
+                break
+            time.sleep(0.05)
+        return sum(1 for c in self.channels.values()
+                   if not c.error and c.session.state != 'init')
+
+    def stop(self):
+        """Stop the I/O thread, close the ports and the worker."""
+        self.stop_event.set()
+        self._wake()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        for channel in self.channels.values():
+            if channel.serial is not None:
+                channel.serial.close()
+                channel.serial = None
+        if self.selector:
+            self.selector.close()
+            self.selector = None
+        for fd in (self._wake_r, self._wake_w):
+            if fd is not None:
+                os.close(fd)
+        self._wake_r = self._wake_w = None
+        self.bus.close()
+
+    def _wake(self):
+        if self._wake_w is not None:
+            try:
+                os.write(self._wake_w, b'x')
+            except BlockingIOError:
+                pass
+
+    # I/O thread
+
+    def _run(self):
+        while not self.stop_event.is_set():
+            now = time.monotonic()
+            delay = self._timers[0][0] - now if self._timers else 1.0
+            for key, mask in self.selector.select(max(0.0, min(delay, 1.0))):
+                channel = key.data
+                if channel is None:
+                    try:
+                        os.read(self._wake_r, 4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                if mask & selectors.EVENT_READ:
+                    self._read(channel)
+                if mask & selectors.EVENT_WRITE:
+                    self._flush(channel)
+
+            now = time.monotonic()
+            while self._timers and self._timers[0][0] <= now:
+                _, _, channel = heapq.heappop(self._timers)
+                channel.timer_at = None
+                values = channel.session.check_timeout(self.timeout, now)
+                if values is not None:
+                    self._complete(channel, values)
+                self._service(channel, now)
+
+    def _read(self, channel: VehicleChannel):
+        try:
+            data = os.read(channel.fd, 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._fail(channel, e)
+            return
+        if not data:
+            # End of file: the adapter went away (e.g. USB unplugged). The fd
+            # stays readable, so it must leave the selector or the loop spins.
+            self._fail(channel, ConnectionError(f"{channel.port} closed the connection"))
+            return
+        values = channel.session.receive_data(data)
+        if values is not None:
+            self._complete(channel, values)
+        self._service(channel, time.monotonic())
+
+    def _flush(self, channel: VehicleChannel):
+        if channel.serial is None:
+            return
+        channel.outgoing += channel.session.data_to_send()
+        if channel.outgoing:
+            try:
+                written = os.write(channel.fd, channel.outgoing)
+                del channel.outgoing[:written]
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                self._fail(channel, e)
+                return
+        events = selectors.EVENT_READ | (selectors.EVENT_WRITE if channel.outgoing else 0)
+        if self.selector.get_key(channel.fd).events != events:
+            self.selector.modify(channel.fd, events, channel)
+
+    def _fail(self, channel: VehicleChannel, error: Exception):
+        print(f"❌ {channel.name}: {error}")
+        self.selector.unregister(channel.fd)
+        channel.serial.close()
+        channel.serial = None
+        # Set last: other threads take a set error to mean the port is gone
+        channel.error = str(error)
+
+    def _schedule(self, channel: VehicleChannel, when: float):
+        # One pending timer per channel is enough; an earlier one re-services it
+        if channel.timer_at is not None and channel.timer_at <= when:
+            return
+        channel.timer_at = when
+        self._timer_seq += 1
+        heapq.heappush(self._timers, (when, self._timer_seq, channel))
+
+    def _service(self, channel: VehicleChannel, now: float):
+        """Start the next sample if due, arm timers and write pending bytes."""
+        if channel.serial is None:
+            return
+        session = channel.session
+        if session.ready:
+            if channel.next_due == 0.0:
+                channel.next_due = now
+            if now >= channel.next_due:
+                channel.jitter.observe(now)
+                session.request_sample()
+                # Deadline schedule like sample_loop(); restart after an overrun
+                channel.next_due += self.update_rate
+                if channel.next_due < now:
+                    channel.next_due = now
+            else:
+                self._schedule(channel, channel.next_due)
+        deadline = session.deadline(self.timeout)
+        if deadline is not None:
+            self._schedule(channel, deadline)
+        self._flush(channel)
+
+    def _complete(self, channel: VehicleChannel, values: Dict[str, Optional[float]]):
+        data = {'timestamp': time.time(), 'vehicle': channel.name}
+        data.update(values)
+        if data.get('speed_kph') is not None:
+            channel.speed_history.append((data['timestamp'], data['speed_kph']))
+            data['accel_calculated'] = calculate_acceleration(channel.speed_history)
+        else:
+            data['accel_calculated'] = None
+        channel.latest_data = data
+        channel.samples += 1
+        self.bus.publish(VEHICLE_SAMPLES, data)
+
+    # Worker thread
+
+    def _process(self, data: Dict[str, Any]):
+        channel = self.channels.get(data['vehicle'])
+        if channel is None:
+            return
+        with channel.lock:
+            if not channel.trip_active:
+                return
+            score, event_type = channel.scorer.update(
+                speed_kph=data.get('speed_kph') or 0,
+                accel=data.get('accel_calculated') or 0
+            )
+            channel.last_score = score
+            channel.last_event = event_type
+            if channel.logger is not None:
+                channel.logger.log_data({**data, 'score': score, 'event_type': event_type or ''})
+
+    # Trips
+
+    def _select(self, vehicles: Optional[List[str]]) -> List[VehicleChannel]:
+        if vehicles is None:
+            return [c for c in self.channels.values() if not c.error]
+        return [self.channels[name] for name in vehicles]
+
+    def start_trip(self, vehicles: Optional[List[str]] = None) -> Dict[str, Optional[str]]:
+        """
+        Start a trip for some or all vehicles.
+
+        Args:
+            vehicles: Vehicle names (default: every working adapter)
+
+        Returns:
+            Dictionary of vehicle name to trip log path (None if not logging)
+        """
+        stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        paths = {}
+        for channel in self._select(vehicles):
+            with channel.lock:
+                path = None
+                if channel.logger is not None:
+                    path = channel.logger.start_trip(f"{channel.name}_trip_{stamp}")
+                channel.scorer.reset()
+                channel.last_score = None
+                channel.last_event = None
+                channel.trip_active = True
+            paths[channel.name] = path
+        return paths
+
+    def end_trip(self, vehicles: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        End trips once every sample received so far is scored and logged.
+
+        Args:
+            vehicles: Vehicle names (default: all vehicles with an active trip)
+
+        Returns:
+            Dictionary of vehicle name to trip summary (logger stats plus score)
+        """
+        self.worker.drain()
+        summaries = {}
+        for channel in self._select(vehicles):
+            with channel.lock:
+                if not channel.trip_active:
+                    continue
+                channel.trip_active = False
+                summary = channel.logger.end_trip() if channel.logger is not None else {}
+                summary['scoring'] = dict(channel.scorer.get_summary(),
+                                          grade=channel.scorer.get_grade())
+            summaries[channel.name] = summary
+        return summaries
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Get per-vehicle counters."""
+        return [channel.get_stats() for channel in self.channels.values()]
+
+    def print_status(self):
+        """Print one status line per vehicle."""
+        for s in self.get_stats():
+            score = f"{s['score']:5.1f}" if s['score'] is not None else "  -  "
+            jitter = f"{s['jitter_ms_p99']:6.2f}" if s['jitter_ms_p99'] is not None else "   -  "
+            print(f"  {s['vehicle']:12s} {s['state']:6s} samples {s['samples']:6d}  "
+                  f"timeouts {s['timeouts']:3d}  jitter p99 {jitter} ms  score {score}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Poll several OBD-II adapters from one thread")
+    parser.add_argument('--vehicle', action='append', metavar='NAME=PORT',
+                        help="Adapter to poll (repeatable; default: gateway.vehicles in config)")
+    parser.add_argument('--interval', type=float, default=5.0,
+                        help="Seconds between status lines")
+    args = parser.parse_args()
+
+    config = Config(phase=1)
+    vehicles = None
+    if args.vehicle:
+        vehicles = []
+        for spec in args.vehicle:
+            name, _, port = spec.partition('=')
+            vehicles.append({'name': name, 'port': port})
+
+    gateway = OBDGateway.from_config(config, vehicles)
+    if not gateway.channels:
+        print("❌ No vehicles configured (gateway.vehicles or --vehicle NAME=PORT)")
+        return 1
+
+    running = Event()
+    running.set()
+    signal.signal(signal.SIGINT, lambda sig, frame: running.clear())
+    signal.signal(signal.SIGTERM, lambda sig, frame: running.clear())
+
+    if not gateway.start():
+        gateway.stop()
+        return 1
+    ready = gateway.wait_ready(timeout=config.get('obd.timeout', 10))
+    print(f"✅ {ready}/{len(gateway.channels)} adapters ready")
+
+    telemetry = TelemetryServer.from_config(config, gateway.bus, topic=VEHICLE_SAMPLES)
+    if telemetry:
+        telemetry.start()
+
+    # Hot reload of scoring thresholds
+    config.on_reload(gateway.configure)
+    config.watch(config.get('system.reload_interval', 1.0))
+
+    gateway.start_trip()
+    try:
+        while running.is_set():
+            time.sleep(args.interval)
+            print(f"[{datetime.now().strftime('%H:%M:%S')}]")
+            gateway.print_status()
+    finally:
+        config.stop_watching()
+        summaries = gateway.end_trip()
+        if telemetry:
+            telemetry.stop()
+        gateway.stop()
+
+    print("\n" + "=" * 60)
+    print("GATEWAY SUMMARY")
+    print("=" * 60)
+    for name, summary in summaries.items():
+        scoring = summary['scoring']
+        print(f"{name:12s} score {scoring['current_score']:5.1f} ({scoring['grade']})  "
+              f"rows {summary.get('data_points', 0)}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
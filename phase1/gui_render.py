@@ -0,0 +1,253 @@
+"""
+Retained-mode rendering helpers for the pygame GUI - Phase 1.
+Caches rendered text and repaints only the screen regions that changed.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, Hashable, List, Optional, Tuple
+
+import pygame
+
+
+# Sentinel for slots that have never been drawn
+_MISSING = object()
+
+
+class GlyphCache:
+    """LRU cache of rendered text surfaces keyed by (font, text, color)."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize glyph cache.
+
+        Args:
+            maxsize: Maximum number of cached surfaces
+        """
+        self.maxsize = maxsize
+        self._cache: 'OrderedDict[tuple, pygame.Surface]' = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font: pygame.font.Font, text: str,
+               color: Tuple[int, int, int]) -> pygame.Surface:
+        """
+        Get the rendered surface for a string.
+
+        Args:
+            font: Font to render with
+            text: Text to render
+            color: RGB color
+
+        Returns:
+            Antialiased text surface (shared, do not modify)
+        """
+        key = (font, text, color)
+        surface = self._cache.get(key)
+        if surface is not None:
+            self._cache.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        self._cache[key] = surface
+        if len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces."""
+        self._cache.clear()
+
+
+class RetainedRenderer:
+    """
+    Dirty-rectangle renderer over a pre-rendered static layer.
+
+    Static content is painted once into a background surface. Dynamic
+    content is drawn through named slots; a slot is repainted only when
+    its key (e.g. the formatted value and color) changes, and only the
+    affected rectangles are pushed to the display.
+    """
+
+    def __init__(self, screen: pygame.Surface):
+        """
+        Initialize renderer.
+
+        Args:
+            screen: Display surface
+        """
+        self.screen = screen
+        self.static = pygame.Surface(screen.get_size()).convert()
+        self._keys: Dict[str, Hashable] = {}
+        self._rects: Dict[str, pygame.Rect] = {}
+        self._dirty: List[pygame.Rect] = []
+        self._full = True
+
+    def build_static(self, paint: Callable[[pygame.Surface], None]):
+        """
+        (Re)build the static layer.
+
+        Args:
+            paint: Callback drawing all static content onto the given surface
+        """
+        paint(self.static)
+        self.invalidate()
+
+    def invalidate(self):
+        """Force a full repaint on the next present() (e.g. after an expose)."""
+        self._keys.clear()
+        self._rects.clear()
+        self._full = True
+
+    def slot(self, name: str, key: Hashable,
+             paint: Callable[[pygame.Surface], Optional[pygame.Rect]]) -> bool:
+        """
+        Draw a dynamic element if its content changed.
+
+        Args:
+            name: Slot name
+            key: Value describing the content; unchanged keys skip drawing
+            paint: Callback drawing onto the screen and returning the
+                rectangle it covered
+
+        Returns:
+            True if the slot was repainted
+        """
+        if not self._full and self._keys.get(name, _MISSING) == key:
+            return False
+
+        # Erase what the slot drew last time
+        old = self._rects.get(name)
+        if old is not None and not self._full:
+            self.screen.blit(self.static, old, old)
+
+        rect = paint(self.screen)
+        rect = pygame.Rect(rect) if rect is not None else None
+
+        self._keys[name] = key
+        if rect is not None:
+            self._rects[name] = rect
+        else:
+            self._rects.pop(name, None)
+
+        if not self._full:
+            if old is not None and rect is not None:
+                self._dirty.append(old.union(rect))
+            elif old is not None or rect is not None:
+                self._dirty.append(old or rect)
+        return True
+
+    def begin_frame(self):
+        """Start a frame (restores the whole static layer if invalidated)."""
+        if self._full:
+            self.screen.blit(self.static, (0, 0))
+
+    def present(self) -> int:
+        """
+        Push changed regions to the display.
+
+        Returns:
+            Number of rectangles updated (-1 for a full flip)
+        """
+        if self._full:
+            pygame.display.flip()
+            self._full = False
+            self._dirty.clear()
+            return -1
+
+        count = len(self._dirty)
+        if count:
+            pygame.display.update(self._dirty)
+            self._dirty = []
+        return count
+
+
+class SparklineView:
+    """
+    Scrolling sparkline kept in its own surface.
+
+    Each update scrolls the existing pixels left by the number of completed
+    columns and draws only the newest ones; history is never replotted
+    except after rebuild(), which update() also runs when the history's
+    window was resized.
+    """
+
+    def __init__(self, history, rect: pygame.Rect, color: Tuple[int, int, int],
+                 background: Tuple[int, int, int] = (0, 0, 0),
+                 baseline: Optional[float] = None,
+                 baseline_color: Tuple[int, int, int] = (60, 60, 60)):
+        """
+        Initialize sparkline view.
+
+        Args:
+            history: SparklineHistory with one column per pixel of rect.width
+            rect: Screen area of the chart
+            color: Line color
+            background: Background color
+            baseline: Value marked with a horizontal line (e.g. 0 for accel)
+            baseline_color: Color of the baseline
+        """
+        self.history = history
+        self.rect = pygame.Rect(rect)
+        self.color = color
+        self.background = background
+        self.baseline_y = None if baseline is None else history.scale(baseline, self.rect.height)
+        self.baseline_color = baseline_color
+        self.surface = pygame.Surface(self.rect.size).convert()
+        self.version = 0
+        self.generation = None
+        self.rebuild()
+
+    def _clear(self, x: int, width: int):
+        self.surface.fill(self.background, (x, 0, width, self.rect.height))
+        if self.baseline_y is not None:
+            self.surface.fill(self.baseline_color, (x, self.baseline_y, width, 1))
+
+    def _draw_column(self, x: int, span):
+        self._clear(x, 1)
+        if span is not None:
+            top = self.history.scale(span[1], self.rect.height)
+            bottom = self.history.scale(span[0], self.rect.height)
+            self.surface.fill(self.color, (x, top, 1, bottom - top + 1))
+
+    def rebuild(self):
+        """Redraw the whole chart from the ring buffer."""
+        self.generation = self.history.generation
+        last, columns = self.history.snapshot()
+        self._clear(0, self.rect.width)
+        for col, span in columns:
+            self._draw_column(self.rect.width - 1 - (last - col), span)
+        self.version += 1
+
+    def update(self) -> bool:
+        """
+        Draw samples received since the last update.
+
+        Returns:
+            True if the chart changed
+        """
+        if self.generation != self.history.generation:
+            self.rebuild()
+            return True
+
+        shift, last, columns = self.history.take_updates()
+        if not columns:
+            return False
+
+        width = self.rect.width
+        if shift >= width:
+            self._clear(0, width)
+        elif shift:
+            self.surface.scroll(-shift, 0)
+            self._clear(width - shift, shift)
+
+        for col, span in columns:
+            self._draw_column(width - 1 - (last - col), span)
+        self.version += 1
+        return True
+
+    def paint(self, screen: pygame.Surface) -> pygame.Rect:
+        """Blit the chart (RetainedRenderer slot callback)."""
+        screen.blit(self.surface, self.rect)
+        return self.rect
@@ -0,0 +1,332 @@
+"""
+asyncio OBD-II client - Phase 1
+Talks ELM327 over a non-blocking pyserial port registered with the event
+loop, so asyncio services can query adapters without executor threads.
+"""
+
+import asyncio
+import os
+import time
+from collections import deque
+from typing import AsyncIterator, Dict, List, NamedTuple, Optional
+
+import serial
+
+from common.scoring import calculate_acceleration
+from phase1.elm327 import PIDS, ELM327Session
+
+
+class _Request(NamedTuple):
+    fields: List[str]
+    future: asyncio.Future
+
+
+class AsyncOBDClient:
+    """
+    asyncio client for one ELM327 adapter.
+
+    The adapter answers one command at a time, so logical requests are
+    queued and coalesced: every request waiting when the adapter becomes
+    free is served by a single query cycle over the union of their fields.
+    Any number of coroutines can therefore have requests in flight.
+    """
+
+    def __init__(self, port: str = '/dev/rfcomm0', baudrate: int = 38400,
+                 timeout: float = 1.0):
+        """
+        Initialize client.
+
+        Args:
+            port: Serial port of the adapter
+            baudrate: Serial baudrate
+            timeout: Seconds to wait for each adapter response before
+                reporting that PID as None
+        """
+        self.port = port
+        self.baudrate = baudrate
+        self.timeout = timeout
+        self.is_connected = False
+
+        self.serial = None
+        self.session: Optional[ELM327Session] = None
+        self.speed_history = deque(maxlen=10)
+
+        self.cycles = 0
+        self.requests = 0
+        self.error: Optional[str] = None
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._outgoing = bytearray()
+        self._progress: Optional[asyncio.Event] = None
+        self._result: Optional[Dict] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+
+    async def connect(self, timeout: float = 10.0) -> bool:
+        """
+        Open the port and initialize the adapter.
+
+        Args:
+            timeout: Seconds allowed for initialization
+
+        Returns:
+            True if the adapter answered the set-up commands
+        """
+        if self.is_connected:
+            return True
+
+        self._loop = asyncio.get_running_loop()
+        try:
+            self.serial = serial.Serial(self.port, self.baudrate, timeout=0, write_timeout=0)
+        except (serial.SerialException, OSError) as e:
+            print(f"❌ Failed to open {self.port}: {e}")
+            return False
+        os.set_blocking(self.serial.fileno(), False)
+
+        self.error = None
+        self.session = ELM327Session()
+        self._progress = asyncio.Event()
+        self._queue = asyncio.Queue()
+        self._loop.add_reader(self.serial.fileno(), self._on_readable)
+        self._flush()
+
+        deadline = time.monotonic() + timeout
+        try:
+            while self.session.state == 'init':
+                if self.serial is None:
+                    raise asyncio.TimeoutError  # The port failed meanwhile
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError
+                await self._wait_progress(min(remaining, self.timeout))
+        except asyncio.TimeoutError:
+            print(f"❌ Adapter on {self.port} did not initialize")
+            await self.disconnect()
+            return False
+
+        self._dispatcher = asyncio.create_task(self._dispatch())
+        self.is_connected = True
+        print(f"✅ Connected to {self.session.adapter_version} on {self.port}")
+        return True
+
+    async def disconnect(self):
+        """Stop the dispatcher, fail queued requests and close the port."""
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+            try:
+                await self._dispatcher
+            except asyncio.CancelledError:
+                pass
+            self._dispatcher = None
+
+        self._fail_queued(ConnectionError("OBD client disconnected"))
+        self._close_port()
+        self.is_connected = False
+
+    async def __aenter__(self) -> 'AsyncOBDClient':
+        if not await self.connect():
+            raise ConnectionError(f"Cannot connect to adapter on {self.port}")
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.disconnect()
+
+    async def query_many(self, fields: List[str],
+                         timeout: Optional[float] = None) -> Dict[str, Optional[float]]:
+        """
+        Query several values.
+
+        Cancelling the caller (or hitting `timeout`) withdraws the request;
+        a query cycle already on the wire still completes for other callers.
+
+        Args:
+            fields: Keys of elm327.PIDS, e.g. ['speed_kph', 'rpm']
+            timeout: Seconds to wait for the result (None waits indefinitely)
+
+        Returns:
+            Dictionary of field to value (None where the vehicle had no data)
+
+        Raises:
+            asyncio.TimeoutError: If the result did not arrive within timeout
+            ConnectionError: If the client is or gets disconnected
+        """
+        if not self.is_connected:
+            raise ConnectionError("OBD client not connected")
+        unknown = [f for f in fields if f not in PIDS]
+        if unknown:
+            raise ValueError(f"Unsupported fields: {unknown}")
+
+        future = self._loop.create_future()
+        self._queue.put_nowait(_Request(list(fields), future))
+        self.requests += 1
+        return await asyncio.wait_for(future, timeout)
+
+    async def query(self, field: str, timeout: Optional[float] = None) -> Optional[float]:
+        """
+        Query one value.
+
+        Args:
+            field: Key of elm327.PIDS
+            timeout: Seconds to wait for the result
+
+        Returns:
+            Value, or None if the vehicle had no data
+        """
+        return (await self.query_many([field], timeout))[field]
+
+    async def read_all(self, timeout: Optional[float] = None) -> Dict:
+        """
+        Read one sample with the same keys as OBDReader.read_all().
+
+        Args:
+            timeout: Seconds to wait for the sample
+
+        Returns:
+            Dictionary with all current values
+        """
+        values = await self.query_many(list(PIDS), timeout)
+        data = {'timestamp': time.time()}
+        data.update(values)
+        if data.get('speed_kph') is not None:
+            self.speed_history.append((data['timestamp'], data['speed_kph']))
+            data['accel_calculated'] = calculate_acceleration(self.speed_history)
+        else:
+            data['accel_calculated'] = None
+        return data
+
+    async def samples(self, update_rate: float = 0.1) -> AsyncIterator[Dict]:
+        """
+        Iterate over samples taken on a fixed schedule.
+
+        Args:
+            update_rate: Sample interval in seconds
+
+        Yields:
+            Sample dictionaries as returned by read_all()
+        """
+        deadline = time.monotonic()
+        while self.is_connected:
+            yield await self.read_all()
+            deadline += update_rate
+            delay = deadline - time.monotonic()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                deadline = time.monotonic()
+
+    # Event loop plumbing
+
+    def _on_readable(self):
+        try:
+            data = os.read(self.serial.fileno(), 4096)
+        except BlockingIOError:
+            return
+        except OSError as e:
+            self._fail(e)
+            return
+        if not data:
+            # End of file: the adapter went away (e.g. unplugged). The fd
+            # stays readable, so it must leave the loop or it spins.
+            self._fail(ConnectionError(f"Adapter on {self.port} closed the connection"))
+            return
+        result = self.session.receive_data(data)
+        if result is not None:
+            self._result = result
+        self._progress.set()
+        self._flush()
+
+    def _fail(self, error: Exception):
+        """Drop a port that failed: requests waiting on it get ConnectionError."""
+        self.error = str(error)
+        print(f"❌ {self.port}: {error}")
+        self._close_port()
+        self.is_connected = False
+        # The dispatcher fails the batch on the wire when cancelled
+        if self._dispatcher is not None:
+            self._dispatcher.cancel()
+        self._fail_queued(ConnectionError(f"OBD adapter lost: {error}"))
+        # Wake a connect() still waiting for the adapter to initialize
+        if self._progress is not None:
+            self._progress.set()
+
+    def _fail_queued(self, error: Exception):
+        if self._queue is None:
+            return
+        while not self._queue.empty():
+            request = self._queue.get_nowait()
+            if not request.future.done():
+                request.future.set_exception(error)
+
+    def _close_port(self):
+        if self.serial is None:
+            return
+        self._loop.remove_reader(self.serial.fileno())
+        self._loop.remove_writer(self.serial.fileno())
+        self.serial.close()
+        self.serial = None
+        self._outgoing.clear()
+
+    def _flush(self):
+        if self.serial is None:
+            return
+        self._outgoing += self.session.data_to_send()
+        fd = self.serial.fileno()
+        if self._outgoing:
+            try:
+                written = os.write(fd, self._outgoing)
+                del self._outgoing[:written]
+            except BlockingIOError:
+                pass
+            except OSError as e:
+                self._fail(e)
+                return
+        if self._outgoing:
+            self._loop.add_writer(fd, self._flush)
+        else:
+            self._loop.remove_writer(fd)
+
+    async def _wait_progress(self, timeout: float):
+        self._progress.clear()
+        await asyncio.wait_for(self._progress.wait(), timeout)
+
+    async def _cycle(self, fields: List[str]) -> Dict[str, Optional[float]]:
+        """Run one query cycle; unanswered PIDs time out individually."""
+        self._result = None
+        self.session.request(fields)
+        self._flush()
+        while self._result is None:
+            deadline = self.session.deadline(self.timeout)
+            try:
+                await self._wait_progress(max(0.0, deadline - time.monotonic()))
+            except asyncio.TimeoutError:
+                result = self.session.check_timeout(self.timeout)
+                self._flush()
+                if result is not None:
+                    self._result = result
+        self.cycles += 1
+        return self._result
+
+    async def _dispatch(self):
+        while True:
+            batch = [await self._queue.get()]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+            batch = [r for r in batch if not r.future.done()]
+            if not batch:
+                continue
+
+            fields = list(dict.fromkeys(f for r in batch for f in r.fields))
+            try:
+                values = await self._cycle(fields)
+            except asyncio.CancelledError:
+                for r in batch:
+                    if not r.future.done():
+                        r.future.set_exception(ConnectionError("OBD client disconnected"))
+                raise
+            for r in batch:
+                if not r.future.done():
+                    r.future.set_result({f: values.get(f) for f in r.fields})
+
+    def __repr__(self) -> str:
+        status = "connected" if self.is_connected else "disconnected"
+        return f"AsyncOBDClient(port={self.port}, status={status})"
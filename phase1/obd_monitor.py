@@ -7,42 +7,90 @@ Main application for driver behavior monitoring using OBD-II data.
 import sys
 import time
 import signal
+import threading
+from functools import partial
 from pathlib import Path
 
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from common.bus import DataBus, SAMPLES
 from common.config import Config
+from common.governor import FrameGovernor
 from common.logger import TripLogger
+from common.metrics import MetricsServer, monitor_metrics
+from common.pipeline import TripPipeline
+from common.profiler import SamplingProfiler
 from common.scoring import DriverScorer
-from phase1.obd_reader import OBDReader
+from common.stats import collect_stats, overlay_lines
+from common.telemetry import TelemetryServer
+from common.vehicle_state import TripDetector
+from phase1.acquisition import create_reader
 
 
 class Phase1Monitor:
     """Main monitor application for Phase 1."""
     
-    def __init__(self):
-        """Initialize the monitor."""
+    def __init__(self, config: Config = None, reader=None, clock=time.time):
+        """
+        Initialize the monitor.
+        
+        Args:
+            config: Configuration (default: phase 1 config file)
+            reader: Sample source with the OBDReader interface (default:
+                create_reader(config), e.g. a ReplayReader for replays)
+            clock: Epoch-seconds clock for trip names and times (replays
+                pass VirtualClock.time so output matches the recording)
+        """
         # Load configuration
-        self.config = Config(phase=1)
+        self.config = config or Config(phase=1)
+        self.clock = clock
         
         # Initialize components
-        self.obd = OBDReader(
-            port=self.config.get('obd.port'),
-            baudrate=self.config.get('obd.baudrate')
-        )
+        self.obd = reader or create_reader(self.config)
         
-        self.logger = TripLogger(
-            log_dir=self.config.log_directory,
-            phase=1
-        )
+        self.logger = TripLogger.from_config(self.config, phase=1, clock=clock)
+        self.logger.recover(background=True)
         
         self.scorer = DriverScorer(
-            config=self.config.get_section('scoring')
+            config=self.config.settings.scoring._asdict(),
+            clock=clock
         )
         
+        # Samples flow reader -> bus -> scorer -> logger, once per sample
+        self.bus = DataBus()
+        self.pipeline = TripPipeline(self.bus, self.scorer, self.logger, clock=clock)
+        self.obd.add_listener(partial(self.bus.publish, SAMPLES))
+        
+        # Main loop pacing: full rate while values change, ~1 Hz when idle
+        self.governor = FrameGovernor.from_config(self.config)
+        self.bus.subscribe(SAMPLES, self.governor.on_sample, name='governor')
+        
+        # Vehicle state: automatic trips, slower polling and refresh when not moving
+        self.vehicle = TripDetector.from_config(self.config)
+        if self.vehicle:
+            self.obd.pace = self.vehicle.pacer()
+            self.vehicle.bind_trips(self.start_trip, self.stop_trip, lambda: self.trip_active)
+            self.vehicle.add_listener(self.governor.on_vehicle_state)
+            self.bus.subscribe(SAMPLES, self.vehicle.on_sample, name='vehicle-state')
+        
+        # Optional sampling profiler (profiling config / CARMONITOR_PROFILE)
+        self.profiler = SamplingProfiler.from_config(self.config)
+        
+        # Optional live sample stream for other local processes
+        self.telemetry = TelemetryServer.from_config(self.config, self.bus)
+        
+        # Optional Prometheus endpoint for unattended vehicles
+        self.metrics = MetricsServer.from_config(self.config)
+        if self.metrics:
+            monitor_metrics(self.metrics.registry, reader=self.obd, bus=self.bus,
+                            pipeline=self.pipeline, logger=self.logger,
+                            telemetry=self.telemetry, vehicle=self.vehicle)
+        
         self.running = False
         self.trip_active = False
+        # Trips start and stop from the keyboard, shutdown and the vehicle-state thread
+        self._trip_lock = threading.Lock()
     
     def start(self) -> bool:
         """
@@ -66,19 +114,29 @@ class Phase1Monitor:
         print("✅ OBD-II connected")
         print()
         
+        if self.profiler:
+            self.profiler.start(Path(self.config.log_directory) /
+                                time.strftime('profile_%Y%m%d_%H%M%S', time.localtime(self.clock())))
+        if self.telemetry:
+            self.telemetry.start()
+        if self.metrics:
+            self.metrics.start()
+        
         self.running = True
         return True
     
     def start_trip(self):
         """Start a new trip."""
-        if self.trip_active:
-            print("Trip already active!")
-            return
-        
-        trip_name = time.strftime('trip_%Y%m%d_%H%M%S')
-        self.logger.start_trip(trip_name)
-        self.scorer.reset()
-        self.trip_active = True
+        with self._trip_lock:
+            if self.trip_active:
+                print("Trip already active!")
+                return
+            
+            trip_name = time.strftime('trip_%Y%m%d_%H%M%S', time.localtime(self.clock()))
+            path = self.pipeline.start_trip(trip_name)
+            self.trip_active = True
+            if self.profiler:
+                self.profiler.start(path)
         
         print("\n" + "=" * 60)
         print("🚗 TRIP STARTED")
@@ -87,12 +145,15 @@ class Phase1Monitor:
     
     def stop_trip(self):
         """Stop current trip."""
-        if not self.trip_active:
-            return
-        
-        summary = self.logger.end_trip()
-        score_summary = self.scorer.get_summary()
-        self.trip_active = False
+        with self._trip_lock:
+            if not self.trip_active:
+                return
+            
+            summary = self.pipeline.end_trip()
+            if self.profiler:
+                self.profiler.stop()
+            score_summary = self.scorer.get_summary()
+            self.trip_active = False
         
         print("\n" + "=" * 60)
         print("🏁 TRIP ENDED")
@@ -133,35 +194,26 @@ class Phase1Monitor:
         # Start async OBD reading
         self.obd.start_async_reading(update_rate=0.1)
         
+        # Hot reload of scoring thresholds and display rates
+        self.config.on_reload(self.apply_settings)
+        self.config.watch(self.config.get('system.reload_interval', 1.0))
+        
         last_display_update = time.time()
         display_interval = 1.0  # Update display every second
         
         try:
             while self.running:
-                # Get latest data
+                # Scoring and logging run on the bus; this loop only displays
                 data = self.obd.get_latest_data()
                 
-                if self.trip_active and data:
-                    # Update score
-                    score, event_type = self.scorer.update(
-                        speed_kph=data.get('speed_kph', 0),
-                        accel=data.get('accel_calculated', 0)
-                    )
-                    
-                    # Add to data
-                    data['event_type'] = event_type
-                    data['score'] = score
-                    
-                    # Log data
-                    self.logger.log_data(data)
-                
                 # Update display
                 current_time = time.time()
                 if current_time - last_display_update >= display_interval:
                     self.display_status(data)
                     last_display_update = current_time
                 
-                time.sleep(0.1)
+                # Back off while parked and idle
+                self.governor.wait()
                 
         except KeyboardInterrupt:
             print("\n\nInterrupted by user")
@@ -189,6 +241,8 @@ class Phase1Monitor:
             print(f"🚗 TRIP ACTIVE - Duration: {self.logger.get_trip_duration():.0f}s")
         else:
             print("⏸️  NO ACTIVE TRIP - Press 's' to start")
+        if self.vehicle:
+            print(f"Vehicle: {self.vehicle.state.replace('_', ' ')}")
         
         print()
         print("VEHICLE DATA:")
@@ -204,19 +258,55 @@ class Phase1Monitor:
             print(f"  Current: {self.scorer.current_score:.1f}/100 ({self.scorer.get_grade()})")
             print(f"  Events: {self.scorer.harsh_brake_count} harsh brakes, ", end="")
             print(f"{self.scorer.aggressive_accel_count} aggressive accels")
-            print(f"  Last Event: {data.get('event_type', 'normal')}")
+            print(f"  Last Event: {self.pipeline.last_event or 'normal'}")
+        
+        if self.config.debug:
+            print()
+            print("INSTRUMENTATION (p50/p99):")
+            for line in overlay_lines(self.get_stats()):
+                print(f"  {line}")
         
         print()
         print("Commands: [s]tart trip | [x] stop trip | [q]uit")
         print("=" * 60)
     
+    def get_stats(self) -> dict:
+        """
+        Get instrumentation from every stage.
+        
+        Returns:
+            Dictionary of section (reader, pipeline, logger, telemetry, vehicle) to
+            StatsRegistry snapshot
+        """
+        return collect_stats(reader=self.obd, pipeline=self.pipeline, logger=self.logger,
+                             telemetry=self.telemetry, vehicle=self.vehicle)
+    
+    def apply_settings(self, settings):
+        """Apply reloaded scoring thresholds and display rates (config watcher thread)."""
+        self.scorer.configure(settings.scoring)
+        self.governor.configure(settings)
+        configure_burst = getattr(self.obd, 'configure_burst', None)
+        if configure_burst is not None:
+            configure_burst(settings.scoring)
+    
     def shutdown(self):
         """Clean shutdown."""
+        self.config.stop_watching()
         if self.trip_active:
             self.stop_trip()
         
+        if self.profiler:
+            self.profiler.stop()
+        if self.telemetry:
+            self.telemetry.stop()
+        if self.metrics:
+            self.metrics.stop()
         self.obd.stop_async_reading()
         self.obd.disconnect()
+        self.bus.close()
+        jitter = getattr(self.obd, 'jitter', None)
+        if jitter is not None:
+            print(jitter.report())
         print("Monitor shutdown complete")
 
 
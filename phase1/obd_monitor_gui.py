@@ -8,18 +8,37 @@ import sys
 import os
 import time
 import pygame
+from collections import deque
 from datetime import datetime
+from functools import partial
+from pathlib import Path
+from threading import Lock, Thread
 
-sys.path.insert(0, '/home/rays/carmonitor')
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from phase1.obd_reader import OBDReader
+from phase1.gui_render import GlyphCache, RetainedRenderer, SparklineView
+from phase1.sparkline import SparklineHistory
+from phase1.acquisition import create_reader
+from common.bus import DataBus, SAMPLES
 from common.config import Config
+from common.governor import FrameGovernor
 from common.logger import TripLogger
+from common.metrics import MetricsServer, monitor_metrics
+from common.pipeline import TripPipeline
+from common.profiler import SamplingProfiler
 from common.scoring import DriverScorer
+from common.startup import record_first_frame
+from common.stats import StatsRegistry, collect_stats, overlay_lines
+from common.telemetry import TelemetryServer
+from common.vehicle_state import TripDetector
+
+
+# Posted by the frame governor to end the wait for the next frame early
+GOVERNOR_WAKE = pygame.USEREVENT + 1
 
 
 class Phase1GUI:
-    def __init__(self):
+    def __init__(self, obd=None, config=None):
         # Initialize pygame
         pygame.init()
         
@@ -46,35 +65,104 @@ class Phase1GUI:
         self.font_medium = pygame.font.Font(None, 48)
         self.font_small = pygame.font.Font(None, 36)
         self.font_tiny = pygame.font.Font(None, 28)
+        self.font_debug = pygame.font.Font(None, 20)
         
         # Load config
-        self.config = Config('/home/rays/carmonitor/config/phase1_config.yaml')
+        self.config = config or Config(phase=1)
         
         # Initialize components
-        self.obd = OBDReader(
-            port=self.config.get('obd.port'),
-            baudrate=self.config.get('obd.baudrate')
-        )
-        self.logger = TripLogger(log_dir=self.config.get('logging.directory'))
-        
-        scorer_config = {
-            "harsh_brake_threshold": self.config.get("scoring.harsh_brake_threshold"),
-            "aggressive_accel_threshold": self.config.get("scoring.aggressive_accel_threshold"),
-            "speeding_threshold": self.config.get("scoring.speeding_threshold")
-        }
-        self.scorer = DriverScorer(config=scorer_config)
+        self.obd = obd or create_reader(self.config)
+        self.logger = TripLogger.from_config(self.config)
+        self.logger.recover(background=True)
+        
+        self.scorer = DriverScorer(config=self.config.settings.scoring._asdict())
+        
+        # Samples flow reader -> bus -> scorer -> logger, once per sample;
+        # the display is just another subscriber
+        self.bus = DataBus()
+        self.pipeline = TripPipeline(self.bus, self.scorer, self.logger)
+        self.obd.add_listener(partial(self.bus.publish, SAMPLES))
+        
+        # Adaptive frame rate: full rate while values change, ~1 Hz when static
+        self.governor = FrameGovernor.from_config(self.config)
+        self.governor.add_wake_callback(self._post_wake)
+        
+        # Vehicle state: automatic trips, slower polling and refresh when not moving
+        self.vehicle = TripDetector.from_config(self.config)
+        if self.vehicle:
+            self.obd.pace = self.vehicle.pacer()
+            self.vehicle.bind_trips(self.start_trip, self.stop_trip, lambda: self.trip_active)
+            self.vehicle.add_listener(self.governor.on_vehicle_state)
+            self.bus.subscribe(SAMPLES, self.vehicle.on_sample, name='vehicle-state')
         
         # State
         self.running = True
         self.trip_active = False
+        # Trips start and stop from clicks, cleanup and the vehicle-state thread
+        self._trip_lock = Lock()
         self.connected = False
         self.last_data = {}
+        self.latest_sample = {}
         
         # Buttons
         self.buttons = self._create_buttons()
         
-        # Clock for FPS
-        self.clock = pygame.time.Clock()
+        # Live history charts (last display.history_seconds of speed and accel)
+        self.history_rects = {
+            'speed': pygame.Rect(50, 255, 180, 34),
+            'accel': pygame.Rect(50, 297, 180, 34),
+        }
+        window = self.config.get('display.history_seconds', 60)
+        self.histories = {
+            'speed': SparklineHistory(self.history_rects['speed'].width, window, v_min=0, v_max=160),
+            'accel': SparklineHistory(self.history_rects['accel'].width, window, v_min=-8, v_max=6),
+        }
+        self.bus.subscribe(SAMPLES, self._on_sample, name='display')
+        
+        # Time the next frame is due (set by the governor after each frame)
+        self.next_frame = time.monotonic()
+        
+        # Retained-mode rendering: cached glyphs, static layer, dirty rects
+        self.glyphs = GlyphCache()
+        self.renderer = RetainedRenderer(self.screen)
+        self.renderer.build_static(self.draw_static)
+        self.sparklines = {
+            'speed': SparklineView(self.histories['speed'], self.history_rects['speed'], self.BLUE),
+            'accel': SparklineView(self.histories['accel'], self.history_rects['accel'], self.ORANGE,
+                                   baseline=0),
+        }
+        
+        # Hot reload of scoring thresholds and display settings
+        self.config.on_reload(self.apply_settings)
+        self.config.watch(self.config.get('system.reload_interval', 1.0))
+        self.frame_times = deque(maxlen=600)
+        
+        # Optional sampling profiler (profiling config / CARMONITOR_PROFILE)
+        self.profiler = SamplingProfiler.from_config(self.config)
+        if self.profiler:
+            self.profiler.start(Path(self.config.log_directory) /
+                                datetime.now().strftime('profile_%Y%m%d_%H%M%S'))
+        
+        # Optional live sample stream for other local processes
+        self.telemetry = TelemetryServer.from_config(self.config, self.bus)
+        if self.telemetry:
+            self.telemetry.start()
+        
+        # Debug overlay ('d' key) over the score panel, refreshed once a second
+        self.display_stats = StatsRegistry()
+        self.show_stats = self.config.debug
+        self.stats_rect = pygame.Rect(490, 100, 300, 295)
+        self.stats_lines = ()
+        self.stats_updated = 0.0
+        
+        # Optional Prometheus endpoint for unattended vehicles
+        self.metrics = MetricsServer.from_config(self.config)
+        if self.metrics:
+            monitor_metrics(self.metrics.registry, reader=self.obd, bus=self.bus,
+                            pipeline=self.pipeline, logger=self.logger,
+                            display=self.display_stats, telemetry=self.telemetry,
+                            vehicle=self.vehicle)
+            self.metrics.start()
         
     def _create_buttons(self):
         button_height = 60
@@ -88,6 +176,33 @@ class Phase1GUI:
             'quit': pygame.Rect(self.width - button_width - 20, y_pos, button_width, button_height)
         }
     
+    def _on_sample(self, data):
+        """Receive a sample (runs on the display's bus thread)"""
+        self.latest_sample = data
+        self.governor.on_sample(data)
+        timestamp = data.get('timestamp')
+        self.histories['speed'].push(data.get('speed_kph'), timestamp)
+        self.histories['accel'].push(data.get('accel_calculated'), timestamp)
+    
+    def _post_wake(self):
+        """Interrupt the frame wait (called from the bus thread)"""
+        try:
+            pygame.event.post(pygame.event.Event(GOVERNOR_WAKE))
+        except pygame.error:
+            pass
+    
+    def apply_settings(self, settings):
+        """Apply reloaded scoring thresholds and display settings (config watcher thread)"""
+        self.scorer.configure(settings.scoring)
+        self.governor.configure(settings)
+        configure_burst = getattr(self.obd, 'configure_burst', None)
+        if configure_burst is not None:
+            configure_burst(settings.scoring)
+        
+        # The charts redraw themselves on their next frame
+        for history in self.histories.values():
+            history.resize_window(settings.display.history_seconds)
+    
     def connect_obd(self):
         """Connect to OBD-II adapter"""
         if self.obd.connect():
@@ -96,19 +211,67 @@ class Phase1GUI:
             return True
         return False
     
+    def _connect_background(self):
+        if not self.connect_obd():
+            print("Failed to connect to OBD-II adapter")
+    
     def start_trip(self):
         """Start a new trip"""
-        if not self.trip_active and self.connected:
-            trip_name = datetime.now().strftime('trip_%Y%m%d_%H%M%S')
-            self.logger.start_trip(trip_name)
-            self.scorer.reset()
-            self.trip_active = True
+        with self._trip_lock:
+            if not self.trip_active and self.connected:
+                trip_name = datetime.now().strftime('trip_%Y%m%d_%H%M%S')
+                path = self.pipeline.start_trip(trip_name)
+                self.trip_active = True
+                if self.profiler:
+                    self.profiler.start(path)
     
     def stop_trip(self):
         """Stop current trip"""
-        if self.trip_active:
-            self.logger.end_trip()
-            self.trip_active = False
+        with self._trip_lock:
+            if self.trip_active:
+                self.pipeline.end_trip()
+                self.trip_active = False
+                if self.profiler:
+                    self.profiler.stop()
+    
+    def draw_static(self, surface):
+        """Draw content that never changes (painted once into the static layer)"""
+        surface.fill(self.BLACK)
+        
+        # Status bar background and title
+        pygame.draw.rect(surface, self.BLUE, (0, 0, self.width, 60))
+        surface.blit(self.glyphs.render(self.font_medium, 'BMW X5 Driver Monitor', self.WHITE), (20, 12))
+        
+        # Value labels
+        y_start = 140
+        surface.blit(self.glyphs.render(self.font_small, 'km/h', self.LIGHT_GRAY), (50, y_start + 80))
+        surface.blit(self.glyphs.render(self.font_tiny, 'RPM', self.LIGHT_GRAY), (250, y_start + 65))
+        surface.blit(self.glyphs.render(self.font_tiny, 'Throttle', self.LIGHT_GRAY), (250, y_start + 145))
+        
+        # History chart frames
+        for rect in self.history_rects.values():
+            pygame.draw.rect(surface, self.GRAY, rect.inflate(2, 2), 1)
+        
+        # Score box
+        box_rect = pygame.Rect(480, 140, 280, 180)
+        pygame.draw.rect(surface, self.GRAY, box_rect, border_radius=15)
+        pygame.draw.rect(surface, self.WHITE, box_rect, 3, border_radius=15)
+    
+    def blit_text(self, surface, font, text, color, **position):
+        """
+        Blit cached text and return the rect it covers.
+        
+        Args:
+            surface: Target surface
+            font: Font to render with
+            text: Text to draw
+            color: RGB color
+            **position: pygame.Rect positioning keyword (topleft, center, ...)
+        """
+        text_surface = self.glyphs.render(font, text, color)
+        text_rect = text_surface.get_rect(**position)
+        surface.blit(text_surface, text_rect)
+        return text_rect
     
     def draw_button(self, name, rect, text, enabled=True):
         """Draw a touchscreen button"""
@@ -116,29 +279,24 @@ class Phase1GUI:
         if not enabled:
             color = self.GRAY
         
-        # Button background
-        pygame.draw.rect(self.screen, color, rect, border_radius=10)
-        pygame.draw.rect(self.screen, self.WHITE, rect, 3, border_radius=10)
+        def paint(surface):
+            # Button background
+            pygame.draw.rect(surface, color, rect, border_radius=10)
+            pygame.draw.rect(surface, self.WHITE, rect, 3, border_radius=10)
+            
+            # Button text
+            self.blit_text(surface, self.font_small, text, self.WHITE, center=rect.center)
+            return rect
         
-        # Button text
-        text_surface = self.font_small.render(text, True, self.WHITE)
-        text_rect = text_surface.get_rect(center=rect.center)
-        self.screen.blit(text_surface, text_rect)
+        self.renderer.slot(f'button_{name}', (text, color), paint)
     
     def draw_status_bar(self):
         """Draw top status bar"""
-        # Background
-        pygame.draw.rect(self.screen, self.BLUE, (0, 0, self.width, 60))
-        
-        # Title
-        title = self.font_medium.render('BMW X5 Driver Monitor', True, self.WHITE)
-        self.screen.blit(title, (20, 12))
-        
         # Connection status
         status_text = 'CONNECTED' if self.connected else 'DISCONNECTED'
         status_color = self.GREEN if self.connected else self.RED
-        status = self.font_tiny.render(status_text, True, status_color)
-        self.screen.blit(status, (self.width - 180, 20))
+        self.renderer.slot('connection', (status_text, status_color), lambda surface: self.blit_text(
+            surface, self.font_tiny, status_text, status_color, topleft=(self.width - 180, 20)))
     
     def draw_trip_status(self):
         """Draw trip status section"""
@@ -151,50 +309,41 @@ class Phase1GUI:
             status_text = 'NO ACTIVE TRIP'
             color = self.ORANGE
         
-        status = self.font_medium.render(status_text, True, color)
-        status_rect = status.get_rect(center=(self.width // 2, y_pos))
-        self.screen.blit(status, status_rect)
+        self.renderer.slot('trip_status', (status_text, color), lambda surface: self.blit_text(
+            surface, self.font_medium, status_text, color, center=(self.width // 2, y_pos)))
     
     def draw_vehicle_data(self):
         """Draw main vehicle data display"""
         y_start = 140
         
         # Speed (large and prominent)
-        speed = self.last_data.get('speed_kph', 0)
-        speed_text = self.font_large.render(f"{speed:.0f}", True, self.WHITE)
-        speed_label = self.font_small.render('km/h', True, self.LIGHT_GRAY)
-        
-        self.screen.blit(speed_text, (50, y_start))
-        self.screen.blit(speed_label, (50, y_start + 80))
+        speed = f"{self.last_data.get('speed_kph') or 0:.0f}"
+        self.renderer.slot('speed', speed, lambda surface: self.blit_text(
+            surface, self.font_large, speed, self.WHITE, topleft=(50, y_start)))
         
         # RPM
-        rpm = self.last_data.get('rpm', 0)
-        rpm_text = self.font_medium.render(f"{rpm:.0f}", True, self.WHITE)
-        rpm_label = self.font_tiny.render('RPM', True, self.LIGHT_GRAY)
-        
-        self.screen.blit(rpm_text, (250, y_start + 10))
-        self.screen.blit(rpm_label, (250, y_start + 65))
+        rpm = f"{self.last_data.get('rpm') or 0:.0f}"
+        self.renderer.slot('rpm', rpm, lambda surface: self.blit_text(
+            surface, self.font_medium, rpm, self.WHITE, topleft=(250, y_start + 10)))
         
         # Throttle
-        throttle = self.last_data.get('throttle_pct', 0)
-        throttle_text = self.font_medium.render(f"{throttle:.0f}%", True, self.WHITE)
-        throttle_label = self.font_tiny.render('Throttle', True, self.LIGHT_GRAY)
-        
-        self.screen.blit(throttle_text, (250, y_start + 90))
-        self.screen.blit(throttle_label, (250, y_start + 145))
+        throttle = f"{self.last_data.get('throttle_pct') or 0:.0f}%"
+        self.renderer.slot('throttle', throttle, lambda surface: self.blit_text(
+            surface, self.font_medium, throttle, self.WHITE, topleft=(250, y_start + 90)))
+    
+    def draw_history(self):
+        """Scroll the history charts by the samples received since the last frame"""
+        for name, view in self.sparklines.items():
+            view.update()
+            self.renderer.slot(f'history_{name}', view.version, view.paint)
     
     def draw_score_panel(self):
         """Draw driver score panel"""
         x_pos = 480
         y_pos = 140
         
-        # Score box
-        box_rect = pygame.Rect(x_pos, y_pos, 280, 180)
-        pygame.draw.rect(self.screen, self.GRAY, box_rect, border_radius=15)
-        pygame.draw.rect(self.screen, self.WHITE, box_rect, 3, border_radius=15)
-        
         if self.trip_active:
-            score = self.scorer.get_score()
+            score = f"{self.scorer.current_score:.0f}"
             grade = self.scorer.get_grade()
             
             # Determine color based on grade
@@ -205,39 +354,78 @@ class Phase1GUI:
             else:
                 score_color = self.RED
             
-            # Score
-            score_text = self.font_large.render(f"{score:.0f}", True, score_color)
-            score_rect = score_text.get_rect(center=(x_pos + 140, y_pos + 60))
-            self.screen.blit(score_text, score_rect)
+            def paint(surface):
+                score_rect = self.blit_text(surface, self.font_large, score, score_color,
+                                            center=(x_pos + 140, y_pos + 60))
+                grade_rect = self.blit_text(surface, self.font_medium, f"Grade: {grade}", self.WHITE,
+                                            center=(x_pos + 140, y_pos + 130))
+                return score_rect.union(grade_rect)
             
-            # Grade
-            grade_text = self.font_medium.render(f"Grade: {grade}", True, self.WHITE)
-            grade_rect = grade_text.get_rect(center=(x_pos + 140, y_pos + 130))
-            self.screen.blit(grade_text, grade_rect)
+            self.renderer.slot('score', (score, score_color, grade), paint)
         else:
             # Not tracking
-            no_trip = self.font_small.render('Start trip', True, self.LIGHT_GRAY)
-            no_trip_rect = no_trip.get_rect(center=(x_pos + 140, y_pos + 50))
-            self.screen.blit(no_trip, no_trip_rect)
+            def paint(surface):
+                line1 = self.blit_text(surface, self.font_small, 'Start trip', self.LIGHT_GRAY,
+                                       center=(x_pos + 140, y_pos + 50))
+                line2 = self.blit_text(surface, self.font_small, 'to track score', self.LIGHT_GRAY,
+                                       center=(x_pos + 140, y_pos + 90))
+                return line1.union(line2)
             
-            no_trip2 = self.font_small.render('to track score', True, self.LIGHT_GRAY)
-            no_trip2_rect = no_trip2.get_rect(center=(x_pos + 140, y_pos + 90))
-            self.screen.blit(no_trip2, no_trip2_rect)
+            self.renderer.slot('score', None, paint)
     
     def draw_events(self):
         """Draw event counters"""
         y_pos = 340
         
-        harsh_brakes = self.scorer.harsh_brake_count
-        aggressive_accels = self.scorer.aggressive_accel_count
+        harsh_brakes = f"Harsh Brakes: {self.scorer.harsh_brake_count}"
+        aggressive_accels = f"Aggressive Accel: {self.scorer.aggressive_accel_count}"
         
         # Harsh brakes
-        harsh_text = self.font_tiny.render(f"Harsh Brakes: {harsh_brakes}", True, self.RED)
-        self.screen.blit(harsh_text, (50, y_pos))
+        self.renderer.slot('harsh_brakes', harsh_brakes, lambda surface: self.blit_text(
+            surface, self.font_tiny, harsh_brakes, self.RED, topleft=(50, y_pos)))
         
         # Aggressive acceleration
-        accel_text = self.font_tiny.render(f"Aggressive Accel: {aggressive_accels}", True, self.ORANGE)
-        self.screen.blit(accel_text, (300, y_pos))
+        self.renderer.slot('aggressive_accels', aggressive_accels, lambda surface: self.blit_text(
+            surface, self.font_tiny, aggressive_accels, self.ORANGE, topleft=(300, y_pos)))
+    
+    def draw_stats(self):
+        """Draw the instrumentation overlay in place of the score panel"""
+        now = time.monotonic()
+        if now - self.stats_updated >= 1.0:
+            self.stats_lines = tuple(overlay_lines(self.get_stats()))
+            self.stats_updated = now
+        lines = self.stats_lines
+        
+        def paint(surface):
+            pygame.draw.rect(surface, (20, 20, 20), self.stats_rect)
+            y = self.stats_rect.top + 4
+            for line in lines:
+                if y + 14 > self.stats_rect.bottom:
+                    break
+                surface.blit(self.glyphs.render(self.font_debug, line, self.LIGHT_GRAY),
+                             (self.stats_rect.left + 6, y))
+                y += 15
+            return self.stats_rect
+        
+        self.renderer.slot('stats', lines, paint)
+    
+    def toggle_stats(self):
+        """Show or hide the debug overlay"""
+        self.show_stats = not self.show_stats
+        self.stats_updated = 0.0
+        self.renderer.invalidate()
+    
+    def get_stats(self):
+        """
+        Get instrumentation from every stage.
+        
+        Returns:
+            Dictionary of section (reader, pipeline, logger, display, telemetry, vehicle) to
+            StatsRegistry snapshot
+        """
+        return collect_stats(reader=self.obd, pipeline=self.pipeline, logger=self.logger,
+                             display=self.display_stats, telemetry=self.telemetry,
+                             vehicle=self.vehicle)
     
     def handle_click(self, pos):
         """Handle touch/click events"""
@@ -249,35 +437,26 @@ class Phase1GUI:
             self.running = False
     
     def update(self):
-        """Update data from OBD"""
+        """Pick up the latest sample (scoring and logging happen on the bus)"""
         if self.connected:
-            self.last_data = self.obd.get_latest_data()
-            
-            if self.trip_active and self.last_data:
-                # Update scorer
-                score, event_type = self.scorer.update(
-                    speed_kph=self.last_data.get('speed_kph', 0),
-                    accel=self.last_data.get('accel_calculated', 0)
-                )
-                
-                # Log data
-                log_data = {
-                    **self.last_data,
-                    'score': score,
-                    'event_type': event_type if event_type else ''
-                }
-                self.logger.log_data(log_data)
+            sample = self.latest_sample
+            if sample is not self.last_data and isinstance(sample.get('timestamp'), (int, float)):
+                self.display_stats.record('age.displayed', (time.time() - sample['timestamp']) * 1e6)
+            self.last_data = sample
     
     def draw(self):
-        """Draw everything"""
-        # Clear screen
-        self.screen.fill(self.BLACK)
+        """Draw everything that changed since the last frame"""
+        self.renderer.begin_frame()
         
         # Draw components
         self.draw_status_bar()
         self.draw_trip_status()
         self.draw_vehicle_data()
-        self.draw_score_panel()
+        self.draw_history()
+        if self.show_stats:
+            self.draw_stats()
+        else:
+            self.draw_score_panel()
         self.draw_events()
         
         # Draw buttons
@@ -287,34 +466,44 @@ class Phase1GUI:
                         enabled=self.trip_active)
         self.draw_button('quit', self.buttons['quit'], 'QUIT', enabled=True)
         
-        # Update display
-        pygame.display.flip()
+        # Push only the changed regions
+        self.renderer.present()
     
     def run(self):
         print("Starting main loop...")
         """Main loop"""
-        # Try to connect
+        # Show the first frame before the (slow) adapter connection
+        self.update()
+        self.draw()
+        record_first_frame('gui', self.config)
+        
+        # Connect in the background; the GUI keeps running either way
         print("Connecting to OBD-II adapter...")
-        if not self.connect_obd():
-            print("Failed to connect to OBD-II adapter")
-            # Continue anyway to show GUI
+        Thread(target=self._connect_background, name='obd-connect', daemon=True).start()
         
         # Main loop
         while self.running:
-            print(f"Loop iteration, running={self.running}")
             # Handle events
-            for event in pygame.event.get():
+            for event in self.wait_events():
                 if event.type == pygame.QUIT:
                     self.running = False
+                elif event.type == pygame.VIDEOEXPOSE:
+                    self.renderer.invalidate()
                 elif event.type == pygame.MOUSEBUTTONDOWN:
+                    self.governor.touch()
                     self.handle_click(event.pos)
                 elif event.type == pygame.KEYDOWN:
+                    self.governor.touch()
                     if event.key == pygame.K_q:
                         self.running = False
                     elif event.key == pygame.K_s:
                         self.start_trip()
                     elif event.key == pygame.K_x:
                         self.stop_trip()
+                    elif event.key == pygame.K_d:
+                        self.toggle_stats()
+            
+            frame_start = time.perf_counter()
             
             # Update data
             self.update()
@@ -322,18 +511,73 @@ class Phase1GUI:
             # Draw
             self.draw()
             
-            # Control frame rate
-            self.clock.tick(10)  # 10 FPS
+            frame_time = time.perf_counter() - frame_start
+            self.frame_times.append(frame_time)
+            self.display_stats.record('frame', frame_time * 1e6)
+            self.next_frame = time.monotonic() + self.governor.interval()
         
         # Cleanup
         self.cleanup()
     
+    def wait_events(self):
+        """
+        Sleep until the next frame is due or something wakes the display.
+        
+        Returns:
+            List of pending pygame events
+        """
+        events = pygame.event.get()
+        # Pointer motion alone does not change the display
+        while all(e.type == pygame.MOUSEMOTION for e in events):
+            remaining = self.next_frame - time.monotonic()
+            if remaining <= 0:
+                break
+            event = pygame.event.wait(max(1, int(remaining * 1000)))
+            if event.type == pygame.NOEVENT:
+                break
+            events += [event] + pygame.event.get()
+        
+        if any(e.type == GOVERNOR_WAKE for e in events):
+            # Woken by new data or a driving event: draw right away
+            self.next_frame = time.monotonic()
+        return events
+    
+    def frame_time_stats(self):
+        """
+        Get update+draw time statistics over recent frames.
+        
+        Returns:
+            Dictionary with mean and p95 frame time in milliseconds
+        """
+        if not self.frame_times:
+            return {'frames': 0, 'mean_ms': 0.0, 'p95_ms': 0.0}
+        times = sorted(self.frame_times)
+        return {
+            'frames': len(times),
+            'mean_ms': 1000 * sum(times) / len(times),
+            'p95_ms': 1000 * times[int(0.95 * (len(times) - 1))]
+        }
+    
     def cleanup(self):
         """Clean up resources"""
+        stats = self.frame_time_stats()
+        print(f"Frame time: mean {stats['mean_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms "
+              f"over {stats['frames']} frames")
+        self.config.stop_watching()
         if self.trip_active:
             self.stop_trip()
+        if self.profiler:
+            self.profiler.stop()
+        if self.telemetry:
+            self.telemetry.stop()
+        if self.metrics:
+            self.metrics.stop()
         if self.connected:
             self.obd.disconnect()
+            jitter = getattr(self.obd, 'jitter', None)
+            if jitter is not None:
+                print(jitter.report().splitlines()[0])
+        self.bus.close()
         pygame.quit()
 
 
@@ -1,18 +1,35 @@
 #!/usr/bin/env python3
 import sys, tkinter as tk
 from datetime import datetime
+from functools import partial
 import threading
 import time
 import math
+from collections import deque
+from pathlib import Path
+from queue import Empty, SimpleQueue
 
-sys.path.insert(0, "/home/rays/carmonitor")
-from phase1.obd_reader import OBDReader
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from phase1.acquisition import create_reader
+from phase1.sparkline import SparklineHistory
+from common.bus import DataBus, SAMPLES
 from common.config import Config
+from common.governor import FrameGovernor
 from common.logger import TripLogger
+from common.metrics import MetricsServer, monitor_metrics, reader_metrics
+from common.pipeline import TripPipeline
+from common.profiler import SamplingProfiler
 from common.scoring import DriverScorer
+from common.startup import record_first_frame
+from common.stats import StatsRegistry, collect_stats, overlay_lines
+from common.telemetry import TelemetryServer
+from common.vehicle_state import TripDetector
+
+# How often the Tk thread picks up work queued by other threads (ms)
+TK_ACTION_POLL_MS = 50
 
 class AccelGauge(tk.Canvas):
-    def __init__(self, parent, width=220, height=160):
+    def __init__(self, parent, width=220, height=160, harsh_brake=-5.0, aggressive_accel=3.0):
         super().__init__(parent, width=width, height=height, bg="black", highlightthickness=0)
         self.width = width
         self.height = height
@@ -21,8 +38,8 @@ class AccelGauge(tk.Canvas):
         self.radius = 70
         
         # Thresholds
-        self.harsh_brake = -5.0
-        self.aggressive_accel = 3.0
+        self.harsh_brake = harsh_brake
+        self.aggressive_accel = aggressive_accel
         self.min_val = -8.0
         self.max_val = 6.0
         
@@ -101,11 +118,38 @@ class AccelGauge(tk.Canvas):
         self.create_text(self.center_x, 8, text="ACCEL (m/s²)", 
                         fill="gray", font=("Helvetica", 9, "bold"))
         
-        # Needle (will be updated)
-        self.needle = None
+        # Needle (created once, moved with coords)
+        end_x, end_y = self.needle_end(0)
+        self.needle = self.create_line(
+            self.center_x, self.center_y, end_x, end_y,
+            fill="#f39c12", width=4, arrow=tk.LAST, arrowshape=(10, 12, 4)
+        )
         self.value_text = self.create_text(self.center_x, self.height - 15, 
                                            text="0.0", fill="white", 
                                            font=("Helvetica", 14, "bold"))
+        
+        # Interpolation state: needle eases from shown value to target
+        self.shown_value = 0.0
+        self.target_value = 0.0
+        self.anim_start_value = 0.0
+        self.anim_start = 0.0
+        self.anim_duration = 0.1  # seconds, one sample interval
+        self.anim_frame_ms = 20
+        self.anim_job = None
+        self.value_label = ("0.0", "#2ecc71")
+    
+    def set_thresholds(self, harsh_brake, aggressive_accel):
+        """Redraw the zones for new scoring thresholds (Tk thread only)"""
+        if (harsh_brake, aggressive_accel) == (self.harsh_brake, self.aggressive_accel):
+            return
+        if self.anim_job is not None:
+            self.after_cancel(self.anim_job)
+        value = self.target_value
+        self.harsh_brake = harsh_brake
+        self.aggressive_accel = aggressive_accel
+        self.delete("all")
+        self.draw_static()
+        self.update_needle(value, animate=False)
     
     def value_to_angle(self, value):
         """Convert acceleration value to angle (90 degrees = straight up at 0)"""
@@ -128,55 +172,225 @@ class AccelGauge(tk.Canvas):
                 angle = 90
         return angle
     
-    def update_needle(self, value):
-        """Update the needle position"""
+    def needle_end(self, value):
+        """Get the needle tip coordinates for a value"""
+        angle_rad = math.radians(self.value_to_angle(value))
+        end_x = self.center_x + (self.radius - 15) * math.cos(angle_rad)
+        end_y = self.center_y - (self.radius - 15) * math.sin(angle_rad)
+        return end_x, end_y
+    
+    def update_needle(self, value, animate=True):
+        """
+        Move the needle towards a new value.
+        
+        The needle glides from its current position to the new value over
+        one sample interval, so motion is smooth without sampling faster.
+        """
         # Clamp value
         value = max(self.min_val, min(self.max_val, value))
         
-        # Delete old needle
-        if self.needle:
-            self.delete(self.needle)
+        # Update value text only when its rendering changes
+        color = "#2ecc71" if self.harsh_brake <= value <= self.aggressive_accel else "#e74c3c"
+        label = (f"{value:.1f}", color)
+        if label != self.value_label:
+            self.itemconfig(self.value_text, text=label[0], fill=color)
+            self.value_label = label
         
-        # Calculate needle position
-        angle = self.value_to_angle(value)
-        angle_rad = math.radians(angle)
-        end_x = self.center_x + (self.radius - 15) * math.cos(angle_rad)
-        end_y = self.center_y - (self.radius - 15) * math.sin(angle_rad)
+        if value == self.target_value:
+            return
         
-        # Draw needle
-        self.needle = self.create_line(
-            self.center_x, self.center_y, end_x, end_y,
-            fill="#f39c12", width=4, arrow=tk.LAST, arrowshape=(10, 12, 4)
-        )
+        self.target_value = value
+        if not animate:
+            self._set_needle(value)
+            return
         
-        # Update value text
-        color = "#2ecc71" if self.harsh_brake <= value <= self.aggressive_accel else "#e74c3c"
-        self.itemconfig(self.value_text, text=f"{value:.1f}", fill=color)
+        self.anim_start_value = self.shown_value
+        self.anim_start = time.monotonic()
+        if self.anim_job is None:
+            self._animate()
+    
+    def _animate(self):
+        """Advance the needle one animation frame"""
+        progress = (time.monotonic() - self.anim_start) / self.anim_duration
+        if progress >= 1.0:
+            self._set_needle(self.target_value)
+            self.anim_job = None
+            return
+        
+        # Ease-out so the needle settles gently on the target
+        eased = 1 - (1 - progress) ** 2
+        self._set_needle(self.anim_start_value + (self.target_value - self.anim_start_value) * eased)
+        self.anim_job = self.after(self.anim_frame_ms, self._animate)
+    
+    def _set_needle(self, value):
+        """Move the existing needle item"""
+        end_x, end_y = self.needle_end(value)
+        self.coords(self.needle, self.center_x, self.center_y, end_x, end_y)
+        self.shown_value = value
+
+
+class Sparkline(tk.Canvas):
+    """
+    Scrolling history chart: one vertical line item per column.
+    
+    Completed columns are shifted left with a single canvas move and only
+    the newest column is created or reshaped, so history is never replotted.
+    """
+    
+    def __init__(self, parent, history, color, baseline=None, height=40):
+        self.history = history
+        self.chart_width = history.columns
+        self.chart_height = height
+        super().__init__(parent, width=self.chart_width, height=height, bg="black",
+                         highlightthickness=1, highlightbackground="#555555")
+        self.color = color
+        self.items = deque()  # (column, item id), oldest first
+        self.last_col = 0
+        self.generation = history.generation
+        
+        if baseline is not None:
+            y = history.scale(baseline, height)
+            self.create_line(0, y, self.chart_width, y, fill="#3c3c3c")
+    
+    def refresh(self):
+        """Draw samples received since the last refresh"""
+        if self.generation != self.history.generation:
+            self.rebuild()
+            return
+        
+        shift, last, columns = self.history.take_updates()
+        if not columns:
+            return
+        
+        self.last_col = last
+        if shift:
+            self.move("column", -shift, 0)
+            while self.items and self.items[0][0] <= last - self.chart_width:
+                self.delete(self.items.popleft()[1])
+        
+        for col, span in columns:
+            self._draw_column(col, span)
+    
+    def rebuild(self):
+        """Redraw every column (after the history window was resized)"""
+        self.generation = self.history.generation
+        self.delete("column")
+        self.items.clear()
+        self.last_col, columns = self.history.snapshot()
+        for col, span in columns:
+            self._draw_column(col, span)
+    
+    def _draw_column(self, col, span):
+        x = self.chart_width - 1 - (self.last_col - col)
+        # Only the newest column is ever redrawn, so look at the tail
+        item = self.items[-1][1] if self.items and self.items[-1][0] == col else None
+        if span is None:
+            if item is not None:
+                self.delete(item)
+                self.items.pop()
+            return
+        
+        top = self.history.scale(span[1], self.chart_height)
+        bottom = self.history.scale(span[0], self.chart_height) + 1
+        if item is None:
+            item = self.create_line(x, top, x, bottom, fill=self.color, tags=("column",))
+            self.items.append((col, item))
+        else:
+            self.coords(item, x, top, x, bottom)
 
 
 class AutoConnectGUI:
-    def __init__(self, root):
+    def __init__(self, root, obd=None, config=None):
         self.root = root
         self.root.geometry("800x480")
         self.root.configure(bg="black")
         
-        self.config = Config("/home/rays/carmonitor/config/phase1_config.yaml")
-        self.obd = None
-        self.logger = TripLogger(log_dir=self.config.get("logging.directory"))
-        cfg = {"harsh_brake_threshold": self.config.get("scoring.harsh_brake_threshold"),
-               "aggressive_accel_threshold": self.config.get("scoring.aggressive_accel_threshold"),
-               "speeding_threshold": self.config.get("scoring.speeding_threshold")}
-        self.scorer = DriverScorer(config=cfg)
+        self.config = config or Config(phase=1)
+        self.obd = obd
+        self.logger = TripLogger.from_config(self.config)
+        self.logger.recover(background=True)
+        self.scorer = DriverScorer(config=self.config.settings.scoring._asdict())
+        
+        # Samples flow reader -> bus -> scorer -> logger, once per sample;
+        # the display is just another subscriber
+        self.bus = DataBus()
+        self.pipeline = TripPipeline(self.bus, self.scorer, self.logger)
         
         self.trip_active = False
-        self.connected = False
+        self.connected = obd is not None
         self.last_data = {}
+        self.latest_sample = {}
         self.running = True
         self.connection_attempts = 0
         
+        # Last (text, fg) applied to each label; unchanged values are skipped
+        self.label_state = {}
+        
+        # Work handed to the Tk thread by the bus, watcher and connection
+        # threads; Tk is only ever called from the thread running mainloop
+        self.tk_actions = SimpleQueue()
+        self.wake_pending = threading.Event()
+        
+        # Adaptive refresh: full rate while values change, ~1 Hz when static
+        self.governor = FrameGovernor.from_config(self.config)
+        self.governor.add_wake_callback(self.post_wake)
+        self.update_job = None
+        self.root.bind_all("<Button-1>", lambda e: self.governor.touch(), add="+")
+        
+        # Vehicle state: automatic trips, slower polling and refresh when not moving;
+        # trip actions are handed to the Tk thread
+        self.vehicle = TripDetector.from_config(self.config)
+        if self.vehicle:
+            self.vehicle.bind_trips(lambda: self.tk_actions.put(self.start_trip),
+                                    lambda: self.tk_actions.put(self.stop_trip),
+                                    lambda: self.trip_active)
+            self.vehicle.add_listener(self.governor.on_vehicle_state)
+            self.bus.subscribe(SAMPLES, self.vehicle.on_sample, name="vehicle-state")
+        
+        # Live history charts (last display.history_seconds of speed and accel)
+        window = self.config.get("display.history_seconds", 60)
+        self.speed_history = SparklineHistory(300, window, v_min=0, v_max=160)
+        self.accel_history = SparklineHistory(300, window, v_min=-8, v_max=6)
+        self.bus.subscribe(SAMPLES, self.on_sample, name="display")
+        
+        # Optional sampling profiler (profiling config / CARMONITOR_PROFILE)
+        self.profiler = SamplingProfiler.from_config(self.config)
+        if self.profiler:
+            self.profiler.start(Path(self.config.log_directory) /
+                                datetime.now().strftime("profile_%Y%m%d_%H%M%S"))
+        
+        # Optional live sample stream for other local processes
+        self.telemetry = TelemetryServer.from_config(self.config, self.bus)
+        if self.telemetry:
+            self.telemetry.start()
+        
+        # Debug overlay ('d' key), refreshed once a second
+        self.display_stats = StatsRegistry()
+        self.show_stats = self.config.debug
+        self.stats_updated = 0.0
+        self.root.bind("<Key-d>", lambda e: self.toggle_stats())
+        # Optional Prometheus endpoint for unattended vehicles
+        self.metrics = MetricsServer.from_config(self.config)
+        if self.metrics:
+            monitor_metrics(self.metrics.registry, bus=self.bus,
+                            pipeline=self.pipeline, logger=self.logger,
+                            display=self.display_stats, telemetry=self.telemetry,
+                            vehicle=self.vehicle)
+            self.metrics.start()
+        
+        if obd is not None:
+            self.attach_reader(obd)
+        
         self.create_widgets()
+        
+        # Hot reload of scoring thresholds and display settings (once the
+        # charts and gauge it updates exist)
+        self.config.on_reload(self.apply_settings)
+        self.config.watch(self.config.get("system.reload_interval", 1.0))
+        
         threading.Thread(target=self.connection_monitor, daemon=True).start()
         self.update_display()
+        self.poll_tk_actions()
     
     def create_widgets(self):
         # BUTTONS AT TOP - Reduced height to 60px
@@ -226,11 +440,18 @@ class AutoConnectGUI:
                                 bg="black", fg="white")
         self.throttle.pack()
         
+        self.speed_chart = Sparkline(left, self.speed_history, "#3498db")
+        self.speed_chart.pack(pady=(8, 2))
+        self.accel_chart = Sparkline(left, self.accel_history, "#f39c12", baseline=0)
+        self.accel_chart.pack()
+        
         # Center: Acceleration Gauge
         center = tk.Frame(main, bg="black")
         center.pack(side=tk.LEFT, padx=5)
         
-        self.accel_gauge = AccelGauge(center)
+        scoring = self.config.settings.scoring
+        self.accel_gauge = AccelGauge(center, harsh_brake=scoring.harsh_brake_threshold,
+                                      aggressive_accel=scoring.aggressive_accel_threshold)
         self.accel_gauge.pack()
         
         # Right: Score panel
@@ -251,6 +472,12 @@ class AutoConnectGUI:
         self.events = tk.Label(right, text="Events: 0", font=("Helvetica", 11), 
                               bg="#34495e", fg="gray")
         self.events.pack(pady=8)
+        
+        # Instrumentation overlay, placed over the score panel when shown
+        self.stats_lbl = tk.Label(self.root, text="", font=("Courier", 8), bg="#111111",
+                                  fg="#cccccc", justify=tk.LEFT, anchor="nw")
+        if self.show_stats:
+            self.stats_lbl.place(x=495, y=65, width=300, height=410)
     
     def connection_monitor(self):
         """Continuously monitor and attempt OBD connection"""
@@ -258,20 +485,19 @@ class AutoConnectGUI:
             if not self.connected:
                 self.connection_attempts += 1
                 status_msg = f"Connecting... ({self.connection_attempts})"
-                self.status.config(text=status_msg, fg="#f39c12")
+                self.tk_actions.put(partial(self.status.config, text=status_msg, fg="#f39c12"))
                 
                 try:
                     if self.obd is None:
-                        self.obd = OBDReader(
-                            port=self.config.get("obd.port"),
-                            baudrate=self.config.get("obd.baudrate")
-                        )
+                        self.obd = create_reader(self.config)
+                        self.attach_reader(self.obd)
                     
                     if self.obd.connect(timeout=5):
                         self.connected = True
                         self.obd.start_async_reading(update_rate=0.1)
-                        self.status.config(text="Connected ●", fg="#2ecc71")
-                        self.start_btn.config(state=tk.NORMAL)
+                        self.tk_actions.put(partial(self.status.config, text="Connected ●",
+                                                    fg="#2ecc71"))
+                        self.tk_actions.put(partial(self.start_btn.config, state=tk.NORMAL))
                     else:
                         time.sleep(3)
                 except Exception as e:
@@ -279,68 +505,196 @@ class AutoConnectGUI:
             else:
                 time.sleep(5)
     
+    def attach_reader(self, obd):
+        """Publish the reader's samples on the bus (and pace it by vehicle state)"""
+        if self.vehicle:
+            obd.pace = self.vehicle.pacer()
+        obd.add_listener(partial(self.bus.publish, SAMPLES))
+        if self.metrics:
+            reader_metrics(self.metrics.registry, obd)
+    
+    def on_sample(self, data):
+        """Receive a sample (runs on the display's bus thread)"""
+        self.latest_sample = data
+        self.governor.on_sample(data)
+        timestamp = data.get("timestamp")
+        self.speed_history.push(data.get("speed_kph"), timestamp)
+        self.accel_history.push(data.get("accel_calculated"), timestamp)
+    
     def start_trip(self):
         if not self.trip_active and self.connected:
-            self.logger.start_trip(datetime.now().strftime("trip_%Y%m%d_%H%M%S"))
-            self.scorer.reset()
+            path = self.pipeline.start_trip(datetime.now().strftime("trip_%Y%m%d_%H%M%S"))
             self.trip_active = True
+            if self.profiler:
+                self.profiler.start(path)
             self.trip_lbl.config(text="RECORDING", fg="#2ecc71")
             self.start_btn.config(state=tk.DISABLED, bg="gray")
             self.stop_btn.config(state=tk.NORMAL, bg="#e74c3c")
     
     def stop_trip(self):
         if self.trip_active:
-            self.logger.end_trip()
+            self.pipeline.end_trip()
             self.trip_active = False
+            if self.profiler:
+                self.profiler.stop()
             self.trip_lbl.config(text="STOPPED", fg="#f39c12")
             self.start_btn.config(state=tk.NORMAL, bg="#2ecc71")
             self.stop_btn.config(state=tk.DISABLED, bg="gray")
     
-    def update_display(self):
-        if not self.running:
+    def get_stats(self):
+        """Get instrumentation from every stage (section -> StatsRegistry snapshot)"""
+        return collect_stats(reader=self.obd, pipeline=self.pipeline, logger=self.logger,
+                             display=self.display_stats, telemetry=self.telemetry,
+                             vehicle=self.vehicle)
+    
+    def toggle_stats(self):
+        """Show or hide the debug overlay"""
+        self.show_stats = not self.show_stats
+        self.stats_updated = 0.0
+        if self.show_stats:
+            self.stats_lbl.place(x=495, y=65, width=300, height=410)
+            self.refresh_stats()
+        else:
+            self.stats_lbl.place_forget()
+    
+    def refresh_stats(self):
+        """Update the overlay text at most once a second"""
+        now = time.monotonic()
+        if now - self.stats_updated < 1.0:
             return
-        
+        self.stats_updated = now
+        self.set_label(self.stats_lbl, "\n".join(overlay_lines(self.get_stats())))
+    
+    def set_label(self, widget, text, fg=None):
+        """Reconfigure a label only if its text or color changed"""
+        state = (text, fg)
+        if self.label_state.get(widget) == state:
+            return
+        self.label_state[widget] = state
+        if fg is None:
+            widget.config(text=text)
+        else:
+            widget.config(text=text, fg=fg)
+    
+    def refresh(self):
+        """Show the latest sample and update widgets whose value changed"""
         if self.connected and self.obd:
             try:
-                self.last_data = self.obd.get_latest_data()
+                sample = self.latest_sample
+                if sample is not self.last_data and isinstance(sample.get("timestamp"), (int, float)):
+                    self.display_stats.record("age.displayed", (time.time() - sample["timestamp"]) * 1e6)
+                self.last_data = sample
                 spd = self.last_data.get("speed_kph", 0) or 0
                 rpm = self.last_data.get("rpm", 0) or 0
                 thr = self.last_data.get("throttle_pct", 0) or 0
                 accel = self.last_data.get("accel_calculated", 0) or 0
                 
-                self.speed.config(text=f"{spd:.0f}")
-                self.rpm.config(text=f"RPM: {rpm:.0f}")
-                self.throttle.config(text=f"Throttle: {thr:.0f}%")
+                self.set_label(self.speed, f"{spd:.0f}")
+                self.set_label(self.rpm, f"RPM: {rpm:.0f}")
+                self.set_label(self.throttle, f"Throttle: {thr:.0f}%")
                 
-                # Update acceleration gauge
+                # Update acceleration gauge and history charts
                 self.accel_gauge.update_needle(accel)
+                self.speed_chart.refresh()
+                self.accel_chart.refresh()
                 
-                if self.trip_active and self.last_data:
-                    score, evt = self.scorer.update(speed_kph=spd, accel=accel)
+                # Scoring and logging run on the bus; just show the results
+                if self.trip_active:
+                    score = self.scorer.current_score
                     grade = self.scorer.get_grade()
-                    self.score_lbl.config(text=f"{score:.0f}")
-                    self.grade.config(text=f"Grade: {grade}")
                     color = "#2ecc71" if grade in ["A","B"] else "#f39c12" if grade=="C" else "#e74c3c"
-                    self.score_lbl.config(fg=color)
+                    self.set_label(self.score_lbl, f"{score:.0f}", color)
+                    self.set_label(self.grade, f"Grade: {grade}")
                     events_total = self.scorer.harsh_brake_count + self.scorer.aggressive_accel_count
-                    self.events.config(text=f"Events: {events_total}")
-                    self.logger.log_data({**self.last_data, "score": score, "event_type": evt or ""})
+                    self.set_label(self.events, f"Events: {events_total}")
             except Exception as e:
                 pass
         else:
             # Not connected - show 0 on gauge
             self.accel_gauge.update_needle(0)
+    
+    def update_display(self):
+        if not self.running:
+            return
         
-        self.root.after(100, self.update_display)
+        self.run_tk_actions()
+        self.wake_pending.clear()
+        self.refresh()
+        if self.show_stats:
+            self.refresh_stats()
+        self.update_job = self.root.after(int(self.governor.interval() * 1000), self.update_display)
+    
+    def run_tk_actions(self):
+        """Run the work queued for the Tk thread by other threads"""
+        while True:
+            try:
+                action = self.tk_actions.get_nowait()
+            except Empty:
+                return
+            action()
+    
+    def poll_tk_actions(self):
+        """Drain queued work and wake-ups between (possibly idle-length) refreshes"""
+        if not self.running:
+            return
+        self.run_tk_actions()
+        if self.wake_pending.is_set():
+            self.on_wake()
+        self.root.after(TK_ACTION_POLL_MS, self.poll_tk_actions)
+    
+    def post_wake(self):
+        """Ask the Tk thread to refresh now (safe from the bus thread)"""
+        self.wake_pending.set()
+    
+    def on_wake(self, event=None):
+        """Replace the pending (possibly idle-length) refresh with an immediate one"""
+        if self.update_job is not None:
+            self.root.after_cancel(self.update_job)
+            self.update_job = None
+        self.update_display()
+    
+    def apply_settings(self, settings):
+        """Apply reloaded scoring thresholds and display settings (config watcher thread)"""
+        self.scorer.configure(settings.scoring)
+        self.governor.configure(settings)
+        configure_burst = getattr(self.obd, 'configure_burst', None)
+        if configure_burst is not None:
+            configure_burst(settings.scoring)
+        
+        # The charts redraw themselves on their next refresh
+        self.speed_history.resize_window(settings.display.history_seconds)
+        self.accel_history.resize_window(settings.display.history_seconds)
+        scoring = settings.scoring
+        self.tk_actions.put(partial(self.accel_gauge.set_thresholds,
+                                    scoring.harsh_brake_threshold,
+                                    scoring.aggressive_accel_threshold))
     
     def quit_app(self):
         self.running = False
+        self.config.stop_watching()
         if self.trip_active:
             self.stop_trip()
+        if self.profiler:
+            self.profiler.stop()
+        if self.telemetry:
+            self.telemetry.stop()
+        if self.metrics:
+            self.metrics.stop()
         if self.connected and self.obd:
             self.obd.disconnect()
+            jitter = getattr(self.obd, 'jitter', None)
+            if jitter is not None:
+                print(jitter.report().splitlines()[0])
+        self.bus.close()
         self.root.quit()
 
-root = tk.Tk()
-app = AutoConnectGUI(root)
-root.mainloop()
+def main():
+    root = tk.Tk()
+    app = AutoConnectGUI(root)
+    root.update()
+    record_first_frame('touch', app.config)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,28 +3,41 @@ OBD-II Reader for Car Monitor - Phase 1.
 Interfaces with Veepeak OBDCheck BLE adapter to read vehicle data.
 """
 
-import obd
 import time
-from typing import Dict, Optional, List, Tuple
+from typing import Callable, Dict, Optional, List, Tuple
 from collections import deque
 from threading import Thread, Lock, Event
 
+from common.realtime import apply_realtime, print_realtime_report, sample_loop
+from common.stats import JitterMeter, StatsRegistry
+
+
+def _obd():
+    """python-obd (which loads pint) takes most of a second to import; load it on first use."""
+    import obd
+    return obd
+
 
 class OBDReader:
     """OBD-II interface for reading vehicle data."""
     
-    def __init__(self, port: str = '/dev/rfcomm0', baudrate: int = 38400):
+    def __init__(self, port: str = '/dev/rfcomm0', baudrate: int = 38400,
+                 realtime: Optional[Dict] = None):
         """
         Initialize OBD-II reader.
         
         Args:
             port: Serial port for OBD adapter
             baudrate: Communication baudrate
+            realtime: apply_realtime() options for the reading thread
         """
         self.port = port
         self.baudrate = baudrate
+        self.realtime = realtime
         self.connection = None
         self.is_connected = False
+        # python-obd's command table, bound on connect (keeps imports off the sample path)
+        self.commands = None
         
         # Data storage
         self.speed_history = deque(maxlen=10)  # (timestamp, speed) pairs
@@ -35,6 +48,22 @@ class OBDReader:
         self.async_thread = None
         self.stop_event = Event()
         self.update_rate = 0.1  # 10 Hz
+        self.jitter = JitterMeter(self.update_rate)
+        
+        # Hot-path instrumentation: per-PID query latency, loop period/jitter
+        self.stats = StatsRegistry()
+        self.stats.histograms['loop.jitter'] = self.jitter.histogram
+        self.stats.histograms['loop.period'] = self.jitter.periods
+        
+        # Callbacks run with every new sample (in the reading thread)
+        self.listeners: List[Callable[[Dict], None]] = []
+        
+        # Duty-cycling hook: sample -> longer interval until the next read, or None
+        self.pace: Optional[Callable[[Dict], Optional[float]]] = None
+        
+        # Event-triggered speed-only bursts (BurstCapture)
+        self.burst = None
+        self._last_published = 0.0
     
     def connect(self, timeout: int = 10) -> bool:
         """
@@ -48,10 +77,13 @@ class OBDReader:
         """
         try:
             print(f"Connecting to OBD-II adapter on {self.port}...")
+            obd = _obd()
+            self.commands = obd.commands
             self.connection = obd.OBD(self.port, baudrate=self.baudrate, timeout=timeout)
             
             if self.connection.is_connected():
                 self.is_connected = True
+                self.stats.count('connects')
                 print("OBD-II connection established!")
                 print(f"Protocol: {self.connection.protocol_name()}")
                 print(f"Vehicle: {self.connection.protocol_id()}")
@@ -74,23 +106,42 @@ class OBDReader:
             self.is_connected = False
             print("OBD-II disconnected")
     
-    def read_speed(self) -> Optional[float]:
+    def _query(self, pid: str, name: str) -> Optional[float]:
         """
-        Read vehicle speed.
+        Query one PID, recording its latency and failures.
         
+        Args:
+            pid: python-obd command name (e.g. 'SPEED')
+            name: Sample field name (used in stats)
+            
         Returns:
-            Speed in km/h or None if failed
+            Value magnitude or None if failed
         """
         if not self.is_connected:
             return None
         
+        start = time.perf_counter()
         try:
-            response = self.connection.query(obd.commands.SPEED)
-            if not response.is_null():
-                return response.value.magnitude
-        except:
-            pass
-        return None
+            response = self.connection.query(getattr(self.commands, pid))
+        except Exception:
+            self.stats.count(f'{name}.failures')
+            return None
+        finally:
+            self.stats.record(f'query.{name}', (time.perf_counter() - start) * 1e6)
+        
+        if response.is_null():
+            self.stats.count(f'{name}.null')
+            return None
+        return response.value.magnitude
+    
+    def read_speed(self) -> Optional[float]:
+        """
+        Read vehicle speed.
+        
+        Returns:
+            Speed in km/h or None if failed
+        """
+        return self._query('SPEED', 'speed_kph')
     
     def read_rpm(self) -> Optional[float]:
         """
@@ -99,16 +150,7 @@ class OBDReader:
         Returns:
             RPM or None if failed
         """
-        if not self.is_connected:
-            return None
-        
-        try:
-            response = self.connection.query(obd.commands.RPM)
-            if not response.is_null():
-                return response.value.magnitude
-        except:
-            pass
-        return None
+        return self._query('RPM', 'rpm')
     
     def read_throttle(self) -> Optional[float]:
         """
@@ -117,16 +159,7 @@ class OBDReader:
         Returns:
             Throttle percentage (0-100) or None if failed
         """
-        if not self.is_connected:
-            return None
-        
-        try:
-            response = self.connection.query(obd.commands.THROTTLE_POS)
-            if not response.is_null():
-                return response.value.magnitude
-        except:
-            pass
-        return None
+        return self._query('THROTTLE_POS', 'throttle_pct')
     
     def read_engine_load(self) -> Optional[float]:
         """
@@ -135,16 +168,7 @@ class OBDReader:
         Returns:
             Engine load percentage (0-100) or None if failed
         """
-        if not self.is_connected:
-            return None
-        
-        try:
-            response = self.connection.query(obd.commands.ENGINE_LOAD)
-            if not response.is_null():
-                return response.value.magnitude
-        except:
-            pass
-        return None
+        return self._query('ENGINE_LOAD', 'engine_load')
     
     def read_all(self) -> Dict:
         """
@@ -153,6 +177,7 @@ class OBDReader:
         Returns:
             Dictionary with all current values
         """
+        start = time.perf_counter()
         data = {
             'timestamp': time.time(),
             'speed_kph': self.read_speed(),
@@ -161,18 +186,100 @@ class OBDReader:
             'engine_load': self.read_engine_load()
         }
         
-        # Calculate acceleration from speed history
+        self._add_acceleration(data)
+        if self.burst is not None and self.burst.observe(data):
+            self.stats.count('bursts')
+        self.stats.record('read_all', (time.perf_counter() - start) * 1e6)
+        self._publish(data)
+        return data
+    
+    def _add_acceleration(self, data: Dict):
+        """Add acceleration from the speed history to a sample."""
         if data['speed_kph'] is not None:
             self.speed_history.append((data['timestamp'], data['speed_kph']))
             data['accel_calculated'] = self.calculate_acceleration()
         else:
             data['accel_calculated'] = None
-        
+    
+    def _publish(self, data: Dict):
+        """Store a sample as the latest and pass it to the listeners."""
         with self.data_lock:
             self.latest_data = data
+        self._last_published = data['timestamp']
+        
+        for listener in self.listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"Error in sample listener: {e}")
+    
+    def sample(self) -> Optional[Dict]:
+        """
+        Take the next reading for the sampling loop.
+        
+        Normally a full read_all(). During a burst, a single speed query:
+        readings go to the burst trace, and a sample (speed fresh, other
+        values held from the last full read) is published only once per
+        update_rate, so listeners see the usual rate.
         
+        Returns:
+            Published sample, or None if this reading only fed the burst
+        """
+        burst = self.burst
+        if burst is None or not burst.active:
+            return self.read_all()
+        
+        timestamp = time.time()
+        speed = self.read_speed()
+        burst.record(timestamp, speed)
+        self.stats.count('burst.readings')
+        if timestamp - self._last_published < self.update_rate:
+            return None
+        
+        data = dict(self.latest_data, timestamp=timestamp, speed_kph=speed)
+        self._add_acceleration(data)
+        self._publish(data)
         return data
     
+    def next_interval(self, data: Optional[Dict]) -> Optional[float]:
+        """
+        Pace hook for the sampling loop.
+        
+        Args:
+            data: Sample returned by sample()
+            
+        Returns:
+            0 during a burst (as fast as the adapter answers), else the
+            duty-cycling interval from self.pace, or None for update_rate
+        """
+        if self.burst is not None and self.burst.active:
+            return 0.0
+        if self.pace is not None and data is not None:
+            return self.pace(data)
+        return None
+    
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """
+        Register a callback for every new sample.
+        
+        Callbacks run in the reading thread, so they must be quick and
+        thread-safe.
+        
+        Args:
+            callback: Function taking the sample dictionary
+        """
+        self.listeners.append(callback)
+    
+    def remove_listener(self, callback: Callable[[Dict], None]):
+        """
+        Unregister a sample callback.
+        
+        Args:
+            callback: Function previously passed to add_listener
+        """
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+    
     def calculate_acceleration(self) -> float:
         """
         Calculate acceleration from speed history.
@@ -209,6 +316,16 @@ class OBDReader:
         with self.data_lock:
             return self.latest_data.copy()
     
+    def configure_burst(self, settings):
+        """
+        Apply reloaded scoring thresholds to burst capture.
+        
+        Args:
+            settings: ScoringSettings
+        """
+        if self.burst is not None:
+            self.burst.configure(settings)
+    
     def start_async_reading(self, update_rate: float = 0.1):
         """
         Start asynchronous data reading in background thread.
@@ -221,6 +338,7 @@ class OBDReader:
             return
         
         self.update_rate = update_rate
+        self.jitter.reset(update_rate)
         self.stop_event.clear()
         self.async_thread = Thread(target=self._async_read_loop, daemon=True)
         self.async_thread.start()
@@ -232,16 +350,27 @@ class OBDReader:
             self.stop_event.set()
             self.async_thread.join(timeout=2.0)
             print("Stopped async OBD-II reading")
+        if self.burst is not None:
+            self.burst.close()
     
     def _async_read_loop(self):
         """Background thread loop for reading OBD-II data."""
-        while not self.stop_event.is_set():
-            try:
-                self.read_all()
-            except Exception as e:
-                print(f"Error in async read: {e}")
-            
-            time.sleep(self.update_rate)
+        if self.realtime:
+            print_realtime_report(apply_realtime(**self.realtime), "OBD reader thread")
+        
+        # read_all() already stores and publishes the sample
+        sample_loop(self.sample, lambda data: None, self.update_rate,
+                    self.stop_event, jitter=self.jitter, pace=self.next_interval)
+    
+    def get_stats(self) -> Dict:
+        """
+        Get reader statistics.
+        
+        Returns:
+            StatsRegistry snapshot: query latency per PID, read_all time,
+            loop period and jitter (ms), connect, failure and null-response counters
+        """
+        return self.stats.snapshot()
     
     def is_vehicle_moving(self, threshold_kph: float = 1.0) -> bool:
         """
@@ -0,0 +1,435 @@
+#!/usr/bin/env python3
+"""
+Trip replay - Phase 1
+Feeds recorded trip logs or raw sample captures through the monitor
+pipeline in place of OBDReader. The pipeline is given a virtual clock that
+follows the recorded time, so a replay runs far faster than real time and
+writes the same rows a live run would; useful for regression-testing
+scoring thresholds and measuring throughput.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from threading import Event, Lock, Thread
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import yaml
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.logger import (
+    iter_trip_rows, parse_number, parse_timestamp, read_trip_header, read_trip_summary
+)
+from common.stats import StatsRegistry
+
+# Columns added by the pipeline; replay feeds only what the reader produced
+PIPELINE_FIELDS = ('score', 'event_type')
+
+# Samples between waits for the bus to empty (queues hold 1000 by default)
+DRAIN_EVERY = 100
+
+
+class VirtualClock:
+    """
+    Clock that follows the replayed samples instead of the wall clock.
+
+    Pass `clock.time` wherever the pipeline takes a clock (Phase1Monitor,
+    TripLogger, DriverScorer, TripPipeline); ReplayReader advances it to
+    each sample's timestamp.
+    """
+
+    def __init__(self, start: float = 0.0):
+        """
+        Initialize clock.
+
+        Args:
+            start: Initial virtual time (epoch seconds)
+        """
+        self.now = start
+        self._lock = Lock()
+
+    def time(self) -> float:
+        """Get the virtual time (epoch seconds)."""
+        return self.now
+
+    def advance(self, seconds: float):
+        """Move the clock forward."""
+        with self._lock:
+            self.now += max(0.0, seconds)
+
+    def advance_to(self, when: float):
+        """Move the clock forward to `when` (never backwards)."""
+        with self._lock:
+            if when > self.now:
+                self.now = when
+
+
+def load_samples(path: str) -> List[Dict[str, Any]]:
+    """
+    Read reader samples from a trip log or a raw capture.
+
+    Args:
+        path: Trip CSV written by TripLogger (full or deadband), or a
+            newline-JSON capture such as the telemetry stream
+
+    Returns:
+        Samples in time order, with numeric values and epoch timestamps;
+        pipeline columns (score, event_type) are removed
+    """
+    samples = []
+    for row in _iter_rows(path):
+        timestamp = parse_timestamp(row.get('timestamp'))
+        if timestamp is None:
+            continue
+        sample = {'timestamp': timestamp}
+        for field, value in row.items():
+            if field in PIPELINE_FIELDS or field == 'timestamp':
+                continue
+            sample[field] = value if isinstance(value, (int, float)) or value is None \
+                else parse_number(value)
+        samples.append(sample)
+    samples.sort(key=lambda s: s['timestamp'])
+    return samples
+
+
+def _iter_rows(path: str) -> Iterator[Dict[str, Any]]:
+    if Path(path).suffix in ('.jsonl', '.json', '.ndjson'):
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    row = json.loads(line)
+                    if isinstance(row, dict) and 'error' not in row:
+                        yield row
+    else:
+        yield from iter_trip_rows(path)
+
+
+class ReplayReader:
+    """
+    Recorded samples with the OBDReader interface.
+
+    Samples keep their recorded timestamps. At speed 0 they are delivered
+    as fast as the pipeline takes them (the reader waits for the bus to
+    empty every DRAIN_EVERY samples, so bounded queues never drop);
+    otherwise at `speed` times the recorded rate.
+    """
+
+    def __init__(self, path: str, speed: float = 0.0, clock: Optional[VirtualClock] = None):
+        """
+        Initialize replay reader.
+
+        Args:
+            path: Trip log or capture (see load_samples)
+            speed: Multiple of real time (0 = as fast as possible)
+            clock: Virtual clock advanced to each sample's timestamp
+        """
+        self.path = path
+        self.port = f"replay:{path}"
+        self.speed = speed
+        self.clock = clock
+        self.is_connected = False
+
+        # Set to bus.drain so accelerated replays wait for the pipeline
+        self.drain: Optional[Callable[[], None]] = None
+
+        self.samples: List[Dict[str, Any]] = []
+        self.position = 0
+        self.latest_data: Dict = {}
+        self.data_lock = Lock()
+        self.listeners: List[Callable[[Dict], None]] = []
+
+        self.async_thread = None
+        self.stop_event = Event()
+        self.finished = Event()
+        self.stats = StatsRegistry()
+
+    def connect(self, timeout: int = 10) -> bool:
+        """
+        Load the recording.
+
+        Returns:
+            True if it contains samples
+        """
+        try:
+            self.samples = load_samples(self.path)
+        except (OSError, ValueError) as e:
+            print(f"❌ Cannot read {self.path}: {e}")
+            return False
+        if not self.samples:
+            print(f"❌ No samples in {self.path}")
+            return False
+        self.position = 0
+        self.finished.clear()
+        if self.clock is not None:
+            self.clock.advance_to(self.samples[0]['timestamp'])
+        self.is_connected = True
+        span = self.samples[-1]['timestamp'] - self.samples[0]['timestamp']
+        print(f"✅ Replaying {len(self.samples)} samples ({span:.0f} s) from {self.path}")
+        return True
+
+    def disconnect(self):
+        """Stop replaying."""
+        self.stop_async_reading()
+        self.is_connected = False
+
+    def read_all(self) -> Dict:
+        """
+        Deliver the next recorded sample.
+
+        Returns:
+            The sample, or an empty dictionary once the recording is exhausted
+        """
+        if self.position >= len(self.samples):
+            self.finished.set()
+            return {}
+        data = dict(self.samples[self.position])
+        self.position += 1
+        if self.clock is not None:
+            self.clock.advance_to(data['timestamp'])
+        with self.data_lock:
+            self.latest_data = data
+        self.stats.count('samples')
+
+        for listener in self.listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"Error in sample listener: {e}")
+        return data
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Register a callback for every new sample."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict], None]):
+        """Unregister a sample callback."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def get_latest_data(self) -> Dict:
+        """Get latest data (thread-safe)."""
+        with self.data_lock:
+            return self.latest_data.copy()
+
+    def get_stats(self) -> Dict:
+        """Get the replayed sample count."""
+        return self.stats.snapshot()
+
+    def is_vehicle_moving(self, threshold_kph: float = 1.0) -> bool:
+        """Check if vehicle is moving."""
+        speed = self.get_latest_data().get('speed_kph')
+        return speed is not None and speed > threshold_kph
+
+    def start_async_reading(self, update_rate: Optional[float] = None):
+        """
+        Replay from a background thread (the recorded timing replaces update_rate).
+
+        Args:
+            update_rate: Ignored; kept for OBDReader compatibility
+        """
+        if self.async_thread and self.async_thread.is_alive():
+            return
+        self.stop_event.clear()
+        self.async_thread = Thread(target=self._replay_loop, name='replay', daemon=True)
+        self.async_thread.start()
+
+    def stop_async_reading(self):
+        """Stop the background thread."""
+        if self.async_thread:
+            self.stop_event.set()
+            self.async_thread.join(timeout=2.0)
+            self.async_thread = None
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every sample has been delivered (and drained).
+
+        Returns:
+            True if the replay finished
+        """
+        return self.finished.wait(timeout)
+
+    def _replay_loop(self):
+        first = self.samples[0]['timestamp'] if self.samples else 0.0
+        started = time.monotonic()
+        while not self.stop_event.is_set() and self.position < len(self.samples):
+            if self.speed > 0:
+                due = started + (self.samples[self.position]['timestamp'] - first) / self.speed
+                delay = due - time.monotonic()
+                if delay > 0 and self.stop_event.wait(delay):
+                    break
+            self.read_all()
+            if self.drain is not None and self.position % DRAIN_EVERY == 0:
+                self.drain()
+        if self.drain is not None:
+            self.drain()
+        if self.position >= len(self.samples):
+            self.finished.set()
+
+    def __repr__(self) -> str:
+        status = "connected" if self.is_connected else "disconnected"
+        return f"ReplayReader(path={self.path}, speed={self.speed}, status={status})"
+
+
+def recording_tolerances(path: str) -> Optional[Dict[str, float]]:
+    """
+    Get the deadband tolerances a trip log was written with.
+
+    Args:
+        path: Trip CSV written by TripLogger
+
+    Returns:
+        Per-field tolerances, or None for a full (every value) log
+    """
+    with open(path, 'rb') as f:
+        meta, _ = read_trip_header(f)
+    if meta.get('mode') != 'deadband':
+        return None
+    return meta.get('tolerances') or {}
+
+
+def _same(expected: Any, actual: Any, tolerance: Optional[float]) -> bool:
+    if expected == actual:
+        return True
+    if tolerance is None:
+        return False
+    a, b = parse_number(expected), parse_number(actual)
+    return a is not None and b is not None and abs(a - b) <= tolerance + 1e-9
+
+
+def compare_trips(expected: str, actual: str, fields: Optional[List[str]] = None,
+                  tolerances: Optional[Dict[str, float]] = None) -> Dict[str, Any]:
+    """
+    Compare the rows of two trip logs.
+
+    Args:
+        expected: Reference trip log (e.g. the recorded live run)
+        actual: Trip log to check (e.g. the replay output)
+        fields: Columns to compare (default: all columns of the reference)
+        tolerances: Per-field numeric tolerance (others must be equal), e.g.
+            recording_tolerances() for a deadband recording
+
+    Returns:
+        Dictionary with row counts, number of differing rows and differences
+        per column
+    """
+    rows_a = list(iter_trip_rows(expected))
+    rows_b = list(iter_trip_rows(actual))
+    fields = fields or (list(rows_a[0]) if rows_a else [])
+    tolerances = tolerances or {}
+    per_field = {field: 0 for field in fields}
+    differing = 0
+    for a, b in zip(rows_a, rows_b):
+        changed = [f for f in fields if not _same(a.get(f), b.get(f), tolerances.get(f))]
+        for field in changed:
+            per_field[field] += 1
+        differing += bool(changed)
+    return {
+        'expected_rows': len(rows_a),
+        'actual_rows': len(rows_b),
+        'differing_rows': differing,
+        'differences': {f: n for f, n in per_field.items() if n},
+    }
+
+
+def replay_trip(config, recording: str, speed: float = 0.0) -> Optional[Dict[str, Any]]:
+    """
+    Replay a recording through Phase1Monitor as one trip.
+
+    Args:
+        config: Config instance (logging.directory receives the trip log)
+        recording: Trip CSV or newline-JSON capture
+        speed: Multiple of real time (0 = as fast as possible)
+
+    Returns:
+        Dictionary with the output path, the trip summary (footer), the sample
+        count, the recorded span and the elapsed seconds, or None if the
+        recording could not be read
+    """
+    from phase1.obd_monitor import Phase1Monitor
+
+    clock = VirtualClock()
+    reader = ReplayReader(recording, speed=speed, clock=clock)
+    monitor = Phase1Monitor(config=config, reader=reader, clock=clock.time)
+    reader.drain = monitor.bus.drain
+    if not monitor.start():
+        return None
+    monitor.start_trip()
+    start = time.perf_counter()
+    monitor.obd.start_async_reading()
+    reader.wait()
+    elapsed = time.perf_counter() - start
+    path = monitor.logger.current_file
+    monitor.stop_trip()
+    monitor.shutdown()
+    return {
+        'path': path,
+        'summary': read_trip_summary(str(path)),
+        'samples': len(reader.samples),
+        'span': reader.samples[-1]['timestamp'] - reader.samples[0]['timestamp'],
+        'elapsed': elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recorded trip through the monitor pipeline")
+    parser.add_argument('recording', help="Trip CSV or newline-JSON sample capture")
+    parser.add_argument('--speed', type=float, default=0,
+                        help="Multiple of real time (default 0 = as fast as possible)")
+    parser.add_argument('--output', default='data/replay', help="Directory for the replayed trip log")
+    parser.add_argument('--set', action='append', default=[], metavar='KEY=VALUE',
+                        help="Override a config value, e.g. scoring.harsh_brake_threshold=-4")
+    parser.add_argument('--compare', action='store_true',
+                        help="Compare the output rows with the recording (trip CSV only)")
+    args = parser.parse_args()
+
+    from common.config import Config
+
+    config = Config(phase=1)
+    config.set('logging.directory', str(Path(args.output).resolve()))
+    # One trip per recording, at the recorded sample rate
+    config.set('vehicle_state.enabled', False)
+    for spec in args.set:
+        key, sep, value = spec.partition('=')
+        if not sep:
+            parser.error(f"--set expects KEY=VALUE, got {spec}")
+        config.set(key, yaml.safe_load(value))
+    Path(config.log_directory).mkdir(parents=True, exist_ok=True)
+
+    result = replay_trip(config, args.recording, speed=args.speed)
+    if result is None:
+        return 1
+    path, samples, span, elapsed = result['path'], result['samples'], result['span'], result['elapsed']
+    print(f"Replayed {samples} samples in {elapsed:.2f} s: {samples / elapsed:.0f} samples/s, "
+          f"{span / elapsed:.0f}x real time")
+    print(f"Output: {path}")
+
+    if not args.compare:
+        return 0
+    # A deadband recording holds each value until it moves past its
+    # tolerance, so only matches within those tolerances can be expected;
+    # score and event_type are recomputed from the held values and can
+    # differ where that rounding crosses a threshold
+    tolerances = recording_tolerances(args.recording)
+    result = compare_trips(args.recording, str(path), tolerances=tolerances)
+    if result['differing_rows'] == 0 and result['expected_rows'] == result['actual_rows']:
+        if tolerances is None:
+            print(f"✅ Output identical to the recording ({result['actual_rows']} rows)")
+        else:
+            print(f"✅ Output matches the recording within its deadband tolerances "
+                  f"({result['actual_rows']} rows)")
+        return 0
+    print(f"❌ {result['differing_rows']} of {result['expected_rows']} rows differ "
+          f"({result['actual_rows']} rows replayed)")
+    for field, count in result['differences'].items():
+        print(f"   {field}: {count}")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Live history for sparkline charts - Phase 1
+Preallocated NumPy ring buffer of per-column min/max plus the bookkeeping
+shared by the pygame and Tk sparkline views.
+"""
+
+import time
+from threading import Lock
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+class SparklineHistory:
+    """
+    Time window of one channel, bucketed into one-pixel columns.
+
+    Each column covers window / columns seconds of sample time, so the
+    chart shows the same span whatever the polling rate (duty-cycled
+    polling while parked, burst capture). Columns without samples are
+    gaps. Samples are folded into a ring of per-column (min, max) values
+    as they arrive, so memory and per-sample work do not depend on the
+    window length. Views call take_updates() once per frame and only draw
+    the columns that changed, scrolling by the number of columns that
+    started in between; when `generation` changes (resize_window()) they
+    redraw from snapshot() instead.
+    """
+
+    def __init__(self, columns: int, window: float = 60.0,
+                 v_min: float = 0.0, v_max: float = 100.0):
+        """
+        Initialize history.
+
+        Args:
+            columns: Chart width in pixels
+            window: Seconds of history shown
+            v_min: Value drawn at the bottom edge
+            v_max: Value drawn at the top edge
+        """
+        self.columns = columns
+        self.seconds_per_column = window / columns
+        self.v_min = v_min
+        self.v_max = v_max
+
+        # Ring of column extremes; NaN marks a column without valid samples
+        self.lows = np.full(columns, np.nan, dtype=np.float32)
+        self.highs = np.full(columns, np.nan, dtype=np.float32)
+        self.count = 0  # Samples pushed in total
+        self.newest: Optional[int] = None  # Absolute index of the newest column
+
+        # Added to time-derived column indexes so they never go backwards
+        # (wall clock stepped back)
+        self._col_offset = 0
+        self.generation = 0  # Bumped when column indexes are renumbered
+
+        self._lock = Lock()
+        self._drawn_count = 0
+        self._drawn_col: Optional[int] = None
+        self._dirty_from: Optional[int] = None  # Oldest column changed since drawn
+
+    @property
+    def window(self) -> float:
+        """Seconds of history shown."""
+        return self.seconds_per_column * self.columns
+
+    @property
+    def last_col(self) -> int:
+        """Absolute index of the newest (possibly partial) column."""
+        return 0 if self.newest is None else self.newest
+
+    def resize_window(self, window: float):
+        """
+        Change the span shown, keeping the samples that still fit (thread-safe).
+
+        Existing columns are merged into the new, wider or narrower ones by
+        their start time. Column indexes change, so views redraw completely.
+
+        Args:
+            window: Seconds of history shown
+        """
+        with self._lock:
+            old_seconds = self.seconds_per_column
+            seconds = window / self.columns
+            if seconds == old_seconds:
+                return
+            kept = []
+            if self.newest is not None:
+                for col in range(self.newest - self.columns + 1, self.newest + 1):
+                    span = self._column(col)
+                    if span is not None:
+                        start = (col - self._col_offset) * old_seconds
+                        kept.append((int(start // seconds), span))
+
+            self.seconds_per_column = seconds
+            self.lows.fill(np.nan)
+            self.highs.fill(np.nan)
+            self._col_offset = 0
+            self.newest = kept[-1][0] if kept else None
+            for col, (lo, hi) in kept:
+                if col > self.newest - self.columns:
+                    i = col % self.columns
+                    self.lows[i] = np.fmin(self.lows[i], lo)
+                    self.highs[i] = np.fmax(self.highs[i], hi)
+
+            self.generation += 1
+            self._drawn_col = None
+            self._dirty_from = None
+
+    def push(self, value: Optional[float], timestamp: Optional[float] = None):
+        """
+        Add a sample (thread-safe, None counts as missing).
+
+        Args:
+            value: Sample value
+            timestamp: Sample time in epoch seconds (default: now)
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        value = np.nan if value is None else value
+        with self._lock:
+            col = int(timestamp // self.seconds_per_column) + self._col_offset
+            newest = self.newest
+            if newest is not None and col < newest:
+                self._col_offset += newest - col
+                col = newest
+
+            i = col % self.columns
+            if col == newest:
+                # fmin/fmax ignore NaN, so gaps do not erase valid samples
+                self.lows[i] = np.fmin(self.lows[i], value)
+                self.highs[i] = np.fmax(self.highs[i], value)
+            else:
+                # Columns skipped without samples become gaps
+                first = col - self.columns + 1 if newest is None else newest + 1
+                first = max(first, col - self.columns + 1)
+                self._clear(first, col)
+                self.lows[i] = value
+                self.highs[i] = value
+                self.newest = col
+                if self._dirty_from is None or first < self._dirty_from:
+                    self._dirty_from = first
+            if self._dirty_from is None or col < self._dirty_from:
+                self._dirty_from = col
+            self.count += 1
+
+    def _clear(self, first: int, end: int):
+        """Mark columns first..end-1 as empty."""
+        if end - first >= self.columns:
+            self.lows.fill(np.nan)
+            self.highs.fill(np.nan)
+            return
+        for col in range(first, end):
+            self.lows[col % self.columns] = np.nan
+            self.highs[col % self.columns] = np.nan
+
+    def scale(self, value: float, height: int) -> int:
+        """Map a value to a pixel row (0 = top), clamped to the chart."""
+        frac = (self.v_max - value) / (self.v_max - self.v_min)
+        return min(height - 1, max(0, int(frac * (height - 1) + 0.5)))
+
+    def _column(self, col: int) -> Optional[Tuple[float, float]]:
+        i = col % self.columns
+        lo = self.lows[i]
+        if np.isnan(lo):
+            return None
+        return float(lo), float(self.highs[i])
+
+    def take_updates(self) -> Tuple[int, int, List[Tuple[int, Optional[Tuple[float, float]]]]]:
+        """
+        Get what changed since the previous call.
+
+        Returns:
+            (shift, last, columns): number of columns to scroll left, index
+            of the newest column, and (column index, (min, max) or None) for
+            every column to redraw
+        """
+        with self._lock:
+            if self.count == self._drawn_count:
+                return 0, self.last_col, []
+
+            last = self.last_col
+            first = last - self.columns + 1
+            if self._drawn_col is None:
+                shift = self.columns
+            else:
+                shift = last - self._drawn_col
+                if self._dirty_from is not None:
+                    first = max(first, self._dirty_from)
+            updates = [(col, self._column(col)) for col in range(first, last + 1)]
+
+            self._drawn_count = self.count
+            self._drawn_col = last
+            self._dirty_from = None
+            return shift, last, updates
+
+    def snapshot(self) -> Tuple[int, List[Tuple[int, Optional[Tuple[float, float]]]]]:
+        """
+        Get every visible column (for a full redraw).
+
+        Returns:
+            (last column index, [(column index, (min, max) or None), ...])
+        """
+        with self._lock:
+            last = self.last_col
+            self._drawn_count = self.count
+            self._drawn_col = last
+            self._dirty_from = None
+            if self.newest is None:
+                return last, []
+
+            first = last - self.columns + 1
+            return last, [(col, self._column(col)) for col in range(first, last + 1)]
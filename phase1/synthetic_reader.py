@@ -0,0 +1,159 @@
+"""
+Synthetic OBD-II data source - Phase 1
+Stands in for OBDReader when no adapter is present (benchmarks, demos).
+"""
+
+import math
+import time
+from threading import Event, Lock, Thread
+from typing import Callable, Dict, List, Optional
+
+from common.realtime import sample_loop
+from common.stats import JitterMeter, StatsRegistry
+
+
+class SyntheticReader:
+    """
+    Deterministic synthetic drive with the OBDReader interface.
+
+    By default samples follow a virtual clock advanced by step(), so the
+    same sequence is produced on every run regardless of how fast the caller
+    is. With realtime=True samples are taken at (and stamped with) the wall
+    clock instead, like a real adapter.
+    """
+
+    def __init__(self, hz: float = 10.0, harsh_every: float = 30.0, realtime: bool = False):
+        """
+        Initialize synthetic reader.
+
+        Args:
+            hz: Sample rate of the virtual clock
+            harsh_every: Seconds between injected harsh-braking events (0 disables)
+            realtime: Sample at the current time instead of a virtual clock
+        """
+        self.hz = hz
+        self.harsh_every = harsh_every
+        self.realtime = realtime
+        self.port = 'synthetic'
+        self.is_connected = False
+
+        self.t = 0.0
+        self.start_time = time.time()
+        self.latest_data: Dict = {}
+        self.data_lock = Lock()
+        self.listeners: List[Callable[[Dict], None]] = []
+
+        self.async_thread = None
+        self.stop_event = Event()
+        self.jitter = JitterMeter(1.0 / hz)
+        self.stats = StatsRegistry()
+        self.stats.histograms['loop.jitter'] = self.jitter.histogram
+        self.stats.histograms['loop.period'] = self.jitter.periods
+
+    def connect(self, timeout: int = 10) -> bool:
+        """Pretend to connect (always succeeds)."""
+        self.is_connected = True
+        return True
+
+    def disconnect(self):
+        """Stop reading and disconnect."""
+        self.stop_async_reading()
+        self.is_connected = False
+
+    def sample(self, t: float) -> Dict:
+        """
+        Compute the sample at virtual time t.
+
+        Args:
+            t: Seconds since the start of the drive
+
+        Returns:
+            Dictionary with the same keys as OBDReader.read_all()
+        """
+        speed = 60 + 30 * math.sin(t / 8)
+        accel = 30 / 8 * math.cos(t / 8) / 3.6
+
+        # Short hard stop every harsh_every seconds
+        if self.harsh_every and t % self.harsh_every < 1.0:
+            accel = -6.5
+
+        return {
+            'timestamp': self.start_time + t,
+            'speed_kph': speed,
+            'rpm': 2000 + 600 * math.sin(t / 5),
+            'throttle_pct': 20 + 15 * math.sin(t / 3),
+            'engine_load': 35 + 10 * math.sin(t / 11),
+            'accel_calculated': accel,
+        }
+
+    def step(self) -> Dict:
+        """
+        Take the next sample and publish it.
+
+        Returns:
+            The new sample
+        """
+        if self.realtime:
+            self.t = time.time() - self.start_time
+        else:
+            self.t += 1.0 / self.hz
+        data = self.sample(self.t)
+        with self.data_lock:
+            self.latest_data = data
+
+        for listener in self.listeners:
+            try:
+                listener(data)
+            except Exception as e:
+                print(f"Error in sample listener: {e}")
+        return data
+
+    # OBDReader compatibility
+    read_all = step
+
+    def add_listener(self, callback: Callable[[Dict], None]):
+        """Register a callback for every new sample."""
+        self.listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[Dict], None]):
+        """Unregister a sample callback."""
+        if callback in self.listeners:
+            self.listeners.remove(callback)
+
+    def get_latest_data(self) -> Dict:
+        """Get latest data (thread-safe)."""
+        with self.data_lock:
+            return self.latest_data.copy()
+
+    def get_stats(self) -> Dict:
+        """Get loop period and jitter statistics (ms)."""
+        return self.stats.snapshot()
+
+    def start_async_reading(self, update_rate: Optional[float] = None):
+        """
+        Produce samples in real time from a background thread.
+
+        Args:
+            update_rate: Interval in seconds (default 1 / hz)
+        """
+        if self.async_thread and self.async_thread.is_alive():
+            return
+        interval = update_rate if update_rate is not None else 1.0 / self.hz
+        self.stop_event.clear()
+        self.jitter.reset(interval)
+        self.async_thread = Thread(target=self._async_loop, args=(interval,), daemon=True)
+        self.async_thread.start()
+
+    def stop_async_reading(self):
+        """Stop the background thread."""
+        if self.async_thread:
+            self.stop_event.set()
+            self.async_thread.join(timeout=2.0)
+
+    def _async_loop(self, interval: float):
+        self.stop_event.wait(interval)
+        sample_loop(self.step, lambda data: None, interval, self.stop_event, jitter=self.jitter)
+
+    def __repr__(self) -> str:
+        status = "connected" if self.is_connected else "disconnected"
+        return f"SyntheticReader(hz={self.hz}, status={status})"
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Sampling jitter benchmark: in-process thread vs isolated acquisition process.
+A synthetic CPU hog (pure-Python threads competing for the GIL, like lane
+detection and UI rendering in Phase 3) runs in the consumer process.
+"""
+
+import argparse
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.realtime import apply_realtime, print_realtime_report, sample_loop
+from common.stats import JitterMeter
+from phase1.acquisition import IsolatedReader
+from phase1.synthetic_reader import SyntheticReader
+
+
+def hog(stop: threading.Event):
+    """Burn CPU in pure Python, holding the GIL as much as possible."""
+    x = 0
+    while not stop.is_set():
+        for i in range(10000):
+            x += i * i
+
+
+def jitter_meter(timestamps, interval: float) -> JitterMeter:
+    """
+    Build a jitter histogram from sample times.
+
+    Args:
+        timestamps: Sample times in seconds
+        interval: Nominal interval in seconds
+
+    Returns:
+        JitterMeter holding one value per sample period
+    """
+    meter = JitterMeter(interval)
+    for t in timestamps:
+        meter.observe(t)
+    return meter
+
+
+def run(mode: str, hogs: int, duration: float, hz: float, realtime=None):
+    """
+    Sample for `duration` seconds with `hogs` busy threads in this process.
+
+    Args:
+        mode: 'thread' (sampling thread in this process) or 'process' (isolated)
+        hogs: Number of CPU hog threads
+        duration: Seconds to sample
+        hz: Sample rate
+        realtime: apply_realtime() options for the sampling thread/process
+
+    Returns:
+        Tuple of (jitter statistics, JitterMeter)
+    """
+    interval = 1.0 / hz
+    timestamps = []
+    collect = lambda data: timestamps.append(data['timestamp'])
+
+    stop_hogs = threading.Event()
+    hog_threads = [threading.Thread(target=hog, args=(stop_hogs,), daemon=True)
+                   for _ in range(hogs)]
+
+    if mode == 'thread':
+        reader = SyntheticReader(hz=hz, realtime=True)
+        stop = threading.Event()
+
+        def sampler_main():
+            if realtime:
+                print_realtime_report(apply_realtime(**realtime), "Sampler thread")
+            sample_loop(reader.read_all, collect, interval, stop)
+
+        sampler = threading.Thread(target=sampler_main, daemon=True)
+        for t in hog_threads:
+            t.start()
+        sampler.start()
+        time.sleep(duration)
+        stop.set()
+        sampler.join()
+    else:
+        reader = IsolatedReader(synthetic=True, realtime=realtime)
+        if not reader.connect():
+            raise RuntimeError("acquisition process failed to start")
+        reader.add_listener(collect)
+        for t in hog_threads:
+            t.start()
+        reader.start_async_reading(update_rate=interval)
+        time.sleep(duration)
+        reader.disconnect()
+
+    stop_hogs.set()
+    for t in hog_threads:
+        t.join()
+
+    meter = jitter_meter(timestamps, interval)
+    s = meter.summary()
+    stats = {
+        'mode': mode,
+        'hogs': hogs,
+        'realtime': bool(realtime),
+        'samples': len(timestamps),
+        'jitter_ms_mean': s['mean'],
+        'jitter_ms_p50': s['p50'],
+        'jitter_ms_p99': s['p99'],
+        'jitter_ms_max': s['max'],
+    }
+    return stats, meter
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Acquisition jitter under CPU load")
+    parser.add_argument('--duration', type=float, default=10.0)
+    parser.add_argument('--hz', type=float, default=10.0)
+    parser.add_argument('--hogs', type=int, nargs='+', default=[0, 3])
+    parser.add_argument('--realtime', action='store_true',
+                        help="Apply SCHED_FIFO/nice, mlockall and pinning to the sampler")
+    parser.add_argument('--cpu', type=int, nargs='+', help="CPUs to pin the sampler to")
+    parser.add_argument('--histogram', action='store_true', help="Print jitter histograms")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    realtime = None
+    if args.realtime:
+        realtime = {'cpus': args.cpu, 'policy': 'fifo', 'priority': 20,
+                    'nice': -10, 'lock_memory': True}
+
+    runs = [run(mode, hogs, args.duration, args.hz, realtime)
+            for hogs in args.hogs for mode in ('thread', 'process')]
+    results = [stats for stats, _ in runs]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Sampling jitter at {args.hz:.0f} Hz over {args.duration:.0f} s")
+    print("-" * 70)
+    for r in results:
+        print(f"{r['mode']:8s} hogs={r['hogs']}  samples {r['samples']:4d}  "
+              f"mean {r['jitter_ms_mean']:6.2f} ms  p50 {r['jitter_ms_p50']:6.2f} ms  "
+              f"p99 {r['jitter_ms_p99']:6.2f} ms  max {r['jitter_ms_max']:6.2f} ms")
+
+    if args.histogram:
+        for stats, meter in runs:
+            print(f"\n{stats['mode']} hogs={stats['hogs']}")
+            print(meter.histogram.format(scale=1e-3, unit=' ms'))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
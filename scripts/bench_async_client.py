@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+asyncio OBD client benchmark against emulated ELM327 adapters.
+Keeps many logical requests in flight across adapters from one thread and
+reports throughput, latency and how many wire cycles served them.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from bench_gateway import start_emulator
+from common.stats import StreamingHistogram
+from phase1.elm327 import PIDS
+from phase1.obd_async import AsyncOBDClient
+
+
+async def run(adapters: int, concurrency: int, duration: float, latency: float) -> dict:
+    """
+    Issue requests from `concurrency` coroutines for `duration` seconds.
+
+    Args:
+        adapters: Number of emulated adapters
+        concurrency: Logical requests kept in flight
+        duration: Seconds to measure
+        latency: Emulated adapter reply delay in seconds
+
+    Returns:
+        Throughput and latency statistics
+    """
+    proc, ports = start_emulator(adapters, latency)
+    clients = [AsyncOBDClient(port) for port in ports]
+    try:
+        if not all(await asyncio.gather(*(c.connect() for c in clients))):
+            raise RuntimeError("emulated adapters failed to initialize")
+
+        latencies = StreamingHistogram()
+        fields = list(PIDS)
+        done = 0
+        end = time.monotonic() + duration
+
+        async def worker():
+            nonlocal done
+            while time.monotonic() < end:
+                client = random.choice(clients)
+                start = time.perf_counter()
+                await client.query_many(random.sample(fields, 2), timeout=5.0)
+                latencies.record((time.perf_counter() - start) * 1e6)
+                done += 1
+
+        cpu0 = time.process_time()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        cpu = time.process_time() - cpu0
+        cycles = sum(c.cycles for c in clients)
+        await asyncio.gather(*(c.disconnect() for c in clients))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    lat = latencies.summary(scale=1e-3)
+    return {
+        'adapters': adapters,
+        'concurrency': concurrency,
+        'requests_per_s': done / duration,
+        'requests_per_cycle': done / cycles if cycles else 0.0,
+        'latency_ms_p50': lat['p50'],
+        'latency_ms_p99': lat['p99'],
+        'cpu_pct': 100 * cpu / duration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="asyncio OBD client under concurrent load")
+    parser.add_argument('--adapters', type=int, default=4)
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 100, 1000, 5000])
+    parser.add_argument('--duration', type=float, default=3.0)
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help="Emulated adapter reply delay in seconds")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [asyncio.run(run(args.adapters, n, args.duration, args.latency))
+               for n in args.concurrency]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"{args.adapters} emulated adapters, {args.latency * 1000:.0f} ms reply delay")
+    print("-" * 78)
+    for r in results:
+        print(f"in flight {r['concurrency']:5d}  requests/s {r['requests_per_s']:9.0f}  "
+              f"per cycle {r['requests_per_cycle']:7.1f}  p50 {r['latency_ms_p50']:6.1f} ms  "
+              f"p99 {r['latency_ms_p99']:6.1f} ms  CPU {r['cpu_pct']:5.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Gateway scaling benchmark against emulated ELM327 adapters.
+Compares the single-threaded selector gateway with one blocking reader
+thread per adapter (the OBDReader model) as the adapter count grows.
+"""
+
+import argparse
+import json
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import serial
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.logger import TripLogger
+from common.scoring import DriverScorer
+from phase1.elm327 import ELM327Session
+from phase1.gateway import OBDGateway
+
+EMULATOR = Path(__file__).parent / 'elm327_emulator.py'
+
+
+def start_emulator(count: int, latency: float):
+    """
+    Start the pty emulator.
+
+    Args:
+        count: Number of adapters
+        latency: Reply delay in seconds
+
+    Returns:
+        (process, list of pty paths)
+    """
+    proc = subprocess.Popen([sys.executable, str(EMULATOR), '--count', str(count),
+                             '--latency', str(latency)],
+                            stdout=subprocess.PIPE, text=True)
+    ports = [proc.stdout.readline().strip() for _ in range(count)]
+    return proc, ports
+
+
+def blocking_reader(port: str, interval: float, stop: threading.Event, counts: list):
+    """Thread-per-adapter baseline: blocking serial reads, one sample at a time."""
+    link = serial.Serial(port, 38400, timeout=1.0)
+    session = ELM327Session()
+
+    def exchange():
+        link.write(session.data_to_send())
+        while True:
+            data = link.read_until(b'>')
+            if not data:
+                return session.check_timeout(0.0)
+            values = session.receive_data(data)
+            if values is not None or session.pending is None:
+                return values
+            link.write(session.data_to_send())
+
+    while session.state == 'init' and not stop.is_set():
+        exchange()
+    deadline = time.monotonic()
+    while not stop.is_set():
+        session.request_sample()
+        if exchange() is not None:
+            counts.append(1)
+        deadline += interval
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            stop.wait(delay)
+        else:
+            deadline = time.monotonic()
+    link.close()
+
+
+def run(mode: str, count: int, duration: float, hz: float, latency: float) -> dict:
+    """
+    Poll `count` emulated adapters for `duration` seconds.
+
+    Args:
+        mode: 'gateway' or 'threads'
+        count: Number of adapters
+        duration: Seconds to measure
+        hz: Sample rate per adapter
+        latency: Emulated adapter reply delay in seconds
+
+    Returns:
+        Throughput and CPU statistics
+    """
+    interval = 1.0 / hz
+    proc, ports = start_emulator(count, latency)
+    try:
+        with tempfile.TemporaryDirectory() as log_dir:
+            if mode == 'gateway':
+                gateway = OBDGateway(update_rate=interval)
+                for i, port in enumerate(ports):
+                    logger = TripLogger(str(Path(log_dir) / f"v{i}"), fsync=False)
+                    gateway.add_vehicle(f"v{i}", port, scorer=DriverScorer(), logger=logger)
+                gateway.start()
+                ready = gateway.wait_ready(timeout=10.0)
+                gateway.start_trip()
+
+                before = sum(c.samples for c in gateway.channels.values())
+                cpu0, t0 = time.process_time(), time.monotonic()
+                time.sleep(duration)
+                cpu1, t1 = time.process_time(), time.monotonic()
+                samples = sum(c.samples for c in gateway.channels.values()) - before
+                timeouts = sum(c.session.timeouts for c in gateway.channels.values())
+
+                gateway.end_trip()
+                gateway.stop()
+                threads = 2  # I/O thread + scoring/logging worker
+            else:
+                stop = threading.Event()
+                counts = []
+                workers = [threading.Thread(target=blocking_reader,
+                                            args=(port, interval, stop, counts), daemon=True)
+                           for port in ports]
+                for t in workers:
+                    t.start()
+                time.sleep(1.0)  # initialization
+                ready = count
+
+                before = len(counts)
+                cpu0, t0 = time.process_time(), time.monotonic()
+                time.sleep(duration)
+                cpu1, t1 = time.process_time(), time.monotonic()
+                samples = len(counts) - before
+                timeouts = 0
+
+                stop.set()
+                for t in workers:
+                    t.join(timeout=2.0)
+                threads = count
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    elapsed = t1 - t0
+    return {
+        'mode': mode,
+        'adapters': count,
+        'ready': ready,
+        'threads': threads,
+        'samples_per_s': samples / elapsed,
+        'expected_per_s': count * hz,
+        'timeouts': timeouts,
+        'cpu_pct': 100 * (cpu1 - cpu0) / elapsed,
+        'cpu_pct_per_adapter': 100 * (cpu1 - cpu0) / elapsed / count,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-adapter gateway scaling")
+    parser.add_argument('--counts', type=int, nargs='+', default=[1, 8, 32, 64])
+    parser.add_argument('--modes', nargs='+', default=['gateway', 'threads'],
+                        choices=['gateway', 'threads'])
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--hz', type=float, default=10.0)
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help="Emulated adapter reply delay in seconds")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    results = [run(mode, count, args.duration, args.hz, args.latency)
+               for count in args.counts for mode in args.modes]
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print(f"Polling emulated adapters at {args.hz:.0f} Hz, {args.latency * 1000:.0f} ms reply delay")
+    print("-" * 78)
+    for r in results:
+        print(f"{r['mode']:8s} adapters {r['adapters']:3d}  threads {r['threads']:3d}  "
+              f"samples/s {r['samples_per_s']:7.1f}/{r['expected_per_s']:<6.0f} "
+              f"CPU {r['cpu_pct']:5.1f}%  ({r['cpu_pct_per_adapter']:.2f}%/adapter)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
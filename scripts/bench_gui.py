@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Headless benchmark for the Phase 1 GUIs.
+Drives the pygame and Tk frontends from a synthetic sample stream and
+reports frame time, CPU per frame and allocations per frame.
+
+    python3 scripts/bench_gui.py --json results.json
+    python3 scripts/bench_gui.py --frontend tk --trip
+
+pygame runs on the SDL dummy video driver. Tk needs an X display; if
+DISPLAY is unset and Xvfb is installed, one is started automatically.
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(PROJECT_ROOT))
+
+from common.config import Config
+from phase1.synthetic_reader import SyntheticReader
+
+
+FRONTENDS = ('pygame', 'tk')
+
+# Frames traced with tracemalloc after the timed run (tracing distorts timing)
+ALLOC_FRAMES = 100
+
+
+def bench_config(log_dir):
+    """Config with logging pointed at the benchmark's temporary directory."""
+    # Set before the app exists: its logger runs crash recovery over the
+    # log directory as soon as it is constructed
+    config = Config(phase=1)
+    config.set('logging.directory', str(log_dir))
+    return config
+
+
+def percentile(values, p):
+    """Nearest-rank percentile of an already sorted list."""
+    return values[min(len(values) - 1, int(p * len(values)))]
+
+
+def measure(frame, frames, warmup, pace_hz, idle=None, prepare=None):
+    """
+    Run and time a frame callback.
+
+    Args:
+        frame: Callable producing one frame
+        frames: Number of timed frames
+        warmup: Untimed frames run first (fills caches)
+        pace_hz: Frame rate to hold between frames (0 = back to back)
+        idle: Callable run while waiting for the next paced frame
+        prepare: Untimed callable run before every frame (e.g. feed a sample)
+
+    Returns:
+        Dictionary with timing and allocation results
+    """
+    prepare = prepare or (lambda: None)
+    for _ in range(warmup):
+        prepare()
+        frame()
+
+    frame_times = []
+    cpu_times = []
+    net_blocks = 0
+    deadline = time.monotonic()
+
+    for _ in range(frames):
+        prepare()
+        blocks_start = sys.getallocatedblocks()
+        cpu_start = time.process_time()
+        start = time.perf_counter()
+        frame()
+        frame_times.append(time.perf_counter() - start)
+        net_blocks += sys.getallocatedblocks() - blocks_start
+
+        # CPU includes event-loop work (e.g. animations) until the next frame
+        if pace_hz:
+            deadline += 1.0 / pace_hz
+            while time.monotonic() < deadline:
+                if idle:
+                    idle()
+                time.sleep(0.001)
+        cpu_times.append(time.process_time() - cpu_start)
+
+    # Transient allocation per frame, traced separately
+    alloc_bytes = []
+    tracemalloc.start()
+    for _ in range(min(frames, ALLOC_FRAMES)):
+        prepare()
+        base = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        frame()
+        alloc_bytes.append(tracemalloc.get_traced_memory()[1] - base)
+    tracemalloc.stop()
+
+    frame_times.sort()
+    alloc_bytes.sort()
+    return {
+        'frames': frames,
+        'frame_ms': {
+            'mean': 1000 * sum(frame_times) / frames,
+            'p50': 1000 * percentile(frame_times, 0.50),
+            'p95': 1000 * percentile(frame_times, 0.95),
+            'p99': 1000 * percentile(frame_times, 0.99),
+            'max': 1000 * frame_times[-1],
+        },
+        'cpu_ms_per_frame': 1000 * sum(cpu_times) / frames,
+        'net_blocks_per_frame': net_blocks / frames,
+        'alloc_bytes_per_frame': {
+            'mean': sum(alloc_bytes) / len(alloc_bytes),
+            'p95': percentile(alloc_bytes, 0.95),
+        },
+    }
+
+
+def bench_pygame(args, log_dir):
+    """Benchmark the pygame GUI (update + draw per frame)."""
+    os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+    os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+    import pygame
+    from phase1.obd_monitor_gui import Phase1GUI
+
+    reader = SyntheticReader(hz=args.hz)
+    app = Phase1GUI(obd=reader, config=bench_config(log_dir))
+    app.connected = reader.connect()
+    if args.trip:
+        app.start_trip()
+
+    def prepare():
+        # Publish one sample and let the bus subscribers handle it
+        reader.step()
+        app.bus.drain()
+
+    def frame():
+        app.update()
+        app.draw()
+
+    try:
+        return measure(frame, args.frames, args.warmup, args.pace, prepare=prepare)
+    finally:
+        if args.trip:
+            app.stop_trip()
+        app.bus.close()
+        pygame.quit()
+
+
+def start_xvfb():
+    """Start Xvfb if there is no display. Returns the process or None."""
+    if os.environ.get('DISPLAY') or not shutil.which('Xvfb'):
+        return None
+    display = ':99'
+    proc = subprocess.Popen(['Xvfb', display, '-screen', '0', '800x480x24'],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    os.environ['DISPLAY'] = display
+    time.sleep(1.0)
+    return proc
+
+
+def bench_tk(args, log_dir):
+    """Benchmark the Tk touch GUI (refresh + event loop per frame)."""
+    import tkinter as tk
+    from phase1.obd_monitor_touch import AutoConnectGUI
+
+    root = tk.Tk()
+    reader = SyntheticReader(hz=args.hz)
+    app = AutoConnectGUI(root, obd=reader, config=bench_config(log_dir))
+    # Stop the GUI's own refresh loop; the benchmark drives frames itself
+    app.running = False
+    if app.update_job is not None:
+        root.after_cancel(app.update_job)
+    if args.trip:
+        app.start_trip()
+    root.update()
+
+    def prepare():
+        reader.step()
+        app.bus.drain()
+
+    def frame():
+        app.refresh()
+        root.update()
+
+    try:
+        return measure(frame, args.frames, args.warmup, args.pace, idle=root.update,
+                       prepare=prepare)
+    finally:
+        if args.trip:
+            app.stop_trip()
+        app.bus.close()
+        root.destroy()
+
+
+def environment():
+    """Describe what the numbers were measured on."""
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        commit = ''
+    return {
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'system': platform.system(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless GUI frame benchmark")
+    parser.add_argument('--frontend', choices=FRONTENDS + ('all',), default='all')
+    parser.add_argument('--frames', type=int, default=300)
+    parser.add_argument('--warmup', type=int, default=30)
+    parser.add_argument('--hz', type=float, default=10.0, help="Synthetic sample rate")
+    parser.add_argument('--pace', type=float, default=0.0,
+                        help="Hold this frame rate between frames (0 = back to back)")
+    parser.add_argument('--trip', action='store_true', help="Benchmark with an active trip")
+    parser.add_argument('--json', metavar='FILE', help="Write results as JSON ('-' for stdout)")
+    args = parser.parse_args()
+
+    frontends = FRONTENDS if args.frontend == 'all' else (args.frontend,)
+    results = {
+        'benchmark': 'gui',
+        'environment': environment(),
+        'params': {k: getattr(args, k) for k in ('frames', 'warmup', 'hz', 'pace', 'trip')},
+        'frontends': {},
+    }
+
+    xvfb = start_xvfb() if 'tk' in frontends else None
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            for name in frontends:
+                if name == 'tk' and not os.environ.get('DISPLAY'):
+                    results['frontends'][name] = {'skipped': "no X display (install Xvfb)"}
+                    continue
+                bench = bench_pygame if name == 'pygame' else bench_tk
+                results['frontends'][name] = bench(args, Path(tmp))
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    if args.json:
+        text = json.dumps(results, indent=2)
+        if args.json == '-':
+            print(text)
+        else:
+            Path(args.json).write_text(text + '\n')
+
+    if args.json != '-':
+        print(f"GUI frame benchmark ({results['environment']['commit']})")
+        print("-" * 60)
+        for name, r in results['frontends'].items():
+            if 'skipped' in r:
+                print(f"{name:7s} skipped: {r['skipped']}")
+                continue
+            ft = r['frame_ms']
+            print(f"{name:7s} frame p50 {ft['p50']:.3f} ms  p95 {ft['p95']:.3f} ms  "
+                  f"p99 {ft['p99']:.3f} ms  max {ft['max']:.3f} ms")
+            print(f"{'':7s} cpu {r['cpu_ms_per_frame']:.3f} ms/frame  "
+                  f"alloc {r['alloc_bytes_per_frame']['mean']:.0f} B/frame  "
+                  f"net blocks {r['net_blocks_per_frame']:+.1f}/frame")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
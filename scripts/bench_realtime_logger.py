@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark for RealTimeLogger.
+Measures messages/sec for the caller (enqueue) and end-to-end (on disk).
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.logger import RealTimeLogger
+
+
+# Minimum end-to-end rate for the Pi (a desktop x86 CPU does ~450k msg/s)
+TARGET_MSGS_PER_SEC = 50000
+
+
+def run(count: int, max_bytes: int) -> dict:
+    """
+    Log `count` messages and time enqueue and end-to-end throughput.
+
+    Args:
+        count: Number of messages
+        max_bytes: Rotation size (0 disables rotation)
+
+    Returns:
+        Dictionary with throughput results
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        logger = RealTimeLogger(Path(tmp) / 'bench.log', buffer_size=500,
+                                flush_interval=0.5, max_bytes=max_bytes)
+
+        start = time.perf_counter()
+        for i in range(count):
+            logger.log(f"speed=88.0 rpm=2100 throttle=23.5 seq={i}")
+        enqueued = time.perf_counter()
+        logger.flush()
+        written = time.perf_counter()
+
+        stats = logger.get_stats()
+        logger.close()
+
+    return {
+        'messages': count,
+        'enqueue_msgs_per_sec': count / (enqueued - start),
+        'end_to_end_msgs_per_sec': count / (written - start),
+        'bytes_written': stats['bytes'],
+        'flushes': stats['flushes'],
+        'rotations': stats['rotations'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="RealTimeLogger throughput benchmark")
+    parser.add_argument('--count', type=int, default=200000)
+    parser.add_argument('--max-bytes', type=int, default=0)
+    parser.add_argument('--target', type=float, default=TARGET_MSGS_PER_SEC)
+    args = parser.parse_args()
+
+    result = run(args.count, args.max_bytes)
+
+    print("RealTimeLogger throughput")
+    print("-" * 50)
+    print(f"Messages:       {result['messages']}")
+    print(f"Enqueue:        {result['enqueue_msgs_per_sec']:,.0f} msg/s")
+    print(f"End-to-end:     {result['end_to_end_msgs_per_sec']:,.0f} msg/s")
+    print(f"Flushes:        {result['flushes']}")
+    print(f"Rotations:      {result['rotations']}")
+    print(f"Target:         {args.target:,.0f} msg/s")
+
+    if result['end_to_end_msgs_per_sec'] < args.target:
+        print("❌ Below throughput target")
+        return 1
+
+    print("✅ Throughput target met")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Per-frame cost of the history sparklines for growing history windows.
+Uses the pygame view on the SDL dummy driver; cost should stay flat.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+import pygame
+
+from phase1.gui_render import SparklineView
+from phase1.sparkline import SparklineHistory
+from phase1.synthetic_reader import SyntheticReader
+
+
+def run(window: float, frames: int, width: int) -> dict:
+    """
+    Time push + incremental update for one history window.
+
+    Args:
+        window: Seconds of history
+        frames: Frames to time (one 10 Hz sample per frame)
+        width: Chart width in pixels
+
+    Returns:
+        Dictionary with per-frame timing in microseconds
+    """
+    reader = SyntheticReader()
+    history = SparklineHistory(width, window, v_min=0, v_max=160)
+    view = SparklineView(history, pygame.Rect(0, 0, width, 40), (50, 150, 220))
+
+    def push():
+        sample = reader.step()
+        history.push(sample['speed_kph'], sample['timestamp'])
+
+    # Fill the whole window first so the ring buffer has wrapped
+    for _ in range(int(window * reader.hz) + 1):
+        push()
+    view.rebuild()
+
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        push()
+        view.update()
+        times.append(time.perf_counter() - start)
+
+    rebuild_start = time.perf_counter()
+    view.rebuild()
+    rebuild = time.perf_counter() - rebuild_start
+
+    times.sort()
+    return {
+        'window_s': window,
+        'samples_per_column': history.seconds_per_column * reader.hz,
+        'frame_us_mean': 1e6 * sum(times) / len(times),
+        'frame_us_p95': 1e6 * times[int(0.95 * (len(times) - 1))],
+        'rebuild_us': 1e6 * rebuild,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sparkline per-frame cost vs history window")
+    parser.add_argument('--windows', type=float, nargs='+', default=[60, 600, 3600])
+    parser.add_argument('--frames', type=int, default=2000)
+    parser.add_argument('--width', type=int, default=180)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    pygame.display.init()
+    pygame.display.set_mode((args.width, 40))
+    results = [run(w, args.frames, args.width) for w in args.windows]
+    pygame.quit()
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+
+    print("Sparkline cost per frame (push + incremental update)")
+    print("-" * 60)
+    for r in results:
+        print(f"window {r['window_s']:6.0f} s  per column {r['samples_per_column']:4.0f}  "
+              f"mean {r['frame_us_mean']:6.1f} us  p95 {r['frame_us_p95']:6.1f} us  "
+              f"full rebuild {r['rebuild_us']:8.1f} us")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
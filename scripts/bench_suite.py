@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""
+Core pipeline benchmark suite with regression tracking.
+Times the hot paths (scoring, acceleration, trip logging, config lookup,
+OBDReader against an emulated adapter) and an end-to-end replay of a
+one-hour synthetic trip. Results are written as JSON; with a baseline the
+run fails when a tracked metric regresses beyond the threshold.
+
+Timings only compare on the same hardware, so no baseline is shipped.
+First run on a machine (e.g. the Pi in the car):
+
+    python scripts/bench_suite.py --save-baseline
+
+records data/benchmarks/baseline.json. Later runs compare against it
+automatically (or against --baseline FILE); without one they only report.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import deque
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.bus import DataBus, SAMPLES
+from common.config import Config
+from common.logger import TripLogger
+from common.pipeline import TripPipeline
+from common.scoring import DriverScorer, calculate_acceleration
+from phase1.synthetic_reader import SyntheticReader
+
+PROJECT_ROOT = Path(__file__).parent.parent
+RESULTS_DIR = PROJECT_ROOT / 'data' / 'benchmarks'
+DEFAULT_BASELINE = RESULTS_DIR / 'baseline.json'
+
+# name -> (function(args) -> {metric: value}, {tracked metric: 'lower' or 'higher' is better})
+BENCHMARKS = {}
+
+
+def benchmark(name, **tracked):
+    """Register a benchmark and the metrics checked against the baseline."""
+    def register(func):
+        BENCHMARKS[name] = (func, tracked)
+        return func
+    return register
+
+
+def time_per_call(func, number: int, repeat: int) -> float:
+    """
+    Median time of one call over `repeat` runs of `number` calls.
+
+    Returns:
+        Microseconds per call
+    """
+    runs = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - start) / number)
+    return statistics.median(runs) * 1e6
+
+
+def synthetic_samples(count: int, hz: float = 10.0):
+    """Samples of a deterministic synthetic drive."""
+    reader = SyntheticReader(hz=hz)
+    return [reader.step() for _ in range(count)]
+
+
+@benchmark('scorer_update', us_per_call='lower')
+def bench_scorer_update(args):
+    samples = synthetic_samples(1000)
+    scorer = DriverScorer()
+    index = 0
+
+    def update():
+        nonlocal index
+        data = samples[index % len(samples)]
+        scorer.update(speed_kph=data['speed_kph'], accel=data['accel_calculated'])
+        index += 1
+
+    return {'us_per_call': time_per_call(update, args.number, args.repeat)}
+
+
+@benchmark('calculate_acceleration', us_per_call='lower')
+def bench_calculate_acceleration(args):
+    history = deque(((s['timestamp'], s['speed_kph']) for s in synthetic_samples(10)), maxlen=10)
+    return {'us_per_call': time_per_call(partial(calculate_acceleration, history),
+                                         args.number, args.repeat)}
+
+
+@benchmark('logger_log_data', us_per_row='lower')
+def bench_logger_log_data(args):
+    samples = synthetic_samples(1000)
+    for data in samples:
+        data.update(score=100.0, event_type='')
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        # fsync off: disk flush latency is device noise, not code cost
+        logger = TripLogger(log_dir, build_pyramid=True, fsync=False)
+        logger.start_trip('bench')
+        index = 0
+
+        def log():
+            nonlocal index
+            logger.log_data(dict(samples[index % len(samples)]))
+            index += 1
+
+        result = time_per_call(log, args.number, args.repeat)
+        logger.end_trip()
+    return {'us_per_row': result}
+
+
+@benchmark('config_get', us_per_call='lower')
+def bench_config_get(args):
+    config = Config(phase=1)
+    return {'us_per_call': time_per_call(partial(config.get, 'scoring.harsh_brake_threshold'),
+                                         args.number, args.repeat),
+            'us_per_attribute': time_per_call(lambda: config.settings.scoring.harsh_brake_threshold,
+                                              args.number, args.repeat)}
+
+
+@benchmark('obd_read_all', ms_per_read='lower')
+def bench_obd_read_all(args):
+    from bench_gateway import start_emulator
+    from phase1.obd_reader import OBDReader
+
+    proc, ports = start_emulator(1, latency=0.0)
+    try:
+        reader = OBDReader(port=ports[0])
+        if not reader.connect(timeout=10):
+            raise RuntimeError("python-obd could not connect to the emulated adapter")
+        try:
+            reads = max(20, args.number // 100)
+            ms = time_per_call(reader.read_all, reads, args.repeat) / 1000
+            stats = reader.get_stats()['histograms']
+        finally:
+            reader.disconnect()
+    finally:
+        proc.terminate()
+        proc.wait()
+    return {'ms_per_read': ms, 'query_ms_p99': stats['query.speed_kph']['p99']}
+
+
+@benchmark('trip_replay_1h', seconds='lower', samples_per_s='higher')
+def bench_trip_replay(args):
+    samples = 3600 * 10  # one hour at 10 Hz
+    reader = SyntheticReader(hz=10.0)
+
+    with tempfile.TemporaryDirectory() as log_dir:
+        bus = DataBus()
+        logger = TripLogger(log_dir, build_pyramid=True, fsync=False)
+        pipeline = TripPipeline(bus, DriverScorer(), logger)
+        reader.add_listener(partial(bus.publish, SAMPLES))
+        pipeline.start_trip('replay')
+
+        start = time.perf_counter()
+        for i in range(samples):
+            reader.step()
+            if i % 500 == 499:
+                # Stay below the queue bound so nothing is dropped
+                bus.drain()
+        summary = pipeline.end_trip()
+        elapsed = time.perf_counter() - start
+
+        stats = pipeline.get_stats()['counters']
+        bus.close()
+
+    dropped = stats['scorer.dropped'] + stats['logger.dropped']
+    if dropped or summary['data_points'] != samples:
+        raise RuntimeError(f"replay lost samples: {summary['data_points']}/{samples} logged, "
+                           f"{dropped} dropped")
+    return {'seconds': elapsed, 'samples_per_s': samples / elapsed}
+
+
+def git_commit() -> str:
+    """Short hash of HEAD, or 'unknown' outside a git checkout."""
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> list:
+    """
+    Find tracked metrics that regressed.
+
+    Args:
+        results: Current results ({benchmark: {metric: value}})
+        baseline: Baseline results in the same format
+        threshold: Allowed relative change (0.2 = 20%)
+
+    Returns:
+        List of (benchmark, metric, baseline value, current value, change)
+    """
+    regressions = []
+    for name, (_, tracked) in BENCHMARKS.items():
+        for metric, better in tracked.items():
+            old = baseline.get(name, {}).get(metric)
+            new = results.get(name, {}).get(metric)
+            if old is None or new is None or old == 0:
+                continue
+            change = (new - old) / old
+            if (better == 'lower' and change > threshold) or \
+                    (better == 'higher' and change < -threshold):
+                regressions.append((name, metric, old, new, change))
+    return regressions
+
+
+def machine_info() -> dict:
+    """Hardware and interpreter the results were measured on."""
+    return {
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or 'unknown',
+        'cpus': os.cpu_count(),
+        'platform': platform.platform(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Core pipeline benchmark suite")
+    parser.add_argument('benchmarks', nargs='*',
+                        help=f"Benchmarks to run (default: all of {', '.join(BENCHMARKS)})")
+    parser.add_argument('--number', type=int, default=5000, help="Calls per timing run")
+    parser.add_argument('--repeat', type=int, default=5, help="Timing runs (median is kept)")
+    parser.add_argument('--output', help="Results file (default: data/benchmarks/<time>.json)")
+    parser.add_argument('--baseline',
+                        help=f"Baseline results to compare against (default: {DEFAULT_BASELINE} "
+                             f"if it exists)")
+    parser.add_argument('--save-baseline', metavar='FILE', nargs='?', const=str(DEFAULT_BASELINE),
+                        help=f"Also write results as a baseline (default: {DEFAULT_BASELINE})")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Allowed regression as a fraction (default 0.2 = 20%%)")
+    args = parser.parse_args()
+    if args.baseline and not Path(args.baseline).exists():
+        parser.error(f"baseline not found: {args.baseline}")
+
+    names = args.benchmarks or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(unknown)}")
+    results = {}
+    for name in names:
+        func, _ = BENCHMARKS[name]
+        print(f"Running {name}...", flush=True)
+        results[name] = func(args)
+
+    report = {
+        'commit': git_commit(),
+        'time': datetime.now().isoformat(),
+        **machine_info(),
+        'results': results,
+    }
+
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"bench_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2))
+    if args.save_baseline:
+        Path(args.save_baseline).parent.mkdir(parents=True, exist_ok=True)
+        Path(args.save_baseline).write_text(json.dumps(report, indent=2))
+        print(f"✅ Baseline saved to {args.save_baseline}")
+
+    print()
+    print(f"Benchmark results ({report['commit']})")
+    print("-" * 60)
+    for name, metrics in results.items():
+        values = "  ".join(f"{metric} {value:.3f}" for metric, value in metrics.items())
+        print(f"{name:24s} {values}")
+    print(f"\nResults written to {output}")
+
+    if args.save_baseline:
+        return 0
+    baseline_file = Path(args.baseline) if args.baseline else DEFAULT_BASELINE
+    if not baseline_file.exists():
+        print(f"⚠️  No baseline for this machine yet; record one with --save-baseline "
+              f"(writes {DEFAULT_BASELINE})")
+        return 0
+
+    baseline = json.loads(baseline_file.read_text())
+    measured_on = {key: baseline.get(key) for key in ('machine', 'processor', 'cpus', 'python')}
+    here = {key: report[key] for key in measured_on}
+    if measured_on != here:
+        print(f"⚠️  Baseline was measured on {measured_on}, this run on {here}; "
+              f"timings may not be comparable")
+    regressions = compare(results, baseline['results'], args.threshold)
+    if not regressions:
+        print(f"✅ No regressions beyond {args.threshold:.0%} against {baseline.get('commit', '?')}")
+        return 0
+    for name, metric, old, new, change in regressions:
+        print(f"❌ {name}.{metric}: {old:.3f} -> {new:.3f} ({change:+.0%})")
+    return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Telemetry server benchmark.
+Publishes synthetic samples at a high rate to many subscribers, some of
+which never read, and reports publish cost on the acquisition side, what
+each kind of client received, and the server's CPU use.
+"""
+
+import argparse
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.bus import DataBus, SAMPLES
+from common.stats import StreamingHistogram
+from common.telemetry import TelemetryServer
+from phase1.synthetic_reader import SyntheticReader
+
+
+def reader_thread(address: str, request: dict, counts: dict, key: str, stop: threading.Event):
+    """Client that reads everything it is sent."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(address)
+    sock.sendall(json.dumps(request).encode() + b'\n')
+    sock.settimeout(0.2)
+    buffer = b''
+    while not stop.is_set():
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not data:
+            break
+        buffer += data
+        lines = buffer.count(b'\n')
+        buffer = buffer[buffer.rfind(b'\n') + 1:]
+        counts[key] = counts.get(key, 0) + lines
+    sock.close()
+
+
+def run(clients: int, stalled: int, hz: float, duration: float) -> dict:
+    """
+    Stream for `duration` seconds.
+
+    Args:
+        clients: Reading clients (half full rate and all channels, half
+            speed only at 5 Hz)
+        stalled: Clients that connect and never read
+        hz: Samples published per second
+        duration: Seconds to publish
+
+    Returns:
+        Publish cost, deliveries per client kind and server statistics
+    """
+    address = os.path.join(tempfile.mkdtemp(), 'telemetry.sock')
+    bus = DataBus()
+    server = TelemetryServer(bus, address=address)
+    server.start()
+
+    stop = threading.Event()
+    counts = {}
+    threads = []
+    for i in range(clients):
+        key, request = ('full', {}) if i % 2 == 0 else ('decimated', {'channels': ['speed_kph'],
+                                                                      'rate': 5})
+        t = threading.Thread(target=reader_thread, args=(address, request, counts, key, stop),
+                             daemon=True)
+        t.start()
+        threads.append(t)
+    idle = []
+    for _ in range(stalled):
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(address)
+        idle.append(sock)
+    while len(server.clients) < clients + stalled:
+        time.sleep(0.01)
+
+    reader = SyntheticReader(hz=hz)
+    publish = StreamingHistogram()
+    published = 0
+    cpu0 = time.thread_time()
+    server_cpu0 = time.process_time()
+    end = time.monotonic() + duration
+    deadline = time.monotonic()
+    while time.monotonic() < end:
+        data = reader.step()
+        start = time.perf_counter()
+        bus.publish(SAMPLES, data)
+        publish.record((time.perf_counter() - start) * 1e6)
+        published += 1
+        deadline += 1.0 / hz
+        delay = deadline - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+    publisher_cpu = time.thread_time() - cpu0
+    process_cpu = time.process_time() - server_cpu0
+    time.sleep(0.5)
+
+    stats = server.get_stats()['counters']
+    stop.set()
+    for t in threads:
+        t.join()
+    server.stop()
+    for sock in idle:
+        sock.close()
+    bus.close()
+
+    readers = max(1, (clients + 1) // 2)
+    return {
+        'published': published,
+        'publish_us_p50': publish.percentile(50),
+        'publish_us_p99': publish.percentile(99),
+        'full_received_per_client': counts.get('full', 0) / readers,
+        'decimated_received_per_client': counts.get('decimated', 0) / max(1, clients // 2),
+        'dropped': stats.get('dropped', 0),
+        'other_cpu_pct': 100 * (process_cpu - publisher_cpu) / duration,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Telemetry server under many subscribers")
+    parser.add_argument('--clients', type=int, default=16, help="Reading clients")
+    parser.add_argument('--stalled', type=int, default=4, help="Clients that never read")
+    parser.add_argument('--hz', type=float, default=100.0, help="Samples published per second")
+    parser.add_argument('--duration', type=float, default=5.0)
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    args = parser.parse_args()
+
+    result = run(args.clients, args.stalled, args.hz, args.duration)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return 0
+
+    print(f"{args.clients} reading + {args.stalled} stalled clients, {args.hz:.0f} Hz "
+          f"for {args.duration:.0f} s ({result['published']} samples)")
+    print("-" * 60)
+    print(f"bus.publish p50/p99:        {result['publish_us_p50']:.1f} / "
+          f"{result['publish_us_p99']:.1f} us")
+    print(f"full-rate client received:  {result['full_received_per_client']:.0f}")
+    print(f"5 Hz client received:       {result['decimated_received_per_client']:.0f}")
+    print(f"lines dropped (stalled):    {result['dropped']}")
+    print(f"bus + server + client CPU:  {result['other_cpu_pct']:.1f}%")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+ELM327 adapter emulator on pseudo-terminals.
+Creates any number of ptys that answer like an ELM327 with a synthetic
+drive, so the gateway can be exercised and benchmarked without hardware.
+Prints one pty path per adapter, then serves until interrupted.
+"""
+
+import argparse
+import heapq
+import os
+import selectors
+import signal
+import sys
+import time
+import tty
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from phase1.elm327 import ELM327Responder
+from phase1.synthetic_reader import SyntheticReader
+
+
+class EmulatedAdapter:
+    """One pty pair plus the adapter-side protocol state."""
+
+    def __init__(self, index: int, latency: float):
+        """
+        Create the pty.
+
+        Args:
+            index: Adapter number (offsets the synthetic drive)
+            latency: Seconds before each reply, like the vehicle bus round trip
+        """
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        os.set_blocking(self.master, False)
+        self.path = os.ttyname(self.slave)
+        self.latency = latency
+
+        drive = SyntheticReader()
+        offset = index * 7.0
+        self.responder = ELM327Responder(lambda t: drive.sample(t + offset))
+
+    def close(self):
+        os.close(self.master)
+        os.close(self.slave)
+
+
+def serve(adapters, stop):
+    """
+    Answer commands on all adapters from one thread.
+
+    Args:
+        adapters: EmulatedAdapter list
+        stop: Callable returning True to stop
+    """
+    selector = selectors.DefaultSelector()
+    for adapter in adapters:
+        selector.register(adapter.master, selectors.EVENT_READ, adapter)
+
+    # Delayed replies: (due, seq, adapter, bytes)
+    pending = []
+    seq = 0
+    while not stop():
+        timeout = min(0.5, max(0.0, pending[0][0] - time.monotonic())) if pending else 0.5
+        for key, _ in selector.select(timeout):
+            adapter = key.data
+            try:
+                data = os.read(adapter.master, 4096)
+            except (BlockingIOError, OSError):
+                continue
+            for _, reply in adapter.responder.receive_data(data):
+                seq += 1
+                heapq.heappush(pending, (time.monotonic() + adapter.latency, seq, adapter, reply))
+
+        now = time.monotonic()
+        while pending and pending[0][0] <= now:
+            _, _, adapter, reply = heapq.heappop(pending)
+            try:
+                os.write(adapter.master, reply)
+            except (BlockingIOError, OSError):
+                pass  # client not reading; the adapter would drop it too
+    selector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emulate ELM327 adapters on ptys")
+    parser.add_argument('--count', type=int, default=1, help="Number of adapters")
+    parser.add_argument('--latency', type=float, default=0.005,
+                        help="Reply delay in seconds (real adapters: 0.02-0.05)")
+    args = parser.parse_args()
+
+    adapters = [EmulatedAdapter(i, args.latency) for i in range(args.count)]
+    for adapter in adapters:
+        print(adapter.path)
+    sys.stdout.flush()
+
+    stopped = []
+    signal.signal(signal.SIGINT, lambda sig, frame: stopped.append(sig))
+    signal.signal(signal.SIGTERM, lambda sig, frame: stopped.append(sig))
+    try:
+        serve(adapters, lambda: bool(stopped))
+    finally:
+        for adapter in adapters:
+            adapter.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
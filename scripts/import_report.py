@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Startup import report.
+Imports each frontend module in a fresh interpreter with -X importtime and
+reports total import time and the slowest modules, plus config load time
+with and without the precompiled cache. Heavy modules (numpy, obd/pint,
+yaml, http.server) should not appear before the first frame.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.config import load_yaml
+
+ROOT = Path(__file__).parent.parent
+FRONTENDS = ['phase1.obd_monitor_touch', 'phase1.obd_monitor_gui', 'phase1.obd_monitor']
+# numpy is expected: the sparkline charts need it for the first frame
+HEAVY = ['obd', 'pint', 'yaml', 'http.server']
+
+
+def import_times(module: str) -> dict:
+    """
+    Import a module in a fresh interpreter and collect -X importtime output.
+
+    Args:
+        module: Dotted module name
+
+    Returns:
+        Dict of module name -> (self us, cumulative us), in import order
+    """
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        last = result.stderr.strip().splitlines()[-1:] or ['unknown error']
+        raise RuntimeError(last[0])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        own, cumulative, name = line[len('import time:'):].split('|')
+        times[name.strip()] = (int(own), int(cumulative))
+    return times
+
+
+def config_load_times(config_file: Path, repeat: int = 20) -> tuple:
+    """
+    Time config loading without and with the cache.
+
+    Args:
+        config_file: YAML config path
+        repeat: Loads to average over
+
+    Returns:
+        (uncached ms, cached ms)
+    """
+    results = []
+    for use_cache in (False, True):
+        if use_cache:
+            load_yaml(config_file)  # Populate the cache
+        start = time.perf_counter()
+        for _ in range(repeat):
+            load_yaml(config_file, use_cache=use_cache)
+        results.append((time.perf_counter() - start) / repeat * 1000)
+    return tuple(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Frontend import and config load times")
+    parser.add_argument('modules', nargs='*', default=FRONTENDS, help="Modules to import")
+    parser.add_argument('--top', type=int, default=10, help="Slowest modules to list")
+    args = parser.parse_args()
+
+    for module in args.modules:
+        print(f"\n{module}")
+        try:
+            times = import_times(module)
+        except RuntimeError as e:
+            print(f"❌ Import failed: {e}")
+            continue
+        total = times.get(module, (0, 0))[1]
+        print(f"  Total import: {total / 1000:.1f} ms ({len(times)} modules)")
+        slowest = sorted(times.items(), key=lambda item: item[1][1], reverse=True)
+        for name, (own, cumulative) in [s for s in slowest if s[0] != module][:args.top]:
+            print(f"  {cumulative / 1000:8.1f} ms cumulative  {own / 1000:7.1f} ms self  {name}")
+        loaded = [name for name in HEAVY if name in times]
+        if loaded:
+            print(f"  ⚠️  Heavy modules loaded at import: {', '.join(loaded)}")
+        else:
+            print("  ✅ No heavy modules loaded at import")
+
+    config_file = ROOT / 'config' / 'phase1_config.yaml'
+    if config_file.exists():
+        with tempfile.TemporaryDirectory() as tmp:
+            # Time a copy so the real cache is left alone
+            copy = Path(tmp) / config_file.name
+            copy.write_bytes(config_file.read_bytes())
+            uncached, cached = config_load_times(copy)
+        print(f"\nConfig load: {uncached:.2f} ms from YAML, {cached:.2f} ms from cache")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Telemetry stream client.
+Connects to a running monitor's telemetry server and prints the samples it
+streams, optionally limited to some channels and a maximum rate.
+"""
+
+import argparse
+import json
+import socket
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from common.config import Config
+
+
+def connect(address: str) -> socket.socket:
+    """
+    Connect to a telemetry server.
+
+    Args:
+        address: Unix socket path or host:port
+
+    Returns:
+        Connected socket
+    """
+    if ':' in address:
+        host, port = address.rsplit(':', 1)
+        return socket.create_connection((host, int(port)))
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.connect(address)
+    return sock
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the live telemetry stream")
+    parser.add_argument('--address', help="Unix socket path or host:port "
+                                          "(default: telemetry.address in config)")
+    parser.add_argument('--channels', nargs='+', help="Channels to receive (default: all)")
+    parser.add_argument('--rate', type=float, default=0,
+                        help="Maximum samples per second (default: every sample)")
+    parser.add_argument('--count', type=int, help="Exit after this many samples")
+    args = parser.parse_args()
+
+    address = args.address or Config(phase=1).get('telemetry.address', '/tmp/carmonitor.sock')
+    try:
+        sock = connect(str(address))
+    except OSError as e:
+        print(f"❌ Cannot connect to {address}: {e}")
+        return 1
+
+    request = {'channels': args.channels, 'rate': args.rate}
+    sock.sendall(json.dumps(request).encode() + b'\n')
+
+    received = 0
+    try:
+        for line in sock.makefile('rb'):
+            message = json.loads(line)
+            if 'error' in message:
+                print(f"❌ Server: {message['error']}")
+                return 1
+            print(json.dumps(message), flush=True)
+            received += 1
+            if args.count and received >= args.count:
+                break
+    except KeyboardInterrupt:
+        pass
+    finally:
+        sock.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
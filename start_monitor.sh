@@ -1,22 +1,20 @@
 #!/bin/bash
 # Auto-start script for BMW X5 Car Monitor
 
-# Wait for display to be ready
-sleep 5
-
-# Wait for OBD device (up to 30 seconds)
-echo "Waiting for OBD device..."
-for i in {1..30}; do
-    if [ -e /dev/ttyUSB0 ]; then
-        echo "OBD device found!"
-        break
-    fi
-    sleep 1
-done
-
 # Set display
 export DISPLAY=:0
 
+# Wait for display to be ready (up to 10 seconds)
+if command -v xset >/dev/null 2>&1; then
+    for i in {1..100}; do
+        xset q >/dev/null 2>&1 && break
+        sleep 0.1
+    done
+fi
+
+# No wait for the OBD device: the GUI shows its first frame immediately and
+# keeps retrying the adapter in the background
+
 # Change to project directory
 cd /home/rays/carmonitor
 
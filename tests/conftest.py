@@ -0,0 +1,104 @@
+"""
+Shared test fixtures: emulated ELM327 adapters on ptys and polling for
+conditions reached on other threads.
+"""
+
+import os
+import select
+import time
+import tty
+from threading import Event, Thread
+
+import pytest
+
+from phase1.elm327 import ELM327Responder
+from phase1.synthetic_reader import SyntheticReader
+
+
+class PtyAdapter:
+    """
+    Emulated adapter on a pty.
+
+    Answered from its own thread, or from an asyncio event loop when one
+    is given (for clients running on that loop).
+    """
+
+    def __init__(self, loop=None):
+        self.master, self.slave = os.openpty()
+        tty.setraw(self.slave)
+        self.path = os.ttyname(self.slave)
+        self.responder = ELM327Responder(SyntheticReader().sample)
+        self.answering = True
+        self.loop = loop
+        self.thread = None
+        self.stop = Event()
+        if loop is None:
+            self.thread = Thread(target=self._serve, daemon=True)
+            self.thread.start()
+        else:
+            os.set_blocking(self.master, False)
+            loop.add_reader(self.master, self._on_readable)
+
+    def _answer(self, data: bytes):
+        if self.answering:
+            for _, reply in self.responder.receive_data(data):
+                os.write(self.master, reply)
+
+    def _serve(self):
+        while not self.stop.is_set():
+            ready, _, _ = select.select([self.master], [], [], 0.05)
+            if not ready:
+                continue
+            try:
+                data = os.read(self.master, 4096)
+            except OSError:
+                return
+            self._answer(data)
+
+    def _on_readable(self):
+        try:
+            data = os.read(self.master, 4096)
+        except OSError:
+            return
+        self._answer(data)
+
+    def unplug(self):
+        """Close both ends of the pty, as pulling the adapter would."""
+        if self.master is None:
+            return
+        if self.thread is not None:
+            self.stop.set()
+            self.thread.join()
+        else:
+            self.loop.remove_reader(self.master)
+        os.close(self.master)
+        os.close(self.slave)
+        self.master = self.slave = None
+
+
+@pytest.fixture
+def pty_adapter():
+    """Factory for PtyAdapters (pass a loop for a loop-driven one); unplugs them afterwards."""
+    adapters = []
+
+    def make(loop=None):
+        adapter = PtyAdapter(loop)
+        adapters.append(adapter)
+        return adapter
+
+    yield make
+    for adapter in adapters:
+        adapter.unplug()
+
+
+def _wait_for(condition, timeout=5.0, interval=0.01):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(interval)
+    return condition()
+
+
+@pytest.fixture
+def wait_for():
+    """Poll a condition until it holds or times out; returns its last value."""
+    return _wait_for
@@ -0,0 +1,196 @@
+"""
+Tests for BurstCapture (trigger, pre-event ring, burst endings, traces)
+and OBDReader.sample publishing at the usual rate during a burst.
+"""
+
+import csv
+import math
+from types import SimpleNamespace
+
+import pytest
+
+from phase1.burst_capture import BurstCapture
+from phase1.obd_reader import OBDReader
+
+T0 = 1_700_000_000.0
+
+# Binary-exact steps, so window and cut-off comparisons are not rounding-sensitive
+STEP = 0.125
+FAST = 1 / 32
+
+
+def sample(t, accel=0.0, speed=60.0):
+    return {'timestamp': T0 + t, 'speed_kph': speed, 'accel_calculated': accel,
+            'rpm': 2000.0, 'throttle_pct': 20.0}
+
+
+def cruise(burst, seconds):
+    """Observe normal-rate samples for some seconds; returns the next time."""
+    n = int(seconds / STEP)
+    for i in range(n):
+        assert not burst.observe(sample(i * STEP))
+    return n * STEP
+
+
+def capture(tmp_path, **kwargs):
+    options = dict(harsh_brake_threshold=-5.0, aggressive_accel_threshold=3.0, precursor=0.6,
+                   pre_seconds=1.0, post_seconds=1.0, max_seconds=4.0, max_rate=64.0,
+                   sample_rate=16.0, accel_window=0.125)
+    options.update(kwargs)
+    return BurstCapture(str(tmp_path), **options)
+
+
+@pytest.mark.parametrize('accel, reason', [(-3.5, 'brake_precursor'), (-6.0, 'harsh_brake'),
+                                           (2.0, 'accel_precursor'), (4.0, 'aggressive_accel')])
+def test_trigger_reason(tmp_path, accel, reason):
+    burst = capture(tmp_path)
+    t = cruise(burst, 1.0)
+    assert burst.observe(sample(t, accel=accel))
+    assert (burst.active, burst.reason, burst.started) == (True, reason, T0 + t)
+
+    # Already bursting: later samples do not trigger again
+    assert not burst.observe(sample(t + STEP, accel=accel))
+    assert burst.bursts == 1
+
+
+def test_small_acceleration_does_not_trigger(tmp_path):
+    burst = capture(tmp_path)
+    assert not burst.observe(sample(0, accel=-2.9))
+    assert not burst.observe(sample(STEP, accel=None))
+    assert not burst.active
+
+
+def test_pre_rows_within_pre_seconds(tmp_path):
+    # The ring holds 2 s at 8 Hz, only the last pre_seconds are kept
+    burst = capture(tmp_path)
+    t = cruise(burst, 3.0)
+    burst.observe(sample(t, accel=-6.0, speed=55.0))
+
+    times = [row[0] - T0 for row in burst._pre]
+    assert times == [t - 1.0 + i * STEP for i in range(9)]
+    assert burst._pre[-1] == (T0 + t, 55.0, -6.0, 2000.0, 20.0)
+
+
+def braking_burst(tmp_path, **kwargs):
+    burst = capture(tmp_path, **kwargs)
+    t = cruise(burst, 1.0)
+    burst.observe(sample(t, accel=-6.0))
+    return burst, T0 + t
+
+
+def test_window_acceleration(tmp_path):
+    burst, start = braking_burst(tmp_path)
+    speed = 60.0
+    accels = []
+    for i in range(8):
+        accels.append(burst.record(start + i * FAST, speed - i * FAST * 4.0 * 3.6))
+
+    # Known once a reading is accel_window (4 readings) after the first
+    assert accels[:4] == [None] * 4
+    assert all(math.isclose(a, -4.0) for a in accels[4:])
+
+    # A failed query adds nothing
+    assert burst.record(start + 8 * FAST, None) is None
+    assert burst.burst_count == 8
+
+
+def test_burst_extended_while_past_precursor(tmp_path):
+    burst, start = braking_burst(tmp_path)
+    assert burst.extend_until == start + 1.0
+
+    # Braking at 4 m/s² for 2 s, then steady
+    speed = 60.0
+    t = 0.0
+    while t < 2.0:
+        burst.record(start + t, speed)
+        speed -= FAST * 4.0 * 3.6
+        t += FAST
+    assert burst.extend_until > start + 2.0
+
+    # Steady: ends post_seconds after the window last showed braking
+    while burst.active:
+        ended_at = start + t
+        burst.record(ended_at, speed)
+        t += FAST
+    assert ended_at == burst.extend_until
+    assert start + 3.0 <= ended_at < start + 3.25
+    assert burst.truncated == 0
+    burst.close()
+
+
+def test_burst_ends_at_max_seconds(tmp_path):
+    burst, start = braking_burst(tmp_path, max_seconds=3.0)
+    speed = 100.0
+    t = 0.0
+    while burst.active:
+        burst.record(start + t, speed)
+        speed -= FAST * 4.0 * 3.6  # keeps extending the burst
+        t += FAST
+    assert t - FAST == 3.0
+    assert burst.reason == 'harsh_brake'
+    assert burst.truncated == 0
+    burst.close()
+
+
+def test_full_buffer_ends_burst(tmp_path):
+    burst, start = braking_burst(tmp_path, max_seconds=1.0, max_rate=8.0)
+    assert burst.burst_size == 8
+    for i in range(8):
+        burst.record(start + i * 0.001, 60.0)
+
+    assert not burst.active
+    assert burst.truncated == 1
+    burst.close()
+
+
+def test_trace_file(tmp_path):
+    burst, start = braking_burst(tmp_path)
+    for i in range(6):
+        burst.record(start + i * FAST, 60.0 - i * FAST * 4.0 * 3.6)
+    burst.observe(sample(1.0, accel=None) | {'rpm': 1500.0, 'throttle_pct': None})
+    burst.close()
+
+    [path] = tmp_path.glob('event_*_harsh_brake.csv')
+    with open(path, newline='') as f:
+        rows = list(csv.DictReader(f))
+    pre = [row for row in rows if row['phase'] == 'pre']
+    burst_rows = [row for row in rows if row['phase'] == 'burst']
+
+    assert len(pre) == 9
+    assert pre[-1]['accel_calculated'] == '-6'
+    assert [float(row['timestamp']) for row in burst_rows] == \
+        [round(start + i * FAST, 3) for i in range(6)]
+    assert [row['accel_calculated'] for row in burst_rows[:4]] == [''] * 4
+    assert [float(row['accel_calculated']) for row in burst_rows[4:]] == \
+        pytest.approx([-4.0, -4.0])
+    # Burst rows hold the last full sample's rpm and throttle
+    assert {(row['rpm'], row['throttle_pct']) for row in burst_rows} == {('1500', '')}
+
+
+def test_reader_publishes_once_per_update_rate(tmp_path, monkeypatch):
+    clock = SimpleNamespace(now=T0)
+    monkeypatch.setattr('phase1.obd_reader.time',
+                        SimpleNamespace(time=lambda: clock.now, perf_counter=lambda: 0.0))
+    reader = OBDReader()
+    reader.update_rate = 0.125
+    reader.burst = capture(tmp_path, post_seconds=10.0, max_seconds=10.0)
+    reader.read_speed = lambda: 60.0
+    published = []
+    reader.add_listener(published.append)
+
+    reader._publish(sample(0) | {'engine_load': 30.0})
+    reader.burst.observe(sample(0, accel=-6.0))
+    assert reader.next_interval(None) == 0.0
+
+    # 1 s of speed-only readings at 32 Hz
+    returned = []
+    for i in range(1, 33):
+        clock.now = T0 + i * FAST
+        returned.append(reader.sample())
+
+    assert [data['timestamp'] - T0 for data in published[1:]] == [i * 0.125 for i in range(1, 9)]
+    assert sum(data is not None for data in returned) == 8
+    assert published[-1]['engine_load'] == 30.0  # held from the last full read
+    assert reader.burst.burst_count == 32
+    assert reader.stats.counters['burst.readings'] == 32
+    reader.burst.close()
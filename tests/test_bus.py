@@ -0,0 +1,128 @@
+"""
+Tests for DataBus subscriptions (drop-oldest queues, errors, close) and
+TripPipeline scoring and logging every sample once.
+"""
+
+import time
+from threading import Event
+
+from common.bus import DataBus, SAMPLES, SCORED, Subscription
+from common.logger import TripLogger, iter_trip_rows
+from common.pipeline import TripPipeline
+from common.scoring import DriverScorer
+
+
+def blocked_subscription(maxsize):
+    """Subscription whose callback holds the first message until released."""
+    received = []
+    release = Event()
+
+    def callback(message):
+        release.wait()
+        received.append(message)
+
+    subscription = Subscription(SAMPLES, callback, maxsize=maxsize)
+    subscription.put(0)
+    deadline = time.monotonic() + 5.0
+    while not subscription.queue.empty() and time.monotonic() < deadline:
+        time.sleep(0.01)  # until the thread holds message 0
+    return subscription, received, release
+
+
+def test_full_queue_drops_oldest():
+    subscription, received, release = blocked_subscription(maxsize=3)
+    for i in range(1, 7):
+        subscription.put(i)
+
+    assert subscription.dropped == 3
+    assert subscription.get_stats()['queued'] == 3
+
+    release.set()
+    subscription.drain()
+    assert received == [0, 4, 5, 6]
+    assert subscription.delivered == 4
+    subscription.close()
+
+
+def test_close_does_not_hang_on_full_queue():
+    subscription, received, release = blocked_subscription(maxsize=2)
+    subscription.put(1)
+    subscription.put(2)
+
+    start = time.monotonic()
+    subscription.close(timeout=0.1)
+    assert time.monotonic() - start < 1.0
+
+    # The stop marker took the oldest slot; the thread ends once unblocked
+    release.set()
+    subscription._thread.join(timeout=5.0)
+    assert not subscription._thread.is_alive()
+    assert received == [0, 2]
+
+
+def test_raising_callback_keeps_thread():
+    received = []
+
+    def callback(message):
+        if message['n'] % 2:
+            raise ValueError(message['n'])
+        received.append(message['n'])
+
+    bus = DataBus()
+    subscription = bus.subscribe(SAMPLES, callback)
+    for i in range(6):
+        bus.publish(SAMPLES, {'n': i})
+    bus.drain()
+
+    assert subscription.errors == 3
+    assert subscription.delivered == 3
+    assert received == [0, 2, 4]
+    assert subscription._thread.is_alive()
+    bus.close()
+    assert not subscription._thread.is_alive()
+
+
+class CountingScorer(DriverScorer):
+    """Scorer counting its updates, slow enough for samples to queue up."""
+
+    def __init__(self):
+        super().__init__()
+        self.updates = 0
+
+    def update(self, speed_kph, accel, **kwargs):
+        self.updates += 1
+        time.sleep(0.001)
+        return super().update(speed_kph, accel, **kwargs)
+
+
+def sample(i):
+    return {'timestamp': 1_700_000_000.0 + i * 0.1, 'speed_kph': float(i), 'rpm': 2000.0}
+
+
+def test_end_trip_scores_and_logs_every_queued_sample(tmp_path):
+    bus = DataBus()
+    scorer = CountingScorer()
+    pipeline = TripPipeline(bus, scorer, TripLogger(str(tmp_path), fsync=False))
+    scored = []
+    bus.subscribe(SCORED, scored.append, maxsize=1000)
+    path = pipeline.start_trip('bus_test')
+
+    for i in range(200):
+        bus.publish(SAMPLES, sample(i))
+    summary = pipeline.end_trip()
+
+    # One score per sample, and none of the queued ones lost at the end
+    assert scorer.updates == 200
+    bus.drain()
+    assert [s['speed_kph'] for s in scored] == [float(i) for i in range(200)]
+    rows = list(iter_trip_rows(path))
+    assert [float(row['speed_kph']) for row in rows] == [float(i) for i in range(200)]
+    assert all(row['score'] for row in rows)
+    assert summary['data_points'] == 200
+    assert pipeline.get_stats()['counters']['scorer.dropped'] == 0
+
+    # Samples after the trip are not scored
+    bus.publish(SAMPLES, sample(200))
+    bus.drain()
+    assert scorer.updates == 200
+    bus.close()
@@ -0,0 +1,101 @@
+"""
+Tests for config reload (typed live sections and restart-only changes)
+and the parsed-config cache.
+"""
+
+import datetime
+import marshal
+import os
+
+import yaml
+
+from common.config import Config, cache_path, load_yaml
+
+
+def write_config(path, **display):
+    data = {
+        'obd': {'port': '/dev/ttyUSB0'},
+        'display': {'width': 480, 'height': 320, 'history_seconds': 60, **display},
+        'scoring': {'harsh_brake_threshold': -5.0},
+    }
+    path.write_text(yaml.safe_dump(data))
+
+
+def test_reload_applies_live_display_settings(tmp_path, capsys):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file)
+    config = Config(str(config_file))
+    applied = []
+    config.on_reload(applied.append)
+
+    write_config(config_file, history_seconds=30, width=800)
+    assert config.reload()
+
+    assert applied[0].display.history_seconds == 30.0
+    assert config.get('display.history_seconds') == 30
+    # The window size is typed and stored, but only used at start-up
+    assert 'display.width take effect after restart' in capsys.readouterr().out
+
+
+def test_invalid_reload_keeps_settings(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file)
+    config = Config(str(config_file))
+
+    write_config(config_file, history_seconds='long')
+    assert not config.reload()
+    assert config.settings.display.history_seconds == 60.0
+
+
+def test_cache_hit_skips_yaml(tmp_path, monkeypatch):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file)
+    data = load_yaml(config_file)
+    assert cache_path(config_file).exists()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("YAML parsed on a cache hit")
+
+    monkeypatch.setattr(yaml, 'safe_load', fail)
+    assert load_yaml(config_file) == data
+
+
+def test_cache_invalidated_by_mtime_and_size(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file, history_seconds=60)
+    load_yaml(config_file)
+
+    # Same size, newer mtime
+    write_config(config_file, history_seconds=30)
+    stat = config_file.stat()
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_yaml(config_file)['display']['history_seconds'] == 30
+
+    # Different size, mtime forced back to the cached one
+    stat = config_file.stat()
+    write_config(config_file, history_seconds=120)
+    os.utime(config_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert load_yaml(config_file)['display']['history_seconds'] == 120
+
+
+def test_corrupt_cache_falls_back_to_yaml(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    write_config(config_file)
+    load_yaml(config_file)
+    cache_path(config_file).write_bytes(b'\x00not marshal')
+
+    assert load_yaml(config_file)['obd']['port'] == '/dev/ttyUSB0'
+    # The cache was rewritten with the parsed file
+    _, cached = marshal.loads(cache_path(config_file).read_bytes())
+    assert cached['obd']['port'] == '/dev/ttyUSB0'
+
+
+def test_unmarshallable_values_are_not_cached(tmp_path):
+    config_file = tmp_path / 'config.yaml'
+    config_file.write_text('trip:\n  since: 2024-05-01\n')  # YAML date
+
+    data = load_yaml(config_file)
+
+    assert data['trip']['since'] == datetime.date(2024, 5, 1)
+    assert not cache_path(config_file).exists()
+    assert list(cache_path(config_file).parent.glob('*.tmp')) == []
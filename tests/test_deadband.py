@@ -0,0 +1,85 @@
+"""
+Tests for deadband (change-only) trip logs: readers must get back every
+logged tick, with values within the configured tolerances.
+"""
+
+import math
+
+from common.logger import TripLogger, iter_trip_rows, parse_number
+from common.query import TripQuery
+
+TOLERANCES = {'speed_kph': 0.5, 'throttle_pct': 1.0, 'rpm': 25, 'engine_load': 2.0,
+              'accel_calculated': 0.1, 'score': 0.1}
+
+
+def make_samples(count=300):
+    """A drive with steady stretches, ramps, noise, events and dropped values."""
+    samples = []
+    for i in range(count):
+        speed = 50.0 if i < 100 else 50.0 + (i - 100) * 0.2
+        samples.append({
+            'timestamp': 1_700_000_000.0 + i * 0.1 + (i % 7) * 0.0013,
+            'speed_kph': speed + 0.1 * math.sin(i),
+            'throttle_pct': None if 150 <= i < 160 else 20.0 + (i // 50),
+            'rpm': 1500 + speed * 20,
+            'engine_load': 30.0,
+            'accel_calculated': 0.0 if i < 100 else 0.55,
+            'event_type': 'harsh_brake' if i == 200 else '',
+            'score': 100.0 - i * 0.01
+        })
+    return samples
+
+
+def write_trip(log_dir, samples, deadband):
+    logger = TripLogger(str(log_dir), deadband=deadband, max_interval=10.0, fsync=False)
+    path = logger.start_trip('trip')
+    for sample in samples:
+        logger.log_data(dict(sample))
+    logger.end_trip()
+    return path
+
+
+def test_round_trip_within_tolerance(tmp_path):
+    samples = make_samples()
+    path = write_trip(tmp_path, samples, TOLERANCES)
+    rows = list(iter_trip_rows(path))
+
+    assert len(rows) == len(samples)
+    for sample, row in zip(samples, rows):
+        assert float(row['timestamp']) == sample['timestamp']
+        assert row['event_type'] == sample['event_type']
+        for field, tolerance in TOLERANCES.items():
+            value = parse_number(row[field])
+            if sample[field] is None:
+                assert value is None
+            else:
+                assert abs(value - sample[field]) <= tolerance + 1e-9
+
+
+def test_zero_tolerance_is_exact(tmp_path):
+    samples = make_samples()
+    full = list(iter_trip_rows(write_trip(tmp_path / 'full', samples, None)))
+    deadband = list(iter_trip_rows(write_trip(tmp_path / 'deadband', samples, {})))
+
+    assert deadband == full
+
+
+def test_deadband_log_is_smaller(tmp_path):
+    samples = make_samples()
+    full = write_trip(tmp_path / 'full', samples, None)
+    deadband = write_trip(tmp_path / 'deadband', samples, TOLERANCES)
+
+    with open(full, 'rb') as f:
+        full_size = len(f.read())
+    with open(deadband, 'rb') as f:
+        deadband_size = len(f.read())
+    assert deadband_size < full_size * 0.6
+
+
+def test_query_sees_every_tick(tmp_path):
+    samples = make_samples()
+    write_trip(tmp_path, samples, TOLERANCES)
+
+    result = TripQuery.from_directory(str(tmp_path)).aggregate({'speed_kph': ['count']},
+                                                               workers=1)
+    assert result.aggregates['speed_kph']['count'] == len(samples)
@@ -0,0 +1,62 @@
+"""
+Tests for OBDGateway losing an adapter: the failed port leaves the selector
+and the other vehicles keep sampling.
+"""
+
+import os
+import time
+
+from phase1.gateway import OBDGateway
+
+
+def start_gateway(adapters):
+    gateway = OBDGateway(update_rate=0.05, timeout=1.0)
+    for i, adapter in enumerate(adapters):
+        gateway.add_vehicle(f'van{i}', adapter.path)
+    assert gateway.start() == len(adapters)
+    assert gateway.wait_ready(5.0) == len(adapters)
+    return gateway
+
+
+def test_unplugged_adapter_leaves_selector(pty_adapter, wait_for):
+    adapters = [pty_adapter(), pty_adapter()]
+    gateway = start_gateway(adapters)
+    try:
+        lost, kept = gateway.channels['van0'], gateway.channels['van1']
+        fd = lost.fd
+        adapters[0].unplug()
+
+        assert wait_for(lambda: lost.error is not None)
+        assert lost.serial is None
+        assert fd not in gateway.selector.get_map()
+
+        # The other vehicle is still sampled
+        samples = kept.samples
+        assert wait_for(lambda: kept.samples > samples + 3)
+    finally:
+        gateway.stop()
+
+
+def test_end_of_file_fails_channel(monkeypatch, pty_adapter, wait_for):
+    adapter = pty_adapter()
+    gateway = start_gateway([adapter])
+    try:
+        channel = gateway.channels['van0']
+        fd = channel.fd
+
+        # A port that reports end of file stays readable forever
+        read = os.read
+        monkeypatch.setattr('phase1.gateway.os.read',
+                            lambda f, size: b'' if f == fd else read(f, size))
+        os.write(adapter.master, b'>')
+
+        assert wait_for(lambda: channel.error is not None)
+        assert 'closed' in channel.error
+        assert fd not in gateway.selector.get_map()
+
+        # The I/O thread is idle again instead of spinning on the fd
+        start = time.process_time()
+        time.sleep(0.3)
+        assert time.process_time() - start < 0.15
+    finally:
+        gateway.stop()
@@ -0,0 +1,36 @@
+"""
+Tests for FrameGovernor: the stationary ceiling and wake-on-touch.
+"""
+
+import time
+
+from common.governor import FrameGovernor
+from common.vehicle_state import IDLE, MOVING
+
+
+def stationary_governor():
+    governor = FrameGovernor(max_hz=10.0, idle_hz=1.0, idle_after=3.0)
+    governor.on_vehicle_state(MOVING, IDLE)
+    return governor
+
+
+def test_stationary_caps_refresh_rate():
+    governor = stationary_governor()
+    governor.wake()  # e.g. values changed while parked
+    assert governor.current_hz() == 1.0
+
+
+def test_touch_lifts_ceiling_while_stationary():
+    governor = stationary_governor()
+    governor.touch()
+    assert governor.current_hz() == 10.0
+
+    # The ceiling returns once the touch is idle_after old
+    governor.last_touch = governor.last_activity = time.monotonic() - 4.0
+    assert governor.current_hz() == 1.0
+
+
+def test_moving_removes_ceiling():
+    governor = stationary_governor()
+    governor.on_vehicle_state(IDLE, MOVING)
+    assert governor.current_hz() == 10.0
@@ -0,0 +1,111 @@
+"""
+Tests for the pygame retained-mode helpers: glyph cache eviction and
+dirty-rectangle bookkeeping (run on SDL's dummy video driver).
+"""
+
+import os
+
+import pytest
+
+pygame = pytest.importorskip('pygame')
+
+from phase1.gui_render import GlyphCache, RetainedRenderer  # noqa: E402
+
+
+class StubFont:
+    """Font stand-in counting renders."""
+
+    def __init__(self):
+        self.rendered = []
+
+    def render(self, text, antialias, color):
+        self.rendered.append(text)
+        return (text, color)
+
+
+def test_cache_hit_does_not_render_again():
+    font = StubFont()
+    cache = GlyphCache(maxsize=4)
+
+    first = cache.render(font, '42', (255, 255, 255))
+    assert cache.render(font, '42', (255, 255, 255)) is first
+    assert font.rendered == ['42']
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # A different color is a different glyph
+    cache.render(font, '42', (255, 0, 0))
+    assert font.rendered == ['42', '42']
+
+
+def test_cache_evicts_least_recently_used():
+    font = StubFont()
+    cache = GlyphCache(maxsize=2)
+
+    cache.render(font, 'a', (0, 0, 0))
+    cache.render(font, 'b', (0, 0, 0))
+    cache.render(font, 'a', (0, 0, 0))  # 'b' is now the oldest
+    cache.render(font, 'c', (0, 0, 0))
+    assert len(cache._cache) == 2
+
+    cache.render(font, 'a', (0, 0, 0))
+    assert font.rendered == ['a', 'b', 'c']
+    cache.render(font, 'b', (0, 0, 0))
+    assert font.rendered == ['a', 'b', 'c', 'b']
+
+
+@pytest.fixture
+def renderer(monkeypatch):
+    monkeypatch.setitem(os.environ, 'SDL_VIDEODRIVER', 'dummy')
+    pygame.display.init()
+    screen = pygame.display.set_mode((200, 100))
+    renderer = RetainedRenderer(screen)
+    renderer.build_static(lambda surface: surface.fill((0, 0, 0)))
+    yield renderer
+    pygame.display.quit()
+
+
+def box(rect):
+    def paint(screen):
+        return screen.fill((255, 255, 255), rect)
+    return paint
+
+
+def test_first_frame_is_a_full_flip(renderer):
+    renderer.begin_frame()
+    renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    assert renderer.present() == -1
+
+
+def test_unchanged_slot_is_not_dirty(renderer):
+    renderer.begin_frame()
+    renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    renderer.present()
+
+    renderer.begin_frame()
+    assert not renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    assert renderer._dirty == []
+    assert renderer.present() == 0
+
+
+def test_changed_slot_dirties_old_and_new_area(renderer):
+    renderer.begin_frame()
+    renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    renderer.slot('rpm', 800, box((100, 50, 30, 10)))
+    renderer.present()
+
+    renderer.begin_frame()
+    assert renderer.slot('speed', 43, box((15, 10, 30, 10)))
+    assert not renderer.slot('rpm', 800, box((100, 50, 30, 10)))
+    assert renderer._dirty == [pygame.Rect(10, 10, 35, 10)]
+    assert renderer.present() == 1
+
+
+def test_invalidate_repaints_everything(renderer):
+    renderer.begin_frame()
+    renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    renderer.present()
+
+    renderer.invalidate()
+    renderer.begin_frame()
+    assert renderer.slot('speed', 42, box((10, 10, 20, 10)))
+    assert renderer.present() == -1
@@ -0,0 +1,127 @@
+"""
+Tests for the metrics registry (Prometheus text rendering), the collectors
+and the HTTP endpoint over TCP and a Unix socket; all offline.
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from common.metrics import (Metric, MetricsRegistry, MetricsServer, Sample, bus_collector,
+                            monitor_metrics, scrape, stats_collector)
+
+
+def stub(counters=None, histograms=None, **attributes):
+    """Component with a StatsRegistry-like get_stats()."""
+    snapshot = {'counters': counters or {}, 'histograms': histograms or {}}
+    return SimpleNamespace(get_stats=lambda: snapshot, **attributes)
+
+
+def test_render_counters_and_gauges():
+    registry = MetricsRegistry()
+    samples = registry.counter('samples_total', 'Samples delivered')
+    samples.inc()
+    samples.inc(2)
+    registry.gauge('score', 'Current score').set(87.5)
+    registry.gauge('missing', 'Omitted when None', lambda: None)
+
+    assert registry.render() == (
+        '# HELP carmonitor_samples_total Samples delivered\n'
+        '# TYPE carmonitor_samples_total counter\n'
+        'carmonitor_samples_total 3\n'
+        '# HELP carmonitor_score Current score\n'
+        '# TYPE carmonitor_score gauge\n'
+        'carmonitor_score 87.5\n'
+    )
+    # Same name returns the same metric
+    assert registry.counter('samples_total', 'Samples delivered') is samples
+
+
+def test_render_labels_and_escaping():
+    registry = MetricsRegistry(prefix='')
+    registry.add_collector(lambda: [Metric('queue_depth', 'gauge', 'Depth\nper "queue" \\', [
+        Sample('', {'topic': 'obd.sample', 'name': 'say "hi"\n\\'}, 2),
+        Sample('', {}, float('nan')),
+    ])])
+
+    assert registry.render().splitlines() == [
+        '# HELP queue_depth Depth\\nper "queue" \\\\',
+        '# TYPE queue_depth gauge',
+        'queue_depth{name="say \\"hi\\"\\n\\\\",topic="obd.sample"} 2',
+        'queue_depth NaN',
+    ]
+
+
+def test_failing_collector_is_skipped():
+    registry = MetricsRegistry()
+    registry.gauge('up', 'Always 1').set(1)
+    registry.add_collector(lambda: 1 / 0)
+
+    assert registry.render().splitlines()[-1] == 'carmonitor_up 1'
+
+
+def test_stats_collector():
+    reader = stub(counters={'timeouts': 4},
+                  histograms={'query_ms': {'count': 10, 'mean': 20.0, 'p50': 15.0,
+                                           'p90': 40.0, 'p99': None},
+                              'unused_ms': {'count': 0}})
+    events, latency = stats_collector(reader=reader, logger=None)()
+
+    assert events.samples == [Sample('', {'section': 'reader', 'name': 'timeouts'}, 4)]
+    labels = {'section': 'reader', 'name': 'query_ms'}
+    assert latency.samples == [
+        Sample('', dict(labels, quantile='0.5'), 0.015),
+        Sample('', dict(labels, quantile='0.9'), 0.04),
+        Sample('_count', labels, 10),
+        Sample('_sum', labels, 0.2),
+    ]
+
+
+def test_bus_collector():
+    bus = SimpleNamespace(get_stats=lambda: [
+        {'name': 'scorer', 'topic': 'obd.sample', 'queued': 3, 'delivered': 50, 'dropped': 1},
+    ])
+    queued, delivered, dropped = bus_collector(bus)()
+    labels = {'subscriber': 'scorer', 'topic': 'obd.sample'}
+
+    assert queued.samples == [Sample('', labels, 3)]
+    assert delivered.samples == [Sample('', labels, 50)]
+    assert dropped.samples == [Sample('', labels, 1)]
+
+
+def test_monitor_metrics():
+    listeners = []
+    reader = stub(counters={'queries': 7}, add_listener=listeners.append, is_connected=True)
+    pipeline = stub(last_score=91.0, trip_active=False)
+    logger = stub(stats=SimpleNamespace(counters={'bytes': 4096}))
+    bus = SimpleNamespace(get_stats=lambda: [])
+    registry = MetricsRegistry()
+    monitor_metrics(registry, reader=reader, bus=bus, pipeline=pipeline, logger=logger)
+    listeners[0]({'speed_kph': 50.0})
+
+    lines = registry.render().splitlines()
+    for line in ('carmonitor_samples_total 1', 'carmonitor_obd_connected 1',
+                 'carmonitor_score 91', 'carmonitor_trip_active 0',
+                 'carmonitor_log_bytes_written_total 4096',
+                 'carmonitor_events_total{name="queries",section="reader"} 7'):
+        assert line in lines
+    # Empty bus families are left out
+    assert not any(line.startswith('carmonitor_bus_') for line in lines)
+
+
+@pytest.mark.parametrize('where', ['tcp', 'unix'])
+def test_server_round_trip(tmp_path, where):
+    address = '127.0.0.1:0' if where == 'tcp' else str(tmp_path / 'metrics.sock')
+    server = MetricsServer(address=address)
+    server.registry.counter('samples_total', 'Samples delivered').inc(5)
+    assert server.start()
+    try:
+        assert not server.address.endswith(':0')
+        text = scrape(server.address)
+    finally:
+        server.stop()
+
+    assert text == server.registry.render()
+    assert 'carmonitor_samples_total 5' in text.splitlines()
+    if where == 'unix':
+        assert not (tmp_path / 'metrics.sock').exists()
@@ -0,0 +1,62 @@
+"""
+Tests for AsyncOBDClient losing its adapter: the port leaves the event
+loop and waiting requests fail with ConnectionError.
+"""
+
+import asyncio
+
+import pytest
+
+from phase1.obd_async import AsyncOBDClient
+
+
+async def connected_client(pty_adapter):
+    adapter = pty_adapter(asyncio.get_running_loop())
+    client = AsyncOBDClient(adapter.path, timeout=5.0)
+    assert await client.connect(timeout=5.0)
+    return adapter, client
+
+
+def test_unplugged_adapter_fails_requests(pty_adapter):
+    async def main():
+        adapter, client = await connected_client(pty_adapter)
+        assert (await client.query('rpm', timeout=5.0)) is not None
+
+        adapter.answering = False
+        in_flight = asyncio.ensure_future(client.query('rpm'))
+        queued = asyncio.ensure_future(client.query('speed_kph'))
+        await asyncio.sleep(0.05)
+        adapter.unplug()
+
+        for request in (in_flight, queued):
+            with pytest.raises(ConnectionError):
+                await asyncio.wait_for(request, 2.0)
+        assert not client.is_connected
+        assert client.serial is None
+        assert client.error
+        with pytest.raises(ConnectionError):
+            await client.query('rpm')
+        await client.disconnect()
+
+    asyncio.run(main())
+
+
+def test_end_of_file_leaves_event_loop(monkeypatch, pty_adapter):
+    async def main():
+        adapter, client = await connected_client(pty_adapter)
+        loop = asyncio.get_running_loop()
+        fd = client.serial.fileno()
+
+        # A port that reports end of file stays readable forever
+        monkeypatch.setattr('phase1.obd_async.os.read', lambda fd, size: b'')
+        request = asyncio.ensure_future(client.query('rpm'))
+        client._on_readable()
+
+        with pytest.raises(ConnectionError):
+            await asyncio.wait_for(request, 2.0)
+        assert not loop.remove_reader(fd)
+        assert not client.is_connected
+        monkeypatch.undo()
+        adapter.unplug()
+
+    asyncio.run(main())
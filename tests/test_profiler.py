@@ -0,0 +1,95 @@
+"""
+Tests for SamplingProfiler: enabling from config and CARMONITOR_PROFILE,
+and the folded stacks and summary a capture window writes.
+"""
+
+import threading
+import time
+
+import pytest
+
+from common.config import Config
+from common.profiler import ENV_VAR, SamplingProfiler
+
+
+def profiling_config(enabled=False, duration=60.0):
+    config = Config(phase=1)
+    config.set('profiling.enabled', enabled)
+    config.set('profiling.duration', duration)
+    config.set('profiling.interval', 0.002)
+    return config
+
+
+def test_disabled_by_default(monkeypatch):
+    monkeypatch.delenv(ENV_VAR, raising=False)
+    assert SamplingProfiler.from_config(profiling_config()) is None
+
+
+def test_env_zero_overrides_config(monkeypatch):
+    monkeypatch.setenv(ENV_VAR, '0')
+    assert SamplingProfiler.from_config(profiling_config(enabled=True)) is None
+
+
+def test_env_one_enables_with_config_window(monkeypatch):
+    monkeypatch.setenv(ENV_VAR, '1')
+    profiler = SamplingProfiler.from_config(profiling_config(duration=30.0))
+    assert profiler is not None
+    assert profiler.duration == 30.0
+    assert profiler.interval == 0.002
+    assert not profiler.is_running
+
+
+def test_env_seconds_sets_window(monkeypatch):
+    monkeypatch.setenv(ENV_VAR, '12')
+    profiler = SamplingProfiler.from_config(profiling_config(duration=30.0))
+    assert profiler.duration == 12.0
+
+
+def busy_worker(stop):
+    while not stop.is_set():
+        sum(range(1000))
+
+
+@pytest.fixture
+def worker():
+    stop = threading.Event()
+    thread = threading.Thread(target=busy_worker, args=(stop,), name='busy-worker')
+    thread.start()
+    yield thread
+    stop.set()
+    thread.join()
+
+
+def test_window_writes_folded_and_summary(tmp_path, worker):
+    profiler = SamplingProfiler(interval=0.002, duration=0.2)
+    profiler.start(str(tmp_path / 'trip.csv'))
+    profiler.thread.join(timeout=5.0)
+    assert not profiler.is_running
+
+    folded = (tmp_path / 'trip.folded').read_text()
+    assert any(line.startswith('busy-worker;') and 'test_profiler.busy_worker' in line
+               for line in folded.splitlines())
+    assert all(line.rsplit(' ', 1)[1].isdigit() for line in folded.splitlines())
+
+    summary = (tmp_path / 'trip.profile.txt').read_text()
+    assert summary.startswith('Sampling profile:')
+    assert 'test_profiler.busy_worker' in summary
+
+
+def test_start_replaces_running_window(tmp_path, worker):
+    profiler = SamplingProfiler(interval=0.002, duration=60.0)
+    profiler.start(str(tmp_path / 'first'))
+    time.sleep(0.1)
+    first = profiler.thread
+
+    profiler.start(str(tmp_path / 'second'))
+    try:
+        # The first window was ended and written before the second began
+        assert not first.is_alive()
+        assert (tmp_path / 'first.folded').exists()
+        assert profiler.is_running
+        assert profiler.output_base == tmp_path / 'second'
+        time.sleep(0.1)
+    finally:
+        profiler.stop()
+    assert (tmp_path / 'second.folded').exists()
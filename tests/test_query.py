@@ -0,0 +1,112 @@
+"""
+Tests for the trip query engine: pyramid push-down must return exactly
+what a full scan returns.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from common.logger import TripLogger
+from common.pyramid import pyramid_path
+from common.query import TripQuery
+
+AGGREGATES = {'speed_kph': ['count', 'sum', 'min', 'max', 'mean'], 'rpm': ['max']}
+
+
+def write_trips(log_dir, build_pyramid=True):
+    """Three trips: slow city driving, a motorway run and a parked car."""
+    logger = TripLogger(str(log_dir), build_pyramid=build_pyramid, fsync=False)
+    profiles = {
+        'trip_a': lambda i: 20 + (i % 30),
+        'trip_b': lambda i: 95 + (i % 40) * 0.5,
+        'trip_c': lambda i: 0.0,
+    }
+    start = 1_700_000_000.0
+    for n, (name, speed) in enumerate(profiles.items()):
+        logger.start_trip(name)
+        for i in range(500):
+            logger.log_data({
+                'timestamp': start + n * 1000 + i * 0.1,
+                'speed_kph': speed(i),
+                'rpm': 800 + speed(i) * 30,
+                'throttle_pct': 10.0
+            })
+        logger.end_trip()
+    return log_dir
+
+
+@pytest.fixture
+def trips(tmp_path):
+    """The same trips with pyramids and, in a second directory, without."""
+    indexed = write_trips(tmp_path / 'indexed')
+    plain = tmp_path / 'plain'
+    shutil.copytree(indexed, plain)
+    for pyramid in plain.glob('*.pyramid.json'):
+        pyramid.unlink()
+    return indexed, plain
+
+
+def run(log_dir, build):
+    query = build(TripQuery.from_directory(str(log_dir)))
+    return query.rows(workers=1), query.aggregate(AGGREGATES, workers=1)
+
+
+@pytest.mark.parametrize('build', [
+    lambda q: q.where('speed_kph', '>', 100),
+    lambda q: q.where('speed_kph', '>=', 114.5),
+    lambda q: q.where('speed_kph', '<', 21),
+    lambda q: q.where('speed_kph', '==', 0),
+    lambda q: q.where('rpm', '<=', 800),
+    lambda q: q.where('speed_kph', '>', 500),
+    lambda q: q.between(1_700_001_010.0, 1_700_001_020.0),
+    lambda q: q.between(1_700_001_010.0).where('speed_kph', '>', 110),
+    lambda q: q.between(None, 1_699_999_999.0),
+])
+def test_push_down_matches_full_scan(trips, build):
+    indexed, plain = trips
+    pruned_rows, pruned_aggs = run(indexed, build)
+    full_rows, full_aggs = run(plain, build)
+
+    assert pruned_rows.rows == full_rows.rows
+    assert pruned_rows.rows_matched == full_rows.rows_matched
+    assert pruned_aggs.aggregates == full_aggs.aggregates
+    assert full_rows.files_skipped == 0
+
+
+def test_push_down_skips_files(trips):
+    indexed, _ = trips
+    result = TripQuery.from_directory(str(indexed)).where('speed_kph', '>', 100).rows(workers=1)
+
+    assert result.files_skipped == 2
+    assert result.files_scanned == 1
+    assert result.rows_matched > 0
+
+
+def test_stale_pyramid_is_not_trusted(trips):
+    indexed, _ = trips
+    trip = indexed / 'trip_c.csv'
+    stat = os.stat(pyramid_path(trip))
+
+    # A row appended after the pyramid was written
+    with open(trip, 'a') as f:
+        f.write('1700002100.0,150.0,10.0,5000,,,,\n')
+    os.utime(pyramid_path(trip), ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    result = TripQuery([str(trip)]).where('speed_kph', '>', 100).rows(workers=1)
+    assert result.files_skipped == 0
+    assert result.rows_matched == 1
+
+
+def test_string_values_compare_numerically(trips):
+    indexed, _ = trips
+    as_text = TripQuery.from_directory(str(indexed)).where('speed_kph', '>', '100').rows(workers=1)
+    as_number = TripQuery.from_directory(str(indexed)).where('speed_kph', '>', 100).rows(workers=1)
+
+    assert as_text.rows == as_number.rows
+
+
+def test_non_numeric_value_is_rejected():
+    with pytest.raises(ValueError):
+        TripQuery([]).where('speed_kph', '>', 'fast')
@@ -0,0 +1,72 @@
+"""
+Tests for apply_realtime: without the privileges it needs it reports what
+failed, falls back to a nice value and never raises.
+"""
+
+import os
+import sys
+
+import pytest
+
+from common import realtime
+from common.realtime import apply_realtime
+
+
+def denied(*args):
+    raise PermissionError(1, 'Operation not permitted')
+
+
+class DeniedLibc:
+    """libc stand-in whose mlockall fails like without RLIMIT_MEMLOCK."""
+
+    def mlockall(self, flags):
+        return -1
+
+
+@pytest.fixture
+def unprivileged(monkeypatch):
+    monkeypatch.setattr(sys, 'platform', 'linux')
+    monkeypatch.setattr(os, 'sched_setaffinity', denied, raising=False)
+    monkeypatch.setattr(os, 'sched_setscheduler', denied, raising=False)
+    monkeypatch.setattr(os, 'SCHED_FIFO', 1, raising=False)
+    monkeypatch.setattr(os, 'sched_param', lambda priority: priority, raising=False)
+    niced = []
+    monkeypatch.setattr(os, 'setpriority', lambda which, who, value: niced.append(value))
+    monkeypatch.setattr(realtime.ctypes, 'CDLL', lambda *args, **kwargs: DeniedLibc())
+    return niced
+
+
+def test_fifo_refused_falls_back_to_nice(unprivileged):
+    report = apply_realtime(cpus=[1], policy='fifo', priority=20, nice=-5, lock_memory=True)
+
+    assert unprivileged == [-5]
+    assert report['applied'] == ['nice -5']
+    failed = ' | '.join(report['failed'])
+    assert 'affinity [1]' in failed
+    assert 'SCHED_FIFO' in failed
+    assert 'mlockall' in failed
+
+
+def test_fifo_refused_without_nice_changes_nothing(unprivileged):
+    report = apply_realtime(policy='fifo')
+
+    assert unprivileged == []
+    assert report['applied'] == []
+    assert len(report['failed']) == 1
+
+
+def test_nice_refused_is_reported(unprivileged, monkeypatch):
+    monkeypatch.setattr(os, 'setpriority', denied)
+
+    report = apply_realtime(policy='nice', nice=-10)
+
+    assert report['applied'] == []
+    assert report['failed'][0].startswith('nice -10')
+
+
+def test_other_platforms_are_skipped(monkeypatch):
+    monkeypatch.setattr(sys, 'platform', 'darwin')
+
+    report = apply_realtime(cpus=[0], policy='fifo', nice=-5, lock_memory=True)
+
+    assert report == {'applied': [], 'failed': ['real-time options are Linux-only']}
@@ -0,0 +1,91 @@
+"""
+Tests for RealTimeLogger: byte accounting, write errors and use after close.
+"""
+
+from common.logger import RealTimeLogger
+
+
+class FailingFile:
+    """File stand-in whose writes fail like a full disk."""
+
+    def write(self, data):
+        raise OSError(28, 'No space left on device')
+
+    def flush(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def test_size_counts_encoded_bytes(tmp_path):
+    log_file = tmp_path / 'rt.log'
+    with RealTimeLogger(str(log_file)) as logger:
+        logger.log('Beschleunigung 3 m/s² – Ölstand ok')
+        assert logger.flush(timeout=5.0)
+        stats = logger.get_stats()
+
+    assert stats['bytes'] == log_file.stat().st_size
+    assert logger._writer.size == log_file.stat().st_size
+
+
+def test_rotation_uses_byte_size(tmp_path):
+    log_file = tmp_path / 'rt.log'
+    with RealTimeLogger(str(log_file), buffer_size=1, max_bytes=200) as logger:
+        for _ in range(10):
+            logger.log('ö' * 20)
+        assert logger.flush(timeout=5.0)
+        stats = logger.get_stats()
+
+    assert stats['rotations'] >= 1
+    assert log_file.with_name('rt.log.1').stat().st_size >= 200
+
+
+def test_write_error_keeps_writer_alive(tmp_path):
+    log_file = tmp_path / 'rt.log'
+    logger = RealTimeLogger(str(log_file))
+    writer = logger._writer
+    writer.file_handle = FailingFile()
+
+    logger.log('lost')
+    assert logger.flush(timeout=5.0)
+    assert writer.thread.is_alive()
+    assert logger.get_stats()['errors'] == 1
+    assert logger.get_stats()['dropped'] == 1
+
+    # Writes resume once the file can be written again
+    writer.file_handle = None
+    logger.log('kept')
+    assert logger.flush(timeout=5.0)
+    logger.close()
+
+    assert 'kept' in log_file.read_text(encoding='utf-8')
+    assert 'lost' not in log_file.read_text(encoding='utf-8')
+
+
+def test_failed_rotation_is_counted(tmp_path):
+    log_file = tmp_path / 'rt.log'
+    logger = RealTimeLogger(str(log_file), buffer_size=1, max_bytes=10, backup_count=1)
+    log_file.unlink()  # Rotation has nothing to rename
+
+    logger.log('first entry past max_bytes')
+    assert logger.flush(timeout=5.0)
+    logger.log('second')
+    assert logger.flush(timeout=5.0)
+    logger.close()
+
+    # The next batch reopened the file (and then rotated it normally)
+    assert logger.get_stats()['errors'] == 1
+    assert logger.get_stats()['rotations'] == 1
+    assert 'second' in log_file.with_name('rt.log.1').read_text(encoding='utf-8')
+
+
+def test_log_after_close_is_written(tmp_path):
+    log_file = tmp_path / 'rt.log'
+    logger = RealTimeLogger(str(log_file))
+    logger.close()
+
+    logger.log('after close')
+
+    assert 'after close' in log_file.read_text(encoding='utf-8')
+    assert logger.flush(timeout=0.1)
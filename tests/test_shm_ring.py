@@ -0,0 +1,136 @@
+"""
+Tests for SharedSampleRing (seqlock reads, wraparound, lost samples) and
+IsolatedReader reconnects.
+"""
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from common.shm_ring import RING_FIELDS, SharedSampleRing
+from phase1.acquisition import IsolatedReader
+from phase1.burst_capture import BurstCapture
+
+
+@pytest.fixture
+def ring():
+    ring = SharedSampleRing.create(capacity=8)
+    yield ring
+    ring.close()
+
+
+def sample(i):
+    return {'timestamp': 1_700_000_000.0 + i, 'speed_kph': float(i), 'rpm': None}
+
+
+def speeds(samples):
+    return [s['speed_kph'] for s in samples]
+
+
+def test_reader_sees_writes(ring):
+    reader = SharedSampleRing.attach(ring.name)
+    try:
+        for i in range(5):
+            ring.write(sample(i))
+        samples, cursor, lost = reader.read_since(0)
+
+        assert speeds(samples) == [0.0, 1.0, 2.0, 3.0, 4.0]
+        assert samples[0]['rpm'] is None
+        assert (cursor, lost) == (5, 0)
+        assert reader.latest()['speed_kph'] == 4.0
+        assert reader.read_since(cursor) == ([], 5, 0)
+    finally:
+        reader.close()
+
+
+def test_wraparound_keeps_newest_capacity(ring):
+    _, cursor, _ = ring.read_since(0)
+    for i in range(20):
+        ring.write(sample(i))
+
+    samples, cursor, lost = ring.read_since(cursor)
+
+    # 20 written into 8 slots: the first 12 were overwritten
+    assert speeds(samples) == [float(i) for i in range(12, 20)]
+    assert (cursor, lost) == (20, 12)
+
+    ring.write(sample(20))
+    samples, cursor, lost = ring.read_since(cursor)
+    assert (speeds(samples), cursor, lost) == ([20.0], 21, 0)
+
+
+def test_slot_being_written_counts_as_lost(ring):
+    for i in range(3):
+        ring.write(sample(i))
+
+    # Leave slot 1 mid-update, as a writer stalled between the two sequence stores would
+    ring._seq[1] += 1
+    samples, cursor, lost = ring.read_since(0)
+
+    assert speeds(samples) == [0.0, 2.0]
+    assert (cursor, lost) == (3, 1)
+
+
+def test_torn_slot_with_even_sequence_is_rejected(ring):
+    for i in range(3):
+        ring.write(sample(i))
+    # The sequence store landed but the data did not (weakly ordered CPU)
+    ring._data[1, RING_FIELDS.index('speed_kph')] = 99.0
+
+    samples, _, lost = ring.read_since(0)
+    assert speeds(samples) == [0.0, 2.0]
+    assert lost == 1
+
+
+def test_overwritten_slot_is_not_returned_as_old_sample(ring):
+    for i in range(3):
+        ring.write(sample(i))
+    # The writer lapped the reader on slot 0 only
+    ring._seq[0] += 2
+
+    samples, _, lost = ring.read_since(0)
+    assert speeds(samples) == [1.0, 2.0]
+    assert lost == 1
+
+
+def test_attach_rejects_other_layout(ring):
+    with pytest.raises(ValueError):
+        SharedSampleRing.attach(ring.name, fields=('timestamp',))
+
+
+def test_reconnect_starts_at_new_ring():
+    reader = IsolatedReader(synthetic=True, capacity=64)
+    received = []
+    reader.add_listener(received.append)
+    try:
+        for run in range(2):
+            assert reader.connect(timeout=5)
+            # A new ring counts from zero; a stale cursor would skip its first samples
+            assert reader.cursor == 0
+            start = len(received)
+            reader.start_async_reading(update_rate=0.02)
+            deadline = time.monotonic() + 10.0
+            while len(received) - start < 5 and time.monotonic() < deadline:
+                time.sleep(0.05)
+            reader.stop_async_reading()
+            assert reader.cursor >= 5
+            reader.lost += 2  # stands in for samples lost on this ring
+
+        assert len(received) >= 10
+        # The lost count is a running total across rings
+        assert reader.lost == 4
+    finally:
+        reader.disconnect()
+
+
+def test_burst_thresholds_are_shared_with_child(tmp_path):
+    reader = IsolatedReader(synthetic=True)
+    thresholds = SimpleNamespace(harsh_brake_threshold=-6.0, aggressive_accel_threshold=4.0)
+    reader.configure_burst(thresholds)
+    assert reader._burst_thresholds[:] == [0.0, 0.0, 0.0]  # no burst capture
+
+    reader.burst = BurstCapture(str(tmp_path), precursor=0.5)
+    reader.configure_burst(thresholds)
+    assert reader._burst_thresholds[:] == [1.0, -6.0, 4.0]
+    assert reader.burst.brake_trigger == -3.0
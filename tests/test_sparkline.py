@@ -0,0 +1,108 @@
+"""
+Tests for SparklineHistory: columns follow sample time, not sample count.
+"""
+
+from phase1.sparkline import SparklineHistory
+
+T0 = 1_700_000_000.0
+
+
+def visible(history):
+    """(column offset from the newest, (min, max)) for columns with data."""
+    last, columns = history.snapshot()
+    return [(last - col, span) for col, span in columns if span is not None]
+
+
+def test_window_is_time_based_at_any_rate():
+    history = SparklineHistory(60, window=60.0, v_min=0, v_max=160)
+
+    # 10 Hz for 30 s, then one sample every 5 s (duty-cycled) for 30 s
+    for i in range(300):
+        history.push(50.0, T0 + i * 0.1)
+    for i in range(1, 7):
+        history.push(0.0, T0 + 30 + i * 5)
+
+    columns = visible(history)
+    # 30 one-second columns at 10 Hz plus 6 slow samples, minus the first
+    # second, which is now 60 s old
+    assert len(columns) == 35
+    assert max(age for age, _ in columns) == 59
+    assert history.last_col - history.snapshot()[1][0][0] == 59
+
+
+def test_old_samples_leave_the_window():
+    history = SparklineHistory(60, window=60.0)
+    history.push(10.0, T0)
+    history.push(20.0, T0 + 59.5)
+    assert [span for _, span in visible(history)] == [(10.0, 10.0), (20.0, 20.0)]
+
+    history.push(30.0, T0 + 61.0)
+    assert [span for _, span in visible(history)] == [(20.0, 20.0), (30.0, 30.0)]
+
+
+def test_column_keeps_min_and_max():
+    history = SparklineHistory(10, window=10.0)
+    for value in (5.0, None, 1.0, 9.0):
+        history.push(value, T0 + 0.2)
+    assert visible(history) == [(0, (1.0, 9.0))]
+
+
+def test_updates_scroll_by_elapsed_time():
+    history = SparklineHistory(60, window=60.0)
+    history.push(1.0, T0)
+    history.take_updates()
+
+    history.push(2.0, T0 + 5.0)
+    shift, last, columns = history.take_updates()
+
+    assert shift == 5
+    # The skipped columns are redrawn as gaps
+    assert [col for col, _ in columns] == list(range(last - 4, last + 1))
+    assert [span for _, span in columns] == [None] * 4 + [(2.0, 2.0)]
+
+
+def test_clock_stepping_back_keeps_scrolling_forward():
+    history = SparklineHistory(60, window=60.0)
+    history.push(1.0, T0 + 3600)
+    history.take_updates()
+    first = history.last_col
+
+    history.push(2.0, T0)  # wall clock stepped back an hour
+    history.push(3.0, T0 + 2.0)
+    shift, last, _ = history.take_updates()
+
+    assert last == first + 2
+    assert shift == 2
+
+
+def test_resize_window_keeps_recent_samples():
+    history = SparklineHistory(60, window=60.0)
+    for i in range(60):
+        history.push(float(i), T0 + i)
+    history.take_updates()
+    generation = history.generation
+
+    history.resize_window(30.0)
+
+    assert history.generation == generation + 1
+    assert history.window == 30.0
+    columns = visible(history)
+    # Only the last 30 s fit; each half-second column still holds its sample
+    assert len(columns) == 30
+    assert columns[0] == (58, (30.0, 30.0))
+    assert columns[-1] == (0, (59.0, 59.0))
+
+    # New samples continue in the resized columns
+    history.push(100.0, T0 + 60.2)
+    assert visible(history)[-2:] == [(2, (59.0, 59.0)), (0, (100.0, 100.0))]
+
+
+def test_widening_window_merges_columns():
+    history = SparklineHistory(10, window=10.0)
+    for i in range(10):
+        history.push(float(i), T0 + i)
+
+    history.resize_window(20.0)
+
+    assert [span for _, span in visible(history)] == [
+        (0.0, 1.0), (2.0, 3.0), (4.0, 5.0), (6.0, 7.0), (8.0, 9.0)]
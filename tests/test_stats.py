@@ -0,0 +1,115 @@
+"""
+Tests for StreamingHistogram percentiles, JitterMeter and StatsRegistry
+snapshots.
+"""
+
+import math
+import random
+
+import pytest
+
+from common.stats import JitterMeter, StatsRegistry, StreamingHistogram
+
+# Width of a bucket relative to its lower edge with 20 buckets per decade
+BUCKET_ERROR = 10 ** (1 / 20)
+
+
+def exact_percentile(values, p):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(p / 100 * len(ordered))) - 1]
+
+
+@pytest.mark.parametrize('distribution', ['uniform', 'exponential', 'lognormal'])
+def test_percentiles_within_bucket_error(distribution):
+    rng = random.Random(1)
+    draw = {'uniform': lambda: rng.uniform(10.0, 1e5),
+            'exponential': lambda: 1.0 + rng.expovariate(1 / 2000.0),
+            'lognormal': lambda: rng.lognormvariate(8.0, 1.5)}[distribution]
+    values = [min(draw(), 9e6) for _ in range(20000)]
+    histogram = StreamingHistogram()
+    for value in values:
+        histogram.record(value)
+
+    for p in (1, 50, 90, 99, 99.9):
+        exact = exact_percentile(values, p)
+        # The estimate is the upper edge of the bucket holding the exact value
+        assert exact <= histogram.percentile(p) <= exact * BUCKET_ERROR
+    assert histogram.percentile(100) == max(values)
+    assert histogram.min == min(values)
+    assert histogram.mean == pytest.approx(sum(values) / len(values))
+
+
+def test_out_of_range_values_report_exact_extremes():
+    histogram = StreamingHistogram(min_value=10.0, max_value=1000.0)
+    for value in (0.5, 2.0, 50.0, 5000.0, 8000.0):
+        histogram.record(value)
+
+    assert histogram.counts[0] == 2
+    assert histogram.counts[-1] == 2
+    assert histogram.percentile(20) == 0.5
+    assert histogram.percentile(50) == pytest.approx(50.0, rel=BUCKET_ERROR - 1)
+    assert histogram.percentile(80) == 8000.0
+    assert StreamingHistogram().percentile(50) is None
+
+
+def test_merge_requires_same_layout():
+    a, b = StreamingHistogram(), StreamingHistogram()
+    for value in range(1, 101):
+        (a if value % 2 else b).record(float(value))
+    a.merge(b)
+    assert (a.count, a.min, a.max, a.total) == (100, 1.0, 100.0, 5050.0)
+
+    with pytest.raises(ValueError):
+        a.merge(StreamingHistogram(buckets_per_decade=10))
+
+
+def test_jitter_meter_with_timestamps():
+    meter = JitterMeter(0.1)
+    for timestamp in (10.0, 10.1, 10.25, 10.3):
+        meter.observe(timestamp)
+
+    # Periods of 100, 150 and 50 ms: deviations of 0, 50 and 50 ms
+    assert meter.periods.count == 3
+    assert meter.periods.min == pytest.approx(50_000)
+    assert meter.periods.max == pytest.approx(150_000)
+    assert meter.histogram.max == pytest.approx(50_000)
+    assert meter.histogram.min == pytest.approx(0, abs=1e-3)
+
+    # After a pause (last cleared) the next call only starts a new period
+    meter.last = None
+    meter.observe(20.0)
+    assert meter.periods.count == 3
+    meter.observe(20.1)
+    assert meter.periods.count == 4
+    assert meter.last == 20.1
+
+
+def test_jitter_meter_reset():
+    meter = JitterMeter(0.1)
+    meter.observe(0.0)
+    meter.observe(0.2)
+    meter.reset(0.05)
+    assert (meter.interval, meter.last, meter.histogram.count) == (0.05, None, 0)
+    assert meter.report() == "Sampling jitter: no data"
+
+
+def test_snapshot_in_milliseconds():
+    stats = StatsRegistry()
+    stats.record('query.rpm', 1500.0)
+    stats.record('query.rpm', 2500.0)
+    stats.count('rpm.null')
+    stats.count('rpm.null', 2)
+    snapshot = stats.snapshot()
+
+    query = snapshot['histograms']['query.rpm']
+    assert (query['count'], query['min'], query['max']) == (2, 1.5, 2.5)
+    assert query['mean'] == pytest.approx(2.0)
+    assert 1.5 <= query['p50'] <= 1.5 * BUCKET_ERROR
+    assert snapshot['counters'] == {'rpm.null': 3}
+
+    meter = JitterMeter(0.1)
+    meter.observe(0.0)
+    meter.observe(0.12)
+    summary = meter.summary()
+    assert summary['interval_ms'] == 100.0
+    assert summary['max'] == pytest.approx(20.0)
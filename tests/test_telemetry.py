@@ -0,0 +1,120 @@
+"""
+Tests for the telemetry stream: per-client decimation, the bounded send
+buffer and a round trip through a DataBus and a Unix socket.
+"""
+
+import json
+import socket
+
+import pytest
+
+from common.bus import DataBus, SAMPLES
+from common.telemetry import TelemetryClient, TelemetryServer
+
+T0 = 1_700_000_000.0
+
+
+def client(rate=0.0, max_buffer=65536):
+    client = TelemetryClient(None, 'test', max_buffer)
+    client.configure({'rate': rate})
+    return client
+
+
+def passed(client, times, vehicle=None):
+    return [t for t in times if client.wants({'timestamp': T0 + t, 'vehicle': vehicle})]
+
+
+def test_wants_keeps_rate_grid():
+    # 16 Hz in, 4 Hz out: every fourth sample
+    assert passed(client(rate=4), [i / 16 for i in range(17)]) == [0, 0.25, 0.5, 0.75, 1.0]
+
+    # A late sample does not shift the grid
+    assert passed(client(rate=4), [0, 0.3125, 0.5, 0.75]) == [0, 0.3125, 0.5, 0.75]
+
+    # More than one interval behind: the grid restarts at the late sample
+    assert passed(client(rate=4), [0, 1.0, 1.125, 1.25]) == [0, 1.0, 1.25]
+
+
+def test_wants_per_vehicle():
+    decimating = client(rate=2)
+    times = [i / 4 for i in range(5)]
+    for t in times:
+        assert decimating.wants({'timestamp': T0 + t, 'vehicle': 'van0'}) == (t in (0, 0.5, 1.0))
+        assert decimating.wants({'timestamp': T0 + t, 'vehicle': 'van1'}) == (t in (0, 0.5, 1.0))
+
+
+def test_wants_without_rate_or_timestamp():
+    assert passed(client(rate=0), [0, 0.01, 0.02]) == [0, 0.01, 0.02]
+    decimating = client(rate=1)
+    assert decimating.wants({'timestamp': 'late'})
+    assert decimating.wants({})
+
+
+def test_configure_rejects_bad_requests():
+    telemetry = client()
+    with pytest.raises(ValueError):
+        telemetry.configure({'channels': 'speed_kph'})
+    with pytest.raises(ValueError):
+        telemetry.configure({'rate': -1})
+    telemetry.configure({'channels': ['rpm'], 'rate': 5})
+    assert (telemetry.channels, telemetry.interval) == (('rpm',), 0.2)
+
+
+def test_enqueue_drops_oldest_lines():
+    telemetry = client(max_buffer=25)
+    for line in (b'line 0...\n', b'line 1...\n', b'line 2...\n', b'line 3...\n'):
+        telemetry.enqueue(line)
+
+    assert list(telemetry.outgoing) == [b'line 2...\n', b'line 3...\n']
+    assert (telemetry.buffered, telemetry.dropped) == (20, 2)
+
+
+def test_enqueue_keeps_partly_sent_line():
+    telemetry = client(max_buffer=25)
+    telemetry.enqueue(b'line 0...\n')
+    telemetry.enqueue(b'line 1...\n')
+    telemetry.offset = 4  # line 0 is partly on the wire
+
+    telemetry.enqueue(b'line 2...\n')
+    assert list(telemetry.outgoing) == [b'line 0...\n', b'line 2...\n']
+
+    # A single line larger than the buffer is still sent
+    telemetry.enqueue(b'x' * 40 + b'\n')
+    assert list(telemetry.outgoing) == [b'line 0...\n', b'x' * 40 + b'\n']
+    assert telemetry.dropped == 2
+
+
+def read_lines(sock, count, timeout=5.0):
+    sock.settimeout(timeout)
+    data = b''
+    while data.count(b'\n') < count:
+        chunk = sock.recv(4096)
+        if not chunk:
+            break
+        data += chunk
+    return [json.loads(line) for line in data.splitlines()]
+
+
+def test_unix_socket_round_trip(tmp_path, wait_for):
+    bus = DataBus()
+    server = TelemetryServer(bus, address=str(tmp_path / 'telemetry.sock'))
+    assert server.start()
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(server.address)
+        sock.sendall(b'{"channels": ["speed_kph"], "rate": 2}\n')
+        assert wait_for(lambda: server.clients and server.clients[0].interval == 0.5)
+
+        for i in range(17):
+            bus.publish(SAMPLES, {'timestamp': T0 + i / 8, 'speed_kph': float(i), 'rpm': 900.0})
+        lines = read_lines(sock, 5)
+        assert lines == [{'timestamp': T0 + t, 'speed_kph': t * 8} for t in (0, 0.5, 1, 1.5, 2)]
+
+        sock.sendall(b'[1, 2]\n')
+        assert 'error' in read_lines(sock, 1)[0]
+        assert wait_for(lambda: server.get_stats()['counters']['sent'] == 6)
+    finally:
+        sock.close()
+        server.stop()
+        bus.close()
+    assert not (tmp_path / 'telemetry.sock').exists()
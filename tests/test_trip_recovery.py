@@ -0,0 +1,146 @@
+"""
+Tests for append-only trip logs: crash recovery from checksummed blocks
+and the durability age budget.
+"""
+
+import shutil
+import threading
+import time
+
+from common.logger import (
+    BLOCK_PREFIX, END_PREFIX, TripLogger, iter_trip_rows, read_trip_summary, recover_trip
+)
+
+
+def write_trip(log_dir, rows=45, block_rows=10):
+    """A completed trip of `rows` rows in blocks of `block_rows`."""
+    logger = TripLogger(str(log_dir), block_rows=block_rows, fsync=False)
+    path = logger.start_trip('trip')
+    for i in range(rows):
+        logger.log_data({'timestamp': 1_700_000_000.0 + i * 0.1, 'speed_kph': 40.0 + i,
+                         'rpm': 2000})
+    logger.end_trip()
+    return path
+
+
+def block_ends(data):
+    """Byte offsets just past each block trailer."""
+    ends = []
+    pos = 0
+    for line in data.splitlines(keepends=True):
+        pos += len(line)
+        if line.startswith(BLOCK_PREFIX.encode()):
+            ends.append(pos)
+    return ends
+
+
+def test_recover_truncates_torn_block(tmp_path):
+    path = write_trip(tmp_path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    ends = block_ends(data)
+    assert len(ends) == 5  # four full blocks, then the last 5 rows
+
+    # Crash halfway through writing the last block: no trailer, torn row
+    with open(path, 'wb') as f:
+        f.write(data[:ends[3] + 40])
+
+    recovered = TripLogger(str(tmp_path)).recover()
+
+    assert [s['file'] for s in recovered] == [path]
+    assert recovered[0]['data_points'] == 40
+    with open(path, 'rb') as f:
+        repaired = f.read()
+    assert repaired.startswith(data[:ends[3]])
+    assert repaired[ends[3]:].startswith(END_PREFIX.encode())
+    assert read_trip_summary(path)['recovered'] is True
+    assert len(list(iter_trip_rows(path))) == 40
+
+
+def test_second_recover_is_noop(tmp_path):
+    path = write_trip(tmp_path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(data[:block_ends(data)[2] + 15])
+
+    logger = TripLogger(str(tmp_path))
+    assert len(logger.recover()) == 1
+    with open(path, 'rb') as f:
+        repaired = f.read()
+
+    assert logger.recover() == []
+    assert recover_trip(path) is None
+    with open(path, 'rb') as f:
+        assert f.read() == repaired
+
+
+def test_complete_trip_is_left_alone(tmp_path):
+    path = write_trip(tmp_path)
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    assert recover_trip(path) is None
+    with open(path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_corrupted_last_block_is_detected(tmp_path):
+    path = write_trip(tmp_path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    ends = block_ends(data)
+
+    # Lose the footer and flip one digit inside the rows of the last block
+    torn = bytearray(data[:ends[4]])
+    i = ends[3] + 5
+    torn[i] = ord('7') if torn[i] != ord('7') else ord('3')
+    with open(path, 'wb') as f:
+        f.write(torn)
+
+    summary = recover_trip(path)
+
+    assert summary['data_points'] == 40
+    assert len(list(iter_trip_rows(path))) == 40
+
+
+def test_open_block_is_sealed_by_age(tmp_path):
+    logger = TripLogger(str(tmp_path), durability_budget=0.2, block_rows=50, fsync=False)
+    path = logger.start_trip('trip')
+    for i in range(3):
+        logger.log_data({'timestamp': 1_700_000_000.0 + i, 'speed_kph': 0.0})
+
+    # No further rows arrive (e.g. polling slowed down while parked)
+    deadline = time.monotonic() + 5.0
+    while (logger.get_stats()['counters'].get('sealed_by_age', 0) == 0
+           and time.monotonic() < deadline):
+        time.sleep(0.05)
+    assert logger.get_stats()['counters']['sealed_by_age'] == 1
+
+    # What a crash at this point would leave behind recovers all 3 rows
+    crashed = tmp_path / 'crashed'
+    crashed.mkdir()
+    shutil.copy(path, crashed / 'trip.csv')
+    assert recover_trip(str(crashed / 'trip.csv'))['data_points'] == 3
+
+    logger.log_data({'timestamp': 1_700_000_010.0, 'speed_kph': 5.0})
+    summary = logger.end_trip()
+    assert summary['data_points'] == 4
+    assert len(list(iter_trip_rows(path))) == 4
+
+
+def test_many_loggers_share_one_sealer_thread(tmp_path):
+    loggers = [TripLogger(str(tmp_path / f'vehicle{i}'), durability_budget=0.1 * (i + 1),
+                          block_rows=50, fsync=False) for i in range(4)]
+    for logger in loggers:
+        logger.start_trip('trip')
+        logger.log_data({'timestamp': 1_700_000_000.0, 'speed_kph': 0.0})
+
+    deadline = time.monotonic() + 5.0
+    while (any(logger.get_stats()['counters'].get('sealed_by_age', 0) == 0
+               for logger in loggers) and time.monotonic() < deadline):
+        time.sleep(0.05)
+    for logger in loggers:
+        assert logger.get_stats()['counters']['sealed_by_age'] == 1
+        logger.end_trip()
+    assert sum(t.name == 'trip-sealer' for t in threading.enumerate()) == 1
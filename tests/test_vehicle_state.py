@@ -0,0 +1,189 @@
+"""
+Tests for VehicleState classification and the TripDetector state machine
+starting and ending trips, driven by sample timestamps.
+"""
+
+import threading
+import time
+
+from common.config import Config
+from common.vehicle_state import IDLE, IGNITION_ON, MOVING, OFF, TripDetector, VehicleState
+
+T0 = 1_700_000_000.0
+
+
+def sample(t, speed=None, rpm=None):
+    return {'timestamp': T0 + t, 'speed_kph': speed, 'rpm': rpm}
+
+
+def driving(t):
+    return sample(t, speed=50.0, rpm=2000.0)
+
+
+def idling(t):
+    return sample(t, speed=0.0, rpm=800.0)
+
+
+def engine_off(t):
+    return sample(t)  # no reply at all
+
+
+class Trips:
+    """Frontend stand-in recording trip starts and ends."""
+
+    def __init__(self, detector):
+        self.active = False
+        self.started = 0
+        self.ended = 0
+        detector.bind_trips(self.start, self.end, lambda: self.active)
+
+    def start(self):
+        self.active = True
+        self.started += 1
+
+    def end(self):
+        self.active = False
+        self.ended += 1
+
+
+def detector(**kwargs):
+    detector = TripDetector(VehicleState(off_after=3.0), end_after_off=10.0,
+                            end_after_idle=60.0, **kwargs)
+    return detector, Trips(detector)
+
+
+def test_classification():
+    vehicle = VehicleState()
+    assert vehicle.update(driving(0)) == MOVING
+    assert vehicle.interval() is None
+    assert vehicle.update(idling(1)) == IDLE
+    assert vehicle.update(sample(2, speed=0.0, rpm=0.0)) == IGNITION_ON
+    assert vehicle.interval() == vehicle.idle_interval
+
+
+def test_dropped_reply_keeps_state_until_off_after():
+    vehicle = VehicleState(off_after=3.0)
+    vehicle.update(driving(0))
+
+    assert vehicle.update(engine_off(1)) == MOVING
+    assert vehicle.update(engine_off(2.9)) == MOVING
+    assert vehicle.update(engine_off(3.0)) == OFF
+    assert vehicle.interval() == vehicle.off_interval
+
+    # Never heard from: off straight away
+    assert VehicleState().update(engine_off(0)) == OFF
+
+
+def test_trip_starts_on_motion():
+    trip_detector, trips = detector()
+    changes = []
+    trip_detector.add_listener(lambda previous, state: changes.append((previous, state)))
+
+    trip_detector.on_sample(engine_off(0))
+    trip_detector.on_sample(idling(1))
+    assert trips.started == 0
+
+    trip_detector.on_sample(driving(2))
+    trip_detector.on_sample(driving(3))
+    assert trips.started == 1
+    assert changes == [(OFF, OFF), (OFF, IDLE), (IDLE, MOVING)]
+    assert trip_detector.get_stats()['counters']['trips.started'] == 1
+
+
+def test_trip_ends_after_engine_off():
+    trip_detector, trips = detector()
+    trip_detector.on_sample(driving(0))
+    trip_detector.on_sample(idling(10))
+
+    # Last reply at 10 s: off from 13 s (off_after), trip ends 10 s later
+    for t in range(11, 23):
+        trip_detector.on_sample(engine_off(t))
+    assert trip_detector.state == OFF
+    assert trips.ended == 0
+
+    trip_detector.on_sample(engine_off(23))
+    assert trips.ended == 1
+
+
+def test_trip_ends_after_idle():
+    trip_detector, trips = detector()
+    trip_detector.on_sample(driving(0))
+    trip_detector.on_sample(idling(5))
+
+    trip_detector.on_sample(idling(64.9))
+    assert trips.ended == 0
+    trip_detector.on_sample(idling(65))
+    assert trips.ended == 1
+
+    # Moving again starts the next trip
+    trip_detector.on_sample(driving(70))
+    assert (trips.started, trips.active) == (2, True)
+
+
+def test_manual_stop_is_not_restarted_while_moving():
+    trip_detector, trips = detector()
+    trip_detector.on_sample(driving(0))
+    assert trips.active
+
+    trips.active = False  # stopped by hand
+    for t in range(1, 30):
+        trip_detector.on_sample(driving(t))
+    assert trips.started == 1
+
+    trip_detector.on_sample(idling(30))
+    trip_detector.on_sample(driving(31))
+    assert trips.started == 2
+
+
+def test_manual_start_while_parked_is_not_ended_at_once():
+    trip_detector, trips = detector()
+    for t in range(0, 100, 10):
+        trip_detector.on_sample(idling(t))
+
+    trips.active = True  # started by hand after idling for 90 s
+    trip_detector.on_sample(idling(100))
+    trip_detector.on_sample(idling(159))
+    assert trips.ended == 0
+    trip_detector.on_sample(idling(160))
+    assert trips.ended == 1
+
+
+def test_auto_trips_off_only_tracks_state():
+    trip_detector, trips = detector(auto_trips=False)
+    trip_detector.on_sample(driving(0))
+    trip_detector.on_sample(engine_off(100))
+
+    assert trip_detector.state == OFF
+    assert (trips.started, trips.ended) == (0, 0)
+
+
+def test_overlapping_trip_stops_end_the_trip_once(tmp_path, monkeypatch):
+    from phase1.obd_monitor import Phase1Monitor
+    from phase1.synthetic_reader import SyntheticReader
+
+    config = Config(phase=1)
+    config.set('logging.directory', str(tmp_path))
+    config.set('logging.durability.fsync', False)
+    config.set('vehicle_state.enabled', False)
+    monitor = Phase1Monitor(config=config, reader=SyntheticReader())
+    try:
+        monitor.start_trip()
+        ends = []
+        end_trip = monitor.pipeline.end_trip
+
+        def slow_end_trip():
+            ends.append(1)
+            time.sleep(0.05)  # widen the window for the other stop
+            return end_trip()
+
+        monkeypatch.setattr(monitor.pipeline, 'end_trip', slow_end_trip)
+        # An automatic end on the detector thread racing a manual stop
+        stopper = threading.Thread(target=monitor.stop_trip)
+        stopper.start()
+        monitor.stop_trip()
+        stopper.join()
+
+        assert ends == [1]
+        assert not monitor.trip_active
+    finally:
+        monitor.bus.close()